@@ -0,0 +1,101 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/batch.py
+# ----------------------------------------------------------
+# Description:
+# Batch evaluation helpers for the FastAPI Calculator app.
+# A batch is an ordered list of (operation, a, b) items that
+# may mix all four operations. Batches are computed column-
+# wise by the NumPy kernel in app/vectorized.py, and a single
+# failure (e.g. division by zero) is reported for that item
+# only instead of failing the whole batch.
+# ----------------------------------------------------------
+
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Union
+import logging
+import math
+
+from app.operations import Number, add, subtract, multiply, divide
+from app.vectorized import (
+    OUT_OF_RANGE,
+    STATUS_DIVIDE_BY_ZERO,
+    STATUS_OK,
+    STATUS_OUT_OF_RANGE,
+    evaluate_columns,
+    op_code_column,
+)
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of items accepted in a single batch request
+MAX_BATCH_SIZE = 100_000
+
+# Operation name → arithmetic function lookup table
+OPERATIONS: Dict[str, Callable[[Number, Number], Number]] = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+}
+
+
+# ----------------------------------------------------------
+# Evaluate a single batch item
+# ----------------------------------------------------------
+def evaluate_item(op: str, a: Number, b: Number) -> Dict[str, Any]:
+    """Evaluate one item and return either {"result": ...} or {"error": ...}."""
+    func = OPERATIONS.get(op)
+    if func is None:
+        return {"error": f"Unsupported operation: {op}"}
+    try:
+        result = func(a, b)
+    except (ValueError, TypeError) as exc:
+        return {"error": str(exc)}
+    if isinstance(result, float) and not math.isfinite(result):
+        return {"error": OUT_OF_RANGE}
+    return {"result": result}
+
+
+# ----------------------------------------------------------
+# Evaluate a whole batch, preserving input order
+# ----------------------------------------------------------
+def evaluate_batch(items: Iterable[Tuple[str, Number, Number]]) -> List[Dict[str, Any]]:
+    """Return one result entry per (op, a, b) item, in the same order."""
+    items = list(items)
+    if not items:
+        return []
+    ops, a, b = zip(*items)
+    try:
+        results, status = evaluate_columns(op_code_column(ops), a, b)
+    except TypeError:
+        # Non-numeric operands: fall back to the scalar path so the
+        # error is attributed to the offending items only.
+        return [evaluate_item(op, x, y) for op, x, y in items]
+
+    entries = []
+    for op, value, code in zip(ops, results.tolist(), status.tolist()):
+        if code == STATUS_OK:
+            entries.append({"result": value})
+        elif code == STATUS_DIVIDE_BY_ZERO:
+            entries.append({"error": "Cannot divide by zero."})
+        elif code == STATUS_OUT_OF_RANGE:
+            entries.append({"error": OUT_OF_RANGE})
+        else:
+            entries.append({"error": f"Unsupported operation: {op}"})
+    return entries
+
+
+# ----------------------------------------------------------
+# Evaluate pre-parsed records (valid items mixed with errors)
+# ----------------------------------------------------------
+def evaluate_parsed(records: Sequence[Union[Tuple[str, Number, Number], Dict[str, Any]]]
+                    ) -> List[Dict[str, Any]]:
+    """
+    Evaluate records produced by a parser: (op, a, b) tuples are computed
+    in one batch, error entries (dicts) are passed through in place.
+    """
+    items = [record for record in records if isinstance(record, tuple)]
+    results = iter(evaluate_batch(items))
+    return [next(results) if isinstance(record, tuple) else record for record in records]
@@ -0,0 +1,201 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/binary.py
+# ----------------------------------------------------------
+# Description:
+# Packed binary wire format for POST /batch.
+#
+# JSON spends most of a large batch's time formatting and
+# parsing floats. Clients that send
+# `Content-Type: application/octet-stream` use columns of raw
+# little-endian values instead:
+#
+#   request  : header | a  float64[n] | b float64[n] | op int8[n]
+#   response : header | result float64[n] | status uint8[n]
+#   header   : b"CAL1", uint32 rows, uint32 errors, 4 pad
+#              bytes (16 bytes, so the float64 columns stay
+#              8-byte aligned)
+#
+# Op codes and status codes are those of app/vectorized.py
+# (add 0, subtract 1, multiply 2, divide 3; status 0 ok,
+# 1 divide by zero, 2 unsupported operation, 3 out of range). Columns are
+# read with np.frombuffer, as views over the request body,
+# and go straight into evaluate_columns; results are written
+# back the same way. Binary requests get a binary response
+# unless the Accept header asks for JSON; JSON requests are
+# unchanged and still served by the regular /batch route.
+# ----------------------------------------------------------
+
+from typing import Optional, Tuple
+import logging
+import struct
+
+import numpy as np
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Match
+from starlette.types import Scope
+
+from app.batch import MAX_BATCH_SIZE
+from app.fastpath import FastRoute
+from app.logging_config import should_log
+from app.metrics import registry
+from app.profiling import mark
+from app.vectorized import (
+    OP_CODES,
+    OUT_OF_RANGE,
+    STATUS_DIVIDE_BY_ZERO,
+    STATUS_OK,
+    STATUS_OUT_OF_RANGE,
+    evaluate_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPE = "application/octet-stream"
+MAGIC = b"CAL1"
+HEADER = struct.Struct("<4sII4x")
+REQUEST_ROW_BYTES = 8 + 8 + 1
+RESPONSE_ROW_BYTES = 8 + 1
+
+_OP_NAMES = {code: name for name, code in OP_CODES.items()}
+
+
+class BinaryFormatError(ValueError):
+    """The body is not a well-formed binary batch."""
+
+
+# ----------------------------------------------------------
+# Encode / decode
+# ----------------------------------------------------------
+def encode_request(codes, a, b) -> bytes:
+    """Pack op-code and operand columns into a request body (used by clients and tests)."""
+    codes = np.asarray(codes, dtype=np.int8)
+    a, b = np.asarray(a, dtype="<f8"), np.asarray(b, dtype="<f8")
+    return HEADER.pack(MAGIC, len(codes), 0) + a.tobytes() + b.tobytes() + codes.tobytes()
+
+
+def decode_request(body: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (codes, a, b) as read-only views over body. Raises BinaryFormatError."""
+    if len(body) < HEADER.size:
+        raise BinaryFormatError("Binary body is shorter than its header.")
+    magic, rows, _ = HEADER.unpack_from(body)
+    if magic != MAGIC:
+        raise BinaryFormatError("Binary body does not start with b'CAL1'.")
+    if rows > MAX_BATCH_SIZE:
+        raise BinaryFormatError(f"Batch exceeds maximum size of {MAX_BATCH_SIZE} operations.")
+    if len(body) != HEADER.size + rows * REQUEST_ROW_BYTES:
+        raise BinaryFormatError(f"Binary body length does not match {rows} rows.")
+    a = np.frombuffer(body, dtype="<f8", count=rows, offset=HEADER.size)
+    b = np.frombuffer(body, dtype="<f8", count=rows, offset=HEADER.size + 8 * rows)
+    codes = np.frombuffer(body, dtype=np.int8, count=rows, offset=HEADER.size + 16 * rows)
+    return codes, a, b
+
+
+def encode_response(results: np.ndarray, status: np.ndarray) -> bytes:
+    """Pack result and status columns into a response body."""
+    errors = int(np.count_nonzero(status))
+    return (HEADER.pack(MAGIC, len(results), errors)
+            + results.astype("<f8", copy=False).tobytes() + status.astype(np.uint8, copy=False).tobytes())
+
+
+def decode_response(body: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Return (results, status, errors) from a response body (used by clients and tests)."""
+    magic, rows, errors = HEADER.unpack_from(body)
+    if magic != MAGIC or len(body) != HEADER.size + rows * RESPONSE_ROW_BYTES:
+        raise BinaryFormatError("Malformed binary response.")
+    results = np.frombuffer(body, dtype="<f8", count=rows, offset=HEADER.size)
+    status = np.frombuffer(body, dtype=np.uint8, count=rows, offset=HEADER.size + 8 * rows)
+    return results, status, errors
+
+
+# ----------------------------------------------------------
+# Content negotiation
+# ----------------------------------------------------------
+def _header(scope: Scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def is_binary(content_type: Optional[bytes]) -> bool:
+    return content_type is not None and content_type.split(b";", 1)[0].strip().lower() == MEDIA_TYPE.encode()
+
+
+def wants_json(accept: Optional[str]) -> bool:
+    """True when Accept names JSON and not the binary format: JSON stays opt-in for binary requests."""
+    if not accept:
+        return False
+    accept = accept.lower()
+    return "application/json" in accept and MEDIA_TYPE not in accept
+
+
+# ----------------------------------------------------------
+# Route
+# ----------------------------------------------------------
+async def binary_batch(request: Request) -> Response:
+    """POST /batch with a packed binary body."""
+    try:
+        codes, a, b = decode_request(await request.body())
+        user_id = _user_id(request)
+        mark("parse")
+    except BinaryFormatError as exc:
+        logger.error("Binary batch error: %s", exc)
+        registry.count_error("validation")
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+
+    results, status = evaluate_columns(codes, a, b)
+    mark("compute")
+    writer = getattr(request.app.state, "calc_writer", None)
+    if writer is not None:
+        user_id = user_id or request.app.state.settings.default_user_id
+        ok = np.flatnonzero(status == STATUS_OK)
+        writer.record_many(
+            {"operation": _OP_NAMES[op], "operand_a": x, "operand_b": y, "result": result, "user_id": user_id}
+            for op, x, y, result in zip(codes[ok].tolist(), a[ok].tolist(), b[ok].tolist(), results[ok].tolist())
+        )
+    if should_log():
+        logger.info("Binary batch performed: %d operations", len(results))
+
+    if wants_json(request.headers.get("accept")):
+        return JSONResponse({"results": [_json_entry(code, value, state) for code, value, state
+                                         in zip(codes.tolist(), results.tolist(), status.tolist())],
+                             "count": len(results), "errors": int(np.count_nonzero(status))})
+    return Response(encode_response(results, status), media_type=MEDIA_TYPE)
+
+
+def _user_id(request: Request) -> Optional[int]:
+    value = request.headers.get("x-user-id")
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise BinaryFormatError("Invalid or missing numeric input.") from None
+
+
+def _json_entry(code: int, value: float, state: int) -> dict:
+    if state == STATUS_OK:
+        return {"result": value}
+    if state == STATUS_DIVIDE_BY_ZERO:
+        return {"error": "Cannot divide by zero."}
+    if state == STATUS_OUT_OF_RANGE:
+        return {"error": OUT_OF_RANGE}
+    return {"error": f"Unsupported operation code: {code}"}
+
+
+class BinaryRoute(FastRoute):
+    """Matches only requests with a binary body, so JSON requests fall through to the regular route."""
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] != "http" or not is_binary(_header(scope, b"content-type")):
+            return Match.NONE, {}
+        return super().matches(scope)
+
+
+def install_binary_routes(app) -> None:
+    """Register the binary /batch handler ahead of the JSON route."""
+    app.router.routes.insert(0, BinaryRoute("/batch", binary_batch, methods=["POST"]))
@@ -0,0 +1,178 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/bulk.py
+# ----------------------------------------------------------
+# Description:
+# Offline bulk processing of calculation files for the CLI
+# (`python cli.py bulk ...`).
+#
+# Input is JSONL ({"op", "a", "b"} per line, like /stream) or
+# CSV with `op,a,b` header columns. JSONL input is read via
+# mmap and CSV input is streamed, so files are never loaded
+# whole. Rows are grouped into chunks and evaluated by a
+# process pool; a bounded window of in-flight chunks keeps
+# memory flat and output is written in input order.
+# ----------------------------------------------------------
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Sequence, Tuple
+import collections
+import csv
+import io
+import mmap
+import os
+import time
+
+from app.batch import evaluate_parsed
+from app.streaming import INVALID_RECORD, encode_ndjson, parse_record
+
+FORMATS = ("jsonl", "csv")
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+# ----------------------------------------------------------
+# Run statistics
+# ----------------------------------------------------------
+@dataclass
+class BulkStats:
+    """Summary of a bulk run."""
+
+    rows: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def detect_format(path: str) -> str:
+    """Infer the file format from its extension (defaults to jsonl)."""
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+# ----------------------------------------------------------
+# Readers (yield raw rows; parsing happens in the workers)
+# ----------------------------------------------------------
+def iter_jsonl_lines(path: str) -> Iterator[bytes]:
+    """Yield non-blank lines of a JSONL file using a memory map."""
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for line in iter(mapped.readline, b""):
+            if line.strip():
+                yield line
+
+
+def iter_csv_rows(path: str) -> Iterator[List[str]]:
+    """Yield [op, a, b] rows from a CSV file with an op,a,b header."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [name.strip().lower() for name in header]
+        try:
+            indexes = [columns.index(name) for name in ("op", "a", "b")]
+        except ValueError:
+            raise ValueError("CSV input needs op, a and b columns.") from None
+        for row in reader:
+            if row:
+                yield [row[i] if i < len(row) else "" for i in indexes]
+
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most size items."""
+    chunk: List[Any] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ----------------------------------------------------------
+# Workers (run in pool processes; return encoded output)
+# ----------------------------------------------------------
+def parse_csv_row(row: Sequence[str]):
+    """Return (op, a, b) for a CSV row, or an error entry."""
+    op, a, b = row
+    try:
+        return (op.strip(), float(a), float(b))
+    except ValueError:
+        return INVALID_RECORD
+
+
+def process_jsonl_chunk(lines: List[bytes]) -> Tuple[bytes, int]:
+    """Evaluate a chunk of JSONL lines. Returns (NDJSON output, error count)."""
+    entries = evaluate_parsed([parse_record(line) for line in lines])
+    return encode_ndjson(entries), sum("error" in entry for entry in entries)
+
+
+def process_csv_chunk(rows: List[List[str]]) -> Tuple[bytes, int]:
+    """Evaluate a chunk of CSV rows. Returns (`result,error` CSV output, error count)."""
+    entries = evaluate_parsed([parse_csv_row(row) for row in rows])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for entry in entries:
+        writer.writerow([entry.get("result", ""), entry.get("error", "")])
+    return buffer.getvalue().encode(), sum("error" in entry for entry in entries)
+
+
+# ----------------------------------------------------------
+# Driver
+# ----------------------------------------------------------
+def process_file(input_path: str, output_path: str, workers: int = 0,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, fmt: str = "") -> BulkStats:
+    """
+    Evaluate every row of input_path and write results to output_path in
+    the same order. workers=0 uses one process per CPU; workers=1 runs
+    in-process without a pool.
+    """
+    fmt = fmt or detect_format(input_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    workers = workers or os.cpu_count() or 1
+
+    if fmt == "csv":
+        rows: Iterable[Any] = iter_csv_rows(input_path)
+        worker: Callable[[List[Any]], Tuple[bytes, int]] = process_csv_chunk
+        header = b"result,error\n"
+    else:
+        rows, worker, header = iter_jsonl_lines(input_path), process_jsonl_chunk, b""
+
+    stats = BulkStats()
+    start = time.perf_counter()
+    with open(output_path, "wb") as out:
+        out.write(header)
+        for count, (output, errors) in run_chunks(chunked(rows, chunk_size), worker, workers):
+            out.write(output)
+            stats.rows += count
+            stats.errors += errors
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def run_chunks(chunks: Iterator[List[Any]], worker: Callable[[List[Any]], Any],
+               workers: int) -> Iterator[Tuple[int, Any]]:
+    """Yield (row_count, worker result) per chunk in order, with a bounded window in flight."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield len(chunk), worker(chunk)
+        return
+
+    window: Deque[Tuple[int, Future]] = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            window.append((len(chunk), pool.submit(worker, chunk)))
+            if len(window) >= workers * 2:
+                count, future = window.popleft()
+                yield count, future.result()
+        while window:
+            count, future = window.popleft()
+            yield count, future.result()
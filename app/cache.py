@@ -0,0 +1,179 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/cache.py
+# ----------------------------------------------------------
+# Description:
+# Bounded memoization layer for the arithmetic functions in
+# app/operations.py, keyed by (operation, a, b).
+#
+# ResultCache keeps a local LRU map with an optional TTL and
+# hit/miss counters. It can also be given a shared backend
+# (CacheBackend) so several uvicorn workers can reuse each
+# other's results; InMemoryBackend is the in-process stand-in
+# for such a shared store. Division errors are cached as
+# negative results and re-raised as ValueError on a hit.
+# ----------------------------------------------------------
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+from app.operations import Number
+
+CacheKey = Tuple[str, Number, Number]
+
+
+# ----------------------------------------------------------
+# Negative result marker
+# ----------------------------------------------------------
+@dataclass(frozen=True)
+class CachedError:
+    """A cached ValueError (e.g. division by zero)."""
+
+    message: str
+
+
+# ----------------------------------------------------------
+# Shared backend interface
+# ----------------------------------------------------------
+class CacheBackend(ABC):
+    """Interface for a cache shared between processes (e.g. Redis)."""
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the stored value, or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value with an optional time-to-live in seconds."""
+
+
+class InMemoryBackend(CacheBackend):
+    """Thread-safe in-process stand-in for a shared cache backend."""
+
+    def __init__(self, maxsize: int = 65_536) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# ----------------------------------------------------------
+# Local LRU result cache
+# ----------------------------------------------------------
+class ResultCache:
+    """LRU + TTL memoization of (operation, a, b) → result."""
+
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None,
+                 backend: Optional[CacheBackend] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl or None
+        self.backend = backend
+        self._data: "OrderedDict[CacheKey, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def cacheable(op: str, a: Number, b: Number) -> bool:
+        """
+        Signed zeros compare equal but can change the sign of a result
+        (e.g. -0.0 * 5), so zero operands bypass the cache. A zero
+        divisor is still cached because every such division fails.
+        """
+        return a != 0 and (b != 0 or op == "divide")
+
+    def get_or_compute(self, op: str, a: Number, b: Number,
+                       func: Callable[[Number, Number], Number]) -> Number:
+        """Return the cached result for (op, a, b), computing it with func on a miss."""
+        if not self.cacheable(op, a, b):
+            return func(a, b)
+
+        key = (op, a, b)
+        value = self._get_local(key)
+        if value is None and self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self.shared_hits += 1
+                self._set_local(key, value)
+
+        if value is None:
+            self.misses += 1
+            try:
+                value = func(a, b)
+            except ValueError as exc:
+                value = CachedError(str(exc))
+            self._set_local(key, value)
+            if self.backend is not None:
+                self.backend.set(key, value, self.ttl)
+        else:
+            self.hits += 1
+
+        if isinstance(value, CachedError):
+            raise ValueError(value.message)
+        return value
+
+    def _get_local(self, key: CacheKey) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def _set_local(self, key: CacheKey, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all local entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """Return size and hit/miss counters."""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,216 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/compression.py
+# ----------------------------------------------------------
+# Description:
+# Response compression negotiated from Accept-Encoding.
+#
+# CompressionMiddleware compresses JSON, NDJSON, HTML and
+# text responses of at least `minimum_size` bytes with
+# brotli (when the `brotli` package is installed) or gzip,
+# whichever the client ranks higher. Small bodies are sent
+# as-is: below about 1 KB the saved bytes do not pay for the
+# CPU time and headers. Streaming responses (/stream) are
+# compressed chunk by chunk with a sync flush, so the client
+# still receives each chunk as soon as it is produced.
+#
+# Levels favour speed (gzip 1, brotli 4): these are dynamic
+# responses compressed on every request, not static assets.
+# See benchmarks/bench_compression.py for bytes-on-wire and
+# CPU cost per response size.
+# ----------------------------------------------------------
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import zlib
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+DEFAULT_MINIMUM_SIZE = 1024
+GZIP_LEVEL = 1
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+UNCOMPRESSIBLE_STATUS = (204, 206, 304)
+
+
+# ----------------------------------------------------------
+# Encoders
+# ----------------------------------------------------------
+class GzipEncoder:
+    """gzip stream; compress() sync-flushes so each chunk can be decoded on arrival."""
+
+    name = "gzip"
+
+    def __init__(self, level: int = GZIP_LEVEL) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    """brotli stream with the same interface as GzipEncoder."""
+
+    name = "br"
+
+    def __init__(self, quality: int = BROTLI_QUALITY) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+ENCODERS = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """One-shot compression of a whole body."""
+    return ENCODERS[encoding]().finish(data)
+
+
+# ----------------------------------------------------------
+# Accept-Encoding negotiation
+# ----------------------------------------------------------
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str, available: Tuple[str, ...] = tuple(ENCODERS)) -> Optional[str]:
+    """
+    The available encoding with the highest q-value ("br" wins ties), or
+    None when the client accepts none of them. Header values repeat, so
+    results are cached.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            weights[name.strip()] = quality
+    wildcard = weights.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name in sorted(available, key=lambda encoding: encoding != "br"):
+        quality = weights.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+# ----------------------------------------------------------
+# ASGI middleware
+# ----------------------------------------------------------
+class CompressionMiddleware:
+    """Compress eligible HTTP responses with the client's preferred encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = DEFAULT_MINIMUM_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    """Holds http.response.start until the first body chunk shows whether to compress."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            return
+        if kind != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        if self.encoder is not None:
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            chunk = self.encoder.compress(body) if more else self.encoder.finish(body)
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more})
+            return
+        await self._first_body(message)
+
+    async def _first_body(self, message: Message) -> None:
+        start = self.start
+        headers = MutableHeaders(raw=list(start["headers"]))
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        eligible = (start["status"] not in UNCOMPRESSIBLE_STATUS
+                    and "content-encoding" not in headers
+                    and compressible(headers.get("content-type", "")))
+        if not eligible:
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if not more:
+            if len(body) >= self.minimum_size:
+                compressed = compress(body, self.encoding)
+                if len(compressed) < len(body):
+                    body = compressed
+                    self._mark_encoded(headers)
+                    headers["content-length"] = str(len(body))
+            self.passthrough = True
+            await self.send({**start, "headers": headers.raw})
+            await self.send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+
+        # streaming: size unknown up front, compress every chunk
+        self.encoder = ENCODERS[self.encoding]()
+        self._mark_encoded(headers)
+        if "content-length" in headers:
+            del headers["content-length"]
+        await self.send({**start, "headers": headers.raw})
+        await self.send({"type": "http.response.body", "body": self.encoder.compress(body), "more_body": True})
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["content-encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"  # the encoded bytes differ from the ETag'd representation
+
@@ -0,0 +1,179 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/config.py
+# ----------------------------------------------------------
+# Description:
+# Central runtime settings for the FastAPI Calculator app.
+# Values are read from environment variables (the same way
+# DATABASE_URL is passed in docker-compose.yml) so behaviour
+# can be tuned per container without code changes.
+# ----------------------------------------------------------
+
+from dataclasses import dataclass
+from typing import Mapping, Optional
+import logging
+import os
+
+from app.logging_config import LOG_MODES
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------
+# Helper: Read typed values from the environment
+# ----------------------------------------------------------
+def _env_int(environ: Mapping[str, str], name: str, default: int) -> int:
+    """Return an integer environment variable, or default when unset/invalid."""
+    try:
+        return int(environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(environ: Mapping[str, str], name: str, default: float) -> float:
+    """Return a float environment variable, or default when unset/invalid."""
+    try:
+        return float(environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_bool(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    """Return a boolean environment variable ("1", "true", "yes", "on" are true)."""
+    value = environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_log_mode(environ: Mapping[str, str], default: str) -> str:
+    """Return CALC_LOG_MODE, or default (with a warning) when it is not a known mode."""
+    mode = environ.get("CALC_LOG_MODE", default).strip().lower()
+    if mode not in LOG_MODES:
+        logger.warning("Unknown CALC_LOG_MODE %r (expected one of %s); using %r.",
+                       mode, ", ".join(LOG_MODES), default)
+        return default
+    return mode
+
+
+# History page sizes (app/history.py), here so main.py can declare
+# its query limits without importing SQLAlchemy at startup
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+# ----------------------------------------------------------
+# Settings container
+# ----------------------------------------------------------
+@dataclass(frozen=True)
+class Settings:
+    """Runtime configuration for the application."""
+
+    # Calculation logging: "off", "sampled" (1-in-N) or "full"
+    log_mode: str = "full"
+    log_sample_rate: int = 100
+
+    # Database (persistence is disabled when DATABASE_URL is unset)
+    database_url: Optional[str] = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0   # seconds to wait for a free connection
+    db_pool_recycle: int = -1       # seconds before a connection is replaced (-1 = never)
+    db_async: bool = True           # use an async driver for reads when one is installed
+    default_user_id: int = 1
+
+    # Background calculation writer
+    writer_batch_size: int = 500
+    writer_flush_interval: float = 0.5
+    writer_queue_size: int = 100_000
+
+    # Result cache (0 disables; TTL of 0 means entries never expire)
+    cache_size: int = 4096
+    cache_ttl: float = 0.0
+
+    # Idempotency-Key responses kept for retries (0 disables)
+    idempotency_size: int = 10_000
+    idempotency_ttl: float = 86_400.0
+
+    # Admission control (0 disables): per-client requests/s, overrides like
+    # "/batch=5:10", concurrency cap and the queueing delay before shedding
+    rate_limit: float = 0.0
+    rate_burst: int = 0
+    rate_limit_routes: str = ""
+    concurrency_limit: int = 0
+    queue_target_ms: float = 50.0
+
+    # Response compression (gzip, or brotli when installed) for bodies of at least this many bytes
+    compression: bool = True
+    compression_min_size: int = 1024
+
+    # Job queue (POST /jobs): worker threads, processes per job (0/1 = in the worker thread),
+    # queued jobs before 503 (0 disables jobs), and seconds finished jobs are kept
+    job_workers: int = 1
+    job_processes: int = 0
+    job_queue_size: int = 64
+    job_queue_bytes: int = 256 * 1024 * 1024  # bodies held in memory for queued jobs
+    job_ttl: float = 3600.0
+
+    # Request profiling (off by default): cProfile 1 in N requests, keep requests slower than
+    # this many ms, ring buffer size; CALC_ADMIN_TOKEN guards /admin/* when set
+    profile_sample_rate: int = 0
+    profile_slow_ms: float = 0.0
+    profile_buffer: int = 50
+    admin_token: Optional[str] = None
+
+    # Serve the arithmetic routes through the low-overhead handlers in app/fastpath.py
+    fast_path: bool = False
+
+    # Worker processes started by `python cli.py serve` (0 = one per CPU)
+    workers: int = 0
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        """Build settings from environment variables."""
+        environ = os.environ if environ is None else environ
+        return cls(
+            log_mode=_env_log_mode(environ, cls.log_mode),
+            log_sample_rate=max(1, _env_int(environ, "CALC_LOG_SAMPLE_RATE", cls.log_sample_rate)),
+            database_url=environ.get("DATABASE_URL") or None,
+            db_pool_size=_env_int(environ, "CALC_DB_POOL_SIZE", cls.db_pool_size),
+            db_max_overflow=_env_int(environ, "CALC_DB_MAX_OVERFLOW", cls.db_max_overflow),
+            db_pool_timeout=_env_float(environ, "CALC_DB_POOL_TIMEOUT", cls.db_pool_timeout),
+            db_pool_recycle=_env_int(environ, "CALC_DB_POOL_RECYCLE", cls.db_pool_recycle),
+            db_async=_env_bool(environ, "CALC_DB_ASYNC", cls.db_async),
+            default_user_id=_env_int(environ, "CALC_DEFAULT_USER_ID", cls.default_user_id),
+            writer_batch_size=max(1, _env_int(environ, "CALC_WRITER_BATCH_SIZE", cls.writer_batch_size)),
+            writer_flush_interval=_env_float(
+                environ, "CALC_WRITER_FLUSH_INTERVAL", cls.writer_flush_interval
+            ),
+            writer_queue_size=_env_int(environ, "CALC_WRITER_QUEUE_SIZE", cls.writer_queue_size),
+            cache_size=_env_int(environ, "CALC_CACHE_SIZE", cls.cache_size),
+            cache_ttl=_env_float(environ, "CALC_CACHE_TTL", cls.cache_ttl),
+            idempotency_size=_env_int(environ, "CALC_IDEMPOTENCY_SIZE", cls.idempotency_size),
+            idempotency_ttl=_env_float(environ, "CALC_IDEMPOTENCY_TTL", cls.idempotency_ttl),
+            rate_limit=_env_float(environ, "CALC_RATE_LIMIT", cls.rate_limit),
+            rate_burst=_env_int(environ, "CALC_RATE_BURST", cls.rate_burst),
+            rate_limit_routes=environ.get("CALC_RATE_LIMIT_ROUTES", cls.rate_limit_routes),
+            concurrency_limit=_env_int(environ, "CALC_CONCURRENCY_LIMIT", cls.concurrency_limit),
+            queue_target_ms=_env_float(environ, "CALC_QUEUE_TARGET_MS", cls.queue_target_ms),
+            compression=_env_bool(environ, "CALC_COMPRESSION", cls.compression),
+            compression_min_size=_env_int(environ, "CALC_COMPRESSION_MIN_SIZE", cls.compression_min_size),
+            job_workers=max(1, _env_int(environ, "CALC_JOB_WORKERS", cls.job_workers)),
+            job_processes=_env_int(environ, "CALC_JOB_PROCESSES", cls.job_processes),
+            job_queue_size=_env_int(environ, "CALC_JOB_QUEUE_SIZE", cls.job_queue_size),
+            job_queue_bytes=_env_int(environ, "CALC_JOB_QUEUE_BYTES", cls.job_queue_bytes),
+            job_ttl=_env_float(environ, "CALC_JOB_TTL", cls.job_ttl),
+            profile_sample_rate=_env_int(environ, "CALC_PROFILE_SAMPLE_RATE", cls.profile_sample_rate),
+            profile_slow_ms=_env_float(environ, "CALC_PROFILE_SLOW_MS", cls.profile_slow_ms),
+            profile_buffer=max(1, _env_int(environ, "CALC_PROFILE_BUFFER", cls.profile_buffer)),
+            admin_token=environ.get("CALC_ADMIN_TOKEN") or None,
+            fast_path=_env_bool(environ, "CALC_FAST_PATH", cls.fast_path),
+            workers=_env_int(environ, "CALC_WORKERS", cls.workers),
+        )
+
+
+def get_settings() -> Settings:
+    """Return settings for the current process environment."""
+    return Settings.from_env()
@@ -0,0 +1,195 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/database.py
+# ----------------------------------------------------------
+# Description:
+# Database access for async routes, opened and closed by the
+# FastAPI lifespan in main.py.
+#
+# Routes call `await database.run(fn, *args)` where fn is a
+# plain SQLAlchemy Core function taking a Connection first
+# (e.g. app/history.py fetch_history). With an async driver
+# installed (asyncpg / psycopg 3 for PostgreSQL, aiosqlite
+# for SQLite) fn runs on an AsyncEngine connection without
+# touching a thread. Otherwise it runs on the synchronous
+# engine in a dedicated thread pool sized to the connection
+# pool, so queries never block the event loop and never pile
+# up more threads than there are connections to serve them.
+#
+# The synchronous engine is always created: the background
+# CalculationWriter (app/persistence.py) uses it.
+# ----------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, ExitStack
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, Optional, TypeVar
+import asyncio
+import functools
+import threading
+
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.pool import NullPool
+
+from app.db import create_db_engine, ensure_user, init_db
+
+T = TypeVar("T")
+
+# Async drivers per backend, in order of preference: (SQLAlchemy driver name, module)
+ASYNC_DRIVERS = {
+    "postgresql": (("asyncpg", "asyncpg"), ("psycopg_async", "psycopg")),
+    "sqlite": (("aiosqlite", "aiosqlite"),),
+}
+
+
+# ----------------------------------------------------------
+# Driver selection
+# ----------------------------------------------------------
+def async_url(url: str) -> Optional[URL]:
+    """The URL rewritten for an installed async driver, or None if there is none."""
+    parsed = make_url(url)
+    if find_spec("greenlet") is None:  # SQLAlchemy's asyncio layer needs greenlet
+        return None
+    if parsed.get_dialect().is_async:
+        return parsed
+    backend = parsed.get_backend_name()
+    for driver, module in ASYNC_DRIVERS.get(backend, ()):
+        if find_spec(module) is not None:
+            return parsed.set(drivername=f"{backend}+{driver}")
+    return None
+
+
+def sync_url(url: str) -> URL:
+    """The URL with an async driver replaced by the backend's default sync driver."""
+    parsed = make_url(url)
+    if parsed.get_dialect().is_async:
+        return parsed.set(drivername=parsed.get_backend_name())
+    return parsed
+
+
+# ----------------------------------------------------------
+# Database handle
+# ----------------------------------------------------------
+def _open_connections(engine: Engine, count: int) -> None:
+    """Check out `count` connections at once, then return them all to the pool."""
+    with ExitStack() as stack:
+        for _ in range(count):
+            stack.enter_context(engine.connect()).exec_driver_sql("SELECT 1")
+
+
+class Database:
+    """Connection pool plus an async way to run queries on it."""
+
+    def __init__(self, url: str, pool_size: int = 5, max_overflow: int = 10,
+                 pool_timeout: float = 30.0, pool_recycle: int = -1,
+                 prefer_async: bool = True) -> None:
+        pool = {"pool_size": pool_size, "max_overflow": max_overflow,
+                "pool_timeout": pool_timeout, "pool_recycle": pool_recycle}
+        self.engine: Engine = create_db_engine(sync_url(url).render_as_string(hide_password=False), **pool)
+        self.async_engine = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._calls = 0  # calls accepted by run() and not yet finished
+        self.busy = 0  # calls currently running on a connection
+
+        target = async_url(url) if prefer_async else None
+        if target is not None:
+            from sqlalchemy.ext.asyncio import create_async_engine
+
+            if target.get_backend_name() == "sqlite":
+                self.async_engine = create_async_engine(target)
+            else:
+                self.async_engine = create_async_engine(target, pool_pre_ping=True, **pool)
+        else:
+            # One thread per connection the pool can hand out; extra calls queue here
+            self._executor = ThreadPoolExecutor(max_workers=max(1, pool_size + max_overflow),
+                                                thread_name_prefix="calc-db")
+
+    @property
+    def mode(self) -> str:
+        return "async" if self.async_engine is not None else "threadpool"
+
+    def init_schema(self, default_user_id: Optional[int] = None) -> None:
+        """Create any missing tables, and the default user when one is given."""
+        init_db(self.engine)
+        if default_user_id is not None:
+            ensure_user(self.engine, default_user_id)
+
+    # ------------------------------------------------------
+    # Running queries
+    # ------------------------------------------------------
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(connection, *args) without blocking the event loop."""
+        self._track(calls=1)
+        try:
+            if self.async_engine is not None:
+                async with self.async_engine.connect() as conn:
+                    self._track(busy=1)
+                    try:
+                        return await conn.run_sync(fn, *args)
+                    finally:
+                        self._track(busy=-1)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(self._call, fn, *args))
+        finally:
+            self._track(calls=-1)
+
+    def _call(self, fn: Callable[..., T], *args: Any) -> T:
+        self._track(busy=1)
+        try:
+            with self.engine.connect() as conn:
+                return fn(conn, *args)
+        finally:
+            self._track(busy=-1)
+
+    def _track(self, calls: int = 0, busy: int = 0) -> None:
+        with self._lock:
+            self._calls += calls
+            self.busy += busy
+
+    @property
+    def waiting(self) -> int:
+        """Calls queued for a connection (async) or an executor thread (threadpool)."""
+        return max(0, self._calls - self.busy)
+
+    async def warm(self, connections: int = 1) -> None:
+        """Open `connections` pooled connections up front, so the first queries skip the connect."""
+        connections = max(1, connections)
+        if self.async_engine is not None:
+            if not isinstance(self.async_engine.sync_engine.pool, NullPool):  # NullPool (SQLite) keeps none
+                async with AsyncExitStack() as stack:
+                    for _ in range(connections):
+                        conn = await stack.enter_async_context(self.async_engine.connect())
+                        await conn.exec_driver_sql("SELECT 1")
+            connections = 1  # the sync engine only serves the background writer
+        await asyncio.get_running_loop().run_in_executor(self._executor, _open_connections, self.engine,
+                                                         connections)
+
+    # ------------------------------------------------------
+    # Pool utilisation
+    # ------------------------------------------------------
+    def pool_stats(self) -> Dict[str, int]:
+        """Pool size, connections in use / idle / overflow, and queued calls."""
+        engine = self.async_engine.sync_engine if self.async_engine is not None else self.engine
+        pool = engine.pool
+        stats = {"busy": self.busy, "waiting": self.waiting}
+        for name, method in (("size", "size"), ("checked_out", "checkedout"),
+                             ("checked_in", "checkedin"), ("overflow", "overflow")):
+            if hasattr(pool, method):  # QueuePool; SQLite's default pools lack some of these
+                stats[name] = getattr(pool, method)()
+        return stats
+
+    # ------------------------------------------------------
+    # Shutdown
+    # ------------------------------------------------------
+    async def close(self) -> None:
+        """Wait for running queries, then close every pooled connection."""
+        if self._executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+            self._executor = None
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+        self.engine.dispose()
+
@@ -0,0 +1,159 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/db.py
+# ----------------------------------------------------------
+# Description:
+# SQLAlchemy Core table definitions mirroring the `users` and
+# `calculations` tables in database_operations.sql, plus a
+# helper to create a pooled engine from DATABASE_URL.
+#
+# The composite indexes on calculations back the history
+# queries in app/history.py; existing databases get them from
+# the alembic migration in migrations/versions/.
+# calculation_stats is a rollup of calculations per (user,
+# operation), kept current by app/stats.py.
+#
+# The same definitions work against PostgreSQL in Docker
+# Compose and against SQLite in tests.
+# ----------------------------------------------------------
+
+from typing import Any, Dict
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.exc import DBAPIError
+
+metadata = MetaData()
+
+# ----------------------------------------------------------
+# Tables (see database_operations.sql)
+# ----------------------------------------------------------
+users = Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("username", String(50), nullable=False, unique=True),
+    Column("email", String(100), nullable=False, unique=True),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+)
+
+calculations = Table(
+    "calculations",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("operation", String(20), nullable=False),
+    Column("operand_a", Float, nullable=False),
+    Column("operand_b", Float, nullable=False),
+    Column("result", Float, nullable=False),
+    Column("timestamp", DateTime, server_default=func.current_timestamp()),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    # History lookups: newest-first per user / per operation, with id as the keyset tiebreaker
+    Index("ix_calculations_user_id_timestamp", "user_id", "timestamp", "id"),
+    Index("ix_calculations_operation_timestamp", "operation", "timestamp", "id"),
+)
+
+# Incrementally maintained rollup of `calculations` (mean = total / count)
+calculation_stats = Table(
+    "calculation_stats",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("operation", String(20), primary_key=True),
+    Column("count", Integer, nullable=False),
+    Column("total", Float, nullable=False),
+    Column("min_result", Float, nullable=False),
+    Column("max_result", Float, nullable=False),
+)
+
+
+# ----------------------------------------------------------
+# Engine creation
+# ----------------------------------------------------------
+def create_db_engine(url: str, pool_size: int = 5, max_overflow: int = 10,
+                     pool_timeout: float = 30.0, pool_recycle: int = -1) -> Engine:
+    """
+    Create a pooled engine. pool_timeout is how long a caller waits for a
+    free connection; pool_recycle (seconds, -1 = never) replaces connections
+    older than that. Pool settings are ignored for SQLite.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return create_engine(url)
+    return create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=True,
+    )
+
+
+# Key of the PostgreSQL advisory lock that serializes schema setup across workers
+SCHEMA_LOCK_KEY = 0x43414C43  # "CALC"
+
+
+def init_db(engine: Engine) -> None:
+    """
+    Create any missing tables (existing tables are left untouched). Safe to
+    run from several workers at once: on PostgreSQL they take turns under
+    an advisory lock; elsewhere a worker that loses the race to create a
+    table finds it on the next pass.
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+            metadata.create_all(conn)
+        return
+    for attempt in range(len(metadata.tables) + 1):
+        try:
+            metadata.create_all(engine)
+            return
+        except DBAPIError:  # another worker created a table between the check and the CREATE
+            if attempt == len(metadata.tables):
+                raise
+
+
+def ensure_user(engine: Engine, user_id: int) -> bool:
+    """
+    Create users.id = user_id if it is missing (returns True when created),
+    so rows recorded without an X-User-Id header satisfy the foreign key.
+    A worker that loses the race to create it gets False, not an error.
+    """
+    row = {"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@localhost"}
+    with engine.begin() as conn:
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            return _ensure_user_generic(conn, row)
+        created = conn.execute(insert(users).values(**row).on_conflict_do_nothing()).rowcount == 1
+        if created and dialect == "postgresql":
+            # an explicit id does not advance the SERIAL sequence; move it past the new row
+            conn.execute(text("SELECT setval(pg_get_serial_sequence('users', 'id'), "
+                              "(SELECT MAX(id) FROM users))"))
+    return created
+
+
+def _ensure_user_generic(conn: Connection, row: Dict[str, Any]) -> bool:
+    """Portable fallback: select, then insert (single worker only)."""
+    if conn.execute(select(users.c.id).where(users.c.id == row["id"])).first() is not None:
+        return False
+    conn.execute(users.insert().values(**row))
+    return True
@@ -0,0 +1,204 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/expressions.py
+# ----------------------------------------------------------
+# Description:
+# Arithmetic expressions with variables for the /evaluate
+# endpoint, e.g. "(a + b) * c / 2".
+#
+# An expression is parsed once with Python's ast module,
+# checked against a whitelist (numbers, variable names,
+# + - * / and unary minus) and compiled into a flat postfix
+# program with constant sub-expressions folded. Compiled
+# programs are cached by expression text. A program runs on
+# scalars through app/operations.py, or on whole columns of
+# variable bindings through the NumPy kernel in
+# app/vectorized.py in a single pass.
+# ----------------------------------------------------------
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+import ast
+import math
+
+import numpy as np
+
+from app.batch import OPERATIONS
+from app.operations import Number
+from app.vectorized import OUT_OF_RANGE, add_array, divide_array, multiply_array, subtract_array
+
+# Longest accepted expression text (characters)
+MAX_EXPRESSION_LENGTH = 1000
+
+# Deepest accepted nesting (unary operators and right-hand operands;
+# left-associative chains such as a + b + c are bounded by the length)
+MAX_EXPRESSION_DEPTH = 100
+
+# Compiled expressions kept in the cache
+CACHE_SIZE = 1024
+
+DIVIDE_BY_ZERO = "Cannot divide by zero."
+
+# Postfix instructions: (opcode, argument)
+PUSH_CONST = 0   # argument: float
+PUSH_VAR = 1     # argument: variable name
+BINARY = 2       # argument: operation name
+NEGATE = 3       # argument: None
+
+Instruction = Tuple[int, Any]
+
+_BINARY_OPS = {ast.Add: "add", ast.Sub: "subtract", ast.Mult: "multiply", ast.Div: "divide"}
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that cannot be compiled or evaluated."""
+
+
+# ----------------------------------------------------------
+# Compiled form
+# ----------------------------------------------------------
+@dataclass(frozen=True)
+class CompiledExpression:
+    """A validated expression as a postfix program."""
+
+    text: str
+    program: Tuple[Instruction, ...]
+    variables: Tuple[str, ...]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text: str) -> CompiledExpression:
+    """Parse, validate and compile an expression (cached by text)."""
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression exceeds {MAX_EXPRESSION_LENGTH} characters.")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+        program = _compile_node(tree.body, 0)
+    except ExpressionError:
+        raise
+    except (SyntaxError, ValueError):
+        raise ExpressionError("Invalid expression syntax.") from None
+    except RecursionError:  # parsing or a long left-associative chain on an already deep stack
+        raise ExpressionError(f"Expression nesting exceeds {MAX_EXPRESSION_DEPTH} levels.") from None
+    variables = tuple(sorted({arg for code, arg in program if code == PUSH_VAR}))
+    return CompiledExpression(text, tuple(program), variables)
+
+
+def _compile_node(node: ast.AST, depth: int) -> List[Instruction]:
+    if depth > MAX_EXPRESSION_DEPTH:
+        raise ExpressionError(f"Expression nesting exceeds {MAX_EXPRESSION_DEPTH} levels.")
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ExpressionError(f"Unsupported constant: {value!r}")
+        try:
+            return [(PUSH_CONST, float(value))]
+        except OverflowError:
+            raise ExpressionError("Constant is too large.") from None
+
+    if isinstance(node, ast.Name):
+        return [(PUSH_VAR, node.id)]
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _compile_node(node.operand, depth + 1)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if len(operand) == 1 and operand[0][0] == PUSH_CONST:
+            return [(PUSH_CONST, -operand[0][1])]
+        return operand + [(NEGATE, None)]
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        name = _BINARY_OPS[type(node.op)]
+        left, right = _compile_node(node.left, depth), _compile_node(node.right, depth + 1)
+        if len(left) == 1 == len(right) and left[0][0] == PUSH_CONST == right[0][0]:
+            try:
+                return [(PUSH_CONST, OPERATIONS[name](left[0][1], right[0][1]))]
+            except ValueError:
+                pass  # e.g. 1 / 0: left unfolded so evaluation reports it
+        return left + right + [(BINARY, name)]
+
+    raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+
+# ----------------------------------------------------------
+# Stack machine shared by the scalar and vectorized paths
+# ----------------------------------------------------------
+def _run(program: Sequence[Instruction], load: Callable[[str], Any], const: Callable[[float], Any],
+         ops: Mapping[str, Callable[[Any, Any], Any]], negate: Callable[[Any], Any]) -> Any:
+    stack: List[Any] = []
+    for code, arg in program:
+        if code == PUSH_CONST:
+            stack.append(const(arg))
+        elif code == PUSH_VAR:
+            stack.append(load(arg))
+        elif code == BINARY:
+            right = stack.pop()
+            stack.append(ops[arg](stack.pop(), right))
+        else:
+            stack.append(negate(stack.pop()))
+    return stack[0]
+
+
+# ----------------------------------------------------------
+# Scalar evaluation (one set of variables)
+# ----------------------------------------------------------
+def evaluate(compiled: CompiledExpression, variables: Mapping[str, Number]) -> float:
+    """Evaluate for one binding. Raises ValueError on missing variables or division by zero."""
+    for name in compiled.variables:
+        if name not in variables:
+            raise ExpressionError(f"Missing value for variable: {name}")
+    result = _run(compiled.program, variables.__getitem__, float, OPERATIONS, lambda value: -value)
+    if not math.isfinite(result):
+        raise ExpressionError(OUT_OF_RANGE)
+    return result
+
+
+# ----------------------------------------------------------
+# Vectorized evaluation (many sets of variables)
+# ----------------------------------------------------------
+def evaluate_many(compiled: CompiledExpression,
+                  bindings: Sequence[Mapping[str, Number]]) -> List[Dict[str, Any]]:
+    """
+    Evaluate one expression against every binding in one vectorized pass.
+    Returns {"result": value} or {"error": message} per binding, in order.
+    """
+    count = len(bindings)
+    if count == 0:
+        return []
+
+    errors: List[Any] = [None] * count
+    columns: Dict[str, np.ndarray] = {}
+    for name in compiled.variables:
+        columns[name] = np.fromiter((b.get(name, np.nan) for b in bindings), dtype=np.float64, count=count)
+        for index, binding in enumerate(bindings):
+            if errors[index] is None and name not in binding:
+                errors[index] = f"Missing value for variable: {name}"
+
+    zero_division = np.zeros(count, dtype=bool)
+
+    def divide_column(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        result, zero_mask = divide_array(a, b)
+        zero_division[:] |= zero_mask
+        return result
+
+    vector_ops = {"add": add_array, "subtract": subtract_array,
+                  "multiply": multiply_array, "divide": divide_column}
+    with np.errstate(over="ignore", invalid="ignore"):
+        results = _run(compiled.program, columns.__getitem__,
+                       lambda value: np.full(count, value), vector_ops, np.negative)
+
+    finite = np.isfinite(results)
+    entries: List[Dict[str, Any]] = []
+    for index, value in enumerate(results.tolist()):
+        if errors[index] is not None:
+            entries.append({"error": errors[index]})
+        elif zero_division[index]:
+            entries.append({"error": DIVIDE_BY_ZERO})
+        elif not finite[index]:
+            entries.append({"error": OUT_OF_RANGE})
+        else:
+            entries.append({"result": value})
+    return entries
@@ -0,0 +1,271 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/fastpath.py
+# ----------------------------------------------------------
+# Description:
+# Optional low-overhead handlers for /add, /subtract,
+# /multiply and /divide (enabled with CALC_FAST_PATH=1).
+#
+# The regular routes build an OperationRequest model, run
+# FastAPI's dependency and validation machinery and serialize
+# through JSONResponse. These handlers are plain Starlette
+# routes placed ahead of them: the body is decoded straight
+# into two floats (orjson when installed, json otherwise),
+# checked with the same lax rules Pydantic applies to float
+# fields, and answered with pre-encoded bytes. Status codes
+# and error bodies match the regular routes exactly, and
+# results still go through the result cache and persistence.
+# Bodies asking for an exact precision mode are handed to
+# app/precision.py, as the regular routes do.
+# ----------------------------------------------------------
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+import json
+import logging
+import math
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match, Route
+from starlette.types import Scope
+
+from app.batch import OPERATIONS
+from app.metrics import registry
+from app.operations import Number
+from app.profiling import mark
+from app.precision import (
+    DEFAULT_DIGITS, MAX_DIGITS, PRECISION_MODES, PrecisionError, evaluate_exact, format_exact,
+    to_float as exact_to_float,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Pre-encoded error bodies (identical to the regular routes' responses)
+INVALID_INPUT_BODY = b'{"error":"Invalid or missing numeric input."}'
+NON_FINITE_BODY = b'{"error":"Out of range float values are not JSON compliant"}'
+
+# Returned by _parse_user_id for a header that is present but not an integer
+_INVALID = object()
+
+
+# ----------------------------------------------------------
+# JSON encode / decode
+# ----------------------------------------------------------
+if orjson is not None:
+    def loads(body: bytes) -> Any:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # orjson rejects integers wider than 64 bits that Pydantic accepts
+            return json.loads(body)
+
+    def dumps(value: Dict[str, Any]) -> bytes:
+        return orjson.dumps(value)
+else:  # pragma: no cover - exercised only without orjson
+    loads = json.loads
+
+    def dumps(value: Dict[str, Any]) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+
+# ----------------------------------------------------------
+# Minimal validation (Pydantic lax float rules)
+# ----------------------------------------------------------
+def to_float(value: Any) -> Optional[float]:
+    """Coerce a JSON value the way a Pydantic float field does; None if invalid."""
+    if isinstance(value, float):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.isascii():  # float() also reads non-ASCII digits such as "１"; Pydantic does not
+            return None
+    if isinstance(value, (int, str)):  # bool is an int and is accepted as 0.0 / 1.0
+        try:
+            return float(value)
+        except (ValueError, OverflowError):
+            return None
+    return None
+
+
+def load_object(body: Union[bytes, str]) -> Optional[Dict[str, Any]]:
+    """Decode a JSON object body; None when it is not valid JSON or not an object."""
+    try:
+        data = loads(body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def operands_from(data: Optional[Dict[str, Any]]) -> Optional[Tuple[float, float]]:
+    """Return (a, b) as floats from a decoded body, or None when invalid."""
+    if data is None or data.get("precision", "float") != "float":
+        return None
+    a, b = to_float(data.get("a")), to_float(data.get("b"))
+    if a is None or b is None:
+        return None
+    return a, b
+
+
+def parse_operands(body: bytes) -> Optional[Tuple[float, float]]:
+    """Return (a, b) from a JSON body, or None when the body is invalid."""
+    return operands_from(load_object(body))
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Coerce like a lax Pydantic int field (integral floats and digit strings)."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def precise_options(data: Dict[str, Any]) -> Optional[Tuple[Any, Any, str, int]]:
+    """Return (a, b, mode, digits) for an exact-precision body, or None when invalid."""
+    mode, digits = data.get("precision"), _to_int(data.get("digits", DEFAULT_DIGITS))
+    a, b = data.get("a"), data.get("b")
+    if mode not in PRECISION_MODES or digits is None or not 1 <= digits <= MAX_DIGITS:
+        return None
+    for value in (a, b):  # StrictInt | StrictFloat | StrictStr
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            return None
+    return a, b, mode, digits
+
+
+def is_json_content_type(content_type: Optional[bytes]) -> bool:
+    """FastAPI only decodes a body as JSON when it has no, or a JSON, content type."""
+    if not content_type:
+        return True
+    media = content_type.split(b";", 1)[0].strip().lower()
+    return media == b"application/json" or (media.startswith(b"application/") and media.endswith(b"+json"))
+
+
+def _read_headers(raw_headers: Iterable[Tuple[bytes, bytes]]) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """Return the raw content-type and x-user-id headers without building a Headers object."""
+    content_type = user_id = None
+    for name, value in raw_headers:
+        if name == b"content-type":
+            content_type = value
+        elif name == b"x-user-id":
+            user_id = value
+    return content_type, user_id
+
+
+def _parse_user_id(value: Optional[bytes]) -> Any:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return _INVALID
+
+
+# ----------------------------------------------------------
+# Endpoint factory
+# ----------------------------------------------------------
+def _json(body: bytes, status_code: int = 200) -> Response:
+    return Response(body, status_code=status_code, media_type=JSON_MEDIA_TYPE)
+
+
+def make_endpoint(operation: str, func: Callable[[Number, Number], Number]):
+    """Build the fast handler for one arithmetic operation."""
+
+    async def endpoint(request: Request) -> Response:
+        content_type, user_header = _read_headers(request.scope["headers"])
+        data = load_object(await request.body()) if is_json_content_type(content_type) else None
+        mark("parse")
+        user_id = _parse_user_id(user_header)
+        if data is not None and user_id is not _INVALID and data.get("precision", "float") != "float":
+            return _exact_response(request, operation, data, user_id)
+        operands = operands_from(data)
+        if operands is None or user_id is _INVALID:
+            logger.error("Validation Error: invalid %s input", operation)
+            registry.count_error("validation")
+            return _json(INVALID_INPUT_BODY, 400)
+
+        a, b = operands
+        state = request.app.state
+        mark("validate")
+        try:
+            cache = getattr(state, "result_cache", None)
+            result = func(a, b) if cache is None else cache.get_or_compute(operation, a, b, func)
+            mark("compute")
+        except ValueError as exc:
+            if operation != "divide":
+                logger.error("%s error: %s", operation.capitalize(), exc)
+                return _json(dumps({"detail": str(exc)}), 400)
+            logger.error("Division error: %s", exc)
+            registry.count_error("divide_by_zero")
+            return _json(dumps({"error": str(exc)}), 400)
+        except Exception as exc:
+            logger.error("%s error: %s", operation.capitalize(), exc)
+            return _json(dumps({"detail": str(exc)}), 400)
+
+        if not math.isfinite(result):
+            return _json(NON_FINITE_BODY, 400)
+
+        writer = getattr(state, "calc_writer", None)
+        if writer is not None:
+            writer.record(operation, a, b, result, user_id or state.settings.default_user_id)
+        return _json(dumps({"result": result}))
+
+    endpoint.__name__ = f"fast_{operation}"
+    return endpoint
+
+
+def _exact_response(request: Request, operation: str, data: Dict[str, Any], user_id: Any) -> Response:
+    """Decimal / fraction calculation, mirroring main._compute_exact."""
+    options = precise_options(data)
+    if options is None:
+        logger.error("Validation Error: invalid %s input", operation)
+        registry.count_error("validation")
+        return _json(INVALID_INPUT_BODY, 400)
+    a, b, mode, digits = options
+    try:
+        exact_a, exact_b, result = evaluate_exact(operation, a, b, mode, digits)
+        formatted = format_exact(result)
+    except PrecisionError as exc:
+        logger.error("Precision error: %s", exc)
+        registry.count_error("validation")
+        return _json(dumps({"error": str(exc)}), 400)
+    except ValueError as exc:
+        logger.error("Division error: %s", exc)
+        registry.count_error("divide_by_zero")
+        return _json(dumps({"error": str(exc)}), 400)
+
+    state = request.app.state
+    writer = getattr(state, "calc_writer", None)
+    stored = (exact_to_float(exact_a), exact_to_float(exact_b), exact_to_float(result))
+    if writer is not None and None not in stored:
+        writer.record(operation, *stored, user_id or state.settings.default_user_id)
+    return _json(dumps({"result": formatted, "precision": mode}))
+
+
+class FastRoute(Route):
+    """Starlette route that records itself in the scope (like FastAPI's APIRoute) for metrics."""
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        match, child_scope = super().matches(scope)
+        if match != Match.NONE:
+            child_scope["route"] = self
+        return match, child_scope
+
+
+def install_fast_routes(app, operations: Optional[Dict[str, Callable[[Number, Number], Number]]] = None) -> None:
+    """Register fast handlers ahead of the regular routes so they match first."""
+    for name, func in (operations or OPERATIONS).items():
+        app.router.routes.insert(0, FastRoute(f"/{name}", make_endpoint(name, func), methods=["POST"]))
@@ -0,0 +1,97 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/history.py
+# ----------------------------------------------------------
+# Description:
+# Read queries over the `calculations` table for the history
+# endpoints, filtered by user, operation and time range.
+#
+# Results are ordered newest first by (timestamp, id) and
+# paginated with an opaque keyset cursor instead of OFFSET:
+# each page continues with `(timestamp, id) < cursor`, which
+# the composite indexes in app/db.py answer with an index
+# range scan, so page 1000 costs the same as page 1.
+# ----------------------------------------------------------
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Engine
+
+from app.config import DEFAULT_PAGE_SIZE
+from app.db import calculations
+
+Cursor = Tuple[datetime, int]
+
+
+# ----------------------------------------------------------
+# Cursor encoding
+# ----------------------------------------------------------
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode the last row's (timestamp, id) as an opaque URL-safe token."""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Decode a cursor token. Raises ValueError for malformed tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        timestamp, row_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor.") from None
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC; convert aware datetimes to match."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# ----------------------------------------------------------
+# History query
+# ----------------------------------------------------------
+def fetch_history(bind: Any, user_id: Optional[int] = None, operation: Optional[str] = None,
+                  start: Optional[datetime] = None, end: Optional[datetime] = None,
+                  limit: int = DEFAULT_PAGE_SIZE,
+                  cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Return (rows, next_cursor) for one page of calculations, newest first.
+    start is inclusive and end exclusive; next_cursor is None on the last page.
+    """
+    query = select(calculations)
+    if user_id is not None:
+        query = query.where(calculations.c.user_id == user_id)
+    if operation is not None:
+        query = query.where(calculations.c.operation == operation)
+    if start is not None:
+        query = query.where(calculations.c.timestamp >= to_naive_utc(start))
+    if end is not None:
+        query = query.where(calculations.c.timestamp < to_naive_utc(end))
+    if cursor is not None:
+        query = query.where(tuple_(calculations.c.timestamp, calculations.c.id) < decode_cursor(cursor))
+    query = query.order_by(calculations.c.timestamp.desc(), calculations.c.id.desc()).limit(limit + 1)
+
+    if isinstance(bind, Engine):
+        with bind.connect() as conn:
+            rows = conn.execute(query).mappings().all()
+    else:
+        rows = bind.execute(query).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+    return [_serialize(row) for row in rows], next_cursor
+
+
+def _serialize(row: Any) -> Dict[str, Any]:
+    item = dict(row)
+    item["timestamp"] = item["timestamp"].isoformat() if item["timestamp"] is not None else None
+    return item
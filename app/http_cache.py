@@ -0,0 +1,111 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/http_cache.py
+# ----------------------------------------------------------
+# Description:
+# In-memory cache of a rendered Jinja2 page with HTTP
+# validators, for the homepage (GET /).
+#
+# templates/index.html does not depend on the request, so
+# it is rendered once and the bytes are reused. Each response
+# carries an ETag (hash of the bytes) and Last-Modified (the
+# template file's mtime). Clients that revalidate with
+# If-None-Match / If-Modified-Since get an empty 304. Jinja's
+# own up-to-date check (a stat of the template file) runs on
+# each hit, so an edited template is re-rendered without a
+# restart. `templates` may be a factory, so Jinja2 is only
+# imported when the page is first rendered.
+# ----------------------------------------------------------
+
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+import hashlib
+import os
+
+from starlette.responses import Response
+
+HTML = "text/html; charset=utf-8"
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    """Rendered bytes plus the validators sent with them."""
+
+    body: bytes
+    etag: str
+    last_modified: str
+    mtime: int
+    uptodate: Callable[[], bool]
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2): W/ prefixes are ignored."""
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == bare:
+            return True
+    return False
+
+
+def not_modified(headers: Mapping[str, str], etag: str, mtime: int) -> bool:
+    """True if the request's validators show the client already has this version."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:  # takes precedence over If-Modified-Since
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(parsedate_to_datetime(if_modified_since).timestamp()) >= mtime
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class CachedTemplate:
+    """A request-independent template rendered once and served with ETag / Last-Modified."""
+
+    def __init__(self, templates: Any, name: str, cache_control: str = "no-cache") -> None:
+        self._templates = templates
+        self._env: Any = None
+        self.name = name
+        self.cache_control = cache_control
+        self._page: Optional[RenderedPage] = None
+        self.renders = 0
+
+    @property
+    def env(self) -> Any:
+        """The Jinja2 environment, created on first use when `templates` is a factory."""
+        if self._env is None:
+            templates = self._templates() if callable(self._templates) else self._templates
+            self._env = templates.env
+        return self._env
+
+    def page(self, context: Optional[Dict[str, Any]] = None) -> RenderedPage:
+        """The cached rendering, re-rendered when the template file has changed."""
+        page = self._page
+        if page is None or not page.uptodate():
+            _, filename, uptodate = self.env.loader.get_source(self.env, self.name)
+            body = self.env.get_template(self.name).render(context or {}).encode("utf-8")
+            mtime = int(os.path.getmtime(filename))
+            page = self._page = RenderedPage(body, etag_for(body), formatdate(mtime, usegmt=True), mtime,
+                                             uptodate or (lambda: True))
+            self.renders += 1
+        return page
+
+    def response(self, request_headers: Mapping[str, str], context: Optional[Dict[str, Any]] = None) -> Response:
+        """200 with the cached body, or an empty 304 when the client's copy is current."""
+        page = self.page(context)
+        headers = {"ETag": page.etag, "Last-Modified": page.last_modified, "Cache-Control": self.cache_control}
+        if not_modified(request_headers, page.etag, page.mtime):
+            return Response(status_code=304, headers=headers)
+        return Response(page.body, media_type=HTML, headers=headers)
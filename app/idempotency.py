@@ -0,0 +1,277 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/idempotency.py
+# ----------------------------------------------------------
+# Description:
+# Idempotency-Key support for the write-through calculation
+# routes (/add, /subtract, /multiply, /divide, /batch).
+#
+# A client that retries a POST with the same Idempotency-Key
+# header gets the stored response back (marked with
+# `Idempotent-Replayed: true`) instead of a second
+# computation and a second row in `calculations`:
+#
+#   first request      → runs, response stored for `ttl` seconds
+#   concurrent repeats → wait for the in-flight request
+#                        (single-flight) and share its response
+#   later retries      → replayed from the store, the route and
+#                        the database are never reached
+#   same key, new body → 422, the key is already bound
+#
+# Keys are scoped by route and X-User-Id. IdempotencyStore
+# keeps completed responses in a CacheBackend (app/cache.py):
+# InMemoryBackend by default, bounded and TTL-evicting, or a
+# shared store so retries landing on another worker replay
+# too. Single-flight is per worker. 5xx responses are not
+# stored, so the client can retry them.
+# ----------------------------------------------------------
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache import CacheBackend, InMemoryBackend
+
+HEADER = b"idempotency-key"
+REPLAY_HEADER = b"idempotent-replayed"
+ROUTES = frozenset({"/add", "/subtract", "/multiply", "/divide", "/batch"})
+
+MAX_KEY_LENGTH = 255
+MAX_STORED_BODY = 1_048_576   # larger responses (huge batches) are not stored
+
+INVALID_KEY = "Invalid Idempotency-Key header."
+KEY_REUSED = "Idempotency-Key was already used with a different request."
+
+StoreKey = Tuple[str, str, str]  # (path, user, key)
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A completed response and the fingerprint of the request that produced it."""
+
+    fingerprint: str
+    status: int
+    headers: Tuple[Tuple[bytes, bytes], ...]
+    body: bytes
+    route: Optional[str] = None  # route path, so replays keep their metrics label
+
+
+# ----------------------------------------------------------
+# Response store + single-flight registry
+# ----------------------------------------------------------
+class IdempotencyStore:
+    """Completed responses by key (TTL + bounded backend) and in-flight requests."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 86_400.0,
+                 backend: Optional[CacheBackend] = None) -> None:
+        self.ttl = ttl or None
+        self.backend = backend if backend is not None else InMemoryBackend(maxsize)
+        self._inflight: Dict[StoreKey, "asyncio.Future[Optional[StoredResponse]]"] = {}
+        self.stored = 0
+        self.replayed = 0
+        self.coalesced = 0
+        self.conflicts = 0
+
+    def get(self, key: StoreKey) -> Optional[StoredResponse]:
+        return self.backend.get(key)
+
+    def put(self, key: StoreKey, response: StoredResponse) -> None:
+        self.backend.set(key, response, self.ttl)
+        self.stored += 1
+
+    def in_flight(self, key: StoreKey) -> "Optional[asyncio.Future[Optional[StoredResponse]]]":
+        return self._inflight.get(key)
+
+    def begin(self, key: StoreKey) -> "asyncio.Future[Optional[StoredResponse]]":
+        """Register the request that will produce the response for key."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def finish(self, key: StoreKey, response: Optional[StoredResponse]) -> None:
+        """Hand the outcome (None if the request failed) to any waiting duplicates."""
+        future = self._inflight.pop(key)
+        if not future.done():
+            future.set_result(response)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "stored": self.stored,
+            "replayed": self.replayed,
+            "coalesced": self.coalesced,
+            "conflicts": self.conflicts,
+            "in_flight": len(self._inflight),
+        }
+
+
+# ----------------------------------------------------------
+# Request fingerprint
+# ----------------------------------------------------------
+def fingerprint(method: str, path: str, body: bytes) -> str:
+    """
+    Hash of the request a key is bound to. JSON bodies are canonicalized
+    (sorted keys, no whitespace) so a client that re-serializes the same
+    payload differently on retry still matches.
+    """
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        pass
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def _header(scope: Scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def valid_key(value: bytes) -> bool:
+    """1-255 visible ASCII characters."""
+    return 0 < len(value) <= MAX_KEY_LENGTH and all(0x20 < byte < 0x7F for byte in value)
+
+
+class _ReplayedRoute:
+    """Stand-in for scope["route"] so MetricsMiddleware labels replays by route."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+
+# ----------------------------------------------------------
+# ASGI middleware
+# ----------------------------------------------------------
+class IdempotencyMiddleware:
+    """
+    Apply Idempotency-Key semantics to POSTs on `routes`. The store is read
+    from app.state.idempotency (set in the lifespan); without one, or
+    without the header, requests pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp, routes: frozenset = ROUTES) -> None:
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.routes:
+            await self.app(scope, receive, send)
+            return
+        key = _header(scope, HEADER)
+        store = getattr(scope["app"].state, "idempotency", None)
+        if key is None or store is None:
+            await self.app(scope, receive, send)
+            return
+        if not valid_key(key):
+            await _send_error(send, 400, INVALID_KEY)
+            return
+
+        body = await _read_body(receive)
+        request_fingerprint = fingerprint(scope["method"], scope["path"], body)
+        user = (_header(scope, b"x-user-id") or b"").decode("latin-1")
+        store_key = (scope["path"], user, key.decode("ascii"))
+
+        stored = store.get(store_key)
+        coalesced = False
+        # a failed in-flight request (None) lets the first waiter run it again
+        while stored is None and store.in_flight(store_key) is not None:
+            stored = await asyncio.shield(store.in_flight(store_key))
+            coalesced = True
+        if stored is not None:
+            if stored.route is not None:
+                scope["route"] = _ReplayedRoute(stored.route)
+            if stored.fingerprint != request_fingerprint:
+                store.conflicts += 1
+                await _send_error(send, 422, KEY_REUSED)
+                return
+            if coalesced:
+                store.coalesced += 1
+            else:
+                store.replayed += 1
+            await _replay(send, stored)
+            return
+
+        await self._run_and_store(scope, _replay_body(body, receive), send, store, store_key,
+                                  request_fingerprint)
+
+    async def _run_and_store(self, scope: Scope, receive: Receive, send: Send, store: IdempotencyStore,
+                             store_key: StoreKey, request_fingerprint: str) -> None:
+        store.begin(store_key)
+        start: Dict[str, object] = {}
+        chunks: List[bytes] = []
+        size = 0
+
+        async def capture(message: Message) -> None:
+            nonlocal size
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body" and size <= MAX_STORED_BODY:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                chunks.append(chunk)
+            await send(message)
+
+        response = None
+        try:
+            await self.app(scope, receive, capture)
+            status = start.get("status", 500)
+            if status < 500 and size <= MAX_STORED_BODY:
+                route = scope.get("route")
+                response = StoredResponse(
+                    request_fingerprint, status, tuple(start.get("headers", ())), b"".join(chunks),
+                    getattr(route, "path", None),
+                )
+                store.put(store_key, response)
+        finally:
+            store.finish(store_key, response)
+
+
+# ----------------------------------------------------------
+# ASGI helpers
+# ----------------------------------------------------------
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """A receive callable that yields the already-read body, then defers to the server."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def _replay(send: Send, stored: StoredResponse) -> None:
+    await send({"type": "http.response.start", "status": stored.status,
+                "headers": [*stored.headers, (REPLAY_HEADER, b"true")]})
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _send_error(send: Send, status: int, message: str) -> None:
+    body = json.dumps({"error": message}).encode()
+    await send({"type": "http.response.start", "status": status, "headers": [
+        (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+    ]})
+    await send({"type": "http.response.body", "body": body})
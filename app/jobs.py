@@ -0,0 +1,429 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/jobs.py
+# ----------------------------------------------------------
+# Description:
+# Asynchronous job queue for calculation batches too large
+# to hold an HTTP request open (POST /jobs).
+#
+# A submitted body (NDJSON records like /stream, or a JSON
+# {"operations": [...]} object like /batch) is stored with a
+# new job id and queued. Worker threads, separate from the
+# event loop, take jobs off a bounded queue, parse them and
+# evaluate them in chunks; with `processes` > 1 the chunks
+# of a job are spread over a process pool (the same ordered,
+# bounded window as `cli.py bulk`). Each finished chunk is
+# stored as NDJSON, so clients can download results while
+# the job is still running.
+#
+#   JobStore          → where jobs, payloads and result
+#                       chunks live; InMemoryJobStore is the
+#                       in-process default, a shared store
+#                       (e.g. Redis) can implement the same
+#                       interface
+#   JobQueue          → submission with a bounded queue
+#                       (job count and total bytes of the
+#                       bodies held for queued jobs),
+#                       long-poll waits, cancellation between
+#                       chunks and expiry of finished jobs
+# ----------------------------------------------------------
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from contextlib import closing
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+
+from app.batch import evaluate_parsed
+from app.bulk import DEFAULT_CHUNK_SIZE, chunked, process_jsonl_chunk, run_chunks
+from app.streaming import encode_ndjson, record_from
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {"application/x-ndjson": "ndjson", "application/json": "json"}
+FINISHED = frozenset({"done", "failed", "cancelled"})
+MAX_JOB_BYTES = 64 * 1024 * 1024          # one request body
+MAX_QUEUED_BYTES = 256 * 1024 * 1024      # bodies of all jobs still waiting for a worker
+MAX_JOB_RECORDS = 10_000_000
+MAX_WAIT = 60.0
+
+
+class JobQueueFull(Exception):
+    """No room for another queued job."""
+
+
+def job_kind(content_type: Optional[str]) -> Optional[str]:
+    """The payload kind for a Content-Type header, or None when jobs do not accept it."""
+    if not content_type:
+        return None
+    return MEDIA_TYPES.get(content_type.split(";", 1)[0].strip().lower())
+
+
+async def read_limited(stream: AsyncIterator[bytes], limit: int = MAX_JOB_BYTES) -> Optional[bytes]:
+    """Read a request body, or return None as soon as it exceeds `limit` bytes."""
+    parts, size = [], 0
+    async for part in stream:
+        size += len(part)
+        if size > limit:
+            return None
+        parts.append(part)
+    return b"".join(parts)
+
+
+# ----------------------------------------------------------
+# Job record
+# ----------------------------------------------------------
+@dataclass
+class Job:
+    """State and progress of one job (mutated by the worker running it)."""
+
+    id: str
+    kind: str
+    state: str = "queued"            # queued | running | done | failed | cancelled
+    total: Optional[int] = None      # records, known once the worker has parsed the payload
+    done: int = 0
+    errors: int = 0
+    chunks: int = 0                  # result chunks available for download
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in FINISHED
+
+    def to_dict(self) -> Dict[str, Any]:
+        progress = self.done / self.total if self.total else (1.0 if self.state == "done" else 0.0)
+        return {
+            "id": self.id, "state": self.state, "total": self.total, "done": self.done,
+            "errors": self.errors, "chunks": self.chunks, "progress": round(progress, 4),
+            "created": self.created, "started": self.started, "finished": self.finished,
+            "error": self.error,
+        }
+
+
+# ----------------------------------------------------------
+# Storage backend interface
+# ----------------------------------------------------------
+class JobStore(ABC):
+    """Interface for job storage shared by the API and the workers."""
+
+    @abstractmethod
+    def add(self, job: Job, payload: bytes) -> None:
+        """Store a new job with its submitted body."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job, or None if it is unknown."""
+
+    @abstractmethod
+    def save(self, job: Job) -> None:
+        """Persist changed job fields (a no-op for in-process stores)."""
+
+    @abstractmethod
+    def take_payload(self, job_id: str) -> Optional[bytes]:
+        """Remove and return the submitted body."""
+
+    @abstractmethod
+    def append_chunk(self, job_id: str, data: bytes) -> None:
+        """Append one chunk of encoded results."""
+
+    @abstractmethod
+    def chunk(self, job_id: str, index: int) -> Optional[bytes]:
+        """Return the result chunk at index, or None if it does not exist yet."""
+
+    @abstractmethod
+    def delete(self, job_id: str) -> None:
+        """Drop the job, its payload and its result chunks."""
+
+    @abstractmethod
+    def jobs(self) -> List[Job]:
+        """Every stored job."""
+
+
+class InMemoryJobStore(JobStore):
+    """Thread-safe in-process job store."""
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, Job] = {}
+        self._payloads: Dict[str, bytes] = {}
+        self._chunks: Dict[str, List[bytes]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, job: Job, payload: bytes) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._payloads[job.id] = payload
+            self._chunks[job.id] = []
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def save(self, job: Job) -> None:
+        pass
+
+    def take_payload(self, job_id: str) -> Optional[bytes]:
+        with self._lock:
+            return self._payloads.pop(job_id, None)
+
+    def append_chunk(self, job_id: str, data: bytes) -> None:
+        with self._lock:
+            chunks = self._chunks.get(job_id)
+            if chunks is not None:
+                chunks.append(data)
+
+    def chunk(self, job_id: str, index: int) -> Optional[bytes]:
+        chunks = self._chunks.get(job_id) or []
+        return chunks[index] if 0 <= index < len(chunks) else None
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._payloads.pop(job_id, None)
+            self._chunks.pop(job_id, None)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+
+# ----------------------------------------------------------
+# Chunk workers (top-level so process pools can pickle them)
+# ----------------------------------------------------------
+def process_records_chunk(records: List[Any]) -> Tuple[bytes, int]:
+    """Evaluate parsed records. Returns (NDJSON output, error count)."""
+    entries = evaluate_parsed(records)
+    return encode_ndjson(entries), sum("error" in entry for entry in entries)
+
+
+def parse_payload(payload: bytes, kind: str) -> Tuple[List[Any], Any]:
+    """Split a job body into records and the chunk worker that evaluates them."""
+    if kind == "ndjson":
+        return [line for line in payload.split(b"\n") if line.strip()], process_jsonl_chunk
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        raise ValueError("Invalid JSON.") from None
+    operations = data.get("operations") if isinstance(data, dict) else None
+    if not isinstance(operations, list):
+        raise ValueError('Job body must be a JSON object with an "operations" list.')
+    return [record_from(item) for item in operations], process_records_chunk
+
+
+# ----------------------------------------------------------
+# Queue and workers
+# ----------------------------------------------------------
+class JobQueue:
+    """Bounded queue of jobs run by worker threads, with long-poll waits and expiry."""
+
+    def __init__(self, store: Optional[JobStore] = None, workers: int = 1, processes: int = 0,
+                 max_queued: int = 64, ttl: float = 3600.0, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_queued_bytes: int = MAX_QUEUED_BYTES, clock=time.time) -> None:
+        self.store = store or InMemoryJobStore()
+        self.workers = max(1, workers)
+        self.processes = processes
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+        self.max_queued_bytes = max_queued_bytes
+        self.clock = clock
+        self._lock = threading.RLock()  # job state changes: submit, claim by a worker, cancel, finish
+        self._payload_sizes: Dict[str, int] = {}  # bodies still held for queued jobs
+        self.queued_bytes = 0
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_queued)
+        self._threads: List[threading.Thread] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: Dict[str, List["asyncio.Future[None]"]] = {}
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.expired = 0
+
+    # ------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------
+    def start(self) -> None:
+        """Start the worker threads (call from the running loop, for long-poll wakeups)."""
+        self._loop = asyncio.get_running_loop()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel unfinished jobs and stop the workers (running jobs stop after their current chunk)."""
+        for job in self.store.jobs():
+            self.cancel(job.id)
+        for _ in self._threads:
+            try:
+                self._queue.put(None, timeout=timeout)  # workers skip the cancelled ids ahead of it
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # ------------------------------------------------------
+    # API
+    # ------------------------------------------------------
+    def submit(self, payload: bytes, kind: str) -> Job:
+        """Queue a job body. Raises JobQueueFull when the queue or its byte budget is at capacity."""
+        self.expire()
+        job = Job(id=uuid.uuid4().hex, kind=kind, created=self.clock())
+        with self._lock:
+            if self.queued_bytes + len(payload) > self.max_queued_bytes:
+                self.rejected += 1
+                raise JobQueueFull()
+            self.store.add(job, payload)
+            self._payload_sizes[job.id] = len(payload)
+            self.queued_bytes += len(payload)
+            try:
+                self._queue.put_nowait(job.id)
+            except queue.Full:
+                self.delete(job.id)
+                self.rejected += 1
+                raise JobQueueFull() from None
+            self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self.expire()
+        return self.store.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """The job once it has finished, or as it is after `timeout` seconds."""
+        job = self.get(job_id)
+        if job is None or job.is_finished or timeout <= 0:
+            return job
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, []).append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters = self._waiters.get(job_id)
+            if waiters is not None and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._waiters[job_id]
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Ask an unfinished job to stop; a queued job is cancelled straight away."""
+        with self._lock:
+            job = self.get(job_id)
+            if job is None or job.is_finished:
+                return job
+            job.cancel_requested = True
+            if job.state == "queued":
+                self._take_payload(job.id)
+                self._finish(job, "cancelled")
+        return job
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._take_payload(job_id)
+            self.store.delete(job_id)
+
+    def chunk(self, job_id: str, index: int) -> Optional[bytes]:
+        return self.store.chunk(job_id, index)
+
+    def expire(self) -> None:
+        """Drop finished jobs (and their results) older than the TTL."""
+        cutoff = self.clock() - self.ttl
+        for job in self.store.jobs():
+            if job.is_finished and job.finished is not None and job.finished <= cutoff:
+                self.store.delete(job.id)
+                self.expired += 1
+
+    def stats(self) -> Dict[str, int]:
+        jobs = self.store.jobs()
+        return {
+            "queued": sum(job.state == "queued" for job in jobs),
+            "running": sum(job.state == "running" for job in jobs),
+            "submitted": self.submitted, "rejected": self.rejected, "completed": self.completed,
+            "failed": self.failed, "cancelled": self.cancelled, "expired": self.expired,
+            "queued_bytes": self.queued_bytes,
+        }
+
+    # ------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            job = self.store.get(job_id)
+            payload = self._claim(job) if job is not None else None
+            if payload is None:
+                continue  # cancelled while queued, or deleted
+            try:
+                self._execute(job, payload)
+            except Exception as exc:  # a bad payload must not kill the worker
+                logger.error("Job %s failed: %s", job.id, exc)
+                job.error = str(exc)
+                self._finish(job, "failed")
+
+    def _claim(self, job: Job) -> Optional[bytes]:
+        """Mark a queued job running and take its body, or None if it was cancelled first."""
+        with self._lock:
+            if job.is_finished or job.cancel_requested:
+                return None
+            job.state, job.started = "running", self.clock()
+            self.store.save(job)
+            return self._take_payload(job.id) or b""
+
+    def _take_payload(self, job_id: str) -> Optional[bytes]:
+        with self._lock:
+            self.queued_bytes -= self._payload_sizes.pop(job_id, 0)
+            return self.store.take_payload(job_id)
+
+    def _execute(self, job: Job, payload: bytes) -> None:
+        records, worker = parse_payload(payload, job.kind)
+        if len(records) > MAX_JOB_RECORDS:
+            raise ValueError(f"Job exceeds maximum size of {MAX_JOB_RECORDS} records.")
+        job.total = len(records)
+        self.store.save(job)
+        with closing(run_chunks(chunked(records, self.chunk_size), worker, self.processes)) as results:
+            for count, (output, errors) in results:
+                if job.cancel_requested:
+                    break
+                self.store.append_chunk(job.id, output)
+                job.done += count
+                job.errors += errors
+                job.chunks += 1
+                self.store.save(job)
+        self._finish(job, "cancelled" if job.cancel_requested else "done")
+
+    def _finish(self, job: Job, state: str) -> None:
+        with self._lock:
+            if job.is_finished:
+                return
+            job.state, job.finished = state, self.clock()
+            self.store.save(job)
+            if state == "done":
+                self.completed += 1
+            elif state == "failed":
+                self.failed += 1
+            else:
+                self.cancelled += 1
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake, job.id)
+
+    def _wake(self, job_id: str) -> None:
+        for waiter in self._waiters.pop(job_id, ()):
+            if not waiter.done():
+                waiter.set_result(None)
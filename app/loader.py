@@ -0,0 +1,333 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/loader.py
+# ----------------------------------------------------------
+# Description:
+# Bulk loader for the `users` and `calculations` tables
+# (`python cli.py load ...`), for load-test datasets and
+# migrations of millions of rows.
+#
+# Rows come from a deterministic synthetic generator (same
+# seed and size → same rows) or from CSV files with a header
+# of table column names. They are streamed, never held in
+# memory whole:
+#
+#   PostgreSQL + psycopg2 → COPY ... FROM STDIN (CSV), fed
+#                           chunk by chunk from a generator
+#   anything else         → multi-row INSERT batches
+#                           (executemany), e.g. SQLite
+#
+# Everything runs in one transaction. When a table starts
+# empty, its secondary indexes (and, on PostgreSQL, the
+# calculations → users foreign key) are dropped for the load
+# and rebuilt afterwards in one pass each, which is much
+# cheaper than maintaining them row by row. A failed load
+# rolls all of it back. The calculation_stats rollup is then
+# rebuilt with app/stats.py.
+# ----------------------------------------------------------
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import csv
+import io
+import logging
+import random
+import time
+
+from sqlalchemy import DateTime, Float, Integer, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.batch import OPERATIONS
+from app.db import calculations, users
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED = 19
+DEFAULT_BATCH_SIZE = 10_000
+OPERATION_NAMES = tuple(OPERATIONS)
+BASE_TIME = datetime(2025, 1, 1)
+
+Row = Tuple[Any, ...]
+
+
+# ----------------------------------------------------------
+# Row sources
+# ----------------------------------------------------------
+@dataclass
+class RowSource:
+    """Column names plus an iterable of row tuples in that order."""
+
+    columns: Tuple[str, ...]
+    rows: Iterable[Row]
+
+
+def synthetic_users(count: int, seed: int = DEFAULT_SEED, start_id: int = 1) -> RowSource:
+    """`count` users with ids from start_id; names and signup times depend only on seed."""
+    def rows() -> Iterator[Row]:
+        rng = random.Random(seed)
+        for user_id in range(start_id, start_id + count):
+            created = BASE_TIME + timedelta(seconds=rng.randrange(365 * 86_400))
+            yield (user_id, f"user{user_id:08d}", f"user{user_id:08d}@example.com", created)
+    return RowSource(("id", "username", "email", "created_at"), rows())
+
+
+def synthetic_calculations(count: int, user_ids: Tuple[int, int], seed: int = DEFAULT_SEED,
+                           start_id: int = 1) -> RowSource:
+    """
+    `count` calculations spread uniformly over the inclusive user id range,
+    one second apart from BASE_TIME (ids and timestamps increase together).
+    """
+    low, high = user_ids
+
+    def rows() -> Iterator[Row]:
+        rng_random = random.Random(seed).random  # one call per field: much cheaper than uniform/choice
+        span = high - low + 1
+        second = timedelta(seconds=1)
+        for offset in range(count):
+            operation = OPERATION_NAMES[int(rng_random() * len(OPERATION_NAMES))]
+            a = int(rng_random() * 200_001 - 100_000) / 100   # -1000.00 .. 1000.00
+            b = int(rng_random() * 200_001 - 100_000) / 100 or 1.0
+            yield (start_id + offset, operation, a, b, OPERATIONS[operation](a, b), BASE_TIME + second * offset,
+                   low + int(rng_random() * span))
+    return RowSource(("id", "operation", "operand_a", "operand_b", "result", "timestamp", "user_id"), rows())
+
+
+def _converter(column: Any) -> Callable[[str], Any]:
+    if isinstance(column.type, Integer):
+        parse: Callable[[str], Any] = int
+    elif isinstance(column.type, Float):
+        parse = float
+    elif isinstance(column.type, DateTime):
+        parse = datetime.fromisoformat
+    else:
+        parse = str
+    return lambda value: parse(value) if value != "" else None
+
+
+def csv_source(path: str, table: Table) -> RowSource:
+    """
+    Rows of a CSV file whose header names columns of `table`. Raises
+    ValueError for unknown columns or missing required ones.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        header = next(csv.reader(handle), [])
+    columns = tuple(name.strip() for name in header)
+    unknown = [name for name in columns if name not in table.c]
+    required = [column.name for column in table.c
+                if not column.nullable and column.server_default is None and not column.primary_key]
+    missing = [name for name in required if name not in columns]
+    if unknown or missing:
+        raise ValueError(f"{path}: unknown columns {unknown} / missing columns {missing} for {table.name}")
+    converters = [_converter(table.c[name]) for name in columns]
+
+    def rows() -> Iterator[Row]:
+        with open(path, newline="", encoding="utf-8") as handle:
+            reader = csv.reader(handle)
+            next(reader)
+            for line, record in enumerate(reader, start=2):
+                if len(record) != len(columns):
+                    raise ValueError(f"{path}:{line}: expected {len(columns)} fields, got {len(record)}")
+                try:
+                    yield tuple(convert(value) for convert, value in zip(converters, record))
+                except ValueError as exc:
+                    raise ValueError(f"{path}:{line}: {exc}") from None
+    return RowSource(columns, rows())
+
+
+# ----------------------------------------------------------
+# Writers
+# ----------------------------------------------------------
+class CSVStream:
+    """Read-only file object producing CSV text from rows, one chunk at a time (for COPY)."""
+
+    def __init__(self, rows: Iterable[Row], chunk_rows: int = DEFAULT_BATCH_SIZE) -> None:
+        self._chunks = self._encode(rows, chunk_rows)
+        self._buffer = ""
+        self._pos = 0
+        self.rows = 0
+
+    def _encode(self, rows: Iterable[Row], chunk_rows: int) -> Iterator[str]:
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        batch: List[Row] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                yield self._flush(out, writer, batch)
+        if batch:
+            yield self._flush(out, writer, batch)
+
+    def _flush(self, out: io.StringIO, writer: Any, batch: List[Row]) -> str:
+        writer.writerows(batch)  # None → empty unquoted field → NULL
+        self.rows += len(batch)
+        batch.clear()
+        data = out.getvalue()
+        out.seek(0)
+        out.truncate()
+        return data
+
+    def read(self, size: int = -1) -> str:
+        """Up to `size` characters ("" at the end); may return less than asked."""
+        if self._pos >= len(self._buffer):
+            self._buffer, self._pos = next(self._chunks, ""), 0
+        end = len(self._buffer) if size is None or size < 0 else self._pos + size
+        data = self._buffer[self._pos:end]
+        self._pos += len(data)
+        return data
+
+
+def supports_copy(conn: Connection) -> bool:
+    """COPY FROM STDIN needs PostgreSQL through psycopg2 (cursor.copy_expert)."""
+    return conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+
+
+def copy_rows(conn: Connection, table: Table, source: RowSource, chunk_rows: int = DEFAULT_BATCH_SIZE) -> int:
+    """Stream rows into table with COPY inside the caller's transaction."""
+    stream = CSVStream(source.rows, chunk_rows)
+    columns = ", ".join(source.columns)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({columns}) FROM STDIN WITH (FORMAT csv)", stream, size=1 << 16)
+    finally:
+        cursor.close()
+    return stream.rows
+
+
+def insert_rows(conn: Connection, table: Table, source: RowSource, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Multi-row INSERT batches (one executemany per batch)."""
+    stmt = table.insert()
+    columns = source.columns
+    count = 0
+    batch: List[Dict[str, Any]] = []
+    for row in source.rows:
+        batch.append(dict(zip(columns, row)))
+        if len(batch) >= batch_size:
+            conn.execute(stmt, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.execute(stmt, batch)
+        count += len(batch)
+    return count
+
+
+# ----------------------------------------------------------
+# Deferred index / foreign-key maintenance
+# ----------------------------------------------------------
+@contextmanager
+def deferred_constraints(conn: Connection, table: Table) -> Iterator[None]:
+    """
+    Drop table's secondary indexes (and, on PostgreSQL, its foreign keys)
+    for the duration of the block and rebuild them after it. Both steps
+    run in the caller's transaction, so a failure restores them.
+    """
+    inspector = inspect(conn)
+    existing = {index["name"] for index in inspector.get_indexes(table.name)}
+    indexes = [index for index in table.indexes if index.name in existing and not index.unique]
+    foreign_keys = inspector.get_foreign_keys(table.name) if conn.dialect.name == "postgresql" else []
+    foreign_keys = [fk for fk in foreign_keys if fk.get("name")]
+
+    for index in indexes:
+        index.drop(conn)
+    for fk in foreign_keys:
+        conn.execute(text(f'ALTER TABLE {table.name} DROP CONSTRAINT "{fk["name"]}"'))
+    yield
+    for index in indexes:
+        index.create(conn)
+    for fk in foreign_keys:  # one validating pass over the table instead of a check per row
+        ondelete = fk.get("options", {}).get("ondelete")
+        conn.execute(text(
+            f'ALTER TABLE {table.name} ADD CONSTRAINT "{fk["name"]}" '
+            f'FOREIGN KEY ({", ".join(fk["constrained_columns"])}) '
+            f'REFERENCES {fk["referred_table"]} ({", ".join(fk["referred_columns"])})'
+            + (f" ON DELETE {ondelete}" if ondelete else "")
+        ))
+
+
+# ----------------------------------------------------------
+# Load driver
+# ----------------------------------------------------------
+@dataclass
+class LoadStats:
+    """Summary of loading one table."""
+
+    table: str
+    method: str
+    rows: int = 0
+    seconds: float = 0.0
+    deferred: List[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _id_range(conn: Connection, table: Table) -> Tuple[Optional[int], Optional[int]]:
+    return tuple(conn.execute(select(func.min(table.c.id), func.max(table.c.id))).one())
+
+
+def load_table(conn: Connection, table: Table, source: RowSource, batch_size: int = DEFAULT_BATCH_SIZE,
+               defer: bool = True) -> LoadStats:
+    """Load one source into table (COPY or INSERT), deferring index work if the table is empty."""
+    method = "copy" if supports_copy(conn) else "insert"
+    stats = LoadStats(table.name, method)
+    empty = _id_range(conn, table)[1] is None
+    start = time.perf_counter()
+    if defer and empty:
+        stats.deferred = [index.name for index in table.indexes if not index.unique]
+        with deferred_constraints(conn, table):
+            stats.rows = _write(conn, table, source, method, batch_size)
+    else:
+        stats.rows = _write(conn, table, source, method, batch_size)
+    if conn.dialect.name == "postgresql" and "id" in source.columns:
+        # explicit ids bypass the SERIAL sequence; move it past them
+        conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                          f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"))
+    stats.seconds = time.perf_counter() - start
+    logger.info("Loaded %d %s rows via %s in %.2fs", stats.rows, table.name, method, stats.seconds)
+    return stats
+
+
+def _write(conn: Connection, table: Table, source: RowSource, method: str, batch_size: int) -> int:
+    if method == "copy":
+        return copy_rows(conn, table, source, batch_size)
+    return insert_rows(conn, table, source, batch_size)
+
+
+def bulk_load(engine: Engine, users_count: int = 0, calculations_count: int = 0,
+              users_file: Optional[str] = None, calculations_file: Optional[str] = None,
+              seed: int = DEFAULT_SEED, batch_size: int = DEFAULT_BATCH_SIZE,
+              defer: bool = True) -> List[LoadStats]:
+    """
+    Load users, then calculations, in one transaction. Synthetic rows get
+    ids after the current maximum; synthetic calculations reference the
+    users present once the user load is done. Raises ValueError when
+    there are no users to reference or a file is invalid.
+    """
+    results: List[LoadStats] = []
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SET LOCAL synchronous_commit TO OFF"))
+
+        if users_file or users_count:
+            if users_file:
+                source = csv_source(users_file, users)
+            else:
+                source = synthetic_users(users_count, seed, (_id_range(conn, users)[1] or 0) + 1)
+            results.append(load_table(conn, users, source, batch_size, defer))
+
+        if calculations_file or calculations_count:
+            if calculations_file:
+                source = csv_source(calculations_file, calculations)
+            else:
+                low, high = _id_range(conn, users)
+                if low is None:
+                    raise ValueError("No users to attach calculations to; load users first.")
+                start_id = (_id_range(conn, calculations)[1] or 0) + 1
+                source = synthetic_calculations(calculations_count, (low, high), seed, start_id)
+            results.append(load_table(conn, calculations, source, batch_size, defer))
+    return results
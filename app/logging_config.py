@@ -0,0 +1,125 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/logging_config.py
+# ----------------------------------------------------------
+# Description:
+# Logging setup for the FastAPI Calculator app.
+#
+# Log records are handed to a QueueHandler and written to
+# stdout by a background QueueListener thread, so request
+# threads never block on console I/O. Message formatting is
+# also deferred to the listener thread.
+#
+# Per-calculation log lines are controlled by a logging mode:
+#   off     → no calculation logs
+#   sampled → one calculation in every N is logged
+#   full    → every calculation is logged
+# Callers guard calculation logs with should_log().
+# ----------------------------------------------------------
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import atexit
+import itertools
+import logging
+import os
+import queue
+import sys
+
+LOG_MODES = ("off", "sampled", "full")
+LOG_FORMAT = "%(levelname)s: %(message)s"
+
+_mode = "full"
+_sample_rate = 1
+_counter = itertools.count()
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+# ----------------------------------------------------------
+# Queue handler that defers formatting to the listener
+# ----------------------------------------------------------
+class LazyQueueHandler(QueueHandler):
+    """QueueHandler that enqueues records unformatted (in-process queue only)."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# ----------------------------------------------------------
+# Calculation log gate
+# ----------------------------------------------------------
+def should_log() -> bool:
+    """Return True when the current calculation should be logged."""
+    if _mode == "full":
+        return True
+    if _mode == "off":
+        return False
+    return next(_counter) % _sample_rate == 0
+
+
+def get_log_mode() -> str:
+    """Return the active calculation logging mode."""
+    return _mode
+
+
+def set_log_mode(mode: str, sample_rate: int = 1) -> None:
+    """Change the calculation logging mode at runtime."""
+    global _mode, _sample_rate, _counter
+    if mode not in LOG_MODES:
+        raise ValueError(f"Unknown log mode: {mode}. Expected one of {', '.join(LOG_MODES)}.")
+    if sample_rate < 1:
+        raise ValueError("Log sample rate must be at least 1.")
+    _mode, _sample_rate, _counter = mode, sample_rate, itertools.count()
+
+
+# ----------------------------------------------------------
+# Root logger configuration
+# ----------------------------------------------------------
+def configure_logging(mode: str = "full", sample_rate: int = 1, level: int = logging.INFO) -> None:
+    """
+    Route the root logger through a background queue writer and set the
+    calculation logging mode. Safe to call more than once.
+    """
+    global _listener, _queue_handler
+    set_log_mode(mode, sample_rate)
+    shutdown_logging()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler = LazyQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+
+
+def shutdown_logging() -> None:
+    """Flush pending records and detach the queue writer, if installed."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_after_fork() -> None:
+    """
+    A forked child (e.g. a gunicorn worker after --preload) inherits the
+    queue handler but not the listener thread, so records would pile up
+    unwritten. Start a fresh listener in the child.
+    """
+    if _listener is not None:
+        configure_logging(_mode, _sample_rate, logging.getLogger().level)
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_after_fork)
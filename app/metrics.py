@@ -0,0 +1,200 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/metrics.py
+# ----------------------------------------------------------
+# Description:
+# Low-overhead request metrics in the Prometheus text format
+# for the /metrics endpoint.
+#
+# MetricsMiddleware is a plain ASGI middleware that records
+# request counts, per-route latency histograms and in-flight
+# requests. Errors are counted by type (validation, divide-by-
+# zero, ...) and an asyncio task samples event-loop lag.
+#
+# All updates happen on the event-loop thread of a worker, so
+# the registry uses plain ints and lists without locks. Each
+# uvicorn worker keeps its own registry (per-worker
+# aggregation); a scrape reports the worker that served it.
+# ----------------------------------------------------------
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds (upper bounds; +Inf is implicit)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Route label used for requests that matched no route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+
+# ----------------------------------------------------------
+# Histogram
+# ----------------------------------------------------------
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts are computed at render time)."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Return (le, cumulative count) pairs including +Inf."""
+        running, out = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            out.append(("+Inf" if bound == float("inf") else repr(bound), running))
+        return out
+
+
+# ----------------------------------------------------------
+# Registry
+# ----------------------------------------------------------
+class MetricsRegistry:
+    """In-process metric storage for one worker."""
+
+    def __init__(self) -> None:
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[str, Histogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.in_flight = 0
+        self.loop_lag = Histogram()
+        self.loop_lag_last = 0.0
+        self.loop_lag_max = 0.0
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, str(status))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.latency.get(route)
+        if histogram is None:
+            histogram = self.latency[route] = Histogram()
+        histogram.observe(seconds)
+
+    def count_error(self, error_type: str) -> None:
+        self.errors[error_type] = self.errors.get(error_type, 0) + 1
+
+    def observe_loop_lag(self, seconds: float) -> None:
+        self.loop_lag.observe(seconds)
+        self.loop_lag_last = seconds
+        self.loop_lag_max = max(self.loop_lag_max, seconds)
+
+    # ------------------------------------------------------
+    # Prometheus text exposition
+    # ------------------------------------------------------
+    def render(self, extra_gauges: Optional[Iterable[Tuple[str, str, float]]] = None) -> str:
+        """Render all metrics; extra_gauges are (name, help, value) triples."""
+        lines: List[str] = []
+
+        lines += ["# HELP calc_requests_total Total HTTP requests.",
+                  "# TYPE calc_requests_total counter"]
+        for (method, route, status), value in sorted(self.requests.items()):
+            lines.append(f'calc_requests_total{{method="{method}",route="{route}",status="{status}"}} {value}')
+
+        lines += ["# HELP calc_request_duration_seconds Request latency by route.",
+                  "# TYPE calc_request_duration_seconds histogram"]
+        for route, histogram in sorted(self.latency.items()):
+            lines += _histogram_lines("calc_request_duration_seconds", histogram, f'route="{route}"')
+
+        lines += ["# HELP calc_errors_total Errors by type.",
+                  "# TYPE calc_errors_total counter"]
+        for error_type, value in sorted(self.errors.items()):
+            lines.append(f'calc_errors_total{{type="{error_type}"}} {value}')
+
+        lines += ["# HELP calc_requests_in_flight Requests currently being served.",
+                  "# TYPE calc_requests_in_flight gauge",
+                  f"calc_requests_in_flight {self.in_flight}"]
+
+        lines += ["# HELP calc_event_loop_lag_seconds Event-loop scheduling delay.",
+                  "# TYPE calc_event_loop_lag_seconds histogram"]
+        lines += _histogram_lines("calc_event_loop_lag_seconds", self.loop_lag, "")
+        lines += ["# HELP calc_event_loop_lag_max_seconds Largest event-loop delay seen.",
+                  "# TYPE calc_event_loop_lag_max_seconds gauge",
+                  f"calc_event_loop_lag_max_seconds {self.loop_lag_max}"]
+
+        for name, help_text, value in extra_gauges or ():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str) -> List[str]:
+    sep = "," if labels else ""
+    lines = [f'{name}_bucket{{{labels}{sep}le="{le}"}} {count}' for le, count in histogram.cumulative()]
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.total}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+# Process-wide registry (one per uvicorn worker)
+registry = MetricsRegistry()
+
+
+# ----------------------------------------------------------
+# ASGI middleware
+# ----------------------------------------------------------
+class MetricsMiddleware:
+    """Record count, latency and status for every HTTP request."""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = registry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        metrics = self.registry
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status = 500
+            metrics.count_error("unhandled_exception")
+            raise
+        finally:
+            metrics.in_flight -= 1
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - start,
+            )
+
+
+# ----------------------------------------------------------
+# Event-loop lag sampler
+# ----------------------------------------------------------
+async def monitor_event_loop(registry: MetricsRegistry = registry, interval: float = 0.5) -> None:
+    """Measure how late the loop wakes up from a sleep; runs until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        registry.observe_loop_lag(max(0.0, loop.time() - expected))
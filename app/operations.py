@@ -8,6 +8,8 @@
 # Defines the core arithmetic functions for the FastAPI Calculator app.
 # Each operation validates numeric inputs, logs execution details,
 # and ensures consistent error handling for invalid data or operations.
+# Calculation logs use lazy %-formatting and are gated by the
+# logging mode in app/logging_config.py (off / sampled / full).
 #
 # In this assignment, these functions act as the logical layer
 # that can later interact with PostgreSQL for data storage and
@@ -17,6 +19,8 @@
 from typing import Union
 import logging
 
+from app.logging_config import should_log
+
 # Type alias for numerical values
 Number = Union[int, float]
 
@@ -31,7 +35,7 @@ logger.setLevel(logging.INFO)
 def _validate_numbers(a: Number, b: Number) -> None:
     """Validate that both inputs are numeric types."""
     if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
-        logger.error(f"Invalid operands: a={a}, b={b}")
+        logger.error("Invalid operands: a=%r, b=%r", a, b)
         raise TypeError("Both operands must be numbers.")
     return None
 
@@ -43,7 +47,8 @@ def add(a: Number, b: Number) -> Number:
     """Return the sum of two numbers."""
     _validate_numbers(a, b)
     result = a + b
-    logger.info(f"Addition performed: {a} + {b} = {result}")
+    if should_log():
+        logger.info("Addition performed: %s + %s = %s", a, b, result)
     return result
 
 
@@ -54,7 +59,8 @@ def subtract(a: Number, b: Number) -> Number:
     """Return the result of subtracting b from a."""
     _validate_numbers(a, b)
     result = a - b
-    logger.info(f"Subtraction performed: {a} - {b} = {result}")
+    if should_log():
+        logger.info("Subtraction performed: %s - %s = %s", a, b, result)
     return result
 
 
@@ -65,7 +71,8 @@ def multiply(a: Number, b: Number) -> Number:
     """Return the product of two numbers."""
     _validate_numbers(a, b)
     result = a * b
-    logger.info(f"Multiplication performed: {a} * {b} = {result}")
+    if should_log():
+        logger.info("Multiplication performed: %s * %s = %s", a, b, result)
     return result
 
 
@@ -76,8 +83,9 @@ def divide(a: Number, b: Number) -> float:
     """Return the result of dividing a by b. Raises ValueError if b is zero."""
     _validate_numbers(a, b)
     if b == 0:
-        logger.error(f"Division by zero attempted: a={a}, b={b}")
+        logger.error("Division by zero attempted: a=%s, b=%s", a, b)
         raise ValueError("Cannot divide by zero.")
     result = a / b
-    logger.info(f"Division performed: {a} / {b} = {result}")
+    if should_log():
+        logger.info("Division performed: %s / %s = %s", a, b, result)
     return result
@@ -0,0 +1,185 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/persistence.py
+# ----------------------------------------------------------
+# Description:
+# Background writer that records computed results in the
+# `calculations` table without adding a database round trip
+# to request latency.
+#
+# Request handlers call record() which only appends to an
+# in-memory queue. A daemon thread drains the queue and writes
+# rows in batches (multi-row INSERT via executemany) through
+# the engine's connection pool. If the queue is full, new rows
+# are dropped and counted rather than blocking the request.
+# Each batch also updates the calculation_stats rollup in the
+# same transaction (see app/stats.py). A batch the database
+# rejects (e.g. a user_id that violates the foreign key) is
+# split in halves and retried, so only the offending rows are
+# dropped and counted as failed.
+# ----------------------------------------------------------
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+import queue
+import threading
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.db import calculations
+from app.stats import aggregate_rows, upsert_stats
+
+logger = logging.getLogger(__name__)
+
+# Sentinel placed on the queue to wake the writer thread for shutdown
+_STOP = object()
+
+
+def utc_now() -> datetime:
+    """Return the current UTC time as a naive datetime (TIMESTAMP column)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# ----------------------------------------------------------
+# Batched calculation writer
+# ----------------------------------------------------------
+class CalculationWriter:
+    """Buffers calculation rows and flushes them to the database in batches."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_queue: int = 100_000,
+        maintain_stats: bool = True,
+    ) -> None:
+        self.engine = engine
+        self.maintain_stats = maintain_stats
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    # ------------------------------------------------------
+    # Producer side (called from request handlers)
+    # ------------------------------------------------------
+    def record(self, operation: str, a: float, b: float, result: float, user_id: int) -> bool:
+        """Queue one calculation row. Returns False if the row was dropped."""
+        row = {
+            "operation": operation,
+            "operand_a": a,
+            "operand_b": b,
+            "result": result,
+            "user_id": user_id,
+            "timestamp": utc_now(),
+        }
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def record_many(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Queue several pre-built rows. Returns how many were accepted."""
+        accepted = 0
+        timestamp = utc_now()
+        for row in rows:
+            row.setdefault("timestamp", timestamp)
+            try:
+                self._queue.put_nowait(row)
+                accepted += 1
+            except queue.Full:
+                self.dropped += 1
+        return accepted
+
+    # ------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="calculation-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush everything still queued and stop the background thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    @property
+    def pending(self) -> int:
+        """Number of rows waiting to be written."""
+        return self._queue.qsize()
+
+    # ------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------
+    def flush(self) -> int:
+        """Write all currently queued rows synchronously. Returns rows written."""
+        total = 0
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return total
+            total += self._write(batch)
+
+    def _run(self) -> None:
+        """Writer thread loop: wait for rows, then write them in batches."""
+        while True:
+            batch = self._drain(block=True)
+            stopping = _STOP in batch
+            rows = [row for row in batch if row is not _STOP]
+            if rows:
+                self._write(rows)
+            if stopping:
+                return
+
+    def _drain(self, block: bool) -> List[Any]:
+        """Collect up to batch_size queued items, optionally waiting for the first."""
+        batch: List[Any] = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows, isolating rejected rows; returns rows written."""
+        with self._lock:
+            return self._insert(rows)
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> int:
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(calculations.insert(), rows)
+                if self.maintain_stats:
+                    upsert_stats(conn, aggregate_rows(rows))
+        except (IntegrityError, DataError) as exc:  # some row is bad: split until it is alone
+            if len(rows) > 1:
+                middle = len(rows) // 2
+                return self._insert(rows[:middle]) + self._insert(rows[middle:])
+            self.failed += 1
+            logger.error("Failed to persist calculation %s: %s", rows[0], exc)
+            return 0
+        except Exception as exc:  # keep the writer alive on DB errors
+            self.failed += len(rows)
+            logger.error("Failed to persist %d calculations: %s", len(rows), exc)
+            return 0
+        self.written += len(rows)
+        return len(rows)
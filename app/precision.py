@@ -0,0 +1,219 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/precision.py
+# ----------------------------------------------------------
+# Description:
+# Opt-in exact arithmetic for the arithmetic and batch routes
+# (`"precision": "decimal"` or `"precision": "fraction"` in
+# the request body; the default stays on floats).
+#
+#   decimal  → decimal.Decimal rounded to `digits` significant
+#              digits (ROUND_HALF_EVEN), default 28
+#   fraction → fractions.Fraction, exact rationals (1/3 stays 1/3)
+#
+# Operands keep the exact value the client sent: JSON integers
+# of any size, numeric strings ("0.1", "1e-30", and "1/3" in
+# fraction mode), and JSON floats by their shortest repr (0.1
+# is read as 0.1, not 0.1000000000000000055...).
+#
+# Integer operands whose result fits the requested precision
+# are computed with native ints, which is exact and several
+# times cheaper than Decimal or Fraction arithmetic. Results
+# are returned as strings so no client-side float parsing can
+# round them.
+# ----------------------------------------------------------
+
+from decimal import Context, Decimal, DivisionByZero, InvalidOperation, Overflow, ROUND_HALF_EVEN
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import math
+import operator
+
+PRECISION_MODES = ("decimal", "fraction")
+
+DEFAULT_DIGITS = 28        # decimal module default
+MAX_DIGITS = 1000          # upper bound for `digits`
+MAX_OPERAND_LENGTH = 1000  # characters in a string operand, digits in an integer one
+MAX_EXPONENT = 1000        # |decimal exponent| of an operand, e.g. 1e1000
+
+# Largest float that is still an exact integer on every platform (2**53)
+_FLOAT_EXACT_INT = 9_007_199_254_740_992
+
+DIVIDE_BY_ZERO = "Cannot divide by zero."
+
+Exact = Union[int, Decimal, Fraction]
+
+
+class PrecisionError(ValueError):
+    """Raised for operands or settings that cannot be used in a precision mode."""
+
+
+# ----------------------------------------------------------
+# Operand parsing
+# ----------------------------------------------------------
+def to_exact(value: Any, mode: str) -> Exact:
+    """Convert a JSON operand to int, Decimal or Fraction without rounding."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise PrecisionError(f"Invalid exact operand: {value!r}")
+    if isinstance(value, int):
+        if abs(value) >= _int_limit(MAX_OPERAND_LENGTH):
+            raise PrecisionError(f"Integer operand exceeds {MAX_OPERAND_LENGTH} digits")
+        return value
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) <= _FLOAT_EXACT_INT:
+            return int(value)
+        if math.isfinite(value) and not value.is_integer():
+            # shortest string that round-trips to this float; always within MAX_EXPONENT
+            number = Decimal(repr(value))
+            return Fraction(*number.as_integer_ratio()) if mode == "fraction" else number
+        value = repr(value)
+
+    text = value.strip()
+    if not text or len(text) > MAX_OPERAND_LENGTH:
+        raise PrecisionError(f"Invalid exact operand: {value!r}")
+    if mode == "fraction" and "/" in text:
+        try:
+            return _normalize(Fraction(text))
+        except (ValueError, ZeroDivisionError):
+            raise PrecisionError(f"Invalid exact operand: {value!r}") from None
+    try:
+        number = Decimal(text)
+    except InvalidOperation:
+        raise PrecisionError(f"Invalid exact operand: {value!r}") from None
+    if not number.is_finite():
+        raise PrecisionError(f"Invalid exact operand: {value!r}")
+    if number and abs(number.adjusted()) > MAX_EXPONENT:
+        raise PrecisionError(f"Operand exponent exceeds {MAX_EXPONENT}: {value!r}")
+    if number == number.to_integral_value():
+        return int(number)
+    return Fraction(number) if mode == "fraction" else number
+
+
+def _normalize(value: Fraction) -> Exact:
+    return value.numerator if value.denominator == 1 else value
+
+
+# ----------------------------------------------------------
+# Arithmetic
+# ----------------------------------------------------------
+@lru_cache(maxsize=64)
+def decimal_context(digits: int) -> Context:
+    """Rounding context for `digits` significant digits (shared per value)."""
+    return Context(prec=digits, rounding=ROUND_HALF_EVEN,
+                   traps=[InvalidOperation, DivisionByZero, Overflow])
+
+
+@lru_cache(maxsize=64)
+def _int_limit(digits: int) -> int:
+    return 10 ** digits
+
+
+def _int_fast_path(operation: str, a: int, b: int, mode: str, digits: int) -> Optional[Exact]:
+    """Exact int result when no rounding is needed, else None."""
+    if operation == "add":
+        result = a + b
+    elif operation == "subtract":
+        result = a - b
+    elif operation == "multiply":
+        result = a * b
+    else:
+        quotient, remainder = divmod(a, b)
+        if remainder:
+            return Fraction(a, b) if mode == "fraction" else None
+        result = quotient
+    if mode == "fraction" or abs(result) < _int_limit(digits):
+        return result
+    return None
+
+
+_DECIMAL_OPS = {"add": Context.add, "subtract": Context.subtract,
+                "multiply": Context.multiply, "divide": Context.divide}
+_FRACTION_OPS = {"add": operator.add, "subtract": operator.sub,
+                 "multiply": operator.mul, "divide": operator.truediv}
+
+
+def calculate(operation: str, a: Exact, b: Exact, mode: str, digits: int = DEFAULT_DIGITS) -> Exact:
+    """
+    Apply an operation to exact operands. Raises ValueError for division
+    by zero and PrecisionError for an unknown mode or operation.
+    """
+    if mode not in PRECISION_MODES:
+        raise PrecisionError(f"Unknown precision mode: {mode}")
+    if operation not in _DECIMAL_OPS:
+        raise PrecisionError(f"Unsupported operation: {operation}")
+    if operation == "divide" and not b:
+        raise ValueError(DIVIDE_BY_ZERO)
+
+    if type(a) is int and type(b) is int:
+        result = _int_fast_path(operation, a, b, mode, digits)
+        if result is not None:
+            return result
+
+    if mode == "fraction":
+        if type(a) is not Fraction:
+            a = Fraction(a)
+        if type(b) is not Fraction:
+            b = Fraction(b)
+        return _normalize(_FRACTION_OPS[operation](a, b))
+
+    context = decimal_context(digits)
+    return _DECIMAL_OPS[operation](context, _to_decimal(a, context), _to_decimal(b, context))
+
+
+def _to_decimal(value: Exact, context: Context) -> Decimal:
+    if type(value) is Decimal:
+        return value
+    if isinstance(value, Fraction):  # only reachable if a caller mixes modes
+        return context.divide(Decimal(value.numerator), Decimal(value.denominator))
+    return Decimal(value)
+
+
+def format_exact(value: Exact) -> str:
+    """String form of an exact result ("3", "0.3", "1E+40", "1/3")."""
+    try:
+        return str(value)
+    except ValueError:  # int larger than sys.get_int_max_str_digits()
+        raise PrecisionError("Result is too large to return exactly") from None
+
+
+def to_float(value: Exact) -> Optional[float]:
+    """Nearest float for storage in the calculations table, or None if out of range."""
+    try:
+        result = float(value)
+    except OverflowError:
+        return None
+    return result if math.isfinite(result) else None
+
+
+# ----------------------------------------------------------
+# Single calculation and batch helpers for the routes
+# ----------------------------------------------------------
+def evaluate_exact(operation: str, a: Any, b: Any, mode: str,
+                   digits: int = DEFAULT_DIGITS) -> Tuple[Exact, Exact, Exact]:
+    """Parse raw operands and compute; returns (a, b, result) as exact values."""
+    exact_a, exact_b = to_exact(a, mode), to_exact(b, mode)
+    return exact_a, exact_b, calculate(operation, exact_a, exact_b, mode, digits)
+
+
+def evaluate_exact_batch(items: Iterable[Tuple[str, Any, Any]], mode: str, digits: int = DEFAULT_DIGITS,
+                         record: Optional[Callable[[str, Exact, Exact, Exact], None]] = None
+                         ) -> List[Dict[str, Any]]:
+    """
+    One {"result": "..."} or {"error": "..."} entry per (op, a, b) item, in
+    order. record(op, a, b, result) is called with the exact values of each
+    successful item.
+    """
+    entries: List[Dict[str, Any]] = []
+    for operation, a, b in items:
+        try:
+            exact_a, exact_b, result = evaluate_exact(operation, a, b, mode, digits)
+            entries.append({"result": format_exact(result)})
+        except ValueError as exc:  # includes PrecisionError
+            entries.append({"error": str(exc)})
+            continue
+        if record is not None:
+            record(operation, exact_a, exact_b, result)
+    return entries
@@ -0,0 +1,297 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/profiling.py
+# ----------------------------------------------------------
+# Description:
+# Opt-in per-request profiling with slow-request capture,
+# served by GET /admin/profiles.
+#
+# When enabled (CALC_PROFILE_SAMPLE_RATE and/or
+# CALC_PROFILE_SLOW_MS), every HTTP request gets a stage
+# timer: handlers call mark(stage) as each step finishes,
+# and the middleware adds receive (body read), serialize /
+# handler (until headers are sent) and send. Stages are
+# consecutive, so they add up to the request's duration:
+#
+#   receive → parse → validate → compute → serialize → send
+#
+# Two kinds of request are kept in a ring buffer of the last
+# N profiles:
+#
+#   sampled → 1 in CALC_PROFILE_SAMPLE_RATE requests run
+#             under cProfile (one at a time). cProfile sees
+#             the whole event-loop thread, so work of other
+#             requests interleaved at an await shows up too.
+#   slow    → requests slower than CALC_PROFILE_SLOW_MS, with
+#             the event-loop stacks a background thread
+#             sampled every few ms while they were in flight
+#             (a slow request cannot be cProfiled after the
+#             fact).
+#
+# Disabled, the middleware costs one attribute lookup and
+# mark() one ContextVar read.
+# ----------------------------------------------------------
+
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import io
+import itertools
+import os
+import sys
+import threading
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+EXEMPT_PREFIXES = ("/metrics", "/health", "/ready", "/admin/")
+STACK_INTERVAL = 0.005
+STACK_HISTORY = 4096
+STACK_DEPTH = 40
+TOP_STACKS = 20
+CPROFILE_LINES = 30
+
+
+# ----------------------------------------------------------
+# Stage timing
+# ----------------------------------------------------------
+class StageTimer:
+    """Consecutive stage durations of one request (seconds)."""
+
+    __slots__ = ("start", "last", "stages")
+
+    def __init__(self) -> None:
+        self.start = self.last = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def mark(self, stage: str) -> None:
+        """Attribute the time since the previous mark to `stage`."""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self.last
+        self.last = now
+
+
+_timer: ContextVar[Optional[StageTimer]] = ContextVar("calc_stage_timer", default=None)
+
+
+def mark(stage: str) -> None:
+    """End `stage` for the current request (no-op unless profiling is enabled)."""
+    timer = _timer.get()
+    if timer is not None:
+        timer.mark(stage)
+
+
+# ----------------------------------------------------------
+# Captured profiles and their ring buffer
+# ----------------------------------------------------------
+@dataclass
+class RequestProfile:
+    """One captured request."""
+
+    id: int
+    reason: str                       # "sampled" or "slow"
+    method: str
+    path: str
+    route: str
+    status: int
+    started: float
+    duration: float
+    stages: Dict[str, float]
+    cprofile: Optional[str] = None    # pstats report (sampled)
+    stacks: List[Dict[str, Any]] = field(default_factory=list)  # folded event-loop stacks (slow)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id, "reason": self.reason, "method": self.method, "path": self.path,
+            "route": self.route, "status": self.status, "started": self.started,
+            "duration_ms": round(self.duration * 1e3, 3),
+            "stages_ms": {stage: round(seconds * 1e3, 3) for stage, seconds in self.stages.items()},
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.summary(), cprofile=self.cprofile, stacks=self.stacks)
+
+
+class ProfileStore:
+    """The last `size` profiles, newest first on read."""
+
+    def __init__(self, size: int = 50) -> None:
+        self._profiles: Deque[RequestProfile] = deque(maxlen=max(1, size))
+
+    def add(self, profile: RequestProfile) -> None:
+        self._profiles.append(profile)
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def list(self) -> List[RequestProfile]:
+        return list(reversed(self._profiles))
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+
+# ----------------------------------------------------------
+# Event-loop stack sampler (for slow requests)
+# ----------------------------------------------------------
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class StackSampler:
+    """Background thread recording the event-loop thread's stack every `interval` seconds."""
+
+    def __init__(self, thread_id: int, interval: float = STACK_INTERVAL, history: int = STACK_HISTORY) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Deque[Tuple[float, Tuple[str, ...]]] = deque(maxlen=history)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="calc-stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(1.0)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None and len(stack) < STACK_DEPTH:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if stack:
+            self.samples.append((time.perf_counter(), tuple(reversed(stack))))
+
+    def between(self, start: float, end: float, top: int = TOP_STACKS) -> List[Dict[str, Any]]:
+        """Most frequent stacks (root;...;leaf) sampled in [start, end]."""
+        counts = Counter(";".join(stack) for at, stack in list(self.samples) if start <= at <= end)
+        return [{"stack": stack, "samples": n} for stack, n in counts.most_common(top)]
+
+
+# ----------------------------------------------------------
+# Profiler
+# ----------------------------------------------------------
+class Profiler:
+    """Decides which requests to capture and keeps the captured profiles."""
+
+    def __init__(self, sample_rate: int = 0, slow_ms: float = 0.0, size: int = 50,
+                 stack_interval: float = STACK_INTERVAL) -> None:
+        self.sample_rate = max(0, sample_rate)
+        self.slow = slow_ms / 1000 if slow_ms > 0 else None
+        self.stack_interval = stack_interval
+        self.store = ProfileStore(size)
+        self.sampler: Optional[StackSampler] = None
+        self._ids = itertools.count(1)
+        self._seen = 0
+        self._active: Any = None      # the running cProfile.Profile, at most one
+        self.sampled = 0
+        self.slow_captured = 0
+
+    def start(self) -> None:
+        """Start the stack sampler for slow requests (call from the event-loop thread)."""
+        if self.slow is not None and self.sampler is None:
+            self.sampler = StackSampler(threading.get_ident(), self.stack_interval)
+            self.sampler.start()
+
+    def stop(self) -> None:
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
+
+    def _should_sample(self) -> bool:
+        if not self.sample_rate or self._active is not None:
+            return False
+        self._seen += 1
+        return self._seen % self.sample_rate == 0
+
+    async def run(self, app: ASGIApp, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run one request with a stage timer; capture it if sampled or slow."""
+        timer = StageTimer()
+        token = _timer.set(timer)
+        status = 500
+
+        async def timed_receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body") and "receive" not in timer.stages:
+                timer.mark("receive")
+            return message
+
+        async def timed_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timer.mark("serialize" if "compute" in timer.stages else "handler")
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                timer.mark("send")
+
+        profile = None
+        if self._should_sample():
+            import cProfile
+
+            profile = self._active = cProfile.Profile()
+            profile.enable()
+        try:
+            await app(scope, timed_receive, timed_send)
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._active = None
+            _timer.reset(token)
+            end = time.perf_counter()
+            duration = end - timer.start
+            if profile is not None:
+                self.sampled += 1
+                self._capture("sampled", scope, status, timer, duration, cprofile=_pstats_report(profile))
+            elif self.slow is not None and duration >= self.slow:
+                self.slow_captured += 1
+                stacks = self.sampler.between(timer.start, end) if self.sampler is not None else []
+                self._capture("slow", scope, status, timer, duration, stacks=stacks)
+
+    def _capture(self, reason: str, scope: Scope, status: int, timer: StageTimer, duration: float,
+                 **detail: Any) -> None:
+        route = scope.get("route")
+        self.store.add(RequestProfile(
+            id=next(self._ids), reason=reason, method=scope["method"], path=scope["path"],
+            route=getattr(route, "path", "unmatched"), status=status,
+            started=time.time() - duration, duration=duration, stages=dict(timer.stages), **detail,
+        ))
+
+    def stats(self) -> Dict[str, int]:
+        return {"sampled": self.sampled, "slow": self.slow_captured, "stored": len(self.store)}
+
+
+def _pstats_report(profile: Any) -> str:
+    import pstats
+
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(CPROFILE_LINES)
+    return out.getvalue()
+
+
+# ----------------------------------------------------------
+# ASGI middleware
+# ----------------------------------------------------------
+class ProfilingMiddleware:
+    """Hand HTTP requests to app.state.profiler when one is configured."""
+
+    def __init__(self, app: ASGIApp, exempt: Tuple[str, ...] = EXEMPT_PREFIXES) -> None:
+        self.app = app
+        self.exempt = exempt
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profiler = getattr(scope["app"].state, "profiler", None) if scope["type"] == "http" else None
+        if profiler is None or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+        await profiler.run(self.app, scope, receive, send)
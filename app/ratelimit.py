@@ -0,0 +1,333 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/ratelimit.py
+# ----------------------------------------------------------
+# Description:
+# Admission control that keeps latency bounded under
+# overload instead of letting every client slow down.
+#
+#   RateLimiter        → per-client token buckets (429), with
+#                        a default policy and per-route
+#                        overrides ("/batch=5:10")
+#   ConcurrencyLimiter → caps requests in progress; the rest
+#                        wait in a FIFO queue and are shed
+#                        (503) once they have waited longer
+#                        than queue_target. The cap adapts
+#                        (AIMD): it shrinks while admitted
+#                        requests take longer than
+#                        latency_target and grows back while
+#                        they are fast and the cap is in use.
+#
+# CPU-bound handlers rarely yield, so on a busy worker the
+# queue forms in the event loop (parsed requests waiting to
+# run), not behind the cap. The limiter therefore also
+# samples the loop's scheduling delay every few milliseconds
+# and sheds new requests while it is above queue_target
+# (the CoDel signal: time spent queued, not queue length).
+#
+# LoadSheddingMiddleware reads both from app.state (set in
+# the lifespan) so each worker keeps its own limits, like the
+# metrics registry. Everything runs on the event-loop thread,
+# so plain counters are used without locks. /health and
+# /metrics are never limited, and /stream is not counted
+# against the concurrency cap (its requests are long-lived).
+# WebSocket connections (/ws) are not counted either, for the
+# same reason; they take a rate-limit token to connect, and
+# app/websocket.py takes one per frame from the same bucket.
+# ----------------------------------------------------------
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import json
+import math
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+EXEMPT_ROUTES = frozenset({"/health", "/ready", "/metrics"})
+UNSHED_ROUTES = frozenset({"/stream"})  # long-lived streams would hold a slot throughout
+UNSHED_PREFIXES = ("/jobs/",)            # job status long-polls would too
+
+RATE_LIMITED = "Rate limit exceeded."
+OVERLOADED = "Server is overloaded, retry later."
+WS_TRY_AGAIN_LATER = 1013  # WebSocket close code for a refused handshake
+
+BACKOFF = 0.9          # multiplicative decrease of the concurrency cap
+MAX_CLIENTS = 100_000  # token buckets kept (least recently seen are dropped)
+
+
+# ----------------------------------------------------------
+# Policies
+# ----------------------------------------------------------
+@dataclass(frozen=True)
+class RoutePolicy:
+    """Token-bucket rate (requests/s per client, 0 = unlimited) and shedding for a route."""
+
+    rate: float = 0.0
+    burst: int = 0      # bucket size; 0 means max(1, rate)
+    shed: bool = True   # subject to the concurrency cap
+
+    @property
+    def capacity(self) -> float:
+        return float(self.burst or max(1, math.ceil(self.rate)))
+
+
+def parse_route_policies(spec: str) -> Dict[str, RoutePolicy]:
+    """
+    Parse "path=rate[:burst][:noshed]" entries separated by commas, e.g.
+    "/batch=5:10,/stream=1:2:noshed". Raises ValueError on a malformed entry.
+    """
+    policies: Dict[str, RoutePolicy] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        path, sep, value = entry.partition("=")
+        fields = value.split(":")
+        if not sep or not path.startswith("/") or not fields[0]:
+            raise ValueError(f"Invalid route policy: {entry!r}")
+        shed = fields[-1] != "noshed"
+        if not shed:
+            fields.pop()
+        try:
+            rate = float(fields[0])
+            burst = int(fields[1]) if len(fields) > 1 else 0
+        except ValueError:
+            raise ValueError(f"Invalid route policy: {entry!r}") from None
+        if len(fields) > 2 or rate < 0 or burst < 0:
+            raise ValueError(f"Invalid route policy: {entry!r}")
+        policies[path] = RoutePolicy(rate, burst, shed)
+    return policies
+
+
+# ----------------------------------------------------------
+# Per-client token buckets
+# ----------------------------------------------------------
+class RateLimiter:
+    """Token bucket per (route, client); routes without an override share one bucket."""
+
+    def __init__(self, default: RoutePolicy, routes: Optional[Dict[str, RoutePolicy]] = None,
+                 max_clients: int = MAX_CLIENTS, clock: Callable[[], float] = time.monotonic) -> None:
+        self.default = default
+        self.routes = routes or {}
+        self.max_clients = max_clients
+        self.clock = clock
+        self._buckets: "OrderedDict[Hashable, List[float]]" = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+
+    def policy(self, path: str) -> RoutePolicy:
+        return self.routes.get(path, self.default)
+
+    def check(self, path: str, client: str) -> float:
+        """Take a token: 0.0 if the request may proceed, else seconds until one is available."""
+        policy = self.routes.get(path)
+        if policy is None:
+            policy, path = self.default, "*"
+        if policy.rate <= 0:
+            return 0.0
+
+        now = self.clock()
+        key = (path, client)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [policy.capacity, now]
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(policy.capacity, bucket[0] + (now - bucket[1]) * policy.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            self.allowed += 1
+            return 0.0
+        self.limited += 1
+        return (1.0 - bucket[0]) / policy.rate
+
+    def stats(self) -> Dict[str, int]:
+        return {"allowed": self.allowed, "limited": self.limited, "clients": len(self._buckets)}
+
+
+# ----------------------------------------------------------
+# Adaptive concurrency cap with a bounded queueing delay
+# ----------------------------------------------------------
+class ConcurrencyLimiter:
+    """Admit up to `limit` requests at once; shed those queued longer than queue_target."""
+
+    def __init__(self, max_limit: int = 64, min_limit: int = 1, queue_target: float = 0.05,
+                 latency_target: Optional[float] = None, max_queue: int = 1024) -> None:
+        self.max_limit = max_limit
+        self.min_limit = max(1, min(min_limit, max_limit))
+        self.queue_target = queue_target
+        self.latency_target = latency_target if latency_target is not None else 2 * queue_target
+        self.max_queue = max_queue
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self.admitted = 0
+        self.shed = 0
+        self.queue_delay = 0.0  # latest event-loop scheduling delay, seconds
+        self._sampler: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._due = math.inf      # loop time the next sample is due
+
+    # ------------------------------------------------------
+    # Event-loop queueing delay
+    # ------------------------------------------------------
+    def start(self, interval: float = 0.01) -> None:
+        """Begin sampling the loop's scheduling delay (call from the running loop)."""
+        self._loop = loop = asyncio.get_running_loop()
+        self._due = loop.time() + interval
+        self._sampler = loop.call_at(self._due, self._sample, interval)
+
+    def stop(self) -> None:
+        if self._sampler is not None:
+            self._sampler.cancel()
+            self._sampler = None
+        self._due = math.inf
+
+    def _sample(self, interval: float) -> None:
+        loop = self._loop
+        now = loop.time()
+        self.queue_delay = max(0.0, now - self._due)  # how long this callback waited behind other work
+        self._due = now + interval
+        self._sampler = loop.call_at(self._due, self._sample, interval)
+
+    def current_delay(self) -> float:
+        """
+        Latest sample, or more if the next sample is already overdue: the
+        loop is then at least that far behind, which catches a burst of
+        requests before the sampler gets to run.
+        """
+        if self._loop is None:
+            return self.queue_delay
+        return max(self.queue_delay, self._loop.time() - self._due)
+
+    # ------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------
+    async def acquire(self) -> bool:
+        """Wait for a slot; False means the request should be shed."""
+        if self.current_delay() > self.queue_target:
+            self.shed += 1
+            return False
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_target)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                self._waiters.remove(waiter)
+                self.shed += 1
+                return False
+        except asyncio.CancelledError:  # client went away while queued
+            if waiter.done():
+                self.release(0.0)
+            else:
+                self._waiters.remove(waiter)
+            raise
+        self.admitted += 1  # the slot was handed over by release()
+        return True
+
+    def release(self, latency: float) -> None:
+        """Free a slot, adapt the cap from the request's latency and admit the next waiter."""
+        saturated = bool(self._waiters) or self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        if latency > self.latency_target:
+            self.limit = max(float(self.min_limit), self.limit * BACKOFF)
+        elif saturated:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        while self._waiters and self.in_flight < int(self.limit):
+            self._waiters.popleft().set_result(None)
+            self.in_flight += 1
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "queue_delay_ms": round(self.queue_delay * 1000, 3),
+        }
+
+
+# ----------------------------------------------------------
+# ASGI middleware
+# ----------------------------------------------------------
+def client_id(scope: Scope) -> str:
+    """Client address (uvicorn resolves X-Forwarded-For from trusted proxies)."""
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class LoadSheddingMiddleware:
+    """Reject over-rate clients with 429 and shed overload with 503, before any route work."""
+
+    def __init__(self, app: ASGIApp, exempt: frozenset = EXEMPT_ROUTES,
+                 unshed: frozenset = UNSHED_ROUTES, unshed_prefixes: Tuple[str, ...] = UNSHED_PREFIXES) -> None:
+        self.app = app
+        self.exempt = exempt
+        self.unshed = unshed
+        self.unshed_prefixes = unshed_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "websocket":
+            await self._admit_websocket(scope, receive, send)
+            return
+        if scope["type"] != "http" or scope["path"] in self.exempt:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope["app"].state
+        rate_limiter: Optional[RateLimiter] = getattr(state, "rate_limiter", None)
+        concurrency: Optional[ConcurrencyLimiter] = getattr(state, "concurrency_limiter", None)
+        shed = scope["path"] not in self.unshed and not scope["path"].startswith(self.unshed_prefixes)
+        if rate_limiter is not None:
+            retry_after = rate_limiter.check(scope["path"], client_id(scope))
+            if retry_after:
+                await _send_error(send, 429, RATE_LIMITED, math.ceil(retry_after))
+                return
+            shed = shed and rate_limiter.policy(scope["path"]).shed
+        if concurrency is None or not shed:
+            await self.app(scope, receive, send)
+            return
+
+        if not await concurrency.acquire():
+            await _send_error(send, 503, OVERLOADED, 1)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            concurrency.release(time.perf_counter() - start)
+
+    async def _admit_websocket(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Refuse the handshake of an over-rate client (the socket's frames are limited by the channel)."""
+        rate_limiter: Optional[RateLimiter] = getattr(scope["app"].state, "rate_limiter", None)
+        if rate_limiter is not None and rate_limiter.check(scope["path"], client_id(scope)):
+            await send({"type": "websocket.close", "code": WS_TRY_AGAIN_LATER})
+            return
+        await self.app(scope, receive, send)
+
+
+async def _send_error(send: Send, status: int, message: str, retry_after: int) -> None:
+    body = json.dumps({"error": message}).encode()
+    headers: List[Tuple[bytes, bytes]] = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        (b"retry-after", str(retry_after).encode()),
+    ]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
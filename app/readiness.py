@@ -0,0 +1,96 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/readiness.py
+# ----------------------------------------------------------
+# Description:
+# Readiness tracking for GET /ready, kept apart from the
+# /health liveness check.
+#
+# /health answers as soon as the process serves requests.
+# /ready answers 200 only once startup warm-up has finished
+# (database pool connections opened, homepage rendered,
+# compute kernels run once), so the first routed requests do
+# not pay for them, and turns 503 again while the app shuts
+# down. Warm-up runs as a background task after the lifespan
+# startup, so the server starts accepting connections (and
+# passing /health) without waiting for it. A failing step,
+# such as a database that is not up yet, is retried with
+# backoff until it succeeds.
+# ----------------------------------------------------------
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+OK = "ok"
+
+WarmupStep = Callable[[], Awaitable[Any]]
+
+
+class Readiness:
+    """Named warm-up checks; ready once every check is ok and the app is not stopping."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self.checks: Dict[str, str] = {}
+        self.stopping = False
+        self.started = clock()
+        self.warmup_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return not self.stopping and all(state == OK for state in self.checks.values())
+
+    def add(self, name: str) -> None:
+        self.checks[name] = PENDING
+
+    def mark(self, name: str, state: str) -> None:
+        self.checks[name] = state
+        if self.warmup_seconds is None and self.ready:
+            self.warmup_seconds = self.clock() - self.started
+
+    def stop(self) -> None:
+        """Report not-ready from now on (shutdown has begun)."""
+        self.stopping = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        status = "stopping" if self.stopping else ("ready" if self.ready else "starting")
+        return {"status": status, "checks": dict(self.checks), "warmup_seconds": self.warmup_seconds}
+
+    def stats(self) -> Dict[str, float]:
+        return {"ready": int(self.ready), "warmup_seconds": self.warmup_seconds or 0.0}
+
+
+def start_warm_up(readiness: Readiness, steps: Dict[str, WarmupStep],
+                  retry: float = 0.5, max_retry: float = 5.0) -> "asyncio.Task[None]":
+    """Register the steps as pending checks, then run them in a background task."""
+    for name in steps:
+        readiness.add(name)
+    return asyncio.create_task(warm_up(readiness, steps, retry, max_retry))
+
+
+async def warm_up(readiness: Readiness, steps: Dict[str, WarmupStep],
+                  retry: float = 0.5, max_retry: float = 5.0) -> None:
+    """Run every warm-up step concurrently, retrying failures, and record each outcome."""
+    await asyncio.gather(*(_run_step(readiness, name, step, retry, max_retry) for name, step in steps.items()))
+
+
+async def _run_step(readiness: Readiness, name: str, step: WarmupStep, retry: float, max_retry: float) -> None:
+    delay = retry
+    while True:
+        try:
+            await step()
+        except Exception as exc:  # keep retrying: the instance stays unready, not dead
+            readiness.mark(name, f"error: {exc}")
+            logger.warning("Warm-up step %s failed, retrying in %.1fs: %s", name, delay, exc)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_retry)
+        else:
+            readiness.mark(name, OK)
+            return
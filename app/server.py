@@ -0,0 +1,161 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/server.py
+# ----------------------------------------------------------
+# Description:
+# Production launch settings for `python cli.py serve`.
+#
+# Runs N worker processes (one per CPU by default) and picks
+# uvloop / httptools when they are installed. With gunicorn
+# available the app is preloaded in the master and forked
+# into UvicornWorker processes (copy-on-write shared memory,
+# SIGHUP for a graceful reload); otherwise uvicorn's own
+# process manager runs the workers (SIGHUP restarts them).
+# SIGTERM drains in-flight requests for graceful_timeout
+# seconds in both modes.
+# ----------------------------------------------------------
+
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Any, Dict, List
+import logging
+import os
+import shutil
+import socket
+
+from app.config import get_settings
+
+logger = logging.getLogger("uvicorn.error")  # configured by uvicorn.Config in the parent process
+
+APP = "main:app"
+SERVERS = ("auto", "gunicorn", "uvicorn")
+
+
+def default_workers() -> int:
+    """One worker per CPU unless CALC_WORKERS says otherwise."""
+    workers = get_settings().workers
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def installed(module: str) -> bool:
+    return find_spec(module) is not None
+
+
+# ----------------------------------------------------------
+# Launch options
+# ----------------------------------------------------------
+@dataclass
+class ServerOptions:
+    """How to run the app in production."""
+
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 0            # 0 = default_workers()
+    server: str = "auto"        # auto | gunicorn | uvicorn
+    loop: str = "auto"          # auto | uvloop | asyncio
+    http: str = "auto"          # auto | httptools | h11
+    graceful_timeout: int = 30  # seconds to finish in-flight requests on shutdown/reload
+    keep_alive: int = 5
+    backlog: int = 2048
+    max_requests: int = 0       # gunicorn only: recycle a worker after N requests (0 = never)
+
+    def resolved(self) -> "ServerOptions":
+        """Return a copy with auto values replaced by concrete choices."""
+        return ServerOptions(
+            host=self.host,
+            port=self.port,
+            workers=self.workers or default_workers(),
+            server=self._server(),
+            loop=("uvloop" if installed("uvloop") else "asyncio") if self.loop == "auto" else self.loop,
+            http=("httptools" if installed("httptools") else "h11") if self.http == "auto" else self.http,
+            graceful_timeout=self.graceful_timeout,
+            keep_alive=self.keep_alive,
+            backlog=self.backlog,
+            max_requests=self.max_requests,
+        )
+
+    def _server(self) -> str:
+        if self.server != "auto":
+            return self.server
+        # gunicorn only adds value with several workers (preload + master process)
+        workers = self.workers or default_workers()
+        return "gunicorn" if workers > 1 and installed("gunicorn") else "uvicorn"
+
+
+# ----------------------------------------------------------
+# Command lines / configs per server
+# ----------------------------------------------------------
+def uvicorn_kwargs(options: ServerOptions) -> Dict[str, Any]:
+    """Keyword arguments for uvicorn.run() (options must be resolved)."""
+    return {
+        "host": options.host,
+        "port": options.port,
+        "workers": options.workers,
+        "loop": options.loop,
+        "http": options.http,
+        "backlog": options.backlog,
+        "timeout_keep_alive": options.keep_alive,
+        "timeout_graceful_shutdown": options.graceful_timeout,
+        "access_log": False,  # per-request access lines cost more than the requests themselves
+        "proxy_headers": True,
+    }
+
+
+def gunicorn_argv(options: ServerOptions) -> List[str]:
+    """gunicorn command line (options must be resolved)."""
+    argv = [
+        "gunicorn", APP,
+        "--worker-class", "uvicorn.workers.UvicornWorker",
+        "--workers", str(options.workers),
+        "--bind", f"{options.host}:{options.port}",
+        "--preload",
+        "--graceful-timeout", str(options.graceful_timeout),
+        "--keep-alive", str(options.keep_alive),
+        "--backlog", str(options.backlog),
+    ]
+    if options.max_requests:
+        argv += ["--max-requests", str(options.max_requests),
+                 "--max-requests-jitter", str(max(1, options.max_requests // 10))]
+    return argv
+
+
+def bind_socket(options: ServerOptions) -> socket.socket:
+    """
+    Listening socket shared by all uvicorn workers. uvicorn's own
+    bind_socket() leaves proto=0, and asyncio only enables TCP_NODELAY on
+    accepted connections whose proto is IPPROTO_TCP; without it every
+    keep-alive response stalls ~40ms on Nagle + delayed ACK.
+    """
+    family = socket.AF_INET6 if ":" in options.host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((options.host, options.port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def run(options: ServerOptions) -> None:
+    """Start the server in the foreground (does not return until shutdown)."""
+    options = options.resolved()
+    if options.server == "gunicorn":
+        executable = shutil.which("gunicorn")
+        if executable is None:
+            raise RuntimeError("gunicorn is not installed.")
+        # uvloop/httptools are picked up by UvicornWorker automatically when installed
+        os.execv(executable, gunicorn_argv(options))  # replaces this process
+        return
+
+    import uvicorn
+    from uvicorn.supervisors import Multiprocess
+
+    config = uvicorn.Config(APP, **uvicorn_kwargs(options))
+    server = uvicorn.Server(config)
+    if options.workers == 1:
+        server.run()
+        return
+    sock = bind_socket(options)
+    logger.info("Serving on %s:%d with %d workers (loop=%s, http=%s)",
+                options.host, sock.getsockname()[1], options.workers, options.loop, options.http)
+    Multiprocess(config, target=server.run, sockets=[sock]).run()
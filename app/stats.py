@@ -0,0 +1,191 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/stats.py
+# ----------------------------------------------------------
+# Description:
+# Per-user, per-operation statistics (count, sum, min, max,
+# mean of results) served from the calculation_stats rollup
+# table instead of a GROUP BY over all of `calculations`.
+#
+# The CalculationWriter folds every flushed batch into the
+# rollup with one upsert in the same transaction as the
+# INSERT, so the two tables never disagree. rebuild_stats()
+# recomputes the rollup from raw rows in id-range chunks,
+# e.g. after bulk loads or manual edits in pgAdmin.
+# ----------------------------------------------------------
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.db import calculation_stats, calculations
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REBUILD_CHUNK = 50_000
+
+# (user_id, operation) → [count, total, min_result, max_result]
+Aggregates = Dict[Tuple[int, str], List[float]]
+
+
+# ----------------------------------------------------------
+# Aggregate rows in memory
+# ----------------------------------------------------------
+def aggregate_rows(rows: Iterable[Dict[str, Any]]) -> Aggregates:
+    """Fold calculation rows into per-(user, operation) aggregates."""
+    aggregates: Aggregates = {}
+    for row in rows:
+        key = (row["user_id"], row["operation"])
+        result = row["result"]
+        entry = aggregates.get(key)
+        if entry is None:
+            aggregates[key] = [1, result, result, result]
+        else:
+            entry[0] += 1
+            entry[1] += result
+            if result < entry[2]:
+                entry[2] = result
+            if result > entry[3]:
+                entry[3] = result
+    return aggregates
+
+
+# ----------------------------------------------------------
+# Merge aggregates into the rollup table
+# ----------------------------------------------------------
+def upsert_stats(conn: Connection, aggregates: Aggregates) -> None:
+    """Add aggregates to calculation_stats inside the caller's transaction."""
+    if not aggregates:
+        return
+    values = [
+        {"user_id": user_id, "operation": operation, "count": count,
+         "total": total, "min_result": low, "max_result": high}
+        for (user_id, operation), (count, total, low, high) in aggregates.items()
+    ]
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        least, greatest = func.least, func.greatest
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        least, greatest = func.min, func.max  # two-argument forms are scalar in SQLite
+    else:
+        _upsert_generic(conn, values)
+        return
+
+    # One statement executed with many parameter sets: compiled once and cached
+    table = calculation_stats.c
+    stmt = insert(calculation_stats)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.user_id, table.operation],
+        set_={
+            "count": table.count + stmt.excluded.count,
+            "total": table.total + stmt.excluded.total,
+            "min_result": least(table.min_result, stmt.excluded.min_result),
+            "max_result": greatest(table.max_result, stmt.excluded.max_result),
+        },
+    )
+    conn.execute(stmt, values)
+
+
+def _upsert_generic(conn: Connection, values: List[Dict[str, Any]]) -> None:
+    """Portable fallback: read-modify-write per key (single writer only)."""
+    table = calculation_stats.c
+    for value in values:
+        key = (table.user_id == value["user_id"]) & (table.operation == value["operation"])
+        current = conn.execute(select(calculation_stats).where(key)).mappings().first()
+        if current is None:
+            conn.execute(calculation_stats.insert().values(value))
+            continue
+        conn.execute(update(calculation_stats).where(key).values(
+            count=current["count"] + value["count"],
+            total=current["total"] + value["total"],
+            min_result=min(current["min_result"], value["min_result"]),
+            max_result=max(current["max_result"], value["max_result"]),
+        ))
+
+
+# ----------------------------------------------------------
+# Read stats for one user (one indexed lookup)
+# ----------------------------------------------------------
+def _summary(count: int, total: float, low: Optional[float], high: Optional[float]) -> Dict[str, Any]:
+    return {"count": count, "sum": total, "min": low, "max": high,
+            "mean": total / count if count else None}
+
+
+def get_user_stats(bind: Any, user_id: int) -> Dict[str, Any]:
+    """Return per-operation and overall stats for a user from the rollup table."""
+    query = select(calculation_stats).where(calculation_stats.c.user_id == user_id)
+    if isinstance(bind, Engine):
+        with bind.connect() as conn:
+            rows = conn.execute(query).mappings().all()
+    else:
+        rows = bind.execute(query).mappings().all()
+
+    operations = {
+        row["operation"]: _summary(row["count"], row["total"], row["min_result"], row["max_result"])
+        for row in sorted(rows, key=lambda r: r["operation"])
+    }
+    overall = _summary(
+        sum(row["count"] for row in rows),
+        sum(row["total"] for row in rows),
+        min((row["min_result"] for row in rows), default=None),
+        max((row["max_result"] for row in rows), default=None),
+    )
+    return {"user_id": user_id, "operations": operations, "overall": overall}
+
+
+# ----------------------------------------------------------
+# Rebuild the rollup from raw rows
+# ----------------------------------------------------------
+@dataclass
+class RebuildStats:
+    """Summary of a rollup rebuild."""
+
+    rows: int = 0
+    chunks: int = 0
+    groups: int = 0
+
+
+def rebuild_stats(engine: Engine, chunk_size: int = DEFAULT_REBUILD_CHUNK) -> RebuildStats:
+    """
+    Recompute calculation_stats from `calculations` in one transaction,
+    aggregating id ranges of chunk_size rows at a time in the database.
+    Run it while no writer is active; rows written meanwhile may be
+    counted twice or missed.
+    """
+    summary = RebuildStats()
+    c = calculations.c
+    with engine.begin() as conn:
+        conn.execute(delete(calculation_stats))
+        low, high = conn.execute(select(func.min(c.id), func.max(c.id))).one()
+        if low is None:
+            return summary
+        totals: Aggregates = {}
+        for start in range(low, high + 1, chunk_size):
+            chunk = conn.execute(
+                select(c.user_id, c.operation, func.count(), func.sum(c.result),
+                       func.min(c.result), func.max(c.result))
+                .where(c.id >= start, c.id < start + chunk_size)
+                .group_by(c.user_id, c.operation)
+            ).all()
+            for user_id, operation, count, total, low_result, high_result in chunk:
+                entry = totals.get((user_id, operation))
+                if entry is None:
+                    totals[(user_id, operation)] = [count, total, low_result, high_result]
+                else:
+                    entry[0] += count
+                    entry[1] += total
+                    entry[2] = min(entry[2], low_result)
+                    entry[3] = max(entry[3], high_result)
+                summary.rows += count
+            summary.chunks += 1
+            logger.info("Rebuilt stats chunk %d (%d rows so far)", summary.chunks, summary.rows)
+        upsert_stats(conn, totals)
+        summary.groups = len(totals)
+    return summary
@@ -0,0 +1,169 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/streaming.py
+# ----------------------------------------------------------
+# Description:
+# Streaming NDJSON evaluation for the /stream endpoint.
+#
+# The request body is read chunk by chunk, split into lines
+# of {"op", "a", "b"} records, evaluated in small groups with
+# the vectorized batch kernel and written back as NDJSON
+# lines in the same order. Reading is pull-based: the next
+# body chunk is only read after the previous results were
+# handed to the server, so a slow client reading results
+# also slows down how fast its input is consumed. Memory use
+# is bounded by the chunk size, MAX_LINE_BYTES and
+# MAX_GROUP_SIZE regardless of the total input size.
+# ----------------------------------------------------------
+
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+import json
+
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.batch import evaluate_parsed
+from app.vectorized import OUT_OF_RANGE
+
+# Longest accepted input line (bytes); longer lines are reported as errors
+MAX_LINE_BYTES = 64 * 1024
+
+# Records evaluated and written per output chunk
+MAX_GROUP_SIZE = 1024
+
+INVALID_RECORD = {"error": "Invalid or missing numeric input."}
+INVALID_JSON = {"error": "Invalid JSON."}
+LINE_TOO_LONG = {"error": f"Line exceeds {MAX_LINE_BYTES} bytes."}
+OUT_OF_RANGE_LINE = json.dumps({"error": OUT_OF_RANGE})
+
+# Sink receiving successfully computed rows (e.g. the persistence writer)
+ResultSink = Callable[[Iterable[Dict[str, Any]]], Any]
+
+
+# ----------------------------------------------------------
+# Response that does not consume the request body
+# ----------------------------------------------------------
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that only sends. The stock implementation listens
+    for client disconnects by calling receive(), which would steal the
+    request body chunks this endpoint is still reading. A disconnect is
+    noticed instead when the body stream ends or a send fails.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except ClientDisconnect:
+            return
+        if self.background is not None:
+            await self.background()
+
+
+# ----------------------------------------------------------
+# Split a chunked byte stream into lines
+# ----------------------------------------------------------
+async def iter_lines(chunks: AsyncIterator[bytes],
+                     max_line: int = MAX_LINE_BYTES) -> AsyncIterator[Optional[bytes]]:
+    """
+    Yield complete lines without their newline. Lines longer than
+    max_line are yielded once as None and the rest of them is skipped.
+    """
+    buffer = b""
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                break
+            if skipping:
+                skipping = False
+            else:
+                yield buffer[start:end] if end - start <= max_line else None
+            start = end + 1
+        buffer = buffer[start:]
+        if len(buffer) > max_line:
+            if not skipping:
+                yield None
+                skipping = True
+            buffer = b""
+    if buffer and not skipping:
+        yield buffer if len(buffer) <= max_line else None
+
+
+# ----------------------------------------------------------
+# Parse one NDJSON record
+# ----------------------------------------------------------
+def parse_record(line: bytes) -> Union[tuple, Dict[str, str]]:
+    """Return (op, a, b) for a valid record, or an error entry."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return INVALID_JSON
+    return record_from(record)
+
+
+def record_from(record: Any) -> Union[tuple, Dict[str, str]]:
+    """Return (op, a, b) for a decoded {"op", "a", "b"} object, or an error entry."""
+    if not isinstance(record, dict):
+        return INVALID_RECORD
+    op, a, b = record.get("op"), record.get("a"), record.get("b")
+    if not isinstance(op, str) or not _is_number(a) or not _is_number(b):
+        return INVALID_RECORD
+    return (op, a, b)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# ----------------------------------------------------------
+# Evaluate a stream of NDJSON records
+# ----------------------------------------------------------
+def _evaluate_group(lines: List[Optional[bytes]], sink: Optional[ResultSink]) -> bytes:
+    """Evaluate a group of lines and return the encoded NDJSON output."""
+    records = [LINE_TOO_LONG if line is None else parse_record(line) for line in lines]
+    entries = evaluate_parsed(records)
+    if sink is not None:
+        sink(
+            {"operation": record[0], "operand_a": record[1], "operand_b": record[2],
+             "result": entry["result"]}
+            for record, entry in zip(records, entries) if "result" in entry
+        )
+    return encode_ndjson(entries)
+
+
+def encode_ndjson(entries: Iterable[Dict[str, Any]]) -> bytes:
+    """Encode result entries as NDJSON bytes (one line per entry)."""
+    return "".join(_encode_entry(entry) + "\n" for entry in entries).encode()
+
+
+def _encode_entry(entry: Dict[str, Any]) -> str:
+    """Strict JSON for one entry; a NaN or ±inf value becomes that line's error."""
+    try:
+        return json.dumps(entry, allow_nan=False)
+    except ValueError:
+        return OUT_OF_RANGE_LINE
+
+
+async def stream_calculations(chunks: AsyncIterator[bytes],
+                              sink: Optional[ResultSink] = None,
+                              group_size: int = MAX_GROUP_SIZE) -> AsyncIterator[bytes]:
+    """Yield NDJSON result chunks for NDJSON input chunks, preserving order."""
+    group: List[Optional[bytes]] = []
+    async for line in iter_lines(chunks):
+        if line is not None and not line.strip():
+            continue  # blank lines carry no record
+        group.append(line)
+        if len(group) >= group_size:
+            yield _evaluate_group(group, sink)
+            group = []
+    if group:
+        yield _evaluate_group(group, sink)
@@ -0,0 +1,157 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/vectorized.py
+# ----------------------------------------------------------
+# Description:
+# Array-aware versions of the arithmetic functions in
+# app/operations.py, built on NumPy. Operands are passed as
+# columns (lists or NumPy arrays), validated once per column
+# and computed in a single vectorized pass. Division reports
+# divide-by-zero positions as a boolean mask instead of
+# raising on the first zero divisor.
+#
+# These functions are the compute kernel for bulk paths such
+# as the /batch endpoint.
+# ----------------------------------------------------------
+
+from typing import Iterable, Sequence, Tuple, Union
+import logging
+
+import numpy as np
+
+from app.logging_config import should_log
+
+# Anything NumPy can turn into a 1-D numeric column
+Column = Union[Sequence[float], np.ndarray]
+
+logger = logging.getLogger(__name__)
+
+# Operation name → numeric op-code used in op-code columns
+OP_CODES = {"add": 0, "subtract": 1, "multiply": 2, "divide": 3}
+
+# Per-row status codes returned by evaluate_columns()
+STATUS_OK = 0
+STATUS_DIVIDE_BY_ZERO = 1
+STATUS_UNSUPPORTED = 2
+STATUS_OUT_OF_RANGE = 3    # overflowed to ±inf (or NaN from inf operands)
+
+OUT_OF_RANGE = "Result is out of range."
+
+# NumPy dtype kinds accepted as numbers (bool, signed, unsigned, float)
+_NUMERIC_KINDS = "biuf"
+
+
+# ----------------------------------------------------------
+# Helper: Validate and convert one operand column
+# ----------------------------------------------------------
+def as_column(values: Column) -> np.ndarray:
+    """Return values as a 1-D float64 array. Raises TypeError for non-numeric data."""
+    array = np.asarray(values)
+    if array.dtype.kind not in _NUMERIC_KINDS:
+        logger.error("Invalid operand column with dtype %s", array.dtype)
+        raise TypeError("Both operands must be numbers.")
+    if array.ndim != 1:
+        raise ValueError("Operand columns must be one-dimensional.")
+    return array.astype(np.float64, copy=False)
+
+
+def _validate_columns(a: Column, b: Column) -> Tuple[np.ndarray, np.ndarray]:
+    """Validate both columns once and check that their lengths match."""
+    col_a, col_b = as_column(a), as_column(b)
+    if col_a.shape != col_b.shape:
+        raise ValueError("Operand columns must have the same length.")
+    return col_a, col_b
+
+
+# ----------------------------------------------------------
+# Element-wise operations
+# ----------------------------------------------------------
+def add_array(a: Column, b: Column) -> np.ndarray:
+    """Return the element-wise sum of two columns."""
+    col_a, col_b = _validate_columns(a, b)
+    result = np.add(col_a, col_b)
+    if should_log():
+        logger.info("Vectorized addition performed on %d elements", result.size)
+    return result
+
+
+def subtract_array(a: Column, b: Column) -> np.ndarray:
+    """Return the element-wise difference a - b of two columns."""
+    col_a, col_b = _validate_columns(a, b)
+    result = np.subtract(col_a, col_b)
+    if should_log():
+        logger.info("Vectorized subtraction performed on %d elements", result.size)
+    return result
+
+
+def multiply_array(a: Column, b: Column) -> np.ndarray:
+    """Return the element-wise product of two columns."""
+    col_a, col_b = _validate_columns(a, b)
+    result = np.multiply(col_a, col_b)
+    if should_log():
+        logger.info("Vectorized multiplication performed on %d elements", result.size)
+    return result
+
+
+def divide_array(a: Column, b: Column) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (quotients, zero_mask) for the element-wise division a / b.
+    Positions where b is zero are flagged in zero_mask and hold NaN.
+    """
+    col_a, col_b = _validate_columns(a, b)
+    zero_mask = col_b == 0
+    result = np.full(col_a.shape, np.nan)
+    np.divide(col_a, col_b, out=result, where=~zero_mask)
+    if should_log():
+        logger.info(
+            "Vectorized division performed on %d elements (%d divide-by-zero)",
+            result.size, int(zero_mask.sum()),
+        )
+    return result, zero_mask
+
+
+# ----------------------------------------------------------
+# Mixed operations in one pass
+# ----------------------------------------------------------
+def op_code_column(ops: Iterable[str]) -> np.ndarray:
+    """Translate operation names to op-codes (-1 for unsupported names)."""
+    return np.fromiter((OP_CODES.get(op, -1) for op in ops), dtype=np.int8)
+
+
+def evaluate_columns(codes: Column, a: Column, b: Column) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate a mixed op-code column against operand columns.
+    Returns (results, status) where status holds STATUS_* codes per row
+    and results is NaN wherever status is not STATUS_OK. Results that
+    overflow to ±inf get STATUS_OUT_OF_RANGE.
+    """
+    col_a, col_b = _validate_columns(a, b)
+    codes = np.asarray(codes, dtype=np.int8)
+    if codes.shape != col_a.shape:
+        raise ValueError("Operand columns must have the same length.")
+
+    results = np.full(col_a.shape, np.nan)
+    status = np.full(col_a.shape, STATUS_UNSUPPORTED, dtype=np.uint8)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        for ufunc, name in ((np.add, "add"), (np.subtract, "subtract"), (np.multiply, "multiply")):
+            mask = codes == OP_CODES[name]
+            ufunc(col_a, col_b, out=results, where=mask)
+            status[mask] = STATUS_OK
+
+        divide_mask = codes == OP_CODES["divide"]
+        zero_mask = divide_mask & (col_b == 0)
+        np.divide(col_a, col_b, out=results, where=divide_mask & ~zero_mask)
+    status[divide_mask] = STATUS_OK
+    status[zero_mask] = STATUS_DIVIDE_BY_ZERO
+
+    out_of_range = (status == STATUS_OK) & ~np.isfinite(results)
+    if out_of_range.any():
+        results[out_of_range] = np.nan
+        status[out_of_range] = STATUS_OUT_OF_RANGE
+
+    if should_log():
+        logger.info("Vectorized batch evaluated on %d elements", results.size)
+    return results, status
@@ -0,0 +1,225 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: app/websocket.py
+# ----------------------------------------------------------
+# Description:
+# Persistent calculation channel for the /ws WebSocket.
+#
+# Clients keep one connection open and pipeline requests on
+# it instead of paying for a full HTTP exchange per
+# calculation:
+#
+#   text frame   → one JSON request {"id", "op", "a", "b"},
+#                  answered with {"id", "result"} or
+#                  {"id", "error"}. Operands follow the REST
+#                  routes' rules, and results go through the
+#                  result cache and persistence like theirs.
+#   binary frame → packed little-endian records
+#                  (uint32 id, uint8 op code, float64 a,
+#                  float64 b; 21 bytes each), answered with
+#                  one frame of (uint32 id, uint8 status,
+#                  float64 result) records (13 bytes each),
+#                  computed in one pass by app/vectorized.py.
+#
+# Frames are answered in order, one at a time: the next
+# frame is only read once the previous response has been
+# handed to the server. A client that sends faster than the
+# worker computes, or reads its responses slowly, fills the
+# server's small per-connection frame queue and then its own
+# TCP window, so memory per connection stays bounded. The
+# loop yields to other connections every YIELD_EVERY frames
+# so one busy client cannot starve the rest. With
+# CALC_RATE_LIMIT set, every frame (text or binary) takes a
+# token from the client's "/ws" bucket; frames over the rate
+# are answered with {"id", "error", "retry_after"} instead of
+# being computed.
+# ----------------------------------------------------------
+
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import logging
+import math
+import time
+
+import numpy as np
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from app.batch import MAX_BATCH_SIZE, OPERATIONS
+from app.fastpath import dumps, load_object, to_float
+from app.metrics import registry
+from app.ratelimit import RATE_LIMITED
+from app.vectorized import OP_CODES, STATUS_OK, evaluate_columns
+
+logger = logging.getLogger(__name__)
+
+ROUTE = "/ws"
+
+# Binary records (packed, little-endian); op codes match app/vectorized.OP_CODES
+REQUEST_RECORD = np.dtype([("id", "<u4"), ("op", "u1"), ("a", "<f8"), ("b", "<f8")])
+RESPONSE_RECORD = np.dtype([("id", "<u4"), ("status", "u1"), ("result", "<f8")])
+
+YIELD_EVERY = 64  # frames handled before letting other connections run
+
+INVALID_INPUT = "Invalid or missing numeric input."
+NON_FINITE = "Out of range float values are not JSON compliant"
+BAD_BINARY_FRAME = (f"Binary frames must hold 1 to {MAX_BATCH_SIZE} records "
+                    f"of {REQUEST_RECORD.itemsize} bytes.")
+
+_MAX_ID = 2 ** 64  # orjson encodes integers up to 64 bits
+_OP_NAMES = {code: name for name, code in OP_CODES.items()}
+
+
+# ----------------------------------------------------------
+# Per-worker counters (exported on /metrics)
+# ----------------------------------------------------------
+class ChannelStats:
+    """Connection and message counts for the /ws channel."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.opened = 0
+        self.messages = 0
+        self.errors = 0
+        self.limited = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"connections": self.connections, "opened": self.opened,
+                "messages": self.messages, "errors": self.errors, "limited": self.limited}
+
+
+# ----------------------------------------------------------
+# Frame handlers
+# ----------------------------------------------------------
+def _valid_id(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return -_MAX_ID // 2 <= value < _MAX_ID
+    return value is None or isinstance(value, str)
+
+
+class CalculationChannel:
+    """Computes the requests of one connection against the app's cache and writer."""
+
+    def __init__(self, cache: Any = None, writer: Any = None, user_id: int = 1,
+                 stats: Optional[ChannelStats] = None, rate_limiter: Any = None,
+                 client: str = "unknown") -> None:
+        self.cache = cache
+        self.writer = writer
+        self.user_id = user_id
+        self.stats = stats or ChannelStats()
+        self.rate_limiter = rate_limiter
+        self.client = client
+
+    def throttle(self) -> float:
+        """Take a rate-limit token for one frame: 0.0 to go ahead, else seconds until the next one."""
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.check(ROUTE, self.client)
+
+    def limited_reply(self, text: Optional[str], retry_after: float) -> str:
+        """The error frame for a frame over the rate (echoing a text frame's id)."""
+        data = load_object(text) if text is not None else None
+        request_id = data.get("id") if data is not None else None
+        if not _valid_id(request_id):
+            request_id = None
+        return dumps({"id": request_id, "error": RATE_LIMITED, "retry_after": round(retry_after, 3)}).decode()
+
+    def handle_text(self, text: str) -> Tuple[str, bool]:
+        """Return the JSON response for one text frame and whether it succeeded."""
+        data = load_object(text)
+        request_id = data.get("id") if data is not None else None
+        if not _valid_id(request_id):
+            request_id, data = None, None
+        result, error = self._compute(data)
+        body = {"id": request_id, "error": error} if error is not None else {"id": request_id, "result": result}
+        return dumps(body).decode(), error is None
+
+    def _compute(self, data: Optional[Dict[str, Any]]) -> Tuple[Optional[float], Optional[str]]:
+        if data is None:
+            registry.count_error("validation")
+            return None, INVALID_INPUT
+        operation = data.get("op")
+        func = OPERATIONS.get(operation) if isinstance(operation, str) else None
+        if func is None:
+            return None, f"Unsupported operation: {operation}"
+        a, b = to_float(data.get("a")), to_float(data.get("b"))
+        if a is None or b is None:
+            registry.count_error("validation")
+            return None, INVALID_INPUT
+        try:
+            result = func(a, b) if self.cache is None else self.cache.get_or_compute(operation, a, b, func)
+        except ValueError as exc:
+            registry.count_error("divide_by_zero")
+            return None, str(exc)
+        if not math.isfinite(result):
+            return None, NON_FINITE
+        if self.writer is not None:
+            self.writer.record(operation, a, b, result, self.user_id)
+        return result, None
+
+    def handle_binary(self, data: bytes) -> Tuple[bytes, bool]:
+        """Return the packed response for one binary frame (or a JSON error) and whether it was valid."""
+        count, remainder = divmod(len(data), REQUEST_RECORD.itemsize)
+        if remainder or not 0 < count <= MAX_BATCH_SIZE:
+            return dumps({"id": None, "error": BAD_BINARY_FRAME}), False
+        records = np.frombuffer(data, dtype=REQUEST_RECORD)  # zero-copy view of the frame
+        results, status = evaluate_columns(records["op"].astype(np.int8), records["a"], records["b"])
+        response = np.empty(count, dtype=RESPONSE_RECORD)
+        response["id"] = records["id"]
+        response["status"] = status
+        response["result"] = results
+        if self.writer is not None:
+            self._persist_columns(records, results, status)
+        return response.tobytes(), True
+
+    def _persist_columns(self, records: np.ndarray, results: np.ndarray, status: np.ndarray) -> None:
+        ok = np.flatnonzero(status == STATUS_OK)
+        for op, a, b, result in zip(records["op"][ok].tolist(), records["a"][ok].tolist(),
+                                    records["b"][ok].tolist(), results[ok].tolist()):
+            self.writer.record(_OP_NAMES[op], a, b, result, self.user_id)
+
+
+# ----------------------------------------------------------
+# Connection loop
+# ----------------------------------------------------------
+async def serve_channel(websocket: WebSocket, channel: CalculationChannel) -> None:
+    """Accept the connection and answer frames in order until the client disconnects."""
+    stats = channel.stats
+    await websocket.accept()
+    stats.connections += 1
+    stats.opened += 1
+    handled = 0
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            start = time.perf_counter()
+            text = message.get("text")
+            retry_after = channel.throttle()
+            if retry_after:
+                await websocket.send_text(channel.limited_reply(text, retry_after))
+                stats.limited += 1
+                status = 429
+            else:
+                if text is not None:
+                    reply, ok = channel.handle_text(text)
+                    await websocket.send_text(reply)
+                else:
+                    reply, ok = channel.handle_binary(message.get("bytes") or b"")
+                    await (websocket.send_bytes(reply) if ok else websocket.send_text(reply.decode()))
+                stats.messages += 1
+                if not ok:
+                    stats.errors += 1
+                status = 200 if ok else 400
+            registry.observe_request("WS", ROUTE, status, time.perf_counter() - start)
+            handled += 1
+            if handled % YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+    except WebSocketDisconnect:  # the client went away before its response was sent
+        logger.info("WebSocket client disconnected with responses pending")
+    finally:
+        stats.connections -= 1
@@ -0,0 +1,121 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/bench_binary.py
+# ----------------------------------------------------------
+# Description:
+# JSON versus the packed binary format (app/binary.py) for
+# POST /batch: bytes on the wire, server time per request
+# and client encode + decode time, per batch size.
+#
+# Requests are driven straight through the ASGI interface
+# (no HTTP client, no network), like bench_fastpath. The best
+# of `--rounds` runs is kept.
+#
+# Usage:
+#   python -m benchmarks.bench_binary [--rounds 5]
+# ----------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Callable, Tuple
+
+import numpy as np
+
+os.environ.pop("DATABASE_URL", None)
+os.environ["CALC_LOG_MODE"] = "off"
+os.environ["CALC_COMPRESSION"] = "0"
+os.environ["CALC_IDEMPOTENCY_SIZE"] = "0"
+
+from app.binary import MEDIA_TYPE, decode_response, encode_request  # noqa: E402
+from main import app  # noqa: E402
+
+SIZES = (100, 1_000, 10_000, 100_000)
+OPS = ("add", "subtract", "multiply", "divide")
+
+
+async def call(body: bytes, content_type: str) -> Tuple[int, bytes]:
+    """POST /batch through the ASGI app; return (status, response body)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/batch", "raw_path": b"/batch", "query_string": b"",
+        "root_path": "", "server": ("bench", 80), "client": ("127.0.0.1", 1),
+        "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status, chunks = 0, []
+
+    async def receive():
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        else:
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+def best(fn: Callable[[], object], rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+async def best_async(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        status, _ = await fn()
+        times.append(time.perf_counter() - start)
+        assert status == 200, status
+    return min(times)
+
+
+async def bench(rounds: int) -> None:
+    async with app.router.lifespan_context(app):
+        print(f"{'rows':>8} {'format':>7} {'request B':>11} {'response B':>11} "
+              f"{'server ms':>10} {'client ms':>10} {'ns/row':>8}")
+        for rows in SIZES:
+            codes = np.arange(rows) % 4
+            a = np.arange(rows) * 1.37
+            b = (np.arange(rows) % 97) + 1.5
+            items = [{"op": OPS[c], "a": x, "b": y} for c, x, y in zip(codes.tolist(), a.tolist(), b.tolist())]
+
+            json_body = json.dumps({"operations": items}).encode()
+            _, json_reply = await call(json_body, "application/json")
+            server = await best_async(lambda: call(json_body, "application/json"), rounds)
+            client = best(lambda: (json.dumps({"operations": items}), json.loads(json_reply)), rounds)
+            print(f"{rows:8,} {'json':>7} {len(json_body):11,} {len(json_reply):11,} "
+                  f"{server * 1e3:10.2f} {client * 1e3:10.2f} {server / rows * 1e9:8.0f}")
+
+            binary_body = encode_request(codes, a, b)
+            _, binary_reply = await call(binary_body, MEDIA_TYPE)
+            server = await best_async(lambda: call(binary_body, MEDIA_TYPE), rounds)
+            client = best(lambda: (encode_request(codes, a, b), decode_response(binary_reply)), rounds)
+            print(f"{'':8} {'binary':>7} {len(binary_body):11,} {len(binary_reply):11,} "
+                  f"{server * 1e3:10.2f} {client * 1e3:10.2f} {server / rows * 1e9:8.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON vs binary /batch")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(bench(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
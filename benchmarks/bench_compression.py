@@ -0,0 +1,100 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/bench_compression.py
+# ----------------------------------------------------------
+# Description:
+# Bytes on the wire and CPU cost of response compression,
+# per response size, for app/compression.py.
+#
+# Bodies are real /batch responses (JSON results of n
+# operations) from about 50 B to 550 KB. Each is compressed
+# with gzip at several levels and with brotli (when the
+# `brotli` package is installed); the table shows the encoded
+# size and the best-of-rounds time per response. A second
+# table compares rendering the homepage template on every hit
+# with serving the cached copy from app/http_cache.py.
+#
+# Usage:
+#   python -m benchmarks.bench_compression [--rounds 5]
+# ----------------------------------------------------------
+
+import argparse
+import json
+import time
+from typing import Callable, List, Tuple
+
+from fastapi.templating import Jinja2Templates
+
+from app.batch import evaluate_batch
+from app.compression import GZIP_LEVEL, BrotliEncoder, GzipEncoder, brotli
+from app.http_cache import CachedTemplate
+
+BATCH_SIZES = (2, 20, 200, 2_000, 20_000)
+OPS = ("add", "subtract", "multiply", "divide")
+
+
+def batch_response(items: int) -> bytes:
+    """The JSON body /batch returns for `items` operations."""
+    operations = [(OPS[i % 4], i * 1.37, (i % 97) + 1.5) for i in range(items)]
+    return json.dumps({"results": evaluate_batch(operations)}).encode()
+
+
+def best_time(fn: Callable[[], bytes], rounds: int, repeat: int) -> Tuple[float, bytes]:
+    """Best per-call time in seconds over `rounds` runs of `repeat` calls."""
+    best, out = float("inf"), b""
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            out = fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best, out
+
+
+def codecs() -> List[Tuple[str, Callable[[bytes], bytes]]]:
+    entries = [(f"gzip-{level}{'*' if level == GZIP_LEVEL else ''}",
+                lambda data, level=level: GzipEncoder(level).finish(data)) for level in sorted({1, GZIP_LEVEL, 6, 9})]
+    if brotli is not None:
+        entries += [(f"br-{quality}{'*' if quality == 4 else ''}",
+                     lambda data, quality=quality: BrotliEncoder(quality).finish(data)) for quality in (1, 4, 11)]
+    return entries
+
+
+def bench_sizes(rounds: int) -> None:
+    print("per-response size and CPU time (* = level used by CompressionMiddleware)")
+    print(f"{'items':>7} {'codec':>8} {'bytes':>10} {'ratio':>7} {'us/resp':>10} {'MB/s':>8}")
+    for items in BATCH_SIZES:
+        body = batch_response(items)
+        print(f"{items:7,} {'identity':>8} {len(body):10,} {1:7.2f} {'-':>10} {'-':>8}")
+        repeat = max(1, 200_000 // len(body))
+        for name, encode in codecs():
+            seconds, encoded = best_time(lambda: encode(body), rounds, repeat)
+            print(f"{'':7} {name:>8} {len(encoded):10,} {len(body) / len(encoded):7.2f} "
+                  f"{seconds * 1e6:10.1f} {len(body) / seconds / 1e6:8.1f}")
+
+
+def bench_homepage(rounds: int) -> None:
+    templates = Jinja2Templates(directory="templates")
+    cached = CachedTemplate(templates, "index.html")
+    template = templates.get_template("index.html")
+    render, _ = best_time(lambda: template.render({}).encode(), rounds, 2_000)
+    serve, _ = best_time(lambda: cached.response({}).body, rounds, 2_000)
+    revalidate, _ = best_time(lambda: cached.response({"if-none-match": cached.page().etag}).body, rounds, 2_000)
+    print()
+    print("homepage")
+    print(f"{'render per hit':>16} {render * 1e6:8.1f} us")
+    print(f"{'cached 200':>16} {serve * 1e6:8.1f} us")
+    print(f"{'cached 304':>16} {revalidate * 1e6:8.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Response compression: bytes on wire and CPU per size")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    bench_sizes(args.rounds)
+    bench_homepage(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
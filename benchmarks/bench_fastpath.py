@@ -0,0 +1,104 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/bench_fastpath.py
+# ----------------------------------------------------------
+# Description:
+# Server-side cost of the regular Pydantic arithmetic routes
+# versus the fast-path handlers in app/fastpath.py.
+#
+# Requests are driven straight through the ASGI interface
+# (no HTTP client, no network) so the numbers reflect only
+# the app's own per-request work. The two modes are run in
+# alternating rounds and the best round of each is kept.
+#
+# Usage:
+#   python -m benchmarks.bench_fastpath [--requests 20000] [--rounds 5]
+# ----------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+# Compute path only: no database writer, no calculation logs.
+os.environ.pop("DATABASE_URL", None)
+os.environ["CALC_LOG_MODE"] = "off"
+os.environ["CALC_FAST_PATH"] = "0"
+
+from app.fastpath import FastRoute, install_fast_routes  # noqa: E402
+from main import app  # noqa: E402
+
+ROUTES = ("/add", "/subtract", "/multiply", "/divide")
+
+
+async def call(path: str, body: bytes) -> int:
+    """Send one POST through the ASGI app and return the status code."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "server": ("bench", 80), "client": ("127.0.0.1", 1),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = 0
+
+    async def receive():
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run_round(path: str, requests: int, offset: int) -> float:
+    bodies = [json.dumps({"a": offset + i + 1, "b": 3.5}).encode() for i in range(requests)]
+    start = time.perf_counter()
+    for body in bodies:
+        await call(path, body)
+    return time.perf_counter() - start
+
+
+def set_fast_path(enabled: bool) -> None:
+    app.router.routes[:] = [route for route in app.router.routes if not isinstance(route, FastRoute)]
+    if enabled:
+        install_fast_routes(app)
+
+
+async def bench(requests: int, rounds: int) -> None:
+    async with app.router.lifespan_context(app):
+        print(f"{'route':10} {'regular req/s':>14} {'fast req/s':>12} {'speedup':>8} "
+              f"{'regular us':>11} {'fast us':>9}")
+        for path in ROUTES:
+            best = {False: float("inf"), True: float("inf")}
+            for round_no in range(rounds):
+                for enabled in (False, True):
+                    set_fast_path(enabled)
+                    await run_round(path, 200, -10_000)  # warm-up
+                    offset = (round_no * 2 + enabled) * requests  # distinct operands → no cache hits
+                    best[enabled] = min(best[enabled], await run_round(path, requests, offset))
+            regular, fast = best[False], best[True]
+            print(f"{path:10} {requests / regular:14,.0f} {requests / fast:12,.0f} {regular / fast:7.2f}x "
+                  f"{regular / requests * 1e6:11.1f} {fast / requests * 1e6:9.1f}")
+        set_fast_path(False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Regular vs fast-path arithmetic routes")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(bench(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
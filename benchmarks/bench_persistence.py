@@ -0,0 +1,77 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/bench_persistence.py
+# ----------------------------------------------------------
+# Description:
+# Measures insert throughput into the `calculations` table:
+# one row per transaction (what a naive per-request INSERT
+# would do) versus the batched CalculationWriter flush.
+#
+# Usage:
+#   python -m benchmarks.bench_persistence [--rows 20000] [--url DATABASE_URL]
+# Without --url a temporary SQLite file is used.
+# ----------------------------------------------------------
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import delete
+
+from app.db import calculations, create_db_engine, init_db
+from app.persistence import CalculationWriter, utc_now
+
+
+def make_row(i: int) -> dict:
+    return {"operation": "add", "operand_a": float(i), "operand_b": 1.0,
+            "result": i + 1.0, "user_id": 1, "timestamp": utc_now()}
+
+
+def single_row_inserts(engine, rows: int) -> float:
+    start = time.perf_counter()
+    for i in range(rows):
+        with engine.begin() as conn:
+            conn.execute(calculations.insert(), make_row(i))
+    return time.perf_counter() - start
+
+
+def batched_inserts(engine, rows: int, batch_size: int) -> float:
+    writer = CalculationWriter(engine, batch_size=batch_size, max_queue=rows)
+    for i in range(rows):
+        writer.record("add", float(i), 1.0, i + 1.0, user_id=1)
+    start = time.perf_counter()
+    writer.flush()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Single-row vs batched insert benchmark")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--url", default=None, help="database URL (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    url = args.url or f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    engine = create_db_engine(url)
+    init_db(engine)
+
+    def reset():
+        with engine.begin() as conn:
+            conn.execute(delete(calculations))
+
+    print(f"database: {engine.url.get_backend_name()}, rows: {args.rows}")
+    reset()
+    elapsed = single_row_inserts(engine, args.rows)
+    print(f"{'single-row':>16}: {elapsed:8.3f}s {args.rows / elapsed:12,.0f} rows/s")
+    for batch_size in (100, 500, 2000):
+        reset()
+        elapsed = batched_inserts(engine, args.rows, batch_size)
+        print(f"{'batch=' + str(batch_size):>16}: {elapsed:8.3f}s {args.rows / elapsed:12,.0f} rows/s")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
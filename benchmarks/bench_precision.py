@@ -0,0 +1,92 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/bench_precision.py
+# ----------------------------------------------------------
+# Description:
+# Cost of the precision modes in app/precision.py against the
+# default float arithmetic, per operation and operand shape:
+#
+#   small ints   → exercises the native-int fast path
+#   decimals     → values like 12.345 (Decimal / Fraction math)
+#   big ints     → 30-digit integers (beyond float precision)
+#
+# Each cell is parse + compute (evaluate_exact) per call, in
+# nanoseconds, so the numbers include the cost of reading the
+# JSON operand exactly. A second table times whole /batch
+# bodies of 10,000 mixed items per mode.
+#
+# Usage:
+#   python -m benchmarks.bench_precision [--calls 20000]
+# ----------------------------------------------------------
+
+import argparse
+import logging
+import random
+import time
+from typing import Any, Callable, List, Tuple
+
+from app.batch import OPERATIONS, evaluate_batch
+from app.precision import evaluate_exact, evaluate_exact_batch
+
+OPS = ("add", "subtract", "multiply", "divide")
+MODES = (("float", None), ("decimal", 28), ("decimal", 100), ("fraction", None))
+
+
+def operands(shape: str, count: int, seed: int = 16) -> List[Tuple[Any, Any]]:
+    """Deterministic operand pairs as they arrive from JSON."""
+    rng = random.Random(seed)
+    if shape == "small ints":
+        return [(rng.randint(-10**6, 10**6), rng.randint(1, 10**6)) for _ in range(count)]
+    if shape == "decimals":
+        return [(round(rng.uniform(-1000, 1000), 3), round(rng.uniform(1, 1000), 3)) for _ in range(count)]
+    return [(rng.randint(10**29, 10**30), rng.randint(10**29, 10**30)) for _ in range(count)]
+
+
+def per_call_ns(func: Callable[[Any, Any], Any], pairs: List[Tuple[Any, Any]]) -> float:
+    start = time.perf_counter()
+    for a, b in pairs:
+        func(a, b)
+    return (time.perf_counter() - start) / len(pairs) * 1e9
+
+
+def mode_function(op: str, mode: str, digits: Any) -> Callable[[Any, Any], Any]:
+    if mode == "float":
+        func = OPERATIONS[op]
+        return lambda a, b: func(float(a), float(b))  # what the float route does after validation
+    return lambda a, b: evaluate_exact(op, a, b, mode, digits)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Float vs decimal vs fraction arithmetic cost")
+    parser.add_argument("--calls", type=int, default=20_000, help="calls per cell")
+    parser.add_argument("--batch", type=int, default=10_000, help="items per batch")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    labels = [mode if digits is None else f"{mode}({digits})" for mode, digits in MODES]
+
+    print("ns per call (parse + compute)")
+    print(f"{'operands':<11} {'op':<9}" + "".join(f"{label:>14}" for label in labels))
+    for shape in ("small ints", "decimals", "big ints"):
+        pairs = operands(shape, args.calls)
+        for op in OPS:
+            cells = [per_call_ns(mode_function(op, mode, digits), pairs) for mode, digits in MODES]
+            print(f"{shape:<11} {op:<9}" + "".join(f"{cell:>14,.0f}" for cell in cells))
+
+    print(f"\n/batch of {args.batch:,} mixed items (decimals)")
+    pairs = operands("decimals", args.batch)
+    items = [(OPS[i % 4], a, b) for i, (a, b) in enumerate(pairs)]
+    for (mode, digits), label in zip(MODES, labels):
+        start = time.perf_counter()
+        if mode == "float":
+            evaluate_batch(items)
+        else:
+            evaluate_exact_batch(items, mode, digits)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<14} {elapsed * 1000:9.2f} ms  {args.batch / elapsed:12,.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
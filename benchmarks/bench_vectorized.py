@@ -0,0 +1,78 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/bench_vectorized.py
+# ----------------------------------------------------------
+# Description:
+# Compares the scalar loop over app/operations.py with the
+# NumPy kernel in app/vectorized.py for mixed batches of
+# 1e3 to 1e7 operations.
+#
+# Usage:
+#   python -m benchmarks.bench_vectorized [--max-scalar 1000000]
+# ----------------------------------------------------------
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from app.batch import OPERATIONS
+from app.vectorized import OP_CODES, evaluate_columns
+
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+
+def make_columns(size: int, seed: int = 9):
+    """Build deterministic mixed op-code and operand columns."""
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, len(OP_CODES), size=size, dtype=np.int8)
+    a = rng.uniform(-1000, 1000, size=size)
+    b = rng.uniform(-1000, 1000, size=size)
+    b[::97] = 0.0  # sprinkle divide-by-zero rows
+    return codes, a, b
+
+
+def scalar_loop(codes, a, b):
+    """Reference path: one app/operations.py call per row."""
+    funcs = [OPERATIONS[name] for name in sorted(OP_CODES, key=OP_CODES.get)]
+    results = []
+    for code, x, y in zip(codes.tolist(), a.tolist(), b.tolist()):
+        try:
+            results.append(funcs[code](x, y))
+        except ValueError:
+            results.append(None)
+    return results
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized operation benchmark")
+    parser.add_argument("--max-scalar", type=int, default=10**6,
+                        help="largest size to run the (slow) scalar loop for")
+    args = parser.parse_args()
+
+    # Keep the handlers out of the measurement; records are still created.
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'size':>10} {'scalar (s)':>12} {'vector (s)':>12} {'speedup':>9} {'vector rows/s':>15}")
+    for size in SIZES:
+        codes, a, b = make_columns(size)
+        vector = timed(evaluate_columns, codes, a, b)
+        if size <= args.max_scalar:
+            scalar = timed(scalar_loop, codes, a, b)
+            scalar_text, speedup = f"{scalar:12.4f}", f"{scalar / vector:8.1f}x"
+        else:
+            scalar_text, speedup = f"{'skipped':>12}", f"{'-':>9}"
+        print(f"{size:>10} {scalar_text} {vector:12.4f} {speedup} {size / vector:15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
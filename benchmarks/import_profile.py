@@ -0,0 +1,149 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/import_profile.py
+# ----------------------------------------------------------
+# Description:
+# Cold-start profile of the app: where `import main` spends
+# its time (from `python -X importtime`) and how long a fresh
+# interpreter takes to import the app, run the lifespan
+# startup and finish the /ready warm-up.
+#
+# Every round runs in a new interpreter, so nothing is
+# cached in sys.modules; the best round is kept. The report
+# lists the slowest modules by their own import time and the
+# cumulative time per top-level package.
+#
+# Usage:
+#   python -m benchmarks.import_profile [--rounds 5] [--top 20] [--module main] [--json]
+# ----------------------------------------------------------
+
+import argparse
+import collections
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Imports the app, runs the lifespan startup, then waits for /ready's warm-up
+STARTUP_SCRIPT = """
+import asyncio, json, time
+t0 = time.perf_counter()
+from main import app
+t1 = time.perf_counter()
+
+async def start():
+    async with app.router.lifespan_context(app):
+        t2 = time.perf_counter()
+        while not app.state.readiness.ready:
+            await asyncio.sleep(0.001)
+        t3 = time.perf_counter()
+    print(json.dumps({"import_ms": (t1 - t0) * 1e3, "lifespan_ms": (t2 - t1) * 1e3,
+                      "warmup_ms": (t3 - t2) * 1e3}))
+
+asyncio.run(start())
+"""
+
+
+class ImportRecord(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _env() -> Dict[str, str]:
+    env = {key: value for key, value in os.environ.items() if key != "DATABASE_URL"}
+    env["CALC_LOG_MODE"] = "off"
+    return env
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse `-X importtime` output into records (depth 0 = imported by the target)."""
+    records = []
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def profile_imports(module: str = "main", rounds: int = 5) -> List[ImportRecord]:
+    """The importtime records of the fastest of `rounds` cold imports of module."""
+    best: List[ImportRecord] = []
+    for _ in range(rounds):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True, cwd=ROOT, env=_env(), check=True)
+        records = parse_importtime(result.stderr)
+        if not best or _total(records, module) < _total(best, module):
+            best = records
+    return best
+
+
+def _total(records: List[ImportRecord], module: str) -> int:
+    return next((r.cumulative_us for r in records if r.name == module), sum(r.self_us for r in records))
+
+
+def by_package(records: List[ImportRecord]) -> Dict[str, int]:
+    """Self time summed per top-level package, in microseconds."""
+    totals: Dict[str, int] = collections.Counter()
+    for record in records:
+        totals[record.name.split(".", 1)[0]] += record.self_us
+    return dict(totals)
+
+
+def measure_startup(rounds: int = 5) -> Dict[str, float]:
+    """Best-of-rounds cold start: process spawn to ready, and its import / lifespan / warm-up parts."""
+    best: Dict[str, float] = {}
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], capture_output=True, text=True,
+                                cwd=ROOT, env=_env(), check=True)
+        total_ms = (time.perf_counter() - start) * 1e3
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        timings["ready_ms"] = total_ms
+        if not best or total_ms < best["ready_ms"]:
+            best = timings
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time and cold-start profile")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    records = profile_imports(args.module, args.rounds)
+    packages = by_package(records)
+    startup = measure_startup(args.rounds) if args.module == "main" else {}
+    if args.json:
+        print(json.dumps({"import_us": _total(records, args.module), "packages_us": packages,
+                          "modules": [r._asdict() for r in records], "startup_ms": startup}, indent=2))
+        return
+
+    print(f"import {args.module}: {_total(records, args.module) / 1e3:,.1f} ms "
+          f"({len(records)} modules, best of {args.rounds})\n")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for record in sorted(records, key=lambda r: r.self_us, reverse=True)[:args.top]:
+        print(f"{record.self_us / 1e3:9.1f} {record.cumulative_us / 1e3:9.1f}  {record.name}")
+    print(f"\n{'self ms':>9}  package")
+    for name, total in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{total / 1e3:9.1f}  {name}")
+    if startup:
+        print(f"\ncold start to ready: {startup['ready_ms']:,.0f} ms (import {startup['import_ms']:,.0f}, "
+              f"lifespan {startup['lifespan_ms']:,.0f}, warm-up {startup['warmup_ms']:,.0f}; "
+              f"the rest is interpreter start-up)")
+
+
+if __name__ == "__main__":
+    main()
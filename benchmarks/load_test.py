@@ -0,0 +1,116 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/load_test.py
+# ----------------------------------------------------------
+# Description:
+# Multi-core scaling test for `python cli.py serve`.
+#
+# For each worker count the server is started as a real
+# subprocess, then several client processes hammer POST /add
+# over keep-alive HTTP connections for a fixed duration.
+# Throughput at N workers is compared with 1 worker; on a
+# box with N free cores the speedup should be close to N.
+# Client processes need CPU too, so give the test twice as
+# many cores as the largest worker count for clean numbers.
+#
+# Usage:
+#   python -m benchmarks.load_test [--workers 1,2,4] [--clients 8] [--duration 10]
+# ----------------------------------------------------------
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BODY = json.dumps({"a": 6, "b": 7}).encode()
+HEADERS = {"Content-Type": "application/json"}
+
+
+def start_server(workers: int, port: int, extra_env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """Launch cli.py serve and wait until /health answers."""
+    env = dict(os.environ, CALC_LOG_MODE="off", CALC_CACHE_SIZE="0", **(extra_env or {}))
+    env.pop("DATABASE_URL", None)  # measure the request path, not the database
+    process = subprocess.Popen(
+        [sys.executable, "cli.py", "serve", "--workers", str(workers),
+         "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                time.sleep(1.0)  # let every worker finish booting
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Server with {workers} workers did not start.")
+
+
+def client(port: int, duration: float, counter) -> None:
+    """One keep-alive connection sending POST /add until duration expires."""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    done = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        conn.request("POST", "/add", body=BODY, headers=HEADERS)
+        response = conn.getresponse()
+        response.read()
+        if response.status == 200:
+            done += 1
+    conn.close()
+    with counter.get_lock():
+        counter.value += done
+
+
+def measure(workers: int, clients: int, duration: float, port: int) -> float:
+    """Requests per second against a server with the given worker count."""
+    server = start_server(workers, port)
+    try:
+        counter = multiprocessing.Value("q", 0)
+        processes = [multiprocessing.Process(target=client, args=(port, duration, counter))
+                     for _ in range(clients)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        return counter.value / (time.perf_counter() - start)
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Worker-count scaling load test")
+    cores = os.cpu_count() or 1
+    default_workers = ",".join(str(n) for n in (1, 2, 4, 8, 16) if n <= cores) or "1"
+    parser.add_argument("--workers", default=default_workers, help="Comma-separated worker counts")
+    parser.add_argument("--clients", type=int, default=max(8, 2 * cores), help="Client processes")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    counts: List[int] = [int(value) for value in args.workers.split(",")]
+    print(f"{cores} CPUs, {args.clients} client processes, {args.duration:.0f}s per run")
+    baseline = None
+    for workers in counts:
+        rate = measure(workers, args.clients, args.duration, args.port)
+        baseline = baseline or rate
+        print(f"workers={workers:<3} {rate:>10,.0f} req/s   speedup {rate / baseline:4.2f}x   "
+              f"efficiency {rate / baseline / workers:4.0%}")
+
+
+if __name__ == "__main__":
+    main()
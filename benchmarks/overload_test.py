@@ -0,0 +1,160 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/overload_test.py
+# ----------------------------------------------------------
+# Description:
+# Overload test for the load-shedding middleware in
+# app/ratelimit.py.
+#
+# A one-worker `python cli.py serve` is started twice: once
+# without admission control and once with
+# CALC_CONCURRENCY_LIMIT / CALC_QUEUE_TARGET_MS set. For each
+# run the capacity is measured with a closed loop, then an
+# open-loop client offers `--overload` times that rate. The
+# latency of each request is taken from its scheduled send
+# time (no coordinated omission), and p50 / p99 are reported
+# for the admitted (200) requests, next to the shed (503)
+# share.
+#
+# Requests are /batch calls of `--items` operations, so the
+# server does far more work per request than the client.
+#
+# Usage:
+#   python -m benchmarks.overload_test [--items 200] [--duration 10] [--overload 2]
+# ----------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from benchmarks.load_test import start_server
+
+HOST = "127.0.0.1"
+MAX_CONNECTIONS = 1024
+
+
+def build_request(items: int) -> bytes:
+    body = json.dumps({"operations": [{"op": "add", "a": i, "b": 1} for i in range(items)]}).encode()
+    head = (f"POST /batch HTTP/1.1\r\nHost: {HOST}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode()
+    return head + body
+
+
+async def exchange(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: bytes) -> int:
+    """Send one request on a keep-alive connection; return the status code."""
+    writer.write(request)
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    length = next((int(line.split(":", 1)[1]) for line in lines if line.lower().startswith("content-length")), 0)
+    await reader.readexactly(length)
+    return int(lines[0].split(" ", 2)[1])
+
+
+async def closed_loop(port: int, request: bytes, connections: int, duration: float) -> float:
+    """Capacity in requests/s: each connection sends its next request as soon as one completes."""
+    done = 0
+    deadline = time.monotonic() + duration
+
+    async def worker() -> None:
+        nonlocal done
+        reader, writer = await asyncio.open_connection(HOST, port)
+        while time.monotonic() < deadline:
+            if await exchange(reader, writer, request) == 200:
+                done += 1
+        writer.close()
+
+    start = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    return done / (time.monotonic() - start)
+
+
+async def open_loop(port: int, request: bytes, rate: float, duration: float) -> Tuple[Counter, List[float]]:
+    """Offer `rate` requests/s regardless of how fast responses come back."""
+    idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+    statuses: Counter = Counter()
+    latencies: List[float] = []
+    open_connections = 0
+
+    async def one(scheduled: float) -> None:
+        nonlocal open_connections
+        if idle:
+            conn = idle.pop()
+        elif open_connections < MAX_CONNECTIONS:
+            open_connections += 1
+            conn = await asyncio.open_connection(HOST, port)
+        else:
+            statuses["client-saturated"] += 1
+            return
+        try:
+            status = await exchange(*conn, request)
+        except (OSError, asyncio.IncompleteReadError):
+            statuses["error"] += 1
+            open_connections -= 1
+            return
+        statuses[status] += 1
+        if status == 200:
+            latencies.append(time.monotonic() - scheduled)
+        idle.append(conn)
+
+    tasks = []
+    start = time.monotonic()
+    total = int(rate * duration)
+    for n in range(total):
+        scheduled = start + n / rate
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(one(scheduled)))
+    await asyncio.gather(*tasks)
+    for _, writer in idle:
+        writer.close()
+    return statuses, latencies
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def run(label: str, env: Dict[str, str], args: argparse.Namespace, request: bytes) -> None:
+    server = start_server(1, args.port, env)
+    try:
+        capacity = asyncio.run(closed_loop(args.port, request, 4, args.duration / 2))
+        offered = capacity * args.overload
+        statuses, latencies = asyncio.run(open_loop(args.port, request, offered, args.duration))
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+    total = sum(statuses.values())
+    print(f"{label:<14} capacity {capacity:7,.0f}/s  offered {offered:7,.0f}/s  "
+          f"ok {statuses[200] / total:5.1%}  shed {statuses[503] / total:5.1%}  "
+          f"other {1 - (statuses[200] + statuses[503]) / total:5.1%}  "
+          f"goodput {statuses[200] / args.duration:7,.0f}/s  "
+          f"p50 {percentile(latencies, 50) * 1000:8.1f} ms  p99 {percentile(latencies, 99) * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="p99 of admitted requests under overload")
+    parser.add_argument("--items", type=int, default=200, help="operations per /batch request")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of overload per run")
+    parser.add_argument("--overload", type=float, default=2.0, help="offered load as a multiple of capacity")
+    parser.add_argument("--limit", type=int, default=8, help="CALC_CONCURRENCY_LIMIT for the shedding run")
+    parser.add_argument("--queue-target-ms", type=float, default=50.0)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    request = build_request(args.items)
+    run("no shedding", {}, args, request)
+    run("shedding", {"CALC_CONCURRENCY_LIMIT": str(args.limit),
+                     "CALC_QUEUE_TARGET_MS": str(args.queue_target_ms)}, args, request)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/suite.py
+# ----------------------------------------------------------
+# Description:
+# Reproducible benchmark suite for the FastAPI Calculator.
+#
+# Measures:
+#   ops.*    raw app/operations.py throughput (calls/sec)
+#   kernel.* vectorized batch kernel throughput (rows/sec)
+#   asgi.*   in-process request throughput and latency
+#            percentiles per route, via httpx's ASGI transport
+#            (no network, no uvicorn)
+#   startup.* cold start of a fresh interpreter: import
+#            time and time until /ready (see import_profile)
+#
+# Results are stored as JSON together with the git commit so
+# two runs can be compared automatically.
+#
+# Usage:
+#   python -m benchmarks.suite run [--quick] [--output FILE] [--fast-path]
+#   python -m benchmarks.suite compare BASE.json NEW.json [--threshold 0.10]
+# ----------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Higher is better for these metrics; the rest (latencies) are lower-is-better
+THROUGHPUT_KEYS = ("ops_per_sec", "rows_per_sec", "requests_per_sec")
+
+
+# ----------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """Summarise per-request latencies (seconds) in milliseconds."""
+    return {
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p90_ms": percentile(samples, 90) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def best_of(repeats: int, func: Callable[[], float]) -> float:
+    """Run a timed function several times and keep the fastest run."""
+    return min(func() for _ in range(repeats))
+
+
+# ----------------------------------------------------------
+# Benchmarks: operations layer
+# ----------------------------------------------------------
+def bench_operations(calls: int, repeats: int) -> Dict[str, Dict[str, float]]:
+    from app.operations import add, subtract, multiply, divide
+
+    results = {}
+    for name, func in (("add", add), ("subtract", subtract), ("multiply", multiply), ("divide", divide)):
+        def run() -> float:
+            start = time.perf_counter()
+            for i in range(1, calls + 1):
+                func(i, 3.5)
+            return time.perf_counter() - start
+        elapsed = best_of(repeats, run)
+        results[f"ops.{name}"] = {"ops_per_sec": calls / elapsed}
+    return results
+
+
+def bench_kernel(rows: int, repeats: int) -> Dict[str, Dict[str, float]]:
+    from benchmarks.bench_vectorized import make_columns
+    from app.vectorized import evaluate_columns
+
+    codes, a, b = make_columns(rows)
+
+    def run() -> float:
+        start = time.perf_counter()
+        evaluate_columns(codes, a, b)
+        return time.perf_counter() - start
+
+    return {"kernel.evaluate_columns": {"rows_per_sec": rows / best_of(repeats, run)}}
+
+
+# ----------------------------------------------------------
+# Benchmarks: in-process ASGI
+# ----------------------------------------------------------
+async def _bench_asgi(requests: int, batch_size: int, repeats: int) -> Dict[str, Dict[str, float]]:
+    import httpx
+    from main import app
+
+    results: Dict[str, Dict[str, float]] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            routes: Dict[str, Callable[[int], Any]] = {
+                route: (lambda i: {"a": i, "b": 3.5})
+                for route in ("/add", "/subtract", "/multiply", "/divide")
+            }
+            routes["/batch"] = lambda i: {"operations": [
+                {"op": "add", "a": i + j, "b": 1.5} for j in range(batch_size)
+            ]}
+            for route, payload in routes.items():
+                for i in range(min(50, requests)):  # warm-up
+                    await client.post(route, json=payload(-i))
+                rounds = []
+                for round_no in range(repeats):
+                    samples = []
+                    start = time.perf_counter()
+                    for i in range(requests):
+                        body = payload(round_no * requests + i + 1)  # distinct operands → no cache hits
+                        t0 = time.perf_counter()
+                        response = await client.post(route, json=body)
+                        samples.append(time.perf_counter() - t0)
+                        response.raise_for_status()
+                    rounds.append((time.perf_counter() - start, samples))
+                elapsed, samples = min(rounds, key=lambda r: r[0])  # best round
+                entry = {"requests_per_sec": requests / elapsed, **latency_summary(samples)}
+                if route == "/batch":
+                    entry["rows_per_sec"] = requests * batch_size / elapsed
+                results[f"asgi.{route.strip('/')}"] = entry
+    return results
+
+
+def bench_asgi(requests: int, batch_size: int, repeats: int) -> Dict[str, Dict[str, float]]:
+    return asyncio.run(_bench_asgi(requests, batch_size, repeats))
+
+
+# ----------------------------------------------------------
+# Benchmarks: cold start
+# ----------------------------------------------------------
+def bench_startup(rounds: int) -> Dict[str, Dict[str, float]]:
+    from benchmarks.import_profile import measure_startup
+
+    timings = measure_startup(rounds)
+    return {"startup.cold": {"import_ms": timings["import_ms"], "ready_ms": timings["ready_ms"]}}
+
+
+# ----------------------------------------------------------
+# Commands
+# ----------------------------------------------------------
+def run_suite(args: argparse.Namespace) -> None:
+    # Benchmark the compute path only: no database writer, quiet logs.
+    os.environ.pop("DATABASE_URL", None)
+    os.environ["CALC_LOG_MODE"] = args.log_mode
+    os.environ["CALC_FAST_PATH"] = "1" if args.fast_path else "0"
+    from app.logging_config import set_log_mode
+    set_log_mode(args.log_mode, 100)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    scale = 10 if args.quick else 1
+    results: Dict[str, Dict[str, float]] = {}
+    results.update(bench_operations(200_000 // scale, repeats=3))
+    results.update(bench_kernel(1_000_000 // scale, repeats=3))
+    results.update(bench_asgi(2_000 // scale, batch_size=1_000, repeats=3))
+    results.update(bench_startup(rounds=1 if args.quick else 3))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": args.quick,
+            "log_mode": args.log_mode,
+            "fast_path": args.fast_path,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+
+    for name, metrics in sorted(results.items()):
+        print(f"{name:28} " + "  ".join(f"{k}={v:,.2f}" for k, v in sorted(metrics.items())))
+    print(f"\nSaved {output}")
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Print per-metric changes and return 1 if any metric regressed past the threshold."""
+    with open(args.base, encoding="utf-8") as handle:
+        base = json.load(handle)
+    with open(args.new, encoding="utf-8") as handle:
+        new = json.load(handle)
+
+    print(f"base {base['meta']['commit']} → new {new['meta']['commit']}")
+    regressions = 0
+    for name in sorted(set(base["results"]) & set(new["results"])):
+        for metric, old_value in sorted(base["results"][name].items()):
+            new_value = new["results"][name].get(metric)
+            if new_value is None or not old_value:
+                continue
+            change = (new_value - old_value) / old_value
+            worse = -change if metric in THROUGHPUT_KEYS else change
+            flag = "REGRESSION" if worse > args.threshold else ""
+            regressions += bool(flag)
+            print(f"{name:28} {metric:18} {old_value:14,.2f} → {new_value:14,.2f} {change:+8.1%} {flag}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FastAPI Calculator benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and store results as JSON")
+    run.add_argument("--quick", action="store_true", help="10x fewer iterations")
+    run.add_argument("--output", default=None, help="result file (default: benchmarks/results/<commit>.json)")
+    run.add_argument("--log-mode", default="off", choices=("off", "sampled", "full"))
+    run.add_argument("--fast-path", action="store_true", help="serve arithmetic routes via app/fastpath.py")
+
+    cmp_ = sub.add_parser("compare", help="compare two result files")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--threshold", type=float, default=0.10,
+                      help="relative change counted as a regression (default 0.10)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run_suite(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: benchmarks/ws_latency_test.py
+# ----------------------------------------------------------
+# Description:
+# Per-calculation latency and throughput of the REST routes
+# versus the /ws WebSocket channel (app/websocket.py).
+#
+# A one-worker `python cli.py serve` is started and driven
+# from one client connection in four modes:
+#
+#   rest          POST /add on a keep-alive connection, one
+#                 request at a time
+#   ws            one JSON text frame at a time
+#   ws-pipelined  JSON text frames with `--window` requests
+#                 in flight
+#   ws-binary     packed binary frames of `--records`
+#                 records (21 bytes each), one frame in flight
+#
+# Latency is the round trip of one request (for ws-binary:
+# of one frame, and per record the frame time divided by the
+# record count). Needs the `websockets` package, which
+# uvicorn also uses to serve /ws.
+#
+# Usage:
+#   python -m benchmarks.ws_latency_test [--requests 5000] [--window 64] [--records 1000]
+# ----------------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Tuple
+
+import numpy as np
+import websockets
+
+from app.websocket import REQUEST_RECORD
+from benchmarks.load_test import start_server
+from benchmarks.overload_test import HOST, exchange, percentile
+
+
+async def rest(port: int, requests: int) -> Tuple[float, List[float]]:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    latencies = []
+    start = time.perf_counter()
+    for i in range(requests):
+        body = json.dumps({"a": i, "b": 1}).encode()
+        request = (f"POST /add HTTP/1.1\r\nHost: {HOST}\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+        sent = time.perf_counter()
+        await exchange(reader, writer, request)
+        latencies.append(time.perf_counter() - sent)
+    elapsed = time.perf_counter() - start
+    writer.close()
+    return requests / elapsed, latencies
+
+
+async def ws_sequential(port: int, requests: int) -> Tuple[float, List[float]]:
+    latencies = []
+    async with websockets.connect(f"ws://{HOST}:{port}/ws") as ws:
+        start = time.perf_counter()
+        for i in range(requests):
+            sent = time.perf_counter()
+            await ws.send(json.dumps({"id": i, "op": "add", "a": i, "b": 1}))
+            await ws.recv()
+            latencies.append(time.perf_counter() - sent)
+        elapsed = time.perf_counter() - start
+    return requests / elapsed, latencies
+
+
+async def ws_pipelined(port: int, requests: int, window: int) -> Tuple[float, List[float]]:
+    sent_at = [0.0] * requests
+    latencies: List[float] = []
+    async with websockets.connect(f"ws://{HOST}:{port}/ws") as ws:
+        credits = asyncio.Semaphore(window)
+
+        async def produce() -> None:
+            for i in range(requests):
+                await credits.acquire()
+                sent_at[i] = time.perf_counter()
+                await ws.send(json.dumps({"id": i, "op": "add", "a": i, "b": 1}))
+
+        start = time.perf_counter()
+        producer = asyncio.ensure_future(produce())
+        for _ in range(requests):
+            reply = json.loads(await ws.recv())
+            latencies.append(time.perf_counter() - sent_at[reply["id"]])
+            credits.release()
+        await producer
+        elapsed = time.perf_counter() - start
+    return requests / elapsed, latencies
+
+
+async def ws_binary(port: int, requests: int, records: int) -> Tuple[float, List[float]]:
+    frames = max(1, requests // records)
+    batch = np.zeros(records, dtype=REQUEST_RECORD)
+    batch["id"] = np.arange(records)
+    batch["a"] = np.arange(records)
+    batch["b"] = 1.0
+    payload = batch.tobytes()
+    latencies = []
+    async with websockets.connect(f"ws://{HOST}:{port}/ws") as ws:
+        start = time.perf_counter()
+        for _ in range(frames):
+            sent = time.perf_counter()
+            await ws.send(payload)
+            await ws.recv()
+            latencies.append((time.perf_counter() - sent) / records)
+        elapsed = time.perf_counter() - start
+    return frames * records / elapsed, latencies
+
+
+def report(label: str, result: Tuple[float, List[float]]) -> None:
+    rate, latencies = result
+    print(f"{label:<14} {rate:12,.0f} calc/s  p50 {percentile(latencies, 50) * 1e6:8.1f} us  "
+          f"p99 {percentile(latencies, 99) * 1e6:8.1f} us")
+
+
+async def bench(args: argparse.Namespace) -> None:
+    await rest(args.port, 200)  # warm-up
+    report("rest", await rest(args.port, args.requests))
+    report("ws", await ws_sequential(args.port, args.requests))
+    report("ws-pipelined", await ws_pipelined(args.port, args.requests, args.window))
+    report("ws-binary", await ws_binary(args.port, args.requests * 20, args.records))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="REST vs WebSocket per-calculation latency")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--window", type=int, default=64, help="requests in flight for ws-pipelined")
+    parser.add_argument("--records", type=int, default=1000, help="records per ws-binary frame")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    server = start_server(1, args.port)
+    try:
+        asyncio.run(bench(args))
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: cli.py
+# ----------------------------------------------------------
+# Description:
+# Command-line entry point for offline work that does not
+# belong in the HTTP server (main.py).
+#
+# Usage:
+#   python cli.py bulk calculations.jsonl results.jsonl --workers 4
+#   python cli.py bulk history.csv results.csv
+#   python cli.py rebuild-stats --database-url postgresql://...
+#   python cli.py load --users 100000 --calculations 5000000 --seed 19
+#   python cli.py load --users-file users.csv --calculations-file calcs.csv
+#   python cli.py serve --workers 4 --port 8000
+# ----------------------------------------------------------
+
+import time
+
+import click
+
+from app.bulk import DEFAULT_CHUNK_SIZE, FORMATS, process_file
+from app.db import create_db_engine, init_db
+from app.loader import DEFAULT_BATCH_SIZE, DEFAULT_SEED, bulk_load
+from app.server import SERVERS, ServerOptions, gunicorn_argv, run as run_server, uvicorn_kwargs
+from app.stats import DEFAULT_REBUILD_CHUNK, rebuild_stats
+
+
+@click.group()
+def cli():
+    """FastAPI Calculator command-line tools."""
+
+
+# ----------------------------------------------------------
+# bulk: evaluate a JSONL/CSV calculation file
+# ----------------------------------------------------------
+@cli.command()
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output_path", type=click.Path(dir_okay=False, writable=True))
+@click.option("--workers", default=0, show_default=True,
+              help="Worker processes (0 = one per CPU, 1 = no pool).")
+@click.option("--chunk-size", default=DEFAULT_CHUNK_SIZE, show_default=True,
+              help="Rows sent to a worker at a time.")
+@click.option("--format", "fmt", type=click.Choice(FORMATS), default=None,
+              help="Input format (default: from file extension).")
+def bulk(input_path, output_path, workers, chunk_size, fmt):
+    """Evaluate every calculation in INPUT_PATH and write results to OUTPUT_PATH in order."""
+    try:
+        stats = process_file(input_path, output_path, workers=workers,
+                             chunk_size=chunk_size, fmt=fmt or "")
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(
+        f"Processed {stats.rows:,} rows ({stats.errors:,} errors) in "
+        f"{stats.seconds:.2f}s → {stats.rows_per_second:,.0f} rows/sec"
+    )
+
+
+# ----------------------------------------------------------
+# rebuild-stats: recompute the calculation_stats rollup
+# ----------------------------------------------------------
+@cli.command("rebuild-stats")
+@click.option("--database-url", envvar="DATABASE_URL", required=True,
+              help="Database to rebuild (default: $DATABASE_URL).")
+@click.option("--chunk-size", default=DEFAULT_REBUILD_CHUNK, show_default=True,
+              help="Calculation ids aggregated per query.")
+def rebuild_stats_command(database_url, chunk_size):
+    """Recompute per-user statistics from the raw calculations table."""
+    engine = create_db_engine(database_url)
+    try:
+        init_db(engine)
+        start = time.perf_counter()
+        stats = rebuild_stats(engine, chunk_size)
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.dispose()
+    click.echo(
+        f"Rebuilt {stats.groups:,} user/operation rows from {stats.rows:,} calculations "
+        f"({stats.chunks:,} chunks) in {elapsed:.2f}s"
+    )
+
+
+# ----------------------------------------------------------
+# load: bulk-load users / calculations (COPY or batched INSERT)
+# ----------------------------------------------------------
+@cli.command()
+@click.option("--database-url", envvar="DATABASE_URL", required=True,
+              help="Database to load (default: $DATABASE_URL).")
+@click.option("--users", "users_count", default=0, show_default=True, help="Synthetic users to generate.")
+@click.option("--calculations", "calculations_count", default=0, show_default=True,
+              help="Synthetic calculations to generate.")
+@click.option("--users-file", type=click.Path(exists=True, dir_okay=False),
+              help="CSV of users (header: table column names) instead of --users.")
+@click.option("--calculations-file", type=click.Path(exists=True, dir_okay=False),
+              help="CSV of calculations (header: table column names) instead of --calculations.")
+@click.option("--seed", default=DEFAULT_SEED, show_default=True, help="Seed for synthetic rows.")
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True,
+              help="Rows per INSERT batch / COPY chunk.")
+@click.option("--defer/--no-defer", default=True, show_default=True,
+              help="Rebuild indexes after loading into an empty table.")
+@click.option("--rebuild/--no-rebuild", "rebuild", default=True, show_default=True,
+              help="Rebuild the calculation_stats rollup afterwards.")
+def load(database_url, users_count, calculations_count, users_file, calculations_file, seed, batch_size,
+         defer, rebuild):
+    """Bulk-load generated or CSV rows into the users and calculations tables."""
+    engine = create_db_engine(database_url)
+    try:
+        init_db(engine)
+        results = bulk_load(engine, users_count, calculations_count, users_file, calculations_file,
+                            seed=seed, batch_size=batch_size, defer=defer)
+        for stats in results:
+            deferred = f", rebuilt {len(stats.deferred)} indexes" if stats.deferred else ""
+            click.echo(f"Loaded {stats.rows:,} {stats.table} rows via {stats.method} in "
+                       f"{stats.seconds:.2f}s → {stats.rows_per_second:,.0f} rows/sec{deferred}")
+        if rebuild and any(stats.table == "calculations" for stats in results):
+            summary = rebuild_stats(engine)
+            click.echo(f"Rebuilt {summary.groups:,} user/operation stats rows")
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+    finally:
+        engine.dispose()
+
+
+# ----------------------------------------------------------
+# serve: production server with one worker per CPU
+# ----------------------------------------------------------
+@cli.command()
+@click.option("--host", default="0.0.0.0", show_default=True)
+@click.option("--port", default=8000, show_default=True)
+@click.option("--workers", default=0, show_default=True,
+              help="Worker processes (0 = one per CPU, or $CALC_WORKERS).")
+@click.option("--server", type=click.Choice(SERVERS), default="auto", show_default=True,
+              help="Process manager (auto = gunicorn with --preload when installed).")
+@click.option("--loop", type=click.Choice(["auto", "uvloop", "asyncio"]), default="auto", show_default=True)
+@click.option("--http", type=click.Choice(["auto", "httptools", "h11"]), default="auto", show_default=True)
+@click.option("--graceful-timeout", default=30, show_default=True,
+              help="Seconds to finish in-flight requests on shutdown or reload.")
+@click.option("--keep-alive", default=5, show_default=True, help="Idle keep-alive timeout (seconds).")
+@click.option("--backlog", default=2048, show_default=True, help="Listen socket backlog.")
+@click.option("--max-requests", default=0, show_default=True,
+              help="Recycle a gunicorn worker after N requests (0 = never).")
+@click.option("--dry-run", is_flag=True, help="Print the resolved configuration and exit.")
+def serve(host, port, workers, server, loop, http, graceful_timeout, keep_alive, backlog,
+          max_requests, dry_run):
+    """Run the API with multiple worker processes for production."""
+    options = ServerOptions(
+        host=host, port=port, workers=workers, server=server, loop=loop, http=http,
+        graceful_timeout=graceful_timeout, keep_alive=keep_alive, backlog=backlog,
+        max_requests=max_requests,
+    ).resolved()
+    if dry_run:
+        if options.server == "gunicorn":
+            click.echo(" ".join(gunicorn_argv(options)))
+        else:
+            settings = " ".join(f"{key}={value}" for key, value in uvicorn_kwargs(options).items())
+            click.echo(f"uvicorn main:app {settings}")
+        return
+    try:
+        run_server(options)
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc))
+
+
+if __name__ == "__main__":
+    cli()
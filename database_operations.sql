@@ -92,3 +92,41 @@ WHERE id = 2;
 
 -- Verify deletion
 SELECT * FROM calculations;
+
+
+-- ==========================================================
+-- (F) HISTORY INDEXES AND KEYSET PAGINATION
+-- ==========================================================
+-- Same indexes as migrations/versions/0001 (alembic upgrade head).
+
+CREATE INDEX IF NOT EXISTS ix_calculations_user_id_timestamp
+    ON calculations (user_id, timestamp, id);
+
+CREATE INDEX IF NOT EXISTS ix_calculations_operation_timestamp
+    ON calculations (operation, timestamp, id);
+
+-- First page of a user's history, newest first
+SELECT * FROM calculations
+WHERE user_id = 1
+ORDER BY timestamp DESC, id DESC
+LIMIT 50;
+
+-- Next page: continue after the last row of the previous page
+-- (its timestamp and id) instead of using OFFSET
+SELECT * FROM calculations
+WHERE user_id = 1
+  AND (timestamp, id) < ('2025-11-03 12:00:00', 42)
+ORDER BY timestamp DESC, id DESC
+LIMIT 50;
+
+
+-- ==========================================================
+-- (G) PER-USER STATISTICS ROLLUP
+-- ==========================================================
+-- Maintained by the app on every write (migrations/versions/0002);
+-- mean = total / count.
+
+SELECT operation, count, total, min_result, max_result,
+       total / count AS mean_result
+FROM calculation_stats
+WHERE user_id = 1;
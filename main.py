@@ -11,28 +11,178 @@
 # Includes logging, error handling, and health monitoring.
 # ----------------------------------------------------------
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from datetime import datetime
+from fastapi import FastAPI, Header, HTTPException, Query, Request, WebSocket
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, StrictFloat, StrictInt, StrictStr
+from typing import Dict, List, Literal, Optional, Union
+import asyncio
+import hmac
 import logging
 from app.operations import add, subtract, multiply, divide
+from app.batch import MAX_BATCH_SIZE, evaluate_batch
+from app.binary import install_binary_routes
+from app.cache import ResultCache
+from app.compression import CompressionMiddleware
+from app.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, get_settings
+from app.expressions import ExpressionError, compile_expression, evaluate, evaluate_many
+from app.fastpath import install_fast_routes
+from app.http_cache import CachedTemplate
+from app.idempotency import IdempotencyMiddleware, IdempotencyStore
+from app.jobs import MAX_JOB_BYTES, MAX_WAIT, JobQueue, JobQueueFull, job_kind, read_limited
+from app.logging_config import configure_logging, should_log
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, monitor_event_loop, registry
+from app.profiling import Profiler, ProfilingMiddleware, mark
+from app.precision import (
+    DEFAULT_DIGITS, MAX_DIGITS, PrecisionError, evaluate_exact, evaluate_exact_batch, format_exact, to_float,
+)
+from app.ratelimit import (
+    ConcurrencyLimiter, LoadSheddingMiddleware, RateLimiter, RoutePolicy, client_id, parse_route_policies,
+)
+from app.readiness import Readiness, start_warm_up
+from app.streaming import NDJSONStreamingResponse, stream_calculations
+from app.websocket import CalculationChannel, ChannelStats, serve_channel
 
 # ----------------------------------------------------------
-# Setup Logging
+# Setup Logging (queue-backed; mode set via CALC_LOG_MODE)
 # ----------------------------------------------------------
-logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+settings = get_settings()
+configure_logging(settings.log_mode, settings.log_sample_rate)
 logger = logging.getLogger(__name__)
 
+
+# ----------------------------------------------------------
+# Application Lifespan (database engine + background writer)
+# ----------------------------------------------------------
+# SQLAlchemy and Jinja2 are imported on first use (a configured
+# DATABASE_URL, the first history query, the homepage warm-up),
+# keeping them out of the import path of a cold start.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the DB pool, writer and result cache at startup; drain them at shutdown."""
+    startup_settings = get_settings()
+    app.state.readiness = readiness = Readiness()
+    app.state.settings = startup_settings
+    app.state.calc_writer = None
+    app.state.result_cache = None
+    app.state.idempotency = None
+    app.state.rate_limiter = None
+    app.state.concurrency_limiter = None
+    app.state.database = database = None
+    app.state.ws_stats = ChannelStats()
+    app.state.jobs = None
+    app.state.profiler = None
+    lag_monitor = asyncio.create_task(monitor_event_loop(registry))
+
+    if startup_settings.cache_size > 0:
+        app.state.result_cache = ResultCache(startup_settings.cache_size, startup_settings.cache_ttl)
+
+    if startup_settings.idempotency_size > 0:
+        app.state.idempotency = IdempotencyStore(startup_settings.idempotency_size,
+                                                 startup_settings.idempotency_ttl)
+
+    try:
+        route_policies = parse_route_policies(startup_settings.rate_limit_routes)
+    except ValueError as exc:
+        logger.error("Ignoring CALC_RATE_LIMIT_ROUTES: %s", exc)
+        route_policies = {}
+    if startup_settings.rate_limit > 0 or route_policies:
+        default_policy = RoutePolicy(max(0.0, startup_settings.rate_limit), max(0, startup_settings.rate_burst))
+        app.state.rate_limiter = RateLimiter(default_policy, route_policies)
+    if startup_settings.concurrency_limit > 0:
+        app.state.concurrency_limiter = ConcurrencyLimiter(
+            startup_settings.concurrency_limit, queue_target=startup_settings.queue_target_ms / 1000,
+        )
+        app.state.concurrency_limiter.start()
+    if startup_settings.profile_sample_rate > 0 or startup_settings.profile_slow_ms > 0:
+        app.state.profiler = Profiler(startup_settings.profile_sample_rate, startup_settings.profile_slow_ms,
+                                      startup_settings.profile_buffer)
+        app.state.profiler.start()
+    if startup_settings.job_queue_size > 0:
+        app.state.jobs = JobQueue(
+            workers=startup_settings.job_workers, processes=startup_settings.job_processes,
+            max_queued=startup_settings.job_queue_size, ttl=startup_settings.job_ttl,
+            max_queued_bytes=startup_settings.job_queue_bytes,
+        )
+        app.state.jobs.start()
+
+    if startup_settings.database_url:
+        from app.database import Database
+        from app.persistence import CalculationWriter
+
+        database = Database(
+            startup_settings.database_url,
+            pool_size=startup_settings.db_pool_size,
+            max_overflow=startup_settings.db_max_overflow,
+            pool_timeout=startup_settings.db_pool_timeout,
+            pool_recycle=startup_settings.db_pool_recycle,
+            prefer_async=startup_settings.db_async,
+        )
+        database.init_schema(default_user_id=startup_settings.default_user_id)
+        app.state.database = database
+        app.state.calc_writer = CalculationWriter(
+            database.engine,
+            batch_size=startup_settings.writer_batch_size,
+            flush_interval=startup_settings.writer_flush_interval,
+            max_queue=startup_settings.writer_queue_size,
+        )
+        app.state.calc_writer.start()
+        logger.info("Calculation persistence enabled (%s queries).", database.mode)
+
+    warm_steps = {"kernels": lambda: asyncio.to_thread(evaluate_batch, [("add", 1, 2), ("divide", 1, 0)]),
+                  "homepage": lambda: asyncio.to_thread(homepage.page)}
+    if database is not None:
+        warm_steps["database"] = lambda: database.warm(startup_settings.db_pool_size)
+    warmup = start_warm_up(readiness, warm_steps)
+
+    yield
+
+    readiness.stop()
+    warmup.cancel()
+    lag_monitor.cancel()
+    if app.state.jobs is not None:
+        app.state.jobs.stop()
+    if app.state.profiler is not None:
+        app.state.profiler.stop()
+    if app.state.concurrency_limiter is not None:
+        app.state.concurrency_limiter.stop()
+    if app.state.calc_writer is not None:
+        app.state.calc_writer.stop()
+        app.state.calc_writer = None
+    if database is not None:
+        await database.close()
+        app.state.database = None
+
+
 # ----------------------------------------------------------
 # Initialize FastAPI app and Jinja2 templates
 # ----------------------------------------------------------
 app = FastAPI(
     title="FastAPI Calculator with PostgreSQL",
     description="Assignment-9: Demonstrating SQL operations with FastAPI + pgAdmin + PostgreSQL",
+    lifespan=lifespan,
 )
-templates = Jinja2Templates(directory="templates")
+app.add_middleware(IdempotencyMiddleware)  # inside MetricsMiddleware, so replays are measured too
+if settings.compression:
+    # outside IdempotencyMiddleware: stored responses stay uncompressed, each replay is encoded per client
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+app.add_middleware(LoadSheddingMiddleware)  # rejects overload before idempotency or route work
+app.add_middleware(ProfilingMiddleware)  # pass-through unless CALC_PROFILE_* is set; sees queueing too
+app.add_middleware(MetricsMiddleware, registry=registry)
+install_binary_routes(app)  # application/octet-stream bodies for /batch; JSON falls through
+if settings.fast_path:
+    install_fast_routes(app)  # plain Starlette handlers ahead of the Pydantic routes
+
+
+def _templates():
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory="templates")
+
+
+homepage = CachedTemplate(_templates, "index.html")  # rendered once, served with ETag / Last-Modified
 
 
 # ----------------------------------------------------------
@@ -41,6 +191,49 @@ templates = Jinja2Templates(directory="templates")
 class OperationRequest(BaseModel):
     a: float = Field(..., description="First number")
     b: float = Field(..., description="Second number")
+    precision: Literal["float"] = Field("float", description="Arithmetic mode (decimal / fraction: exact)")
+
+
+class BatchItem(BaseModel):
+    op: str = Field(..., description="Operation name: add, subtract, multiply or divide")
+    a: float = Field(..., description="First number")
+    b: float = Field(..., description="Second number")
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchItem] = Field(..., description="Ordered list of operations to evaluate")
+    precision: Literal["float"] = Field("float", description="Arithmetic mode (decimal / fraction: exact)")
+
+
+# Exact operands keep the JSON value as sent: big ints, floats or numeric strings
+ExactOperand = Union[StrictInt, StrictFloat, StrictStr]
+
+
+class PreciseOperationRequest(BaseModel):
+    a: ExactOperand = Field(..., description="First number (JSON number or numeric string)")
+    b: ExactOperand = Field(..., description="Second number (JSON number or numeric string)")
+    precision: Literal["decimal", "fraction"] = Field(..., description="Exact arithmetic mode")
+    digits: int = Field(DEFAULT_DIGITS, ge=1, le=MAX_DIGITS, description="Significant digits (decimal mode)")
+
+
+class PreciseBatchItem(BaseModel):
+    op: str = Field(..., description="Operation name: add, subtract, multiply or divide")
+    a: ExactOperand = Field(..., description="First number (JSON number or numeric string)")
+    b: ExactOperand = Field(..., description="Second number (JSON number or numeric string)")
+
+
+class PreciseBatchRequest(BaseModel):
+    operations: List[PreciseBatchItem] = Field(..., description="Ordered list of operations to evaluate")
+    precision: Literal["decimal", "fraction"] = Field(..., description="Exact arithmetic mode")
+    digits: int = Field(DEFAULT_DIGITS, ge=1, le=MAX_DIGITS, description="Significant digits (decimal mode)")
+
+
+class EvaluateRequest(BaseModel):
+    expression: str = Field(..., description="Arithmetic expression, e.g. (a + b) * c / 2")
+    variables: Dict[str, float] = Field(default_factory=dict, description="Variable values for one evaluation")
+    bindings: Optional[List[Dict[str, float]]] = Field(
+        None, description="Many sets of variable values, evaluated in one vectorized call"
+    )
 
 
 # ----------------------------------------------------------
@@ -49,7 +242,8 @@ class OperationRequest(BaseModel):
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handles invalid input validation errors (422 → 400)."""
-    logger.error(f"Validation Error: {exc}")
+    logger.error("Validation Error: %s", exc)
+    registry.count_error("validation")
     return JSONResponse(
         status_code=400,
         content={"error": "Invalid or missing numeric input."},
@@ -59,64 +253,375 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handles unexpected server errors."""
-    logger.error(f"Unexpected Error: {exc}")
+    logger.error("Unexpected Error: %s", exc)
     return JSONResponse(status_code=400, content={"error": str(exc)})
 
 
+# ----------------------------------------------------------
+# Helper: Compute through the result cache (when enabled)
+# ----------------------------------------------------------
+def _compute(request: Request, operation: str, func, a: float, b: float) -> float:
+    """Return func(a, b), served from the result cache on repeated operands."""
+    mark("validate")  # FastAPI decoded and validated the body before the route ran
+    cache = getattr(request.app.state, "result_cache", None)
+    result = func(a, b) if cache is None else cache.get_or_compute(operation, a, b, func)
+    mark("compute")
+    return result
+
+
+# ----------------------------------------------------------
+# Helper: Queue a computed result for persistence
+# ----------------------------------------------------------
+def _persist(request: Request, operation: str, a: float, b: float, result: float,
+             user_id: Optional[int]) -> None:
+    """Hand the result to the background writer (no-op when no database is configured)."""
+    writer = getattr(request.app.state, "calc_writer", None)
+    if writer is not None:
+        writer.record(operation, a, b, result, user_id or request.app.state.settings.default_user_id)
+
+
+# ----------------------------------------------------------
+# Helper: Exact (decimal / fraction) calculation
+# ----------------------------------------------------------
+def _compute_exact(request: Request, operation: str, data: PreciseOperationRequest,
+                   user_id: Optional[int]):
+    """Compute in the requested precision mode; results are returned as strings."""
+    mark("validate")
+    try:
+        a, b, result = evaluate_exact(operation, data.a, data.b, data.precision, data.digits)
+        formatted = format_exact(result)
+        mark("compute")
+    except PrecisionError as exc:
+        logger.error("Precision error: %s", exc)
+        registry.count_error("validation")
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+    except ValueError as exc:
+        logger.error("Division error: %s", exc)
+        registry.count_error("divide_by_zero")
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+
+    stored = (to_float(a), to_float(b), to_float(result))
+    if None not in stored:  # the calculations table holds float approximations
+        _persist(request, operation, *stored, user_id)
+    if should_log():
+        logger.info("Exact %s performed (%s): %s, %s = %s", operation, data.precision, a, b, formatted)
+    return {"result": formatted, "precision": data.precision}
+
+
 # ----------------------------------------------------------
 # Arithmetic Routes (REST API)
 # ----------------------------------------------------------
 @app.post("/add")
-async def add_numbers(data: OperationRequest):
+async def add_numbers(data: Union[OperationRequest, PreciseOperationRequest], request: Request,
+                      x_user_id: Optional[int] = Header(None)):
     """Add two numbers."""
+    if data.precision != "float":
+        return _compute_exact(request, "add", data, x_user_id)
     try:
-        result = add(data.a, data.b)
-        logger.info(f"Addition performed: {data.a} + {data.b} = {result}")
+        result = _compute(request, "add", add, data.a, data.b)
+        _persist(request, "add", data.a, data.b, result, x_user_id)
         return {"result": result}
     except Exception as e:
-        logger.error(f"Addition error: {e}")
+        logger.error("Addition error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/subtract")
-async def subtract_numbers(data: OperationRequest):
+async def subtract_numbers(data: Union[OperationRequest, PreciseOperationRequest], request: Request,
+                           x_user_id: Optional[int] = Header(None)):
     """Subtract two numbers."""
+    if data.precision != "float":
+        return _compute_exact(request, "subtract", data, x_user_id)
     try:
-        result = subtract(data.a, data.b)
-        logger.info(f"Subtraction performed: {data.a} - {data.b} = {result}")
+        result = _compute(request, "subtract", subtract, data.a, data.b)
+        _persist(request, "subtract", data.a, data.b, result, x_user_id)
         return {"result": result}
     except Exception as e:
-        logger.error(f"Subtraction error: {e}")
+        logger.error("Subtraction error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/multiply")
-async def multiply_numbers(data: OperationRequest):
+async def multiply_numbers(data: Union[OperationRequest, PreciseOperationRequest], request: Request,
+                           x_user_id: Optional[int] = Header(None)):
     """Multiply two numbers."""
+    if data.precision != "float":
+        return _compute_exact(request, "multiply", data, x_user_id)
     try:
-        result = multiply(data.a, data.b)
-        logger.info(f"Multiplication performed: {data.a} * {data.b} = {result}")
+        result = _compute(request, "multiply", multiply, data.a, data.b)
+        _persist(request, "multiply", data.a, data.b, result, x_user_id)
         return {"result": result}
     except Exception as e:
-        logger.error(f"Multiplication error: {e}")
+        logger.error("Multiplication error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/divide")
-async def divide_numbers(data: OperationRequest):
+async def divide_numbers(data: Union[OperationRequest, PreciseOperationRequest], request: Request,
+                         x_user_id: Optional[int] = Header(None)):
     """Divide two numbers."""
+    if data.precision != "float":
+        return _compute_exact(request, "divide", data, x_user_id)
     try:
-        result = divide(data.a, data.b)
-        logger.info(f"Division performed: {data.a} / {data.b} = {result}")
+        result = _compute(request, "divide", divide, data.a, data.b)
+        _persist(request, "divide", data.a, data.b, result, x_user_id)
         return {"result": result}
     except ValueError as ve:
-        logger.error(f"Division error: {ve}")
+        logger.error("Division error: %s", ve)
+        registry.count_error("divide_by_zero")
         return JSONResponse(status_code=400, content={"error": str(ve)})
     except Exception as e:
-        logger.error(f"Unexpected division error: {e}")
+        logger.error("Unexpected division error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# ----------------------------------------------------------
+# Batch Route (many operations per request)
+# ----------------------------------------------------------
+@app.post("/batch")
+async def batch_operations(data: Union[BatchRequest, PreciseBatchRequest], request: Request,
+                           x_user_id: Optional[int] = Header(None)):
+    """Evaluate a mixed list of operations, reporting errors per item."""
+    count = len(data.operations)
+    if count > MAX_BATCH_SIZE:
+        logger.error("Batch too large: %d items", count)
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Batch exceeds maximum size of {MAX_BATCH_SIZE} operations."},
+        )
+
+    items = [(item.op, item.a, item.b) for item in data.operations]
+    mark("validate")
+    if data.precision != "float":
+        # exact modes run item by item; stored rows are float approximations
+        rows = []
+        results = evaluate_exact_batch(
+            items, data.precision, data.digits,
+            record=lambda op, a, b, result: rows.append((op, to_float(a), to_float(b), to_float(result))),
+        )
+    else:
+        results = evaluate_batch(items)
+        rows = ((op, a, b, entry["result"]) for (op, a, b), entry in zip(items, results) if "result" in entry)
+    errors = sum(1 for entry in results if "error" in entry)
+    mark("compute")
+
+    writer = getattr(request.app.state, "calc_writer", None)
+    if writer is not None:
+        user_id = x_user_id or request.app.state.settings.default_user_id
+        writer.record_many(
+            {"operation": op, "operand_a": a, "operand_b": b, "result": result, "user_id": user_id}
+            for op, a, b, result in rows if None not in (a, b, result)
+        )
+    if should_log():
+        logger.info("Batch performed: %d operations, %d errors", count, errors)
+    return {"results": results, "count": count, "errors": errors}
+
+
+# ----------------------------------------------------------
+# Expression Route (chained operations in one request)
+# ----------------------------------------------------------
+@app.post("/evaluate")
+async def evaluate_expression(data: EvaluateRequest):
+    """Evaluate an arithmetic expression for one set of variables, or many via bindings."""
+    try:
+        compiled = compile_expression(data.expression)
+        if data.bindings is None:
+            return {"result": evaluate(compiled, data.variables)}
+    except ExpressionError as exc:  # invalid expression, missing variable, result out of range
+        logger.error("Expression error: %s", exc)
+        registry.count_error("validation")
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+    except ValueError as exc:  # division by zero (app/operations.py)
+        logger.error("Expression error: %s", exc)
+        registry.count_error("divide_by_zero")
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+
+    count = len(data.bindings)
+    if count > MAX_BATCH_SIZE:
+        logger.error("Too many bindings: %d", count)
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Batch exceeds maximum size of {MAX_BATCH_SIZE} operations."},
+        )
+    results = evaluate_many(compiled, data.bindings)
+    errors = sum(1 for entry in results if "error" in entry)
+    if should_log():
+        logger.info("Expression evaluated: %s for %d bindings, %d errors", data.expression, count, errors)
+    return {"results": results, "count": count, "errors": errors}
+
+
+# ----------------------------------------------------------
+# Streaming Route (NDJSON in → NDJSON out)
+# ----------------------------------------------------------
+@app.post("/stream")
+async def stream_operations(request: Request, x_user_id: Optional[int] = Header(None)):
+    """Evaluate an NDJSON body of {op, a, b} records, streaming results as they are computed."""
+    writer = getattr(request.app.state, "calc_writer", None)
+    user_id = x_user_id or request.app.state.settings.default_user_id
+
+    def record_rows(rows):
+        writer.record_many(dict(row, user_id=user_id) for row in rows)
+
+    sink = record_rows if writer is not None else None
+    return NDJSONStreamingResponse(stream_calculations(request.stream(), sink))
+
+
+# ----------------------------------------------------------
+# WebSocket Route (pipelined calculations on one connection)
+# ----------------------------------------------------------
+@app.websocket("/ws")
+async def calculation_channel(websocket: WebSocket, x_user_id: Optional[int] = Header(None)):
+    """Answer pipelined {id, op, a, b} text frames or packed binary frames, in order."""
+    state = websocket.app.state
+    channel = CalculationChannel(
+        cache=getattr(state, "result_cache", None),
+        writer=getattr(state, "calc_writer", None),
+        user_id=x_user_id or state.settings.default_user_id,
+        stats=getattr(state, "ws_stats", None),
+        rate_limiter=getattr(state, "rate_limiter", None),
+        client=client_id(websocket.scope),
+    )
+    await serve_channel(websocket, channel)
+
+
+# ----------------------------------------------------------
+# Job Routes (large batches run off the request, polled by id)
+# ----------------------------------------------------------
+def _job_queue(request: Request) -> Optional[JobQueue]:
+    return getattr(request.app.state, "jobs", None)
+
+
+def _jobs_disabled() -> JSONResponse:
+    return JSONResponse(status_code=503, content={"error": "Job queue is disabled."})
+
+
+def _job_not_found() -> JSONResponse:
+    return JSONResponse(status_code=404, content={"error": "Job not found."})
+
+
+def _job_view(job) -> dict:
+    return dict(job.to_dict(), status_url=f"/jobs/{job.id}", results_url=f"/jobs/{job.id}/results")
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: Request):
+    """Queue an NDJSON or {"operations": [...]} body; returns the job id to poll."""
+    jobs = _job_queue(request)
+    if jobs is None:
+        return _jobs_disabled()
+    kind = job_kind(request.headers.get("content-type"))
+    if kind is None:
+        return JSONResponse(status_code=415,
+                            content={"error": "Jobs accept application/x-ndjson or application/json bodies."})
+    payload = await read_limited(request.stream())
+    if payload is None:
+        return JSONResponse(status_code=413, content={"error": f"Job body exceeds {MAX_JOB_BYTES} bytes."})
+    try:
+        job = jobs.submit(payload, kind)
+    except JobQueueFull:
+        return JSONResponse(status_code=503, content={"error": "Job queue is full, retry later."},
+                            headers={"Retry-After": "5"})
+    if should_log():
+        logger.info("Job %s queued (%s, %d bytes)", job.id, kind, len(payload))
+    return JSONResponse(status_code=202, content=_job_view(job), headers={"Location": f"/jobs/{job.id}"})
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(request: Request, job_id: str, wait: float = Query(0, ge=0, le=MAX_WAIT)):
+    """Job state and progress; with `wait`, hold the request until the job finishes (long-poll)."""
+    jobs = _job_queue(request)
+    if jobs is None:
+        return _jobs_disabled()
+    job = await jobs.wait(job_id, wait)
+    return _job_not_found() if job is None else _job_view(job)
+
+
+@app.get("/jobs/{job_id}/results")
+async def job_results(request: Request, job_id: str, chunk: int = Query(0, ge=0)):
+    """One chunk of a job's results as NDJSON, in submission order; X-Next-Chunk names the next one."""
+    jobs = _job_queue(request)
+    if jobs is None:
+        return _jobs_disabled()
+    job = jobs.get(job_id)
+    if job is None:
+        return _job_not_found()
+    data = jobs.chunk(job_id, chunk)
+    if data is None:
+        if not job.is_finished:
+            return JSONResponse(status_code=409, content={"error": "Chunk not ready yet."},
+                                headers={"Retry-After": "1"})
+        return JSONResponse(status_code=404, content={"error": "Chunk not found."})
+    headers = {"X-Chunk": str(chunk), "X-Chunks": str(job.chunks), "X-Job-State": job.state}
+    if not job.is_finished or chunk + 1 < job.chunks:
+        headers["X-Next-Chunk"] = str(chunk + 1)
+    return Response(data, media_type="application/x-ndjson", headers=headers)
+
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(request: Request, job_id: str):
+    """Cancel a queued or running job; delete a finished one and its results."""
+    jobs = _job_queue(request)
+    if jobs is None:
+        return _jobs_disabled()
+    job = jobs.get(job_id)
+    if job is None:
+        return _job_not_found()
+    if job.is_finished:
+        jobs.delete(job_id)
+        return {"id": job_id, "state": "deleted"}
+    return _job_view(jobs.cancel(job_id))
+
+
+# ----------------------------------------------------------
+# History Routes (keyset-paginated reads of `calculations`)
+# ----------------------------------------------------------
+async def _history_page(request: Request, user_id: Optional[int], operation: Optional[str],
+                        start: Optional[datetime], end: Optional[datetime], limit: int,
+                        cursor: Optional[str]):
+    database = getattr(request.app.state, "database", None)
+    if database is None:
+        return JSONResponse(status_code=503, content={"error": "Calculation history requires a database."})
+    from app.history import fetch_history
+
+    try:
+        items, next_cursor = await database.run(fetch_history, user_id, operation, start, end, limit, cursor)
+    except ValueError as exc:
+        logger.error("History query error: %s", exc)
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+    return {"items": items, "count": len(items), "next_cursor": next_cursor}
+
+
+# Queries run through app/database.py (async driver, or its bounded thread pool)
+# so they never stall the event loop.
+@app.get("/users/{user_id}/calculations")
+async def user_calculations(request: Request, user_id: int, operation: Optional[str] = None,
+                            start: Optional[datetime] = None, end: Optional[datetime] = None,
+                            limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                            cursor: Optional[str] = None):
+    """A user's calculations, newest first, optionally filtered by operation and time range."""
+    return await _history_page(request, user_id, operation, start, end, limit, cursor)
+
+
+@app.get("/calculations")
+async def list_calculations(request: Request, operation: Optional[str] = None,
+                            start: Optional[datetime] = None, end: Optional[datetime] = None,
+                            limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                            cursor: Optional[str] = None):
+    """All users' calculations, newest first, optionally filtered by operation and time range."""
+    return await _history_page(request, None, operation, start, end, limit, cursor)
+
+
+@app.get("/users/{user_id}/stats")
+async def user_stats(request: Request, user_id: int):
+    """Count, sum, min, max and mean of a user's results per operation (from the rollup table)."""
+    database = getattr(request.app.state, "database", None)
+    if database is None:
+        return JSONResponse(status_code=503, content={"error": "Calculation history requires a database."})
+    from app.stats import get_user_stats
+
+    return await database.run(get_user_stats, user_id)
+
+
 # ----------------------------------------------------------
 # Health Check Endpoint
 # ----------------------------------------------------------
@@ -130,13 +635,142 @@ async def health_check():
     }
 
 
+# ----------------------------------------------------------
+# Readiness Endpoint (warm pools and caches, not just alive)
+# ----------------------------------------------------------
+@app.get("/ready")
+async def readiness_check(request: Request):
+    """200 once startup warm-up has finished, 503 while warming up or shutting down."""
+    readiness = getattr(request.app.state, "readiness", None)
+    if readiness is None:
+        return JSONResponse(status_code=503, content={"status": "starting", "checks": {}})
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=readiness.to_dict())
+
+
+# ----------------------------------------------------------
+# Metrics Endpoint (Prometheus text format)
+# ----------------------------------------------------------
+DB_POOL_HELP = {
+    "busy": "Queries currently running on a pooled connection.",
+    "waiting": "Queries waiting for a connection or database thread.",
+    "size": "Configured connection pool size.",
+    "checked_out": "Pooled connections in use.",
+    "checked_in": "Idle pooled connections.",
+    "overflow": "Connections open beyond the pool size (negative = unopened pool slots).",
+}
+
+
+@app.get("/metrics")
+async def metrics(request: Request):
+    """Expose request, error, cache and writer metrics for Prometheus."""
+    gauges = []
+    cache = getattr(request.app.state, "result_cache", None)
+    if cache is not None:
+        gauges += [(f"calc_cache_{name}", f"Result cache {name}.", value)
+                   for name, value in cache.stats().items()]
+    writer = getattr(request.app.state, "calc_writer", None)
+    if writer is not None:
+        gauges += [
+            ("calc_writer_pending", "Calculations waiting to be written.", writer.pending),
+            ("calc_writer_written", "Calculations written to the database.", writer.written),
+            ("calc_writer_dropped", "Calculations dropped on a full queue.", writer.dropped),
+            ("calc_writer_failed", "Calculations lost to failed writes.", writer.failed),
+        ]
+    idempotency = getattr(request.app.state, "idempotency", None)
+    if idempotency is not None:
+        gauges += [(f"calc_idempotency_{name}", f"Idempotency-Key responses {name}.", value)
+                   for name, value in idempotency.stats().items()]
+    rate_limiter = getattr(request.app.state, "rate_limiter", None)
+    if rate_limiter is not None:
+        gauges += [(f"calc_ratelimit_{name}", f"Rate limiter {name} requests or clients.", value)
+                   for name, value in rate_limiter.stats().items()]
+    concurrency = getattr(request.app.state, "concurrency_limiter", None)
+    if concurrency is not None:
+        gauges += [(f"calc_concurrency_{name}", f"Concurrency limiter {name}.", value)
+                   for name, value in concurrency.stats().items()]
+    ws_stats = getattr(request.app.state, "ws_stats", None)
+    if ws_stats is not None:
+        gauges += [(f"calc_ws_{name}", f"WebSocket channel {name}.", value)
+                   for name, value in ws_stats.stats().items()]
+    readiness = getattr(request.app.state, "readiness", None)
+    if readiness is not None:
+        gauges += [(f"calc_readiness_{name}", f"Readiness {name.replace('_', ' ')}.", value)
+                   for name, value in readiness.stats().items()]
+    profiler = getattr(request.app.state, "profiler", None)
+    if profiler is not None:
+        gauges += [(f"calc_profiles_{name}", f"Request profiles {name}.", value)
+                   for name, value in profiler.stats().items()]
+    jobs = getattr(request.app.state, "jobs", None)
+    if jobs is not None:
+        gauges += [(f"calc_jobs_{name}", f"Job queue {name} jobs.", value)
+                   for name, value in jobs.stats().items()]
+    database = getattr(request.app.state, "database", None)
+    if database is not None:
+        gauges += [(f"calc_db_pool_{name}", DB_POOL_HELP[name], value)
+                   for name, value in database.pool_stats().items()]
+    return Response(registry.render(gauges), media_type=METRICS_CONTENT_TYPE)
+
+
+# ----------------------------------------------------------
+# Admin: Request Profiles (CALC_PROFILE_SAMPLE_RATE / _SLOW_MS)
+# ----------------------------------------------------------
+ADMIN_DISABLED = "Admin routes are disabled: CALC_ADMIN_TOKEN is not set."
+
+
+def _admin_denied(request: Request) -> Optional[JSONResponse]:
+    """403 unless the X-Admin-Token header matches CALC_ADMIN_TOKEN (always 403 while it is unset)."""
+    token = request.app.state.settings.admin_token
+    if not token:
+        return JSONResponse(status_code=403, content={"error": ADMIN_DISABLED})
+    # bytes, not str: compare_digest raises TypeError on non-ASCII str
+    if not hmac.compare_digest(request.headers.get("x-admin-token", "").encode(), token.encode()):
+        return JSONResponse(status_code=403, content={"error": "Admin token required."})
+    return None
+
+
+def _profiler(request: Request):
+    return getattr(request.app.state, "profiler", None)
+
+
+@app.get("/admin/profiles")
+async def list_profiles(request: Request):
+    """Summaries (stage timings, no reports) of the captured profiles, newest first."""
+    denied = _admin_denied(request)
+    if denied is not None:
+        return denied
+    profiler = _profiler(request)
+    if profiler is None:
+        return JSONResponse(status_code=503, content={"error": "Request profiling is disabled."})
+    profiles = [profile.summary() for profile in profiler.store.list()]
+    return {"profiles": profiles, "count": len(profiles), **profiler.stats()}
+
+
+@app.get("/admin/profiles/{profile_id}")
+async def get_profile(request: Request, profile_id: int,
+                      output: Literal["json", "text"] = Query("json", alias="format")):
+    """One captured profile with its cProfile report or sampled stacks."""
+    denied = _admin_denied(request)
+    if denied is not None:
+        return denied
+    profiler = _profiler(request)
+    if profiler is None:
+        return JSONResponse(status_code=503, content={"error": "Request profiling is disabled."})
+    profile = profiler.store.get(profile_id)
+    if profile is None:
+        return JSONResponse(status_code=404, content={"error": "Profile not found."})
+    if output == "text":
+        stacks = "".join(f"{entry['samples']:6d}  {entry['stack']}\n" for entry in profile.stacks)
+        return Response(profile.cprofile or stacks, media_type="text/plain")
+    return profile.to_dict()
+
+
 # ----------------------------------------------------------
 # Root Route (HTML Template)
 # ----------------------------------------------------------
 @app.get("/")
 async def home(request: Request):
-    """Render the homepage."""
-    return templates.TemplateResponse("index.html", {"request": request})
+    """Serve the cached homepage (304 when the client's copy is current)."""
+    return homepage.response(request.headers)
 
 
 # ----------------------------------------------------------
@@ -0,0 +1,32 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: migrations/versions/0001_calculation_history_indexes.py
+# ----------------------------------------------------------
+# Description:
+# Composite indexes backing the calculation history queries
+# (app/history.py). The tables themselves already exist from
+# database_operations.sql or app/db.py init_db(); indexes are
+# created only when missing so fresh databases (which get
+# them from init_db) upgrade cleanly too.
+# ----------------------------------------------------------
+
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_calculations_user_id_timestamp", "calculations",
+                    ["user_id", "timestamp", "id"], if_not_exists=True)
+    op.create_index("ix_calculations_operation_timestamp", "calculations",
+                    ["operation", "timestamp", "id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_calculations_operation_timestamp", table_name="calculations", if_exists=True)
+    op.drop_index("ix_calculations_user_id_timestamp", table_name="calculations", if_exists=True)
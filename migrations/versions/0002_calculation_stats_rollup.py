@@ -0,0 +1,44 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: migrations/versions/0002_calculation_stats_rollup.py
+# ----------------------------------------------------------
+# Description:
+# calculation_stats rollup table (see app/stats.py), rebuilt
+# from the existing rows of `calculations`. The app's
+# init_db() may already have created the table (empty, or
+# counting only rows written since), so the rollup is always
+# recomputed rather than seeded only when the table is new.
+# ----------------------------------------------------------
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("calculation_stats"):
+        op.create_table(
+            "calculation_stats",
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("operation", sa.String(20), primary_key=True),
+            sa.Column("count", sa.Integer, nullable=False),
+            sa.Column("total", sa.Float, nullable=False),
+            sa.Column("min_result", sa.Float, nullable=False),
+            sa.Column("max_result", sa.Float, nullable=False),
+        )
+    op.execute("DELETE FROM calculation_stats")
+    op.execute(
+        "INSERT INTO calculation_stats (user_id, operation, count, total, min_result, max_result) "
+        "SELECT user_id, operation, COUNT(*), SUM(result), MIN(result), MAX(result) "
+        "FROM calculations GROUP BY user_id, operation"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("calculation_stats")
@@ -33,19 +33,20 @@ def fastapi_server():
     """
     print("\n🚀 Starting FastAPI server for E2E tests...")
     server = subprocess.Popen(["python", "main.py"])
-    url = "http://127.0.0.1:8000/health"
+    url = "http://127.0.0.1:8000/ready"
     started = False
 
-    # Wait for the server to become responsive
-    for _ in range(30):
+    # Poll readiness (warm pools and caches) every 50 ms, for up to 30 seconds
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
         try:
-            if requests.get(url).status_code == 200:
+            if requests.get(url, timeout=1).status_code == 200:
                 started = True
-                print("✅ FastAPI server is running and healthy.")
+                print("✅ FastAPI server is running and ready.")
                 break
-        except requests.exceptions.ConnectionError:
+        except requests.exceptions.RequestException:
             pass
-        time.sleep(1)
+        time.sleep(0.05)
 
     if not started:
         server.terminate()
@@ -0,0 +1,94 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_batch_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the /batch endpoint. Verifies mixed
+# operations are returned in order with per-item errors and
+# that oversized or malformed batches are rejected with 400.
+# ----------------------------------------------------------
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+
+# ----------------------------------------------------------
+# Fixture: FastAPI client
+# ----------------------------------------------------------
+@pytest.fixture(scope="module")
+def client():
+    """Create a reusable TestClient for the FastAPI app."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+# ----------------------------------------------------------
+# /batch endpoint → mixed operations
+# ----------------------------------------------------------
+def test_batch_mixed_operations(client):
+    payload = {"operations": [
+        {"op": "add", "a": 1, "b": 2},
+        {"op": "subtract", "a": 5, "b": 3},
+        {"op": "multiply", "a": 4, "b": 2.5},
+        {"op": "divide", "a": 9, "b": 3},
+    ]}
+    response = client.post("/batch", json=payload)
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [{"result": 3}, {"result": 2}, {"result": 10}, {"result": 3}],
+        "count": 4,
+        "errors": 0,
+    }
+
+
+# ----------------------------------------------------------
+# /batch endpoint → per-item errors
+# ----------------------------------------------------------
+def test_batch_reports_item_errors(client):
+    """Division by zero and unknown operations fail only their own item."""
+    payload = {"operations": [
+        {"op": "divide", "a": 1, "b": 0},
+        {"op": "power", "a": 2, "b": 3},
+        {"op": "add", "a": 1, "b": 1},
+    ]}
+    response = client.post("/batch", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["results"] == [
+        {"error": "Cannot divide by zero."},
+        {"error": "Unsupported operation: power"},
+        {"result": 2},
+    ]
+    assert body["errors"] == 2
+
+
+# ----------------------------------------------------------
+# /batch endpoint → invalid payloads
+# ----------------------------------------------------------
+def test_batch_invalid_item_rejected(client):
+    """Non-numeric operands fail validation for the whole request."""
+    response = client.post("/batch", json={"operations": [{"op": "add", "a": None, "b": 1}]})
+    assert response.status_code == 400
+    assert "Invalid" in response.json()["error"]
+
+
+def test_batch_too_large(monkeypatch, client):
+    """Batches above MAX_BATCH_SIZE are rejected before evaluation."""
+    import main
+    monkeypatch.setattr(main, "MAX_BATCH_SIZE", 2)
+    payload = {"operations": [{"op": "add", "a": 1, "b": 1}] * 3}
+    response = client.post("/batch", json=payload)
+    assert response.status_code == 400
+    assert "maximum size of 2" in response.json()["error"]
+
+
+def test_batch_overflow_is_a_per_item_error(client):
+    payload = {"operations": [{"op": "multiply", "a": 1e308, "b": 10}, {"op": "add", "a": 1, "b": 2}]}
+    response = client.post("/batch", json=payload)
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [{"error": "Result is out of range."}, {"result": 3.0}], "count": 2, "errors": 1,
+    }
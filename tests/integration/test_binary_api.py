@@ -0,0 +1,80 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_binary_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for POST /batch with packed binary
+# bodies: binary and JSON responses, errors, persistence and
+# metrics labelling.
+# ----------------------------------------------------------
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from app.binary import MEDIA_TYPE, decode_response, encode_request
+from app.db import calculations
+from main import app
+
+BINARY = {"Content-Type": MEDIA_TYPE}
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_binary_batch_returns_binary_results(client):
+    body = encode_request([0, 1, 2, 3, 3, 7], [1, 5, 2, 9, 1, 1], [2, 3, 4, 3, 0, 1])
+    response = client.post("/batch", content=body, headers=BINARY)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MEDIA_TYPE
+    results, status, errors = decode_response(response.content)
+    assert results[:4].tolist() == [3.0, 2.0, 8.0, 3.0]
+    assert status.tolist() == [0, 0, 0, 0, 1, 2]
+    assert errors == 2
+
+
+def test_binary_batch_with_json_accept(client):
+    body = encode_request([0, 3, 9, 2], [1, 1, 1, 1e308], [2, 0, 1, 10])
+    response = client.post("/batch", content=body, headers={**BINARY, "Accept": "application/json"})
+    assert response.json() == {
+        "results": [{"result": 3.0}, {"error": "Cannot divide by zero."},
+                    {"error": "Unsupported operation code: 9"}, {"error": "Result is out of range."}],
+        "count": 4, "errors": 3,
+    }
+
+
+def test_json_batch_is_unchanged(client):
+    response = client.post("/batch", json={"operations": [{"op": "add", "a": 1, "b": 2}]},
+                           headers={"Accept": MEDIA_TYPE})
+    assert response.json() == {"results": [{"result": 3.0}], "count": 1, "errors": 0}
+
+
+@pytest.mark.parametrize("body, headers", [
+    (b"not a batch", BINARY),
+    (encode_request([0], [1], [2]), {**BINARY, "X-User-Id": "abc"}),
+])
+def test_malformed_binary_batch(client, body, headers):
+    response = client.post("/batch", content=body, headers=headers)
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+def test_binary_batch_is_persisted_and_measured(monkeypatch, tmp_path):
+    db_path = tmp_path / "calc.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    with TestClient(app) as client:
+        body = encode_request([0, 2, 3, 3], [1, 2, 3, 4], [1, 2, 3, 0])
+        assert client.post("/batch", content=body, headers={**BINARY, "X-User-Id": "3"}).status_code == 200
+        text = client.get("/metrics").text
+        assert 'calc_requests_total{method="POST",route="/batch",status="200"}' in text
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as conn:
+        total = conn.execute(select(func.count()).select_from(calculations)
+                             .where(calculations.c.user_id == 3)).scalar_one()
+    engine.dispose()
+    assert total == 3
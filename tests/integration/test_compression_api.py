@@ -0,0 +1,88 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_compression_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for negotiated response compression and
+# the cached homepage with ETag / Last-Modified revalidation.
+# ----------------------------------------------------------
+
+import gzip
+import json
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_large_batch_response_is_gzipped(client):
+    batch = {"operations": [{"op": "add", "a": i, "b": 1} for i in range(200)]}
+    response = client.post("/batch", json=batch, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()["results"]) == 200  # httpx decodes transparently
+
+    plain = client.post("/batch", json=batch, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == response.json()
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.post("/add", json={"a": 1, "b": 2}, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_stream_is_compressed(client):
+    body = b"".join(json.dumps({"op": "add", "a": i, "b": 1}).encode() + b"\n" for i in range(100))
+    with client.stream("POST", "/stream", content=body, headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw).count(b"\n") == 100
+
+
+def test_idempotent_replay_is_compressed_per_request(client):
+    batch = {"operations": [{"op": "multiply", "a": i, "b": 2} for i in range(200)]}
+    first = client.post("/batch", json=batch, headers={"Idempotency-Key": "zip-1", "Accept-Encoding": "gzip"})
+    replay = client.post("/batch", json=batch, headers={"Idempotency-Key": "zip-1", "Accept-Encoding": "identity"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert "content-encoding" not in replay.headers
+    assert replay.json() == first.json()
+
+
+def test_compression_can_be_disabled(monkeypatch):
+    import importlib
+    import main
+
+    monkeypatch.setenv("CALC_COMPRESSION", "0")
+    try:
+        reloaded = importlib.reload(main)
+        with TestClient(reloaded.app) as test_client:
+            batch = {"operations": [{"op": "add", "a": i, "b": 1} for i in range(200)]}
+            response = test_client.post("/batch", json=batch, headers={"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in response.headers
+    finally:
+        monkeypatch.delenv("CALC_COMPRESSION")
+        importlib.reload(main)
+
+
+def test_homepage_etag_and_last_modified(client):
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    assert client.get("/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/", headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get("/", headers={"If-None-Match": '"stale"'}).status_code == 200
@@ -0,0 +1,58 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_evaluate_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the /evaluate expression endpoint,
+# for single evaluations and vectorized bindings.
+# ----------------------------------------------------------
+
+from fastapi.testclient import TestClient
+from app.batch import MAX_BATCH_SIZE
+from main import app
+
+client = TestClient(app)
+
+
+def test_evaluate_single_expression():
+    response = client.post("/evaluate", json={"expression": "(a + b) * c", "variables": {"a": 1, "b": 2, "c": 3}})
+    assert response.status_code == 200
+    assert response.json() == {"result": 9.0}
+
+
+def test_evaluate_many_bindings():
+    response = client.post("/evaluate", json={
+        "expression": "a / b",
+        "bindings": [{"a": 6, "b": 3}, {"a": 1, "b": 0}, {"a": "8", "b": 2}],
+    })
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [{"result": 2.0}, {"error": "Cannot divide by zero."}, {"result": 4.0}],
+        "count": 3,
+        "errors": 1,
+    }
+
+
+def test_evaluate_errors_use_error_contract():
+    cases = [
+        ({"expression": "a ** 2", "variables": {"a": 2}}, "Unsupported syntax: BinOp"),
+        ({"expression": "a / b", "variables": {"a": 1, "b": 0}}, "Cannot divide by zero."),
+        ({"expression": "a + b", "variables": {"a": 1}}, "Missing value for variable: b"),
+        ({"expression": "(a"}, "Invalid expression syntax."),
+        ({"expression": "-" * 999 + "1"}, "Expression nesting exceeds 100 levels."),
+        ({"expression": "a", "variables": {"a": "x"}}, "Invalid or missing numeric input."),
+    ]
+    for payload, message in cases:
+        response = client.post("/evaluate", json=payload)
+        assert response.status_code == 400
+        assert response.json() == {"error": message}
+
+
+def test_evaluate_rejects_too_many_bindings(monkeypatch):
+    monkeypatch.setattr("main.MAX_BATCH_SIZE", 2)
+    response = client.post("/evaluate", json={"expression": "a", "bindings": [{"a": 1}] * 3})
+    assert response.status_code == 400
+    assert response.json() == {"error": "Batch exceeds maximum size of 2 operations."}
+    assert MAX_BATCH_SIZE > 2
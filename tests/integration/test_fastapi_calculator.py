@@ -203,3 +203,14 @@ def test_divide_unexpected_exception(monkeypatch, client):
     res = client.post("/divide", json={"a": 4, "b": 2})
     assert res.status_code == 400
     assert "Unexpected math error" in res.text
+
+
+def test_repeated_requests_use_result_cache(client):
+    """Identical operands are served from the cache after the first call."""
+    cache = client.app.state.result_cache
+    before = cache.stats()
+    for _ in range(3):
+        assert client.post("/multiply", json={"a": 7, "b": 6}).json() == {"result": 42}
+    after = cache.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
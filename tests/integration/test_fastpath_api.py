@@ -0,0 +1,98 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_fastpath_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the fast-path arithmetic routes:
+# responses must match the regular Pydantic routes for valid
+# and invalid input, and results are still cached/persisted.
+# ----------------------------------------------------------
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from app.db import calculations
+from app.fastpath import install_fast_routes
+import main
+
+
+def make_fast_app():
+    fast_app = FastAPI(lifespan=main.lifespan)
+    install_fast_routes(fast_app)
+    return fast_app
+
+
+CASES = [
+    ("/add", {"json": {"a": 10, "b": 5}}, {}),
+    ("/subtract", {"json": {"a": "10", "b": 2.5}}, {}),
+    ("/multiply", {"json": {"a": True, "b": 4}}, {}),
+    ("/divide", {"json": {"a": 9, "b": 3}}, {}),
+    ("/divide", {"json": {"a": 9, "b": 0}}, {}),
+    ("/multiply", {"json": {"a": 1e308, "b": 10}}, {}),
+    ("/add", {"json": {"a": "abc", "b": 1}}, {}),
+    ("/add", {"json": {"a": "\uff11", "b": 1}}, {}),       # fullwidth digit one
+    ("/add", {"json": {"a": "\u0663", "b": 1}}, {}),       # Arabic-Indic digit three
+    ("/add", {"json": {"a": "\u00a01\u2003", "b": 1}}, {}),  # Unicode whitespace around ASCII digits
+    ("/subtract", {"json": {"a": "1_000", "b": " 2 "}}, {}),
+    ("/add", {"json": {"a": "inf", "b": 1}}, {}),
+    ("/add", {"json": {"a": 1}}, {}),
+    ("/add", {"json": [1, 2]}, {}),
+    ("/add", {"content": b"{bad json"}, {}),
+    ("/add", {"content": b""}, {}),
+    ("/add", {"content": b'{"a": 1, "b": 2}'}, {"content-type": "text/plain"}),
+    ("/add", {"json": {"a": 1, "b": 2}}, {"x-user-id": "abc"}),
+    ("/add", {"json": {"a": 1, "b": 2}}, {"x-user-id": "7"}),
+    ("/add", {"json": {"a": 1, "b": 2, "precision": "float"}}, {}),
+    ("/add", {"json": {"a": "0.1", "b": 0.2, "precision": "decimal"}}, {}),
+    ("/divide", {"json": {"a": 1, "b": 3, "precision": "decimal", "digits": "40"}}, {}),
+    ("/divide", {"json": {"a": "1/3", "b": 2, "precision": "fraction"}}, {}),
+    ("/divide", {"json": {"a": 1, "b": 0, "precision": "fraction"}}, {}),
+    ("/add", {"json": {"a": "abc", "b": 1, "precision": "decimal"}}, {}),
+    ("/add", {"json": {"a": True, "b": 1, "precision": "decimal"}}, {}),
+    ("/add", {"json": {"a": 1, "b": 1, "precision": "decimal", "digits": 0}}, {}),
+    ("/add", {"json": {"a": 1, "b": 1, "precision": "bogus"}}, {}),
+    ("/add", {"json": {"a": 1, "b": 1, "precision": None}}, {}),
+]
+
+
+@pytest.mark.parametrize("route, body, headers", CASES)
+def test_fast_path_matches_regular_routes(route, body, headers):
+    with TestClient(main.app, raise_server_exceptions=False) as regular, \
+            TestClient(make_fast_app()) as fast:
+        expected = regular.post(route, headers=headers, **body)
+        actual = fast.post(route, headers=headers, **body)
+    assert actual.status_code == expected.status_code
+    assert actual.json() == expected.json()
+    assert actual.headers["content-type"] == "application/json"
+
+
+def test_fast_path_reports_operation_errors_like_regular_routes(monkeypatch):
+    def broken(a, b):
+        raise TypeError("boom")
+
+    fast_app = FastAPI(lifespan=main.lifespan)
+    install_fast_routes(fast_app, {"add": broken})
+    with TestClient(fast_app) as client:
+        response = client.post("/add", json={"a": 1, "b": 2})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "boom"}
+
+
+def test_fast_path_uses_cache_and_persistence(monkeypatch, tmp_path):
+    db_path = tmp_path / "calc.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    fast_app = make_fast_app()
+    with TestClient(fast_app) as client:
+        client.post("/add", json={"a": 2, "b": 3}, headers={"X-User-Id": "4"})
+        client.post("/add", json={"a": 2, "b": 3})
+        assert fast_app.state.result_cache.stats()["hits"] == 1
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as conn:
+        rows = conn.execute(select(calculations.c.operation, calculations.c.result,
+                                   calculations.c.user_id)).all()
+    engine.dispose()
+    assert sorted(rows) == [("add", 5.0, 1), ("add", 5.0, 4)]
@@ -0,0 +1,87 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_history_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the calculation history endpoints
+# with keyset pagination, backed by a temporary SQLite file.
+# Database-backed tests run on both query paths of
+# app/database.py: the AsyncEngine (aiosqlite) and the
+# thread-pool fallback (CALC_DB_ASYNC=0).
+# ----------------------------------------------------------
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+
+@pytest.fixture(params=["async", "threadpool"])
+def db_mode(request, monkeypatch, tmp_path):
+    """Point DATABASE_URL at a fresh SQLite file, queried on the given path."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'calc.db'}")
+    monkeypatch.setenv("CALC_DB_ASYNC", "1" if request.param == "async" else "0")
+    return request.param
+
+
+def settle_writer():
+    """Wait until every queued result is committed (stop() joins the writer thread)."""
+    app.state.calc_writer.stop()
+    app.state.calc_writer.start()
+
+
+def test_history_requires_database():
+    with TestClient(app) as client:
+        response = client.get("/users/1/calculations")
+    assert response.status_code == 503
+    assert response.json() == {"error": "Calculation history requires a database."}
+
+
+def test_history_pages_and_filters(db_mode):
+    with TestClient(app) as client:
+        assert client.app.state.database.mode == db_mode
+        for i in range(7):
+            client.post("/add", json={"a": i, "b": 1}, headers={"X-User-Id": "3"})
+        client.post("/multiply", json={"a": 2, "b": 4}, headers={"X-User-Id": "3"})
+        client.post("/add", json={"a": 100, "b": 1}, headers={"X-User-Id": "4"})
+        settle_writer()
+
+        first = client.get("/users/3/calculations", params={"operation": "add", "limit": 5}).json()
+        second = client.get("/users/3/calculations",
+                            params={"operation": "add", "limit": 5, "cursor": first["next_cursor"]}).json()
+        everyone = client.get("/calculations", params={"operation": "multiply"}).json()
+        future = client.get("/users/3/calculations", params={"start": "2999-01-01T00:00:00Z"}).json()
+        bad_cursor = client.get("/users/3/calculations", params={"cursor": "nope"})
+        bad_limit = client.get("/users/3/calculations", params={"limit": 0})
+
+    assert first["count"] == 5 and first["next_cursor"]
+    assert second["count"] == 2 and second["next_cursor"] is None
+    ids = [item["id"] for item in first["items"] + second["items"]]
+    assert len(set(ids)) == 7
+    assert {item["operation"] for item in first["items"] + second["items"]} == {"add"}
+    assert [item["result"] for item in everyone["items"]] == [8.0]
+    assert future == {"items": [], "count": 0, "next_cursor": None}
+    assert bad_cursor.status_code == 400 and bad_cursor.json() == {"error": "Invalid cursor."}
+    assert bad_limit.status_code == 400
+
+
+def test_user_stats_endpoint(db_mode):
+    with TestClient(app) as client:
+        assert client.app.state.database.mode == db_mode
+        client.post("/add", json={"a": 1, "b": 2}, headers={"X-User-Id": "5"})
+        client.post("/add", json={"a": 10, "b": 20}, headers={"X-User-Id": "5"})
+        client.post("/batch", json={"operations": [{"op": "multiply", "a": 2, "b": 3}]},
+                    headers={"X-User-Id": "5"})
+        settle_writer()
+        stats = client.get("/users/5/stats").json()
+
+    assert stats["operations"]["add"] == {"count": 2, "sum": 33.0, "min": 3.0, "max": 30.0, "mean": 16.5}
+    assert stats["operations"]["multiply"]["count"] == 1
+    assert stats["overall"]["count"] == 3
+
+
+def test_user_stats_requires_database():
+    with TestClient(app) as client:
+        response = client.get("/users/1/stats")
+    assert response.status_code == 503
@@ -0,0 +1,80 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_idempotency_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the Idempotency-Key header: retried
+# requests are replayed without a second database row, keys
+# are scoped per route and user, and a reused key with a
+# different body is rejected.
+# ----------------------------------------------------------
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from app.db import calculations
+from main import app
+
+
+def read_rows(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as conn:
+        rows = conn.execute(select(calculations.c.operation, calculations.c.result, calculations.c.user_id)
+                            .order_by(calculations.c.id)).all()
+    engine.dispose()
+    return [tuple(row) for row in rows]
+
+
+def test_retries_are_replayed_without_duplicate_rows(monkeypatch, tmp_path):
+    db_path = tmp_path / "calc.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    key = {"Idempotency-Key": "order-42"}
+
+    with TestClient(app) as client:
+        first = client.post("/add", json={"a": 2, "b": 3}, headers=key)
+        retry = client.post("/add", json={"b": 3, "a": 2}, headers=key)
+        assert first.json() == retry.json() == {"result": 5}
+        assert "idempotent-replayed" not in first.headers
+        assert retry.headers["idempotent-replayed"] == "true"
+
+        # same key on another route or for another user is a new request
+        assert client.post("/multiply", json={"a": 2, "b": 3}, headers=key).json() == {"result": 6}
+        client.post("/add", json={"a": 2, "b": 3}, headers={**key, "X-User-Id": "7"})
+
+        batch = {"operations": [{"op": "subtract", "a": 9, "b": 4}]}
+        client.post("/batch", json=batch, headers={"Idempotency-Key": "batch-1"})
+        assert client.post("/batch", json=batch, headers={"Idempotency-Key": "batch-1"}).json()["count"] == 1
+
+        # a stored error is replayed as well
+        assert client.post("/divide", json={"a": 1, "b": 0}, headers=key).status_code == 400
+        assert client.post("/divide", json={"a": 1, "b": 0}, headers=key).json() == \
+            {"error": "Cannot divide by zero."}
+
+    assert read_rows(db_path) == [("add", 5, 1), ("multiply", 6, 1), ("add", 5, 7), ("subtract", 5, 1)]
+
+
+def test_reused_key_with_different_body_is_rejected():
+    with TestClient(app) as client:
+        headers = {"Idempotency-Key": "reused"}
+        client.post("/subtract", json={"a": 5, "b": 1}, headers=headers)
+        response = client.post("/subtract", json={"a": 5, "b": 2}, headers=headers)
+        assert response.status_code == 422
+        assert response.json() == {"error": "Idempotency-Key was already used with a different request."}
+
+        response = client.post("/subtract", json={"a": 5, "b": 2}, headers={"Idempotency-Key": "bad key"})
+        assert response.status_code == 400
+
+        text = client.get("/metrics").text
+        assert "calc_idempotency_conflicts 1" in text
+        assert 'calc_requests_total{method="POST",route="/subtract",status="422"} 1' in text
+
+
+def test_idempotency_disabled(monkeypatch):
+    monkeypatch.setenv("CALC_IDEMPOTENCY_SIZE", "0")
+    with TestClient(app) as client:
+        assert client.app.state.idempotency is None
+        response = client.post("/add", json={"a": 1, "b": 1}, headers={"Idempotency-Key": "k"})
+        assert "idempotent-replayed" not in client.post(
+            "/add", json={"a": 1, "b": 1}, headers={"Idempotency-Key": "k"}).headers
+        assert response.json() == {"result": 2}
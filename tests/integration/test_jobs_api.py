@@ -0,0 +1,118 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_jobs_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the job routes: submission, long-poll
+# status, chunked result downloads, cancellation, limits and
+# metrics.
+# ----------------------------------------------------------
+
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app import jobs as jobs_module
+from main import app
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def finished(client, job_id):
+    response = client.get(f"/jobs/{job_id}", params={"wait": 10})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_submit_poll_and_download(client):
+    body = b'{"op": "add", "a": 1, "b": 2}\n{"op": "divide", "a": 1, "b": 0}\nnot json\n'
+    response = client.post("/jobs", content=body, headers=NDJSON)
+    assert response.status_code == 202
+    job = response.json()
+    assert response.headers["location"] == job["status_url"] == f"/jobs/{job['id']}"
+
+    job = finished(client, job["id"])
+    assert (job["state"], job["total"], job["done"], job["errors"], job["progress"]) == ("done", 3, 3, 2, 1.0)
+
+    results = client.get(job["results_url"])
+    assert results.headers["content-type"] == "application/x-ndjson"
+    assert (results.headers["x-chunk"], results.headers["x-chunks"]) == ("0", "1")
+    assert "x-next-chunk" not in results.headers
+    assert [json.loads(line) for line in results.text.splitlines()] == [
+        {"result": 3.0}, {"error": "Cannot divide by zero."}, {"error": "Invalid JSON."},
+    ]
+    assert client.get(job["results_url"], params={"chunk": 1}).status_code == 404
+
+
+def test_json_operations_body_is_downloaded_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(client.app.state.jobs, "chunk_size", 2)
+    operations = [{"op": "multiply", "a": n, "b": 3} for n in range(5)]
+    job = finished(client, client.post("/jobs", json={"operations": operations}).json()["id"])
+    assert job["chunks"] == 3
+
+    results, chunk = [], "0"
+    while chunk is not None:
+        response = client.get(job["results_url"], params={"chunk": chunk})
+        results += [json.loads(line) for line in response.text.splitlines()]
+        chunk = response.headers.get("x-next-chunk")
+    assert results == [{"result": float(3 * n)} for n in range(5)]
+
+
+def test_malformed_job_fails(client):
+    job = finished(client, client.post("/jobs", json={"ops": []}).json()["id"])
+    assert job["state"] == "failed"
+    assert "operations" in job["error"]
+
+
+def test_unknown_job_and_bad_submissions(client):
+    assert client.get("/jobs/missing").json() == {"error": "Job not found."}
+    assert client.get("/jobs/missing/results").status_code == 404
+    assert client.delete("/jobs/missing").status_code == 404
+    assert client.post("/jobs", content=b"1,2", headers={"Content-Type": "text/csv"}).status_code == 415
+    assert client.get("/jobs/missing", params={"wait": 999}).status_code == 400
+
+
+def test_oversized_body_is_rejected(client, monkeypatch):
+    real = jobs_module.read_limited
+    monkeypatch.setattr("main.read_limited", lambda stream: real(stream, limit=8))
+    response = client.post("/jobs", content=b'{"op": "add", "a": 1, "b": 2}\n', headers=NDJSON)
+    assert response.status_code == 413
+
+
+def test_queued_job_is_cancelled_then_deleted(client):
+    client.app.state.jobs.stop()                  # no workers: jobs stay queued
+    job = client.post("/jobs", content=b"", headers=NDJSON).json()
+    assert client.get(job["results_url"]).status_code == 409
+    assert client.delete(job["status_url"]).json()["state"] == "cancelled"
+    assert client.delete(job["status_url"]).json() == {"id": job["id"], "state": "deleted"}
+    assert client.get(job["status_url"]).status_code == 404
+
+
+def test_full_queue_returns_503(monkeypatch):
+    monkeypatch.setenv("CALC_JOB_QUEUE_SIZE", "1")
+    with TestClient(app) as client:
+        client.app.state.jobs.stop()
+        assert client.post("/jobs", content=b"", headers=NDJSON).status_code == 202
+        response = client.post("/jobs", content=b"", headers=NDJSON)
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+        text = client.get("/metrics").text
+        assert "calc_jobs_rejected 1" in text
+        assert "calc_jobs_queued 1" in text
+
+
+def test_jobs_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("CALC_JOB_QUEUE_SIZE", "0")
+    with TestClient(app) as client:
+        assert client.post("/jobs", content=b"", headers=NDJSON).status_code == 503
+        assert client.get("/jobs/x").json() == {"error": "Job queue is disabled."}
+        assert client.get("/jobs/x/results").status_code == 503
+        assert client.delete("/jobs/x").status_code == 503
+        assert "calc_jobs_" not in client.get("/metrics").text
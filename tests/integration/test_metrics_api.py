@@ -0,0 +1,72 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_metrics_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the /metrics endpoint: request and
+# error counters, latency histograms and cache/writer gauges.
+# ----------------------------------------------------------
+
+import re
+from fastapi.testclient import TestClient
+from main import app
+
+
+def sample(text, series):
+    """Return the value of one exposition line (0 if absent)."""
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_metrics_counts_requests_and_errors():
+    with TestClient(app) as client:
+        before = client.get("/metrics").text
+        client.post("/add", json={"a": 1, "b": 2})
+        client.post("/divide", json={"a": 1, "b": 0})
+        client.post("/multiply", json={"a": "x", "b": 2})
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = response.text
+
+    def delta(series):
+        return sample(after, series) - sample(before, series)
+
+    assert delta('calc_requests_total{method="POST",route="/add",status="200"}') == 1
+    assert delta('calc_requests_total{method="POST",route="/divide",status="400"}') == 1
+    assert delta('calc_requests_total{method="POST",route="/multiply",status="400"}') == 1
+    assert delta('calc_errors_total{type="divide_by_zero"}') == 1
+    assert delta('calc_errors_total{type="validation"}') == 1
+    assert delta('calc_request_duration_seconds_count{route="/add"}') == 1
+    assert 'calc_request_duration_seconds_bucket{route="/add",le="+Inf"}' in after
+    assert "calc_requests_in_flight 1" in after  # the /metrics request itself
+    assert "calc_cache_hits " in after
+
+
+def test_metrics_count_expression_errors_by_type():
+    with TestClient(app) as client:
+        before = client.get("/metrics").text
+        client.post("/evaluate", json={"expression": "a / b", "variables": {"a": 1, "b": 0}})
+        client.post("/evaluate", json={"expression": "a + b", "variables": {"a": 1}})
+        client.post("/evaluate", json={"expression": "(a"})
+        after = client.get("/metrics").text
+
+    def delta(series):
+        return sample(after, series) - sample(before, series)
+
+    assert delta('calc_errors_total{type="divide_by_zero"}') == 1
+    assert delta('calc_errors_total{type="validation"}') == 2
+
+
+def test_metrics_include_writer_and_pool_gauges(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'calc.db'}")
+    with TestClient(app) as client:
+        client.post("/add", json={"a": 1, "b": 2})
+        text = client.get("/metrics").text
+    assert "calc_writer_pending " in text
+    assert "calc_writer_dropped 0" in text
+    assert "calc_db_pool_busy 0" in text
+    assert "calc_db_pool_waiting 0" in text
@@ -0,0 +1,57 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_persistence_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests verifying that computed results are
+# recorded in the `calculations` table. DATABASE_URL points
+# at a temporary SQLite file so no PostgreSQL is needed.
+# ----------------------------------------------------------
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from app.db import calculations
+from main import app
+
+
+def read_rows(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as conn:
+        rows = conn.execute(select(calculations).order_by(calculations.c.id)).all()
+    engine.dispose()
+    return [(r.operation, r.operand_a, r.operand_b, r.result, r.user_id) for r in rows]
+
+
+# ----------------------------------------------------------
+# Routes record results through the background writer
+# ----------------------------------------------------------
+def test_results_are_persisted(monkeypatch, tmp_path):
+    db_path = tmp_path / "calc.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+
+    with TestClient(app) as client:
+        assert client.post("/add", json={"a": 2, "b": 3}).status_code == 200
+        assert client.post("/subtract", json={"a": 9, "b": 4}, headers={"X-User-Id": "2"}).status_code == 200
+        assert client.post("/multiply", json={"a": 3, "b": 3}).status_code == 200
+        assert client.post("/divide", json={"a": 8, "b": 0}).status_code == 400
+        assert client.post("/divide", json={"a": 8, "b": 2}).status_code == 200
+        batch = {"operations": [{"op": "add", "a": 1, "b": 1}, {"op": "divide", "a": 1, "b": 0}]}
+        assert client.post("/batch", json=batch).status_code == 200
+    # Leaving the client runs shutdown, which drains the writer.
+
+    assert read_rows(db_path) == [
+        ("add", 2, 3, 5, 1),
+        ("subtract", 9, 4, 5, 2),
+        ("multiply", 3, 3, 9, 1),
+        ("divide", 8, 2, 4, 1),
+        ("add", 1, 1, 2, 1),
+    ]
+
+
+def test_persistence_disabled_without_database_url(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    with TestClient(app) as client:
+        assert client.app.state.calc_writer is None
+        assert client.post("/add", json={"a": 1, "b": 1}).json() == {"result": 2}
@@ -0,0 +1,109 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_precision_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the decimal / fraction precision
+# modes on the arithmetic routes and /batch, including the
+# float approximations stored in the calculations table.
+# ----------------------------------------------------------
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from app.db import calculations
+from main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+# ----------------------------------------------------------
+# Arithmetic routes
+# ----------------------------------------------------------
+@pytest.mark.parametrize("route, body, expected", [
+    ("/add", {"a": "0.1", "b": "0.2", "precision": "decimal"}, "0.3"),
+    ("/add", {"a": 12345678901234567890123, "b": 1, "precision": "decimal"}, "12345678901234567890124"),
+    ("/subtract", {"a": "1/2", "b": "1/3", "precision": "fraction"}, "1/6"),
+    ("/multiply", {"a": 0.1, "b": 3, "precision": "decimal"}, "0.3"),
+    ("/divide", {"a": 1, "b": 3, "precision": "fraction"}, "1/3"),
+    ("/divide", {"a": 2, "b": 3, "precision": "decimal", "digits": 6}, "0.666667"),
+])
+def test_exact_modes(client, route, body, expected):
+    response = client.post(route, json=body)
+    assert response.status_code == 200
+    assert response.json() == {"result": expected, "precision": body["precision"]}
+
+
+def test_float_mode_is_unchanged(client):
+    assert client.post("/add", json={"a": 0.1, "b": 0.2}).json() == {"result": 0.30000000000000004}
+    assert client.post("/add", json={"a": 0.1, "b": 0.2, "precision": "float"}).json() == \
+        {"result": 0.30000000000000004}
+
+
+@pytest.mark.parametrize("body, error", [
+    ({"a": 1, "b": 0, "precision": "fraction"}, "Cannot divide by zero."),
+    ({"a": "abc", "b": 1, "precision": "decimal"}, "Invalid exact operand: 'abc'"),
+    ({"a": 1, "b": 1, "precision": "decimal", "digits": 5000}, "Invalid or missing numeric input."),
+    ({"a": 1, "b": 1, "precision": "binary"}, "Invalid or missing numeric input."),
+])
+def test_exact_mode_errors(client, body, error):
+    response = client.post("/divide", json=body)
+    assert response.status_code == 400
+    assert response.json() == {"error": error}
+
+
+# ----------------------------------------------------------
+# Batch
+# ----------------------------------------------------------
+def test_exact_batch(client):
+    payload = {"precision": "fraction", "operations": [
+        {"op": "divide", "a": 1, "b": 3},
+        {"op": "add", "a": "1/3", "b": "2/3"},
+        {"op": "divide", "a": 1, "b": 0},
+    ]}
+    response = client.post("/batch", json=payload)
+    assert response.json() == {
+        "results": [{"result": "1/3"}, {"result": "1"}, {"error": "Cannot divide by zero."}],
+        "count": 3,
+        "errors": 1,
+    }
+
+
+def test_oversized_integers_are_rejected_per_item(client):
+    huge = "1" + "0" * 4000  # sent as raw JSON: json.dumps cannot encode 10**4000
+    body = ('{"precision": "fraction", "operations": [{"op": "multiply", "a": %s, "b": %s}, '
+            '{"op": "add", "a": 1, "b": 2}]}' % (huge, huge))
+    response = client.post("/batch", content=body, headers={"Content-Type": "application/json"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [{"error": "Integer operand exceeds 1000 digits"}, {"result": "3"}], "count": 2, "errors": 1,
+    }
+    single = client.post("/multiply", content='{"a": %s, "b": 2, "precision": "fraction"}' % huge,
+                         headers={"Content-Type": "application/json"})
+    assert single.status_code == 400
+    assert single.json() == {"error": "Integer operand exceeds 1000 digits"}
+
+
+# ----------------------------------------------------------
+# Persistence stores float approximations
+# ----------------------------------------------------------
+def test_exact_results_are_persisted_as_floats(monkeypatch, tmp_path):
+    db_path = tmp_path / "calc.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    with TestClient(app) as db_client:
+        db_client.post("/divide", json={"a": 1, "b": 4, "precision": "fraction"})
+        db_client.post("/multiply", json={"a": 10 ** 200, "b": 10 ** 200, "precision": "fraction"})  # too big
+        db_client.post("/batch", json={"precision": "decimal", "operations": [{"op": "add", "a": "0.5", "b": 1}]})
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as conn:
+        rows = conn.execute(select(calculations.c.operation, calculations.c.result)
+                            .order_by(calculations.c.id)).all()
+    engine.dispose()
+    assert [tuple(row) for row in rows] == [("divide", 0.25), ("add", 1.5)]
@@ -0,0 +1,112 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_profiling_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for request profiling: stage timings of
+# the calculation routes, the /admin/profiles endpoints, the
+# admin token and metrics.
+# ----------------------------------------------------------
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.fastpath import install_fast_routes
+from app.profiling import ProfilingMiddleware
+from main import app, lifespan
+
+ADMIN = {"X-Admin-Token": "s3cret"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("CALC_PROFILE_SAMPLE_RATE", "1")
+    monkeypatch.setenv("CALC_ADMIN_TOKEN", "s3cret")
+    with TestClient(app, headers=ADMIN) as test_client:
+        yield test_client
+
+
+def test_profiles_disabled_by_default(monkeypatch):
+    monkeypatch.setenv("CALC_ADMIN_TOKEN", "s3cret")
+    with TestClient(app, headers=ADMIN) as client:
+        assert client.app.state.profiler is None
+        response = client.get("/admin/profiles")
+        assert response.status_code == 503
+        assert response.json() == {"error": "Request profiling is disabled."}
+
+
+def test_sampled_calculation_has_stage_timings(client):
+    assert client.post("/divide", json={"a": 6, "b": 3}).json()["result"] == 2
+    listing = client.get("/admin/profiles").json()
+    assert listing["count"] == 1 and listing["sampled"] == 1
+    [summary] = listing["profiles"]
+    assert summary["route"] == "/divide" and summary["status"] == 200
+    # FastAPI parses and validates the body together, so the Pydantic routes have no separate parse stage
+    assert list(summary["stages_ms"]) == ["receive", "validate", "compute", "serialize", "send"]
+
+    detail = client.get(f"/admin/profiles/{summary['id']}").json()
+    assert "function calls" in detail["cprofile"]
+    text = client.get(f"/admin/profiles/{summary['id']}", params={"format": "text"})
+    assert text.headers["content-type"].startswith("text/plain")
+    assert text.text == detail["cprofile"]
+    assert "calc_profiles_sampled 1" in client.get("/metrics").text
+
+
+def test_batch_and_exact_routes_are_staged(client):
+    client.post("/batch", json={"operations": [{"op": "add", "a": 1, "b": 2}]})
+    client.post("/add", json={"a": "0.1", "b": "0.2", "precision": "decimal"})
+    profiles = client.get("/admin/profiles").json()["profiles"]
+    assert [summary["route"] for summary in profiles] == ["/add", "/batch"]
+    for summary in profiles:
+        assert {"validate", "compute", "serialize"} <= set(summary["stages_ms"])
+
+
+def test_fast_path_reports_a_parse_stage(monkeypatch):
+    monkeypatch.setenv("CALC_PROFILE_SAMPLE_RATE", "1")
+    fast_app = FastAPI(lifespan=lifespan)
+    fast_app.add_middleware(ProfilingMiddleware)
+    install_fast_routes(fast_app)
+    with TestClient(fast_app) as client:
+        assert client.post("/add", json={"a": 1, "b": 2}).json() == {"result": 3}
+        [profile] = client.app.state.profiler.store.list()
+    assert list(profile.stages) == ["receive", "parse", "validate", "compute", "serialize", "send"]
+
+
+def test_unknown_profile_is_404(client):
+    response = client.get("/admin/profiles/999")
+    assert response.status_code == 404
+    assert response.json() == {"error": "Profile not found."}
+
+
+def test_admin_token_is_required_when_set(monkeypatch):
+    monkeypatch.setenv("CALC_PROFILE_SAMPLE_RATE", "1")
+    monkeypatch.setenv("CALC_ADMIN_TOKEN", "s3cret")
+    with TestClient(app) as client:
+        assert client.get("/admin/profiles").status_code == 403
+        assert client.get("/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 403
+        assert client.get("/admin/profiles", headers=ADMIN).status_code == 200
+        # non-ASCII header bytes (Latin-1 on the wire) are a wrong token, not a server error
+        assert client.get("/admin/profiles", headers={"X-Admin-Token": "s3cr\u00e9t".encode("latin-1")}).status_code == 403
+
+
+def test_admin_routes_fail_closed_without_a_token(monkeypatch):
+    monkeypatch.setenv("CALC_PROFILE_SAMPLE_RATE", "1")
+    with TestClient(app) as client:
+        client.post("/add", json={"a": 1, "b": 2})
+        for path in ("/admin/profiles", "/admin/profiles/1"):
+            response = client.get(path, headers=ADMIN)
+            assert response.status_code == 403
+            assert response.json() == {"error": "Admin routes are disabled: CALC_ADMIN_TOKEN is not set."}
+
+
+def test_slow_requests_are_captured(monkeypatch):
+    monkeypatch.setenv("CALC_PROFILE_SLOW_MS", "0.001")
+    monkeypatch.setenv("CALC_ADMIN_TOKEN", "s3cret")
+    with TestClient(app, headers=ADMIN) as client:
+        client.post("/add", json={"a": 1, "b": 2})
+        [profile] = client.get("/admin/profiles").json()["profiles"]
+        assert profile["reason"] == "slow"
+        detail = client.get(f"/admin/profiles/{profile['id']}").json()
+        assert detail["cprofile"] is None and isinstance(detail["stacks"], list)
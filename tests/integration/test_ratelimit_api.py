@@ -0,0 +1,53 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_ratelimit_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for per-client rate limiting, per-route
+# overrides and the admission-control gauges on /metrics.
+# ----------------------------------------------------------
+
+from fastapi.testclient import TestClient
+from main import app
+
+
+def test_rate_limit_and_route_override(monkeypatch):
+    monkeypatch.setenv("CALC_RATE_LIMIT", "0.01")
+    monkeypatch.setenv("CALC_RATE_BURST", "2")
+    monkeypatch.setenv("CALC_RATE_LIMIT_ROUTES", "/batch=0")
+    with TestClient(app) as client:
+        assert client.post("/add", json={"a": 1, "b": 1}).status_code == 200
+        assert client.post("/subtract", json={"a": 1, "b": 1}).status_code == 200
+        response = client.post("/multiply", json={"a": 1, "b": 1})
+        assert response.status_code == 429
+        assert response.json() == {"error": "Rate limit exceeded."}
+        assert int(response.headers["retry-after"]) > 0
+
+        batch = {"operations": [{"op": "add", "a": 1, "b": 1}]}
+        assert all(client.post("/batch", json=batch).status_code == 200 for _ in range(5))
+        assert client.get("/health").status_code == 200
+
+        text = client.get("/metrics").text
+        assert "calc_ratelimit_limited 1" in text
+        assert "calc_ratelimit_allowed 2" in text
+
+
+def test_concurrency_limiter_gauges(monkeypatch):
+    monkeypatch.setenv("CALC_CONCURRENCY_LIMIT", "4")
+    with TestClient(app) as client:
+        assert client.app.state.rate_limiter is None
+        assert client.post("/add", json={"a": 1, "b": 2}).json() == {"result": 3}
+        text = client.get("/metrics").text
+        assert "calc_concurrency_limit 4" in text
+        assert "calc_concurrency_admitted 1" in text
+        assert "calc_concurrency_shed 0" in text
+
+
+def test_admission_control_is_off_by_default_and_ignores_bad_specs(monkeypatch):
+    monkeypatch.setenv("CALC_RATE_LIMIT_ROUTES", "/batch=fast")
+    with TestClient(app) as client:
+        assert client.app.state.rate_limiter is None
+        assert client.app.state.concurrency_limiter is None
+        assert "calc_ratelimit" not in client.get("/metrics").text
@@ -0,0 +1,65 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_readiness_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for GET /ready, startup warm-up and the
+# lazily imported subsystems.
+# ----------------------------------------------------------
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from fastapi.testclient import TestClient
+from main import app
+
+
+def wait_ready(client, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get("/ready")
+        if response.status_code == 200 or time.monotonic() > deadline:
+            return response
+        time.sleep(0.01)
+
+
+def test_ready_after_warm_up():
+    with TestClient(app) as client:
+        response = wait_ready(client)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert body["checks"] == {"kernels": "ok", "homepage": "ok"}
+        assert client.get("/health").status_code == 200
+        metrics = client.get("/metrics").text
+        assert "calc_readiness_ready 1" in metrics
+        readiness = client.app.state.readiness
+    assert readiness.to_dict()["status"] == "stopping"
+
+
+def test_ready_waits_for_the_database_pool(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'calc.db'}")
+    monkeypatch.setenv("CALC_DB_POOL_SIZE", "2")
+    with TestClient(app) as client:
+        assert wait_ready(client).json()["checks"]["database"] == "ok"
+        assert client.app.state.database.engine.pool.checkedin() >= 1  # the writer's pool, in either mode
+
+
+def test_ready_is_503_until_warm():
+    with TestClient(app) as client:
+        client.app.state.readiness.add("database")
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+
+def test_cold_import_skips_database_and_template_libraries():
+    code = "import sys, main; print(sorted({'sqlalchemy', 'jinja2'} & set(sys.modules)))"
+    env = {key: value for key, value in os.environ.items() if key != "DATABASE_URL"}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).resolve().parents[2], env=env)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,50 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_stream_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the /stream NDJSON endpoint using a
+# chunked request body.
+# ----------------------------------------------------------
+
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from app.db import calculations
+from main import app
+
+
+def ndjson_body(count):
+    """Yield an NDJSON body in small chunks (sent with chunked encoding)."""
+    for i in range(count):
+        op = "divide" if i % 10 == 0 else "add"
+        yield json.dumps({"op": op, "a": i, "b": 0 if op == "divide" else 1}).encode() + b"\n"
+
+
+def test_stream_endpoint_returns_ndjson_in_order():
+    with TestClient(app) as client:
+        response = client.post("/stream", content=ndjson_body(3000))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 3000
+    assert lines[0] == {"error": "Cannot divide by zero."}
+    assert lines[1] == {"result": 2}
+    assert lines[2999] == {"result": 3000}
+
+
+def test_stream_endpoint_persists_results(monkeypatch, tmp_path):
+    db_path = tmp_path / "calc.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    with TestClient(app) as client:
+        response = client.post("/stream", content=ndjson_body(20), headers={"X-User-Id": "2"})
+        assert response.status_code == 200
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as conn:
+        total = conn.execute(select(func.count()).select_from(calculations)
+                             .where(calculations.c.user_id == 2)).scalar_one()
+    engine.dispose()
+    assert total == 18
@@ -0,0 +1,95 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/integration/test_websocket_api.py
+# ----------------------------------------------------------
+# Description:
+# Integration tests for the /ws calculation channel:
+# pipelined text frames, binary frames, persistence and the
+# channel gauges on /metrics.
+# ----------------------------------------------------------
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from starlette.websockets import WebSocketDisconnect
+from app.db import calculations
+from app.websocket import REQUEST_RECORD, RESPONSE_RECORD
+from main import app
+
+
+def test_pipelined_text_frames_are_answered_in_order():
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            for i in range(50):
+                ws.send_json({"id": i, "op": "subtract", "a": i, "b": 1})
+            ws.send_json({"id": "z", "op": "divide", "a": 1, "b": 0})
+            replies = [ws.receive_json() for _ in range(51)]
+        assert replies[:50] == [{"id": i, "result": i - 1.0} for i in range(50)]
+        assert replies[50] == {"id": "z", "error": "Cannot divide by zero."}
+
+        text = client.get("/metrics").text
+        assert "calc_ws_messages 51" in text
+        assert "calc_ws_errors 1" in text
+        assert 'calc_requests_total{method="WS",route="/ws",status="200"}' in text
+
+
+def test_binary_frames():
+    records = np.zeros(3, dtype=REQUEST_RECORD)
+    records["id"] = [1, 2, 3]
+    records["op"] = [2, 3, 1]
+    records["a"] = [2.0, 1.0, 5.0]
+    records["b"] = [8.0, 4.0, 0.5]
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            ws.send_bytes(records.tobytes())
+            response = np.frombuffer(ws.receive_bytes(), dtype=RESPONSE_RECORD)
+            ws.send_bytes(b"short")
+            error = ws.receive_json()
+    assert response["result"].tolist() == [16.0, 0.25, 4.5]
+    assert response["status"].tolist() == [0, 0, 0]
+    assert "Binary frames must hold" in error["error"]
+
+
+def test_channel_results_are_persisted_for_the_header_user(monkeypatch, tmp_path):
+    db_path = tmp_path / "calc.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws", headers={"X-User-Id": "2"}) as ws:
+            for i in range(5):
+                ws.send_json({"id": i, "op": "add", "a": i, "b": 1})
+            assert [ws.receive_json()["id"] for _ in range(5)] == list(range(5))
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as conn:
+        total = conn.execute(select(func.count()).select_from(calculations)
+                             .where(calculations.c.user_id == 2)).scalar_one()
+    engine.dispose()
+    assert total == 5
+
+
+def test_invalid_user_header_is_rejected():
+    with TestClient(app) as client:
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/ws", headers={"X-User-Id": "abc"}) as ws:
+                ws.receive_json()
+
+
+def test_channel_is_rate_limited_per_client(monkeypatch):
+    monkeypatch.setenv("CALC_RATE_LIMIT_ROUTES", "/ws=0.01:2")
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:         # takes the first token
+            ws.send_json({"id": 1, "op": "add", "a": 1, "b": 2})
+            assert ws.receive_json() == {"id": 1, "result": 3.0}
+            ws.send_json({"id": 2, "op": "add", "a": 1, "b": 2})
+            reply = ws.receive_json()
+            assert (reply["id"], reply["error"]) == (2, "Rate limit exceeded.")
+        with pytest.raises(WebSocketDisconnect) as refused:
+            with client.websocket_connect("/ws"):
+                pass
+        assert refused.value.code == 1013
+        text = client.get("/metrics").text
+        assert "calc_ws_limited 1" in text
+        assert 'calc_requests_total{method="WS",route="/ws",status="429"} 1' in text
@@ -0,0 +1,76 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_batch.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the batch evaluation helpers in app/batch.py.
+# Verifies that mixed operations are evaluated in order and
+# that failing items are reported individually.
+# ----------------------------------------------------------
+
+import pytest
+from app.batch import evaluate_batch, evaluate_item
+
+
+# ----------------------------------------------------------
+# Test evaluate_item() for each supported operation
+# ----------------------------------------------------------
+@pytest.mark.parametrize("op, a, b, expected", [
+    ("add", 2, 3, 5),
+    ("subtract", 10, 4, 6),
+    ("multiply", 3, 4, 12),
+    ("divide", 9, 3, 3.0),
+])
+def test_evaluate_item(op, a, b, expected):
+    """Verify each operation name maps to the right arithmetic function."""
+    assert evaluate_item(op, a, b) == {"result": expected}
+
+
+# ----------------------------------------------------------
+# Test evaluate_item() error reporting
+# ----------------------------------------------------------
+@pytest.mark.parametrize("op, a, b, message", [
+    ("divide", 1, 0, "Cannot divide by zero."),
+    ("modulo", 1, 2, "Unsupported operation: modulo"),
+    ("add", "x", 2, "Both operands must be numbers."),
+])
+def test_evaluate_item_errors(op, a, b, message):
+    """Ensure failures are returned as error entries instead of raised."""
+    assert evaluate_item(op, a, b) == {"error": message}
+
+
+# ----------------------------------------------------------
+# Test evaluate_batch() keeps order and isolates errors
+# ----------------------------------------------------------
+def test_evaluate_batch_preserves_order():
+    """A failing item must not affect the items around it."""
+    items = [("add", 1, 1), ("divide", 1, 0), ("multiply", 2, 5)]
+    assert evaluate_batch(items) == [
+        {"result": 2},
+        {"error": "Cannot divide by zero."},
+        {"result": 10},
+    ]
+
+
+def test_evaluate_batch_empty():
+    """An empty batch yields an empty result list."""
+    assert evaluate_batch([]) == []
+
+
+def test_evaluate_batch_non_numeric_item():
+    """A non-numeric operand only fails its own item."""
+    assert evaluate_batch([("add", "x", 2), ("add", 1, 2)]) == [
+        {"error": "Both operands must be numbers."},
+        {"result": 3},
+    ]
+
+
+def test_evaluate_batch_overflow_fails_only_its_item():
+    """A result that overflows to inf is a per-item error, on both the vector and scalar paths."""
+    assert evaluate_batch([("multiply", 1e308, 10), ("add", 1, 2)]) == [
+        {"error": "Result is out of range."},
+        {"result": 3.0},
+    ]
+    assert evaluate_item("multiply", 1e308, 10) == {"error": "Result is out of range."}
@@ -0,0 +1,69 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_binary.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the packed binary batch format and content
+# negotiation in app/binary.py.
+# ----------------------------------------------------------
+
+import numpy as np
+import pytest
+from app.batch import MAX_BATCH_SIZE
+from app.binary import (
+    HEADER, MAGIC, BinaryFormatError, decode_request, decode_response, encode_request, encode_response,
+    is_binary, wants_json,
+)
+
+
+def test_request_round_trip_is_zero_copy():
+    body = encode_request([0, 3, 2], [1.5, 2.0, 3.0], [4.0, 0.0, -1.0])
+    assert len(body) == HEADER.size + 3 * 17
+    codes, a, b = decode_request(body)
+    assert codes.tolist() == [0, 3, 2]
+    assert a.tolist() == [1.5, 2.0, 3.0]
+    assert b.tolist() == [4.0, 0.0, -1.0]
+    assert not a.flags.owndata and not a.flags.writeable  # views over the body
+    assert a.flags.aligned and b.flags.aligned
+
+
+def test_response_round_trip_counts_errors():
+    body = encode_response(np.array([1.0, np.nan]), np.array([0, 1], dtype=np.uint8))
+    results, status, errors = decode_response(body)
+    assert results[0] == 1.0 and np.isnan(results[1])
+    assert status.tolist() == [0, 1]
+    assert errors == 1
+
+
+def test_empty_request():
+    codes, a, b = decode_request(encode_request([], [], []))
+    assert len(codes) == len(a) == len(b) == 0
+
+
+@pytest.mark.parametrize("body, message", [
+    (b"CAL1", "shorter than its header"),
+    (HEADER.pack(b"XXXX", 0, 0), "does not start with"),
+    (HEADER.pack(MAGIC, 2, 0) + b"\0" * 17, "does not match 2 rows"),
+    (HEADER.pack(MAGIC, MAX_BATCH_SIZE + 1, 0), "exceeds maximum size"),
+])
+def test_malformed_requests(body, message):
+    with pytest.raises(BinaryFormatError, match=message):
+        decode_request(body)
+
+
+def test_malformed_response():
+    with pytest.raises(BinaryFormatError):
+        decode_response(HEADER.pack(MAGIC, 3, 0))
+
+
+def test_negotiation():
+    assert is_binary(b"application/octet-stream")
+    assert is_binary(b"Application/Octet-Stream; charset=binary")
+    assert not is_binary(b"application/json")
+    assert not is_binary(None)
+    assert wants_json("application/json")
+    assert not wants_json("application/octet-stream, application/json;q=0.5")
+    assert not wants_json("*/*")
+    assert not wants_json(None)
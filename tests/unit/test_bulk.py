@@ -0,0 +1,120 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_bulk.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the offline bulk processor in app/bulk.py
+# and the `bulk` command in cli.py. Verifies JSONL and CSV
+# inputs, ordered output with and without a process pool,
+# and error reporting for malformed rows.
+# ----------------------------------------------------------
+
+import json
+import pytest
+from click.testing import CliRunner
+from app.bulk import chunked, process_file
+from cli import cli
+
+JSONL_ROWS = [
+    {"op": "add", "a": 1, "b": 2},
+    {"op": "divide", "a": 1, "b": 0},
+    {"op": "multiply", "a": 3, "b": 4},
+    {"op": "subtract", "a": 10, "b": 4},
+    {"op": "divide", "a": 9, "b": 3},
+]
+EXPECTED = [{"result": 3}, {"error": "Cannot divide by zero."}, {"result": 12}, {"result": 6}, {"result": 3}]
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    path = tmp_path / "input.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in JSONL_ROWS) + "\n\nnot json\n")
+    return path
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+# ----------------------------------------------------------
+# JSONL input
+# ----------------------------------------------------------
+@pytest.mark.parametrize("workers", [1, 2])
+def test_jsonl_results_keep_input_order(jsonl_file, tmp_path, workers):
+    out = tmp_path / "out.jsonl"
+    stats = process_file(str(jsonl_file), str(out), workers=workers, chunk_size=2)
+    assert read_jsonl(out) == EXPECTED + [{"error": "Invalid JSON."}]
+    assert stats.rows == 6
+    assert stats.errors == 2
+    assert stats.rows_per_second > 0
+
+
+def test_empty_jsonl_file(tmp_path):
+    src, out = tmp_path / "empty.jsonl", tmp_path / "out.jsonl"
+    src.write_text("")
+    stats = process_file(str(src), str(out), workers=1)
+    assert stats.rows == 0
+    assert stats.rows_per_second == 0.0
+    assert out.read_text() == ""
+
+
+# ----------------------------------------------------------
+# CSV input
+# ----------------------------------------------------------
+def test_csv_input(tmp_path):
+    src, out = tmp_path / "input.csv", tmp_path / "out.csv"
+    src.write_text("b,op,a\n2,add,1\n0,divide,5\nx,add,1\n\n4,multiply\n")
+    stats = process_file(str(src), str(out), workers=1)
+    assert out.read_text().splitlines() == [
+        "result,error",
+        "3.0,",
+        ",Cannot divide by zero.",
+        ",Invalid or missing numeric input.",
+        ",Invalid or missing numeric input.",
+    ]
+    assert (stats.rows, stats.errors) == (4, 3)
+
+
+def test_csv_missing_columns(tmp_path):
+    src = tmp_path / "bad.csv"
+    src.write_text("x,y\n1,2\n")
+    with pytest.raises(ValueError, match="op, a and b"):
+        process_file(str(src), str(tmp_path / "out.csv"), workers=1)
+
+
+def test_empty_csv_file(tmp_path):
+    src, out = tmp_path / "empty.csv", tmp_path / "out.csv"
+    src.write_text("")
+    assert process_file(str(src), str(out), workers=1).rows == 0
+    assert out.read_text() == "result,error\n"
+
+
+def test_unknown_format(jsonl_file, tmp_path):
+    with pytest.raises(ValueError, match="Unsupported format"):
+        process_file(str(jsonl_file), str(tmp_path / "out"), fmt="xml")
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+# ----------------------------------------------------------
+# CLI
+# ----------------------------------------------------------
+def test_cli_bulk_reports_rows_per_second(jsonl_file, tmp_path):
+    out = tmp_path / "out.jsonl"
+    result = CliRunner().invoke(cli, ["bulk", str(jsonl_file), str(out), "--workers", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Processed 6 rows (2 errors)" in result.output
+    assert "rows/sec" in result.output
+    assert read_jsonl(out)[0] == {"result": 3}
+
+
+def test_cli_bulk_reports_bad_input(tmp_path):
+    src = tmp_path / "bad.csv"
+    src.write_text("x\n1\n")
+    result = CliRunner().invoke(cli, ["bulk", str(src), str(tmp_path / "out.csv")])
+    assert result.exit_code != 0
+    assert "op, a and b" in result.output
@@ -0,0 +1,149 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_cache.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the LRU/TTL result cache in app/cache.py,
+# including negative caching of division errors and the
+# shared in-memory backend.
+# ----------------------------------------------------------
+
+import pytest
+from app import cache as cache_module
+from app.cache import CacheBackend, InMemoryBackend, ResultCache
+from app.operations import add, divide, multiply
+
+
+class CountingFunc:
+    """Wraps an operation and counts how often it really runs."""
+
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, a, b):
+        self.calls += 1
+        return self.func(a, b)
+
+
+# ----------------------------------------------------------
+# Hits, misses and LRU eviction
+# ----------------------------------------------------------
+def test_repeated_operands_hit_the_cache():
+    cache, func = ResultCache(maxsize=8), CountingFunc(add)
+    assert cache.get_or_compute("add", 2, 3, func) == 5
+    assert cache.get_or_compute("add", 2, 3, func) == 5
+    assert func.calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_removes_least_recent():
+    cache, func = ResultCache(maxsize=2), CountingFunc(add)
+    cache.get_or_compute("add", 1, 1, func)
+    cache.get_or_compute("add", 2, 2, func)
+    cache.get_or_compute("add", 1, 1, func)  # refresh (1, 1)
+    cache.get_or_compute("add", 3, 3, func)  # evicts (2, 2)
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    cache.get_or_compute("add", 1, 1, func)
+    assert func.calls == 3
+    cache.get_or_compute("add", 2, 2, func)
+    assert func.calls == 4
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache, func = ResultCache(maxsize=8, ttl=5), CountingFunc(add)
+    cache.get_or_compute("add", 1, 2, func)
+    now[0] += 4
+    cache.get_or_compute("add", 1, 2, func)
+    assert func.calls == 1
+    now[0] += 2
+    cache.get_or_compute("add", 1, 2, func)
+    assert func.calls == 2
+
+
+# ----------------------------------------------------------
+# Negative caching and bypass rules
+# ----------------------------------------------------------
+def test_division_errors_are_cached():
+    cache, func = ResultCache(), CountingFunc(divide)
+    for _ in range(3):
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            cache.get_or_compute("divide", 4, 0, func)
+    assert func.calls == 1
+
+
+def test_other_exceptions_are_not_cached():
+    cache = ResultCache()
+
+    def broken(a, b):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("add", 1, 2, broken)
+    assert len(cache) == 0
+
+
+def test_zero_operands_bypass_cache():
+    """-0.0 == 0.0, so caching would return the wrong signed zero."""
+    cache = ResultCache()
+    assert str(cache.get_or_compute("multiply", -0.0, 5, multiply)) == "-0.0"
+    assert str(cache.get_or_compute("multiply", 0.0, 5, multiply)) == "0.0"
+    assert len(cache) == 0
+
+
+def test_clear():
+    cache = ResultCache()
+    cache.get_or_compute("add", 1, 2, add)
+    cache.clear()
+    assert len(cache) == 0
+
+
+# ----------------------------------------------------------
+# Shared backend
+# ----------------------------------------------------------
+def test_shared_backend_serves_other_workers():
+    backend = InMemoryBackend()
+    worker_a, worker_b = ResultCache(backend=backend), ResultCache(backend=backend)
+    func = CountingFunc(add)
+    worker_a.get_or_compute("add", 4, 5, func)
+    assert worker_b.get_or_compute("add", 4, 5, func) == 9
+    assert func.calls == 1
+    assert worker_b.shared_hits == 1
+
+    divide_func = CountingFunc(divide)
+    with pytest.raises(ValueError):
+        worker_a.get_or_compute("divide", 1, 0, divide_func)
+    with pytest.raises(ValueError):
+        worker_b.get_or_compute("divide", 1, 0, divide_func)
+    assert divide_func.calls == 1
+
+
+def test_in_memory_backend_bounds_and_ttl(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    backend = InMemoryBackend(maxsize=2)
+    backend.set("a", 1, ttl=1)
+    backend.set("b", 2)
+    backend.set("c", 3)
+    assert backend.get("a") is None  # evicted by size
+    backend.set("d", 4, ttl=1)
+    now[0] += 2
+    assert backend.get("d") is None  # expired
+    assert backend.get("c") == 3
+
+
+def test_backend_interface_is_abstract():
+    class GetOnly(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        CacheBackend()
+    with pytest.raises(TypeError):
+        GetOnly()  # set() not implemented
@@ -0,0 +1,142 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_compression.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for Accept-Encoding negotiation, the encoders
+# and CompressionMiddleware in app/compression.py, driven
+# with minimal ASGI apps.
+# ----------------------------------------------------------
+
+import asyncio
+import gzip
+import zlib
+import pytest
+from app import compression
+from app.compression import CompressionMiddleware, GzipEncoder, compress, compressible, negotiate
+
+
+# ----------------------------------------------------------
+# Negotiation
+# ----------------------------------------------------------
+@pytest.mark.parametrize("header, available, expected", [
+    ("gzip, deflate", ("gzip",), "gzip"),
+    ("gzip, br", ("gzip", "br"), "br"),
+    ("br;q=0.5, gzip", ("gzip", "br"), "gzip"),
+    ("gzip;q=0", ("gzip",), None),
+    ("*", ("gzip",), "gzip"),
+    ("*;q=0, identity", ("gzip",), None),
+    ("deflate", ("gzip",), None),
+    ("gzip;q=abc", ("gzip",), None),
+    ("GZIP", ("gzip",), "gzip"),
+])
+def test_negotiate(header, available, expected):
+    assert negotiate(header, available) == expected
+
+
+def test_compressible_types():
+    assert compressible("application/json")
+    assert compressible("text/html; charset=utf-8")
+    assert compressible("application/x-ndjson")
+    assert not compressible("image/png")
+    assert not compressible("")
+
+
+# ----------------------------------------------------------
+# Encoders
+# ----------------------------------------------------------
+def test_gzip_round_trip_and_streaming_chunks_decode_on_arrival():
+    data = b'{"result": 1.5}' * 200
+    assert gzip.decompress(compress(data, "gzip")) == data
+
+    encoder = GzipEncoder()
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    first = encoder.compress(b"line-1\n")
+    assert decoder.decompress(first) == b"line-1\n"  # sync flush: no waiting for more input
+    assert decoder.decompress(encoder.finish(b"line-2\n")) == b"line-2\n"
+    assert decoder.eof
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+def test_brotli_round_trip():  # pragma: no cover - optional dependency
+    data = b'{"result": 1.5}' * 200
+    assert compression.brotli.decompress(compress(data, "br")) == data
+
+
+# ----------------------------------------------------------
+# Middleware
+# ----------------------------------------------------------
+def make_app(body: bytes, content_type: bytes = b"application/json", status: int = 200,
+             chunks: int = 1, extra_headers=()):
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type), *extra_headers]
+        if chunks == 1:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        for n in range(chunks):
+            await send({"type": "http.response.body", "body": body, "more_body": n < chunks - 1})
+    return app
+
+
+def call(app, accept: bytes = b"gzip", scope_type: str = "http"):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    scope = {"type": scope_type, "headers": [(b"accept-encoding", accept)] if accept else []}
+    asyncio.run(CompressionMiddleware(app, minimum_size=100)(scope, receive, send))
+    start = sent[0]
+    return start, dict(start["headers"]), b"".join(m.get("body", b"") for m in sent[1:]), sent
+
+
+def test_large_json_is_compressed():
+    body = b'{"results": [' + b'{"result": 2.0},' * 100 + b"]}"
+    start, headers, wire, _ = call(make_app(body, extra_headers=[(b"etag", b'"abc"')]))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"vary"] == b"Accept-Encoding"
+    assert headers[b"etag"] == b'W/"abc"'
+    assert int(headers[b"content-length"]) == len(wire) < len(body)
+    assert gzip.decompress(wire) == body
+
+
+@pytest.mark.parametrize("app, accept", [
+    (make_app(b"x" * 50), b"gzip"),                              # below minimum_size
+    (make_app(b"x" * 500, content_type=b"image/png"), b"gzip"),  # not a text type
+    (make_app(b"x" * 500, status=304), b"gzip"),
+    (make_app(b"x" * 500, extra_headers=[(b"content-encoding", b"br")]), b"gzip"),
+    (make_app(b"x" * 500), b"deflate"),                          # nothing acceptable
+    (make_app(b"x" * 500), b""),
+    (make_app(bytes(range(256)) * 1), b"gzip"),                  # would not shrink
+])
+def test_ineligible_responses_pass_through(app, accept):
+    _, headers, wire, _ = call(app, accept)
+    assert b"content-encoding" not in headers or headers[b"content-encoding"] == b"br"
+    assert wire in (b"x" * 50, b"x" * 500, bytes(range(256)))
+
+
+def test_streaming_response_is_compressed_per_chunk():
+    line = b'{"id": 1, "result": 2.0}\n'
+    start, headers, wire, sent = call(make_app(line, content_type=b"application/x-ndjson", chunks=3))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    assert [m["more_body"] for m in sent[1:]] == [True, True, False]
+    assert gzip.decompress(wire) == line * 3
+
+
+def test_non_http_scope_passes_through():
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "lifespan.startup.complete"})
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(CompressionMiddleware(app)({"type": "lifespan"}, None, send))
+    assert sent == [{"type": "lifespan.startup.complete"}]
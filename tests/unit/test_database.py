@@ -0,0 +1,190 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_database.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for driver selection, the bounded thread-pool
+# query path and pool statistics in app/database.py, run
+# against a temporary SQLite file.
+# ----------------------------------------------------------
+
+import asyncio
+import threading
+import pytest
+from sqlalchemy import select
+from app import database as database_module
+from app.database import Database, async_url, sync_url
+from app.db import _ensure_user_generic, calculations, create_db_engine, ensure_user, users
+
+
+# ----------------------------------------------------------
+# Driver selection
+# ----------------------------------------------------------
+def test_async_url_is_none_without_an_async_driver(monkeypatch):
+    monkeypatch.setattr(database_module, "find_spec",
+                        lambda name: object() if name == "greenlet" else None)
+    assert async_url("sqlite:///calc.db") is None
+    assert async_url("postgresql://user:pw@db/calc") is None
+
+
+def test_async_url_picks_installed_driver(monkeypatch):
+    monkeypatch.setattr(database_module, "find_spec", lambda name: object())
+    assert async_url("postgresql://user:pw@db/calc").drivername == "postgresql+asyncpg"
+    assert async_url("sqlite:///calc.db").drivername == "sqlite+aiosqlite"
+    assert async_url("postgresql+asyncpg://db/calc").drivername == "postgresql+asyncpg"
+
+
+def test_async_url_needs_greenlet(monkeypatch):
+    monkeypatch.setattr(database_module, "find_spec",
+                        lambda name: None if name == "greenlet" else object())
+    assert async_url("postgresql://db/calc") is None
+
+
+def test_sync_url_drops_async_driver():
+    assert sync_url("postgresql+asyncpg://user:pw@db/calc").drivername == "postgresql"
+    assert sync_url("postgresql+psycopg2://db/calc").drivername == "postgresql+psycopg2"
+
+
+def test_create_db_engine_passes_pool_timeouts():
+    engine = create_db_engine("postgresql://user:pw@localhost/db", pool_timeout=2.5, pool_recycle=600)
+    assert engine.pool._timeout == 2.5
+    assert engine.pool._recycle == 600
+    engine.dispose()
+
+
+# ----------------------------------------------------------
+# Query paths: AsyncEngine (aiosqlite) and the thread pool
+# ----------------------------------------------------------
+def open_database(tmp_path, mode, **pool):
+    database = Database(f"sqlite:///{tmp_path / 'calc.db'}", prefer_async=mode == "async", **pool)
+    assert database.mode == mode
+    database.init_schema(default_user_id=1)
+    return database
+
+
+@pytest.fixture(params=["async", "threadpool"])
+def database(request, tmp_path):
+    database = open_database(tmp_path, request.param, pool_size=1, max_overflow=0)
+    yield database
+    asyncio.run(database.close())
+
+
+@pytest.fixture
+def threadpool_database(tmp_path):
+    database = open_database(tmp_path, "threadpool", pool_size=1, max_overflow=0)
+    yield database
+    asyncio.run(database.close())
+
+
+def count_rows(conn):
+    return len(conn.execute(select(calculations.c.id)).all())
+
+
+def test_run_executes_on_a_pooled_connection(database):
+    with database.engine.begin() as conn:
+        conn.execute(calculations.insert(), [
+            {"operation": "add", "operand_a": 1, "operand_b": 2, "result": 3, "user_id": 1}
+        ])
+    assert asyncio.run(database.run(count_rows)) == 1
+    assert database.pool_stats()["busy"] == 0
+
+
+def test_run_is_bounded_by_pool_size_and_reports_waiting(threadpool_database):
+    database = threadpool_database  # async calls run on the loop thread, so they cannot block here
+    release = threading.Event()
+    seen = {}
+
+    def blocking(conn):
+        release.wait(5)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(database.run(blocking))
+        second = asyncio.ensure_future(database.run(count_rows))
+        for _ in range(200):  # wait for the first call to occupy the only thread
+            await asyncio.sleep(0.01)
+            if database.busy == 1:
+                break
+        seen.update(database.pool_stats())
+        release.set()
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(scenario()) == ["done", 0]
+    assert seen["busy"] == 1 and seen["waiting"] == 1
+    assert database.pool_stats()["waiting"] == 0
+
+
+def test_run_propagates_errors(database):
+    def failing(conn):
+        raise ValueError("Invalid cursor.")
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        asyncio.run(database.run(failing))
+    assert database.busy == 0 and database.waiting == 0
+
+
+def test_pool_stats_include_queue_pool_counters(tmp_path):
+    database = Database("postgresql://user:pw@localhost/db", pool_size=3, max_overflow=2,
+                        prefer_async=False)
+    stats = database.pool_stats()
+    assert stats["size"] == 3 and stats["checked_out"] == 0
+    assert {"busy", "waiting", "checked_in", "overflow"} <= set(stats)
+    asyncio.run(database.close())
+
+
+@pytest.mark.parametrize("mode", ["async", "threadpool"])
+def test_warm_opens_pooled_connections(tmp_path, mode):
+    database = Database(f"sqlite:///{tmp_path / 'calc.db'}", pool_size=3, max_overflow=0,
+                        prefer_async=mode == "async")
+    assert database.engine.pool.checkedin() == 0
+    asyncio.run(database.warm(3))
+    # aiosqlite engines use a NullPool, so in async mode only the writer's sync pool keeps a connection
+    assert database.engine.pool.checkedin() == (1 if mode == "async" else 3)
+    asyncio.run(database.close())
+
+
+def test_init_schema_creates_the_default_user(tmp_path):
+    database = Database(f"sqlite:///{tmp_path / 'calc.db'}", prefer_async=False)
+    database.init_schema(default_user_id=1)
+    database.init_schema(default_user_id=1)  # idempotent
+    with database.engine.connect() as conn:
+        assert conn.execute(select(users.c.id, users.c.username)).all() == [(1, "user1")]
+    asyncio.run(database.close())
+
+
+def test_init_schema_tolerates_workers_starting_together(tmp_path):
+    """Several workers setting up the same database at once all start; one creates the user."""
+    url = f"sqlite:///{tmp_path / 'calc.db'}"
+    databases = [Database(url, prefer_async=False) for _ in range(4)]
+    start, errors = threading.Barrier(len(databases)), []
+
+    def worker(database):
+        start.wait()
+        try:
+            database.init_schema(default_user_id=1)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(database,)) for database in databases]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    with databases[0].engine.connect() as conn:
+        assert conn.execute(select(users.c.id)).all() == [(1,)]
+    for database in databases:
+        asyncio.run(database.close())
+
+
+def test_ensure_user_reports_whether_it_created_the_row(tmp_path):
+    database = Database(f"sqlite:///{tmp_path / 'calc.db'}", prefer_async=False)
+    database.init_schema()
+    assert ensure_user(database.engine, 7) is True
+    assert ensure_user(database.engine, 7) is False
+    with database.engine.begin() as conn:  # portable fallback for other backends
+        assert _ensure_user_generic(conn, {"id": 8, "username": "user8", "email": "user8@localhost"}) is True
+        assert _ensure_user_generic(conn, {"id": 8, "username": "user8", "email": "user8@localhost"}) is False
+    asyncio.run(database.close())
@@ -0,0 +1,129 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_expressions.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the expression compiler and the scalar and
+# vectorized evaluators in app/expressions.py.
+# ----------------------------------------------------------
+
+import inspect
+import sys
+import pytest
+from app import expressions
+from app.expressions import (
+    BINARY, NEGATE, PUSH_CONST, PUSH_VAR, ExpressionError, compile_expression, evaluate, evaluate_many,
+)
+
+
+# ----------------------------------------------------------
+# Compilation
+# ----------------------------------------------------------
+def test_compile_produces_postfix_program_and_variables():
+    compiled = compile_expression("(a + b) * -c")
+    assert compiled.program == (
+        (PUSH_VAR, "a"), (PUSH_VAR, "b"), (BINARY, "add"),
+        (PUSH_VAR, "c"), (NEGATE, None), (BINARY, "multiply"),
+    )
+    assert compiled.variables == ("a", "b", "c")
+
+
+def test_compile_folds_constant_subexpressions():
+    assert compile_expression("x * (2 + 3) / -(+4)").program == (
+        (PUSH_VAR, "x"), (PUSH_CONST, 5.0), (BINARY, "multiply"), (PUSH_CONST, -4.0), (BINARY, "divide"),
+    )
+
+
+def test_compile_keeps_constant_division_by_zero_for_evaluation():
+    compiled = compile_expression("1 / 0")
+    assert compiled.program[-1] == (BINARY, "divide")
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        evaluate(compiled, {})
+
+
+def test_compile_is_cached_by_text():
+    compile_expression.cache_clear()
+    first = compile_expression("a + 1")
+    assert compile_expression("a + 1") is first
+    assert compile_expression.cache_info().hits == 1
+
+
+@pytest.mark.parametrize("text", [
+    "a ** 2", "a // 2", "a % 2", "f(a)", "a.b", "a[0]", "'x' + a", "True + 1", "1j", "a if b else c",
+    "a +", "", "__import__('os')", "lambda: 1", "10" * 400,
+])
+def test_compile_rejects_unsupported_expressions(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+
+def test_compile_rejects_overlong_expressions():
+    with pytest.raises(ExpressionError, match="exceeds"):
+        compile_expression("a + " * expressions.MAX_EXPRESSION_LENGTH + "a")
+
+
+@pytest.mark.parametrize("text", ["-" * 999 + "1", "1 - (" * 101 + "1" + ")" * 101])
+def test_compile_rejects_deep_nesting(text):
+    with pytest.raises(ExpressionError, match="nesting exceeds 100 levels"):
+        compile_expression(text)
+
+
+def test_compile_accepts_long_left_associative_chains():
+    compiled = compile_expression(" + ".join(["a"] * 249))
+    assert evaluate(compiled, {"a": 2}) == 498
+
+
+def test_compile_turns_recursion_errors_into_expression_errors():
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + 60)
+    try:
+        with pytest.raises(ExpressionError, match="nesting exceeds"):
+            compile_expression(" + ".join(["b"] * 200))
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+# ----------------------------------------------------------
+# Scalar evaluation
+# ----------------------------------------------------------
+def test_evaluate_scalar():
+    assert evaluate(compile_expression("(a + b) * c / 2 - 1"), {"a": 1, "b": 2, "c": 4}) == 5.0
+
+
+def test_evaluate_scalar_errors():
+    with pytest.raises(ExpressionError, match="Missing value for variable: b"):
+        evaluate(compile_expression("a + b"), {"a": 1})
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        evaluate(compile_expression("a / (b - 1)"), {"a": 1, "b": 1})
+    with pytest.raises(ExpressionError, match="out of range"):
+        evaluate(compile_expression("a * a"), {"a": 1e200})
+
+
+# ----------------------------------------------------------
+# Vectorized evaluation
+# ----------------------------------------------------------
+def test_evaluate_many_matches_scalar_results():
+    compiled = compile_expression("(a - b) * c / (b + 1) + -a")
+    bindings = [{"a": i, "b": i % 7, "c": 0.5 * i} for i in range(200)]
+    results = evaluate_many(compiled, bindings)
+    assert results == [{"result": pytest.approx(evaluate(compiled, binding))} for binding in bindings]
+
+
+def test_evaluate_many_reports_errors_per_row():
+    compiled = compile_expression("a / (b - 1) * 2")
+    results = evaluate_many(compiled, [
+        {"a": 4, "b": 3}, {"a": 4, "b": 1}, {"a": 4}, {"a": 1e308, "b": 1.5},
+    ])
+    assert results == [
+        {"result": 4.0},
+        {"error": "Cannot divide by zero."},
+        {"error": "Missing value for variable: b"},
+        {"error": "Result is out of range."},
+    ]
+
+
+def test_evaluate_many_without_variables_or_bindings():
+    assert evaluate_many(compile_expression("2 * 3"), [{}, {}]) == [{"result": 6.0}, {"result": 6.0}]
+    assert evaluate_many(compile_expression("a"), []) == []
@@ -0,0 +1,79 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_fastpath.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the body parsing and validation helpers of
+# the fast-path arithmetic handlers in app/fastpath.py.
+# ----------------------------------------------------------
+
+import pytest
+from app.fastpath import is_json_content_type, parse_operands, precise_options, to_float
+
+
+# ----------------------------------------------------------
+# Lax float coercion (mirrors Pydantic float fields)
+# ----------------------------------------------------------
+@pytest.mark.parametrize("value, expected", [
+    (1, 1.0), (2.5, 2.5), (True, 1.0), ("3", 3.0), (" 4 ", 4.0), ("1e3", 1000.0),
+    (2 ** 70, float(2 ** 70)),
+])
+def test_to_float_accepts_numbers_and_numeric_strings(value, expected):
+    assert to_float(value) == expected
+
+
+@pytest.mark.parametrize("value", [None, "", "abc", "0x10", [1], {"a": 1}, 10 ** 400, "\uff11", "\u0663"])
+def test_to_float_rejects_invalid_values(value):
+    assert to_float(value) is None
+
+
+# ----------------------------------------------------------
+# Body parsing
+# ----------------------------------------------------------
+def test_parse_operands_valid_body():
+    assert parse_operands(b'{"a": 10, "b": "2.5"}') == (10.0, 2.5)
+
+
+def test_parse_operands_accepts_integers_wider_than_64_bits():
+    assert parse_operands(b'{"a": 1180591620717411303424, "b": 1}') == (float(2 ** 70), 1.0)
+
+
+@pytest.mark.parametrize("body", [
+    b"", b"not json", b"[1, 2]", b'{"a": 1}', b'{"a": null, "b": 2}', b'{"a": "x", "b": 2}', b"\xff",
+])
+def test_parse_operands_invalid_body(body):
+    assert parse_operands(body) is None
+
+
+def test_parse_operands_leaves_exact_modes_to_app_precision():
+    assert parse_operands(b'{"a": 1, "b": 2, "precision": "float"}') == (1.0, 2.0)
+    assert parse_operands(b'{"a": 1, "b": 2, "precision": "decimal"}') is None
+
+
+@pytest.mark.parametrize("data, expected", [
+    ({"a": "0.1", "b": 2, "precision": "decimal"}, ("0.1", 2, "decimal", 28)),
+    ({"a": 1, "b": 2.5, "precision": "fraction", "digits": "7"}, (1, 2.5, "fraction", 7)),
+    ({"a": 1, "b": 2, "precision": "decimal", "digits": 12.0}, (1, 2, "decimal", 12)),
+    ({"a": 1, "b": 2, "precision": "binary"}, None),
+    ({"a": 1, "b": 2, "precision": "decimal", "digits": 0}, None),
+    ({"a": 1, "b": 2, "precision": "decimal", "digits": "many"}, None),
+    ({"a": 1, "b": 2, "precision": "decimal", "digits": 1.5}, None),
+    ({"a": False, "b": 2, "precision": "decimal"}, None),
+    ({"b": 2, "precision": "fraction"}, None),
+])
+def test_precise_options_mirror_the_pydantic_model(data, expected):
+    assert precise_options(data) == expected
+
+
+@pytest.mark.parametrize("content_type, expected", [
+    (None, True),
+    (b"application/json", True),
+    (b"Application/JSON; charset=utf-8", True),
+    (b"application/merge-patch+json", True),
+    (b"text/plain", False),
+    (b"application/x-www-form-urlencoded", False),
+])
+def test_is_json_content_type(content_type, expected):
+    assert is_json_content_type(content_type) is expected
@@ -0,0 +1,163 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_history.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the keyset-paginated history queries in
+# app/history.py and the index migration, run against a
+# temporary SQLite file in place of PostgreSQL.
+# ----------------------------------------------------------
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+from app.db import calculations, create_db_engine, init_db
+from app.history import decode_cursor, encode_cursor, fetch_history, to_naive_utc
+
+BASE_TIME = datetime(2025, 11, 3, 12, 0, 0)
+
+
+# ----------------------------------------------------------
+# Fixture: SQLite engine with 25 rows over two users
+# ----------------------------------------------------------
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'calc.db'}")
+    init_db(engine)
+    rows = [
+        {"operation": "add" if i % 2 else "multiply", "operand_a": i, "operand_b": 1, "result": i + 1,
+         "user_id": 1 if i < 20 else 2,
+         # rows 10 and 11 share a timestamp to exercise the id tiebreaker
+         "timestamp": BASE_TIME + timedelta(minutes=min(i, 10) if i <= 11 else i)}
+        for i in range(25)
+    ]
+    with engine.begin() as conn:
+        conn.execute(calculations.insert(), rows)
+    yield engine
+    engine.dispose()
+
+
+# ----------------------------------------------------------
+# Cursor encoding
+# ----------------------------------------------------------
+def test_cursor_round_trip():
+    token = encode_cursor(BASE_TIME, 42)
+    assert "=" not in token
+    assert decode_cursor(token) == (BASE_TIME, 42)
+
+
+@pytest.mark.parametrize("token", ["", "!!!", encode_cursor(BASE_TIME, 1)[:-3], "bm90LWEtY3Vyc29y"])
+def test_decode_cursor_rejects_malformed_tokens(token):
+    with pytest.raises(ValueError, match="Invalid cursor."):
+        decode_cursor(token)
+
+
+def test_to_naive_utc():
+    aware = datetime(2025, 11, 3, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+    assert to_naive_utc(aware) == datetime(2025, 11, 3, 12, 0)
+    assert to_naive_utc(BASE_TIME) is BASE_TIME
+    assert to_naive_utc(None) is None
+
+
+# ----------------------------------------------------------
+# History queries
+# ----------------------------------------------------------
+def test_pages_walk_all_rows_newest_first_without_gaps(engine):
+    seen, cursor = [], None
+    while True:
+        items, cursor = fetch_history(engine, user_id=1, limit=6, cursor=cursor)
+        seen += items
+        if cursor is None:
+            break
+    assert len(seen) == 20
+    keys = [(item["timestamp"], item["id"]) for item in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert len(set(keys)) == 20
+    assert {item["user_id"] for item in seen} == {1}
+
+
+def test_filters_by_operation_and_time_range(engine):
+    items, cursor = fetch_history(
+        engine, user_id=1, operation="add",
+        start=BASE_TIME + timedelta(minutes=12), end=BASE_TIME + timedelta(minutes=17),
+    )
+    assert cursor is None
+    assert [item["operand_a"] for item in items] == [15.0, 13.0]
+    assert items[0]["timestamp"] == (BASE_TIME + timedelta(minutes=15)).isoformat()
+
+
+def test_query_without_user_and_with_connection(engine):
+    with engine.connect() as conn:
+        items, cursor = fetch_history(conn, operation="multiply", limit=100)
+    assert cursor is None
+    assert len(items) == 13
+    assert {item["user_id"] for item in items} == {1, 2}
+
+
+def test_invalid_cursor_raises(engine):
+    with pytest.raises(ValueError):
+        fetch_history(engine, user_id=1, cursor="garbage")
+
+
+# ----------------------------------------------------------
+# Migrations: upgrade a database created from raw SQL
+# ----------------------------------------------------------
+def test_migrations_add_indexes_and_seed_stats_rollup(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(50), "
+                          "email VARCHAR(100), created_at TIMESTAMP)"))
+        conn.execute(text("CREATE TABLE calculations (id INTEGER PRIMARY KEY, operation VARCHAR(20), "
+                          "operand_a FLOAT, operand_b FLOAT, result FLOAT, timestamp TIMESTAMP, "
+                          "user_id INTEGER REFERENCES users(id))"))
+        conn.execute(text("INSERT INTO calculations (operation, operand_a, operand_b, result, user_id) "
+                          "VALUES ('add', 1, 2, 3, 1), ('add', 4, 4, 8, 1), ('divide', 1, 2, 0.5, 2)"))
+
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+
+    def index_names():
+        return {index["name"] for index in inspect(engine).get_indexes("calculations")}
+
+    command.upgrade(config, "head")
+    assert {"ix_calculations_user_id_timestamp", "ix_calculations_operation_timestamp"} <= index_names()
+    with engine.connect() as conn:
+        seeded = conn.execute(text("SELECT user_id, operation, count, total, min_result, max_result "
+                                   "FROM calculation_stats ORDER BY user_id")).all()
+    assert seeded == [(1, "add", 2, 11.0, 3.0, 8.0), (2, "divide", 1, 0.5, 0.5, 0.5)]
+    command.upgrade(config, "head")  # idempotent
+    command.downgrade(config, "base")
+    assert not index_names() & {"ix_calculations_user_id_timestamp", "ix_calculations_operation_timestamp"}
+    assert not inspect(engine).has_table("calculation_stats")
+    engine.dispose()
+
+
+def test_stats_migration_backfills_a_table_created_by_the_app(tmp_path):
+    """The app's init_db() creates calculation_stats empty; the migration still counts old rows."""
+    url = f"sqlite:///{tmp_path / 'calc.db'}"
+    engine = create_db_engine(url)
+    init_db(engine)
+    with engine.begin() as conn:
+        conn.execute(calculations.insert(), [
+            {"operation": "add", "operand_a": 1, "operand_b": 2, "result": 3, "user_id": 1},
+            {"operation": "add", "operand_a": 4, "operand_b": 4, "result": 8, "user_id": 1},
+        ])
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+    with engine.connect() as conn:
+        rollup = conn.execute(text("SELECT user_id, operation, count, total FROM calculation_stats")).all()
+    assert rollup == [(1, "add", 2, 11.0)]
+    engine.dispose()
+
+
+def test_init_db_creates_history_indexes(engine):
+    names = {index["name"] for index in inspect(engine).get_indexes("calculations")}
+    assert {"ix_calculations_user_id_timestamp", "ix_calculations_operation_timestamp"} <= names
@@ -0,0 +1,86 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_http_cache.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the cached template and the conditional
+# request checks in app/http_cache.py.
+# ----------------------------------------------------------
+
+import os
+from email.utils import formatdate
+import pytest
+from fastapi.templating import Jinja2Templates
+from app.http_cache import CachedTemplate, etag_for, not_modified
+
+
+@pytest.fixture
+def page_dir(tmp_path):
+    template = tmp_path / "page.html"
+    template.write_text("<h1>v1</h1>")
+    os.utime(template, (1_700_000_000, 1_700_000_000))
+    return tmp_path
+
+
+def test_page_is_rendered_once_and_re_rendered_when_the_file_changes(page_dir):
+    cached = CachedTemplate(Jinja2Templates(directory=str(page_dir)), "page.html")
+    first = cached.page()
+    assert cached.page() is first
+    assert cached.renders == 1
+    assert first.body == b"<h1>v1</h1>"
+    assert first.etag == etag_for(first.body)
+    assert first.last_modified == formatdate(1_700_000_000, usegmt=True)
+
+    (page_dir / "page.html").write_text("<h1>v2</h1>")
+    os.utime(page_dir / "page.html", (1_700_000_100, 1_700_000_100))
+    second = cached.page()
+    assert second.body == b"<h1>v2</h1>"
+    assert second.etag != first.etag
+    assert cached.renders == 2
+
+
+def test_templates_factory_is_called_on_first_render(page_dir):
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return Jinja2Templates(directory=str(page_dir))
+
+    cached = CachedTemplate(factory, "page.html")
+    assert calls == []
+    cached.page()
+    cached.page()
+    assert calls == [1]
+
+
+def test_response_headers_and_304(page_dir):
+    cached = CachedTemplate(Jinja2Templates(directory=str(page_dir)), "page.html")
+    response = cached.response({})
+    assert response.status_code == 200
+    assert response.body == b"<h1>v1</h1>"
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["content-type"].startswith("text/html")
+
+    revalidated = cached.response({"if-none-match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.body == b""
+    assert revalidated.headers["etag"] == response.headers["etag"]
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({}, False),
+    ({"if-none-match": '"abc"'}, True),
+    ({"if-none-match": 'W/"abc"'}, True),                  # weak comparison
+    ({"if-none-match": '"old", "abc"'}, True),
+    ({"if-none-match": "*"}, True),
+    ({"if-none-match": '"old"'}, False),
+    ({"if-none-match": '"old"', "if-modified-since": formatdate(2_000, usegmt=True)}, False),
+    ({"if-modified-since": formatdate(1_000, usegmt=True)}, True),
+    ({"if-modified-since": formatdate(2_000, usegmt=True)}, True),
+    ({"if-modified-since": formatdate(999, usegmt=True)}, False),
+    ({"if-modified-since": "not a date"}, False),
+])
+def test_not_modified(headers, expected):
+    assert not_modified(headers, '"abc"', 1_000) is expected
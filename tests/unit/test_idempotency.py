@@ -0,0 +1,170 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_idempotency.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for request fingerprints, key validation, the
+# response store and single-flight coalescing in
+# app/idempotency.py, driven with a minimal ASGI app.
+# ----------------------------------------------------------
+
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from app.cache import InMemoryBackend
+from app.idempotency import (
+    IdempotencyMiddleware, IdempotencyStore, StoredResponse, fingerprint, valid_key,
+)
+
+
+# ----------------------------------------------------------
+# Fingerprints and keys
+# ----------------------------------------------------------
+def test_fingerprint_canonicalizes_json():
+    assert fingerprint("POST", "/add", b'{"a": 1, "b": 2}') == fingerprint("POST", "/add", b'{"b":2,"a":1}')
+    assert fingerprint("POST", "/add", b'{"a": 1, "b": 2}') != fingerprint("POST", "/add", b'{"a": 1, "b": 3}')
+    assert fingerprint("POST", "/add", b"{}") != fingerprint("POST", "/subtract", b"{}")
+    assert fingerprint("POST", "/add", b"not json") == fingerprint("POST", "/add", b"not json")
+
+
+@pytest.mark.parametrize("key, valid", [
+    (b"retry-1", True), (b"a" * 255, True), (b"", False), (b"a" * 256, False),
+    (b"has space", False), ("ключ".encode(), False),
+])
+def test_valid_key(key, valid):
+    assert valid_key(key) is valid
+
+
+# ----------------------------------------------------------
+# Store
+# ----------------------------------------------------------
+def test_store_evicts_oldest_and_expires(monkeypatch):
+    store = IdempotencyStore(maxsize=2, ttl=10)
+    response = StoredResponse("f", 200, (), b"{}")
+    for key in ("a", "b", "c"):
+        store.put(("/add", "", key), response)
+    assert store.get(("/add", "", "a")) is None
+    assert store.get(("/add", "", "c")) is response
+    assert store.stats()["stored"] == 3
+
+    clock = [1000.0]
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: clock[0])
+    store.put(("/add", "", "d"), response)
+    clock[0] += 11
+    assert store.get(("/add", "", "d")) is None
+
+
+def test_store_accepts_a_shared_backend():
+    backend = InMemoryBackend()
+    IdempotencyStore(backend=backend).put(("/add", "", "k"), StoredResponse("f", 200, (), b"1"))
+    assert IdempotencyStore(backend=backend).get(("/add", "", "k")).body == b"1"
+
+
+# ----------------------------------------------------------
+# Middleware
+# ----------------------------------------------------------
+class SlowApp:
+    """Counts calls; responds with the request body after yielding to the loop."""
+
+    def __init__(self, status=200, fail=False):
+        self.calls = 0
+        self.status = status
+        self.fail = fail
+        self.state = SimpleNamespace(idempotency=IdempotencyStore())
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        body = (await receive())["body"]
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("boom")
+        await send({"type": "http.response.start", "status": self.status, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+
+def call(middleware, app, body=b'{"a": 1}', key=b"k1", path="/add", method="POST"):
+    headers = [(b"idempotency-key", key)] if key is not None else []
+    scope = {"type": "http", "method": method, "path": path, "headers": headers, "app": app}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await middleware(scope, receive, send)
+        start = sent[0]
+        return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+    return run()
+
+
+def test_concurrent_duplicates_share_one_computation():
+    app = SlowApp()
+    middleware = IdempotencyMiddleware(app)
+
+    async def scenario():
+        return await asyncio.gather(*(call(middleware, app) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert app.calls == 1
+    assert {body for _, _, body in results} == {b'{"a": 1}'}
+    assert sum(1 for _, headers, _ in results if headers.get(b"idempotent-replayed") == b"true") == 4
+    assert app.state.idempotency.stats() == \
+        {"stored": 1, "replayed": 0, "coalesced": 4, "conflicts": 0, "in_flight": 0}
+
+
+def test_later_retry_replays_and_new_body_conflicts():
+    app = SlowApp(status=400)
+    middleware = IdempotencyMiddleware(app)
+    assert asyncio.run(call(middleware, app))[0] == 400
+    status, headers, body = asyncio.run(call(middleware, app))
+    assert (status, headers[b"idempotent-replayed"], body) == (400, b"true", b'{"a": 1}')
+
+    status, _, body = asyncio.run(call(middleware, app, body=b'{"a": 2}'))
+    assert status == 422
+    assert json.loads(body) == {"error": "Idempotency-Key was already used with a different request."}
+    assert app.calls == 1
+
+
+def test_server_errors_are_not_stored():
+    app = SlowApp(status=503)
+    middleware = IdempotencyMiddleware(app)
+    asyncio.run(call(middleware, app))
+    asyncio.run(call(middleware, app))
+    assert app.calls == 2
+
+
+def test_failed_request_releases_waiters():
+    app = SlowApp(fail=True)
+    middleware = IdempotencyMiddleware(app)
+
+    async def scenario():
+        return await asyncio.gather(call(middleware, app), call(middleware, app), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert app.calls == 2  # the waiter ran the request itself
+    assert app.state.idempotency.stats()["in_flight"] == 0
+
+
+@pytest.mark.parametrize("kwargs", [{"key": None}, {"path": "/evaluate"}, {"method": "GET"}])
+def test_requests_without_key_or_outside_routes_pass_through(kwargs):
+    app = SlowApp()
+    middleware = IdempotencyMiddleware(app)
+    asyncio.run(call(middleware, app, **kwargs))
+    asyncio.run(call(middleware, app, **kwargs))
+    assert app.calls == 2
+    assert app.state.idempotency.stats()["stored"] == 0
+
+
+def test_invalid_key_is_rejected():
+    app = SlowApp()
+    status, _, body = asyncio.run(call(IdempotencyMiddleware(app), app, key=b"a" * 300))
+    assert (status, json.loads(body)) == (400, {"error": "Invalid Idempotency-Key header."})
+    assert app.calls == 0
@@ -0,0 +1,245 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_jobs.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the job store, payload parsing and the
+# queue's workers, long-poll waits, cancellation and expiry
+# in app/jobs.py.
+# ----------------------------------------------------------
+
+import asyncio
+import json
+import threading
+import pytest
+from app import jobs as jobs_module
+from app.jobs import (
+    InMemoryJobStore, Job, JobQueue, JobQueueFull, JobStore, job_kind, parse_payload, process_records_chunk,
+    read_limited,
+)
+
+
+def ndjson(*records):
+    return b"".join(json.dumps(record).encode() + b"\n" for record in records)
+
+
+def lines(data):
+    return [json.loads(line) for line in data.splitlines()]
+
+
+async def run(queue, payload, kind="ndjson", timeout=10):
+    queue.start()
+    try:
+        job = queue.submit(payload, kind)
+        return await queue.wait(job.id, timeout)
+    finally:
+        queue.stop()
+
+
+# ----------------------------------------------------------
+# Helpers and parsing
+# ----------------------------------------------------------
+def test_job_kind_and_progress():
+    assert job_kind("application/x-ndjson") == "ndjson"
+    assert job_kind("Application/JSON; charset=utf-8") == "json"
+    assert job_kind("text/plain") is None
+    assert job_kind(None) is None
+    job = Job(id="j", kind="json", total=4, done=1)
+    assert job.to_dict()["progress"] == 0.25
+    assert Job(id="k", kind="json", state="done", total=0).to_dict()["progress"] == 1.0
+
+
+def test_read_limited():
+    async def body(*parts):
+        for part in parts:
+            yield part
+
+    assert asyncio.run(read_limited(body(b"ab", b"cd"), limit=4)) == b"abcd"
+    assert asyncio.run(read_limited(body(b"ab", b"cde"), limit=4)) is None
+
+
+def test_parse_payload():
+    records, worker = parse_payload(b'{"op": "add", "a": 1, "b": 2}\n\n  \n{"op"}\n', "ndjson")
+    assert len(records) == 2
+    assert lines(worker(records)[0]) == [{"result": 3.0}, {"error": "Invalid JSON."}]
+
+    records, worker = parse_payload(b'{"operations": [{"op": "divide", "a": 1, "b": 0}, 7]}', "json")
+    assert worker is process_records_chunk
+    output, errors = worker(records)
+    assert lines(output) == [{"error": "Cannot divide by zero."}, {"error": "Invalid or missing numeric input."}]
+    assert errors == 2
+
+
+@pytest.mark.parametrize("payload", [b"not json", b"[1, 2]", b'{"operations": 5}'])
+def test_parse_payload_rejects_malformed_json(payload):
+    with pytest.raises(ValueError):
+        parse_payload(payload, "json")
+
+
+def test_store_chunks_and_delete():
+    store = InMemoryJobStore()
+    store.add(Job(id="j", kind="json"), b"body")
+    assert store.take_payload("j") == b"body" and store.take_payload("j") is None
+    store.append_chunk("j", b"a")
+    store.append_chunk("missing", b"b")
+    assert store.chunk("j", 0) == b"a"
+    assert store.chunk("j", 1) is None and store.chunk("j", -1) is None
+    store.delete("j")
+    assert store.get("j") is None and store.jobs() == []
+
+
+def test_store_interface_is_abstract():
+    class ReadOnlyStore(JobStore):
+        def get(self, job_id):
+            return None
+
+    with pytest.raises(TypeError):
+        JobStore()
+    with pytest.raises(TypeError):
+        ReadOnlyStore()  # add(), save(), ... not implemented
+
+
+# ----------------------------------------------------------
+# Queue
+# ----------------------------------------------------------
+def test_job_runs_in_chunks_and_wakes_waiters():
+    queue = JobQueue(chunk_size=2)
+    records = [{"op": "add", "a": n, "b": 1} for n in range(5)] + [{"op": "divide", "a": 1, "b": 0}]
+    job = asyncio.run(run(queue, ndjson(*records)))
+    assert (job.state, job.total, job.done, job.errors, job.chunks) == ("done", 6, 6, 1, 3)
+    output = b"".join(queue.chunk(job.id, n) for n in range(job.chunks))
+    assert lines(output)[:5] == [{"result": float(n + 1)} for n in range(5)]
+    assert queue.stats()["completed"] == 1
+
+
+def test_job_chunks_can_run_in_worker_processes():
+    queue = JobQueue(processes=2, chunk_size=3)
+    payload = json.dumps({"operations": [{"op": "multiply", "a": n, "b": 2} for n in range(10)]}).encode()
+    job = asyncio.run(run(queue, payload, "json"))
+    assert (job.state, job.chunks) == ("done", 4)
+    output = b"".join(queue.chunk(job.id, n) for n in range(job.chunks))
+    assert lines(output) == [{"result": float(2 * n)} for n in range(10)]
+
+
+def test_bad_payload_fails_the_job_not_the_worker():
+    queue = JobQueue()
+
+    async def scenario():
+        queue.start()
+        failed = queue.submit(b"[]", "json")
+        ok = queue.submit(ndjson({"op": "add", "a": 1, "b": 1}), "ndjson")
+        results = await queue.wait(failed.id, 10), await queue.wait(ok.id, 10)
+        queue.stop()
+        return results
+
+    failed, ok = asyncio.run(scenario())
+    assert failed.state == "failed" and "operations" in failed.error
+    assert ok.state == "done"
+    assert queue.stats()["failed"] == 1
+
+
+def test_full_queue_rejects_submissions():
+    queue = JobQueue(max_queued=1)            # not started: jobs stay queued
+    queue.submit(b"", "ndjson")
+    with pytest.raises(JobQueueFull):
+        queue.submit(b"", "ndjson")
+    assert len(queue.store.jobs()) == 1
+    assert queue.stats()["rejected"] == 1
+
+
+def test_queued_bodies_share_a_byte_budget():
+    queue = JobQueue(max_queued_bytes=10)    # not started: jobs stay queued
+    first = queue.submit(b"123456", "ndjson")
+    with pytest.raises(JobQueueFull):
+        queue.submit(b"123456", "ndjson")
+    assert queue.stats()["queued_bytes"] == 6
+    queue.cancel(first.id)                    # a cancelled job's body is released at once
+    assert queue.stats()["queued_bytes"] == 0 and queue.store.take_payload(first.id) is None
+    queue.submit(b"123456", "ndjson")
+    assert queue.stats()["rejected"] == 1
+
+
+def test_queued_job_is_cancelled_immediately():
+    queue = JobQueue()
+    job = queue.submit(b"", "ndjson")
+    assert queue.cancel(job.id).state == "cancelled"
+    assert queue.cancel("missing") is None
+    assert queue.stats()["cancelled"] == 1
+
+
+def test_worker_skips_a_job_cancelled_before_it_is_claimed():
+    queue = JobQueue()
+    job = queue.submit(ndjson({"op": "add", "a": 1, "b": 1}), "ndjson")
+    queue.cancel(job.id)
+    assert queue._claim(job) is None          # the worker's claim loses to the cancel
+    assert job.state == "cancelled" and job.started is None
+    queue._finish(job, "cancelled")           # finishing twice is a no-op
+    assert queue.stats()["cancelled"] == 1
+
+
+def test_claim_takes_the_body_and_releases_its_bytes():
+    queue = JobQueue()
+    job = queue.submit(b"body", "ndjson")
+    assert queue._claim(job) == b"body"
+    assert job.state == "running" and queue.stats()["queued_bytes"] == 0
+    assert queue.cancel(job.id).state == "running" and job.cancel_requested
+
+
+def test_running_job_stops_between_chunks(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    real = jobs_module.process_jsonl_chunk
+
+    def slow_chunk(lines):
+        started.set()
+        release.wait(5)
+        return real(lines)
+
+    monkeypatch.setattr(jobs_module, "process_jsonl_chunk", slow_chunk)
+    queue = JobQueue(chunk_size=1)
+
+    async def scenario():
+        queue.start()
+        job = queue.submit(ndjson(*({"op": "add", "a": n, "b": 0} for n in range(5))), "ndjson")
+        await asyncio.to_thread(started.wait, 5)
+        queue.cancel(job.id)
+        release.set()
+        job = await queue.wait(job.id, 10)
+        queue.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.state == "cancelled"
+    assert job.done < job.total
+
+
+def test_wait_times_out_with_current_state():
+    queue = JobQueue()                        # not started: the job never runs
+
+    async def scenario():
+        job = queue.submit(b"", "ndjson")
+        return await queue.wait(job.id, 0.01), await queue.wait("missing", 1)
+
+    job, missing = asyncio.run(scenario())
+    assert job.state == "queued" and missing is None
+    assert queue._waiters == {}
+
+
+def test_finished_jobs_expire_after_ttl():
+    now = [1000.0]
+    queue = JobQueue(ttl=60, clock=lambda: now[0])
+    job = queue.submit(b"", "ndjson")
+    queue.cancel(job.id)
+    now[0] += 59
+    assert queue.get(job.id) is not None
+    now[0] += 1
+    assert queue.get(job.id) is None
+    assert queue.stats()["expired"] == 1
+
+
+def test_stop_cancels_unfinished_jobs():
+    queue = JobQueue()                        # not started: the job stays queued
+    job = queue.submit(b"", "ndjson")
+    queue.stop()
+    assert job.state == "cancelled"
@@ -0,0 +1,192 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_loader.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the bulk loader in app/loader.py: synthetic
+# and CSV row sources, the COPY text stream, deferred index
+# rebuilds and the `cli.py load` command, on SQLite.
+# ----------------------------------------------------------
+
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import func, inspect, select
+from app.db import calculation_stats, calculations, create_db_engine, init_db, users
+from app.loader import (
+    CSVStream, RowSource, bulk_load, copy_rows, csv_source, supports_copy, synthetic_calculations,
+    synthetic_users,
+)
+from cli import cli
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'calc.db'}")
+    init_db(engine)
+    yield engine
+    engine.dispose()
+
+
+def count(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(table)).scalar()
+
+
+# ----------------------------------------------------------
+# Row sources
+# ----------------------------------------------------------
+def test_synthetic_rows_are_deterministic():
+    first = list(synthetic_calculations(500, (3, 7), seed=5).rows)
+    assert first == list(synthetic_calculations(500, (3, 7), seed=5).rows)
+    assert first != list(synthetic_calculations(500, (3, 7), seed=6).rows)
+    assert [row[0] for row in first[:3]] == [1, 2, 3]
+    assert {row[6] for row in first} == {3, 4, 5, 6, 7}
+    assert all(row[3] != 0 for row in first)
+    assert first[1][5] == datetime(2025, 1, 1, 0, 0, 1)
+
+    users_rows = list(synthetic_users(2, start_id=10).rows)
+    assert [row[:3] for row in users_rows] == [
+        (10, "user00000010", "user00000010@example.com"),
+        (11, "user00000011", "user00000011@example.com"),
+    ]
+
+
+def test_synthetic_results_match_their_operation():
+    for _, operation, a, b, result, _, _ in synthetic_calculations(200, (1, 1)).rows:
+        expected = {"add": a + b, "subtract": a - b, "multiply": a * b, "divide": a / b}[operation]
+        assert result == expected
+
+
+def test_csv_source_converts_column_types(tmp_path):
+    path = tmp_path / "calcs.csv"
+    path.write_text("operation,operand_a,operand_b,result,user_id,timestamp\n"
+                    "add,1.5,2,3.5,1,2025-02-03 04:05:06\n"
+                    "divide,1,4,0.25,2,\n")
+    source = csv_source(str(path), calculations)
+    assert source.columns == ("operation", "operand_a", "operand_b", "result", "user_id", "timestamp")
+    assert list(source.rows) == [
+        ("add", 1.5, 2.0, 3.5, 1, datetime(2025, 2, 3, 4, 5, 6)),
+        ("divide", 1.0, 4.0, 0.25, 2, None),
+    ]
+
+
+@pytest.mark.parametrize("content, error", [
+    ("operation,operand_a,operand_b,result\nadd,1,2,3\n", "missing columns \\['user_id'\\]"),
+    ("operation,operand_a,operand_b,result,user_id,colour\n", "unknown columns \\['colour'\\]"),
+])
+def test_csv_source_rejects_bad_headers(tmp_path, content, error):
+    path = tmp_path / "calcs.csv"
+    path.write_text(content)
+    with pytest.raises(ValueError, match=error):
+        csv_source(str(path), calculations)
+
+
+@pytest.mark.parametrize("row, error", [("add,1,2,3", "expected 5 fields"), ("add,x,2,3,1", "could not convert")])
+def test_csv_source_reports_bad_rows_with_line_numbers(tmp_path, row, error):
+    path = tmp_path / "calcs.csv"
+    path.write_text(f"operation,operand_a,operand_b,result,user_id\nadd,1,2,3,1\n{row}\n")
+    with pytest.raises(ValueError, match=f"calcs.csv:3: {error}"):
+        list(csv_source(str(path), calculations).rows)
+
+
+# ----------------------------------------------------------
+# COPY stream
+# ----------------------------------------------------------
+def test_csv_stream_reads_in_pieces():
+    stream = CSVStream([(1, "add", 0.1, None), (2, 'say "hi"', 2.0, datetime(2025, 1, 1))], chunk_rows=1)
+    pieces = []
+    while True:
+        piece = stream.read(5)
+        if not piece:
+            break
+        pieces.append(piece)
+    assert "".join(pieces) == '1,add,0.1,\n2,"say ""hi""",2.0,2025-01-01 00:00:00\n'
+    assert stream.rows == 2 and max(map(len, pieces)) <= 5
+
+
+def test_copy_rows_streams_csv_to_copy_expert():
+    copied = {}
+
+    class Cursor:
+        def copy_expert(self, sql, stream, size):
+            copied["sql"] = sql
+            copied["data"] = "".join(iter(lambda: stream.read(size), ""))
+
+        def close(self):
+            copied["closed"] = True
+
+    conn = SimpleNamespace(connection=SimpleNamespace(cursor=Cursor))
+    rows = copy_rows(conn, users, RowSource(("id", "username", "email"), [(1, "a", "a@x"), (2, "b", "b@x")]))
+    assert rows == 2
+    assert copied == {"sql": "COPY users (id, username, email) FROM STDIN WITH (FORMAT csv)",
+                      "data": "1,a,a@x\n2,b,b@x\n", "closed": True}
+
+
+def test_supports_copy_only_for_psycopg2(engine):
+    with engine.connect() as conn:
+        assert supports_copy(conn) is False
+    postgres = SimpleNamespace(dialect=SimpleNamespace(name="postgresql", driver="psycopg2"))
+    assert supports_copy(postgres) is True
+
+
+# ----------------------------------------------------------
+# Loading
+# ----------------------------------------------------------
+def test_bulk_load_defers_indexes_on_an_empty_table(engine):
+    results = bulk_load(engine, users_count=20, calculations_count=1_000, batch_size=300)
+    assert [(s.table, s.method, s.rows) for s in results] == [("users", "insert", 20), ("calculations", "insert", 1000)]
+    assert sorted(results[1].deferred) == ["ix_calculations_operation_timestamp", "ix_calculations_user_id_timestamp"]
+    assert results[1].rows_per_second > 0
+    assert {index["name"] for index in inspect(engine).get_indexes("calculations")} == \
+        {"ix_calculations_operation_timestamp", "ix_calculations_user_id_timestamp"}
+
+    # a second load appends after the existing ids and keeps the indexes in place
+    results = bulk_load(engine, users_count=5, calculations_count=10)
+    assert results[1].deferred == []
+    with engine.connect() as conn:
+        assert conn.execute(select(func.max(users.c.id))).scalar() == 25
+        assert conn.execute(select(func.min(calculations.c.id), func.max(calculations.c.id))).one() == (1, 1010)
+
+
+def test_bulk_load_needs_users_for_synthetic_calculations(engine):
+    with pytest.raises(ValueError, match="load users first"):
+        bulk_load(engine, calculations_count=10)
+    assert count(engine, calculations) == 0
+
+
+def test_failed_load_rolls_back(engine, tmp_path):
+    path = tmp_path / "calcs.csv"
+    path.write_text("operation,operand_a,operand_b,result,user_id\nadd,1,2,3,1\nadd,1,2\n")
+    with pytest.raises(ValueError):
+        bulk_load(engine, users_count=3, calculations_file=str(path))
+    assert count(engine, users) == 0
+    assert len(inspect(engine).get_indexes("calculations")) == 2
+
+
+def test_load_command(tmp_path):
+    url = f"sqlite:///{tmp_path / 'calc.db'}"
+    users_csv = tmp_path / "users.csv"
+    users_csv.write_text("username,email\nalice,alice@example.com\nbob,bob@example.com\n")
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["load", "--database-url", url, "--users-file", str(users_csv),
+                                 "--calculations", "400", "--seed", "3"])
+    assert result.exit_code == 0, result.output
+    assert "Loaded 2 users rows via insert" in result.output
+    assert "Loaded 400 calculations rows via insert" in result.output
+    assert "rebuilt 2 indexes" in result.output
+    assert "Rebuilt 8 user/operation stats rows" in result.output
+
+    engine = create_db_engine(url)
+    with engine.connect() as conn:
+        assert conn.execute(select(func.sum(calculation_stats.c.count))).scalar() == 400
+    engine.dispose()
+
+    result = runner.invoke(cli, ["load", "--database-url", f"sqlite:///{tmp_path / 'empty.db'}",
+                                 "--calculations", "5"])
+    assert result.exit_code != 0
+    assert "load users first" in result.output
@@ -0,0 +1,177 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_logging_config.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the calculation logging modes and the
+# queue-backed log writer in app/logging_config.py, plus
+# environment parsing in app/config.py.
+# ----------------------------------------------------------
+
+import logging
+import os
+import pytest
+from app import logging_config
+from app.config import Settings
+from app.logging_config import configure_logging, set_log_mode, should_log, shutdown_logging
+from app.operations import add
+
+
+# ----------------------------------------------------------
+# Fixture: restore the default logging mode after each test
+# ----------------------------------------------------------
+@pytest.fixture(autouse=True)
+def restore_mode():
+    mode, rate = logging_config._mode, logging_config._sample_rate
+    yield
+    set_log_mode(mode, rate)
+
+
+# ----------------------------------------------------------
+# Test should_log() for each mode
+# ----------------------------------------------------------
+def test_full_mode_logs_everything():
+    set_log_mode("full")
+    assert all(should_log() for _ in range(10))
+
+
+def test_off_mode_logs_nothing():
+    set_log_mode("off")
+    assert not any(should_log() for _ in range(10))
+
+
+def test_sampled_mode_logs_one_in_n():
+    set_log_mode("sampled", 4)
+    assert [should_log() for _ in range(8)] == [True, False, False, False] * 2
+
+
+@pytest.mark.parametrize("mode, rate", [("verbose", 1), ("sampled", 0)])
+def test_set_log_mode_rejects_bad_values(mode, rate):
+    with pytest.raises(ValueError):
+        set_log_mode(mode, rate)
+
+
+# ----------------------------------------------------------
+# Test that calculations respect the mode
+# ----------------------------------------------------------
+def test_off_mode_skips_calculation_records(caplog):
+    set_log_mode("off")
+    with caplog.at_level(logging.INFO, logger="app.operations"):
+        add(1, 2)
+    assert "Addition performed" not in caplog.text
+
+
+def test_full_mode_emits_calculation_records(caplog):
+    set_log_mode("full")
+    with caplog.at_level(logging.INFO, logger="app.operations"):
+        add(1, 2)
+    assert "Addition performed: 1 + 2 = 3" in caplog.text
+
+
+# ----------------------------------------------------------
+# Test the queue-backed writer
+# ----------------------------------------------------------
+def test_queue_writer_outputs_formatted_records(capsys):
+    """Records are formatted and written by the listener thread."""
+    configure_logging("full")
+    try:
+        logging.getLogger("app.test").warning("value=%s", 42)
+        shutdown_logging()  # stops the listener and drains the queue
+        assert "WARNING: value=42" in capsys.readouterr().out
+    finally:
+        with capsys.disabled():  # bind the restored handler to the real stdout, not this test's capture
+            configure_logging("full")
+
+
+def test_forked_child_restarts_listener(capsys):
+    """A preloaded app forked into workers still writes its logs."""
+    with capsys.disabled():
+        configure_logging("full")
+    pid = os.fork()
+    if pid == 0:  # child: the parent's listener thread does not exist here
+        listener = logging_config._listener
+        os._exit(0 if listener is not None and listener._thread.is_alive() else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+
+# ----------------------------------------------------------
+# Test Settings.from_env()
+# ----------------------------------------------------------
+def test_settings_from_env():
+    settings = Settings.from_env({"CALC_LOG_MODE": "SAMPLED", "CALC_LOG_SAMPLE_RATE": "50"})
+    assert settings.log_mode == "sampled"
+    assert settings.log_sample_rate == 50
+
+
+def test_settings_defaults_on_invalid_values():
+    settings = Settings.from_env({"CALC_LOG_SAMPLE_RATE": "many"})
+    assert settings.log_mode == "full"
+    assert settings.log_sample_rate == 100
+
+
+def test_settings_unknown_log_mode_falls_back_to_full(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.config"):
+        settings = Settings.from_env({"CALC_LOG_MODE": "verbose"})
+    assert settings.log_mode == "full"
+    assert "Unknown CALC_LOG_MODE 'verbose'" in caplog.text
+
+
+def test_settings_fast_path_flag():
+    assert Settings.from_env({}).fast_path is False
+    assert Settings.from_env({"CALC_FAST_PATH": "1"}).fast_path is True
+    assert Settings.from_env({"CALC_FAST_PATH": "off"}).fast_path is False
+
+
+def test_settings_database_pool_options():
+    settings = Settings.from_env({"CALC_DB_POOL_TIMEOUT": "2.5", "CALC_DB_POOL_RECYCLE": "1800",
+                                  "CALC_DB_ASYNC": "0"})
+    assert (settings.db_pool_timeout, settings.db_pool_recycle, settings.db_async) == (2.5, 1800, False)
+    assert Settings.from_env({}).db_async is True
+
+
+def test_settings_idempotency_options():
+    settings = Settings.from_env({"CALC_IDEMPOTENCY_SIZE": "0", "CALC_IDEMPOTENCY_TTL": "60"})
+    assert (settings.idempotency_size, settings.idempotency_ttl) == (0, 60.0)
+    assert Settings.from_env({}).idempotency_size == 10_000
+
+
+def test_settings_admission_control_options():
+    settings = Settings.from_env({"CALC_RATE_LIMIT": "20", "CALC_RATE_BURST": "40",
+                                  "CALC_RATE_LIMIT_ROUTES": "/batch=1", "CALC_CONCURRENCY_LIMIT": "32",
+                                  "CALC_QUEUE_TARGET_MS": "25"})
+    assert (settings.rate_limit, settings.rate_burst, settings.rate_limit_routes) == (20.0, 40, "/batch=1")
+    assert (settings.concurrency_limit, settings.queue_target_ms) == (32, 25.0)
+    assert Settings.from_env({}).concurrency_limit == 0
+
+
+def test_settings_compression_options():
+    settings = Settings.from_env({"CALC_COMPRESSION": "0", "CALC_COMPRESSION_MIN_SIZE": "4096"})
+    assert (settings.compression, settings.compression_min_size) == (False, 4096)
+    assert Settings.from_env({}).compression is True
+
+
+def test_settings_job_queue_options():
+    settings = Settings.from_env({"CALC_JOB_WORKERS": "0", "CALC_JOB_PROCESSES": "4",
+                                  "CALC_JOB_QUEUE_SIZE": "8", "CALC_JOB_TTL": "60"})
+    assert (settings.job_workers, settings.job_processes) == (1, 4)
+    assert (settings.job_queue_size, settings.job_ttl) == (8, 60.0)
+    assert Settings.from_env({}).job_queue_size == 64
+    assert Settings.from_env({"CALC_JOB_QUEUE_BYTES": "1024"}).job_queue_bytes == 1024
+
+
+def test_settings_profiling_options():
+    settings = Settings.from_env({"CALC_PROFILE_SAMPLE_RATE": "100", "CALC_PROFILE_SLOW_MS": "250",
+                                  "CALC_PROFILE_BUFFER": "0", "CALC_ADMIN_TOKEN": "secret"})
+    assert (settings.profile_sample_rate, settings.profile_slow_ms) == (100, 250.0)
+    assert (settings.profile_buffer, settings.admin_token) == (1, "secret")
+    defaults = Settings.from_env({})
+    assert (defaults.profile_sample_rate, defaults.profile_slow_ms, defaults.admin_token) == (0, 0.0, None)
+
+
+def test_settings_server_workers():
+    assert Settings.from_env({"CALC_WORKERS": "3"}).workers == 3
+    assert Settings.from_env({"CALC_WORKERS": "lots"}).workers == 0
+    assert Settings.from_env({}).workers == 0
@@ -0,0 +1,133 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_metrics.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the histogram, registry rendering, ASGI
+# middleware and event-loop lag sampler in app/metrics.py.
+# ----------------------------------------------------------
+
+import asyncio
+import pytest
+from app.metrics import (
+    Histogram, MetricsMiddleware, MetricsRegistry, UNMATCHED_ROUTE, monitor_event_loop,
+)
+
+
+# ----------------------------------------------------------
+# Histogram
+# ----------------------------------------------------------
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+    assert histogram.total == pytest.approx(3.65)
+
+
+# ----------------------------------------------------------
+# Registry rendering
+# ----------------------------------------------------------
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.observe_request("POST", "/add", 200, 0.002)
+    registry.observe_request("POST", "/add", 200, 0.004)
+    registry.observe_request("POST", "/divide", 400, 0.001)
+    registry.count_error("divide_by_zero")
+    registry.observe_loop_lag(0.003)
+    registry.observe_loop_lag(0.001)
+
+    text = registry.render([("calc_cache_hits", "Result cache hits.", 7)])
+    assert 'calc_requests_total{method="POST",route="/add",status="200"} 2' in text
+    assert 'calc_requests_total{method="POST",route="/divide",status="400"} 1' in text
+    assert 'calc_request_duration_seconds_bucket{route="/add",le="0.0025"} 1' in text
+    assert 'calc_request_duration_seconds_bucket{route="/add",le="+Inf"} 2' in text
+    assert 'calc_request_duration_seconds_count{route="/add"} 2' in text
+    assert 'calc_errors_total{type="divide_by_zero"} 1' in text
+    assert "calc_requests_in_flight 0" in text
+    assert "calc_event_loop_lag_seconds_count 2" in text
+    assert "calc_event_loop_lag_max_seconds 0.003" in text
+    assert "# TYPE calc_cache_hits gauge\ncalc_cache_hits 7" in text
+    assert text.endswith("\n")
+
+
+# ----------------------------------------------------------
+# Middleware
+# ----------------------------------------------------------
+class FakeRoute:
+    path = "/items/{item_id}"
+
+
+async def call(middleware, scope):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    return sent
+
+
+def test_middleware_records_route_template_and_status():
+    registry = MetricsRegistry()
+
+    async def app(scope, receive, send):
+        assert registry.in_flight == 1
+        scope["route"] = FakeRoute()
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = asyncio.run(call(MetricsMiddleware(app, registry), {"type": "http", "method": "GET"}))
+    assert len(sent) == 2
+    assert registry.requests == {("GET", "/items/{item_id}", "201"): 1}
+    assert registry.in_flight == 0
+
+
+def test_middleware_labels_unmatched_and_failed_requests():
+    registry = MetricsRegistry()
+
+    async def app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(call(MetricsMiddleware(app, registry), {"type": "http", "method": "POST"}))
+    assert registry.requests == {("POST", UNMATCHED_ROUTE, "500"): 1}
+    assert registry.errors == {"unhandled_exception": 1}
+    assert registry.in_flight == 0
+
+
+def test_middleware_passes_through_non_http_scopes():
+    registry = MetricsRegistry()
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(scope["type"])
+
+    asyncio.run(call(MetricsMiddleware(app, registry), {"type": "lifespan"}))
+    assert seen == ["lifespan"]
+    assert registry.requests == {}
+
+
+# ----------------------------------------------------------
+# Event-loop lag sampler
+# ----------------------------------------------------------
+def test_monitor_event_loop_records_lag():
+    registry = MetricsRegistry()
+
+    async def run():
+        task = asyncio.create_task(monitor_event_loop(registry, interval=0.01))
+        for _ in range(200):  # up to 2s on a loaded machine
+            await asyncio.sleep(0.01)
+            if registry.loop_lag.count:
+                break
+        task.cancel()
+
+    asyncio.run(run())
+    assert registry.loop_lag.count >= 1
+    assert registry.loop_lag_max >= 0.0
@@ -0,0 +1,136 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_persistence.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the batched CalculationWriter in
+# app/persistence.py, run against a temporary SQLite file in
+# place of PostgreSQL.
+# ----------------------------------------------------------
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from app.db import calculation_stats, calculations, create_db_engine, ensure_user, init_db, users
+from app.persistence import CalculationWriter
+
+
+# ----------------------------------------------------------
+# Fixture: SQLite engine with the calculator schema
+# ----------------------------------------------------------
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'calc.db'}")
+    init_db(engine)
+    yield engine
+    engine.dispose()
+
+
+def count_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(calculations)).scalar_one()
+
+
+# ----------------------------------------------------------
+# Test synchronous flush
+# ----------------------------------------------------------
+def test_flush_writes_queued_rows_in_batches(engine):
+    writer = CalculationWriter(engine, batch_size=2)
+    for i in range(5):
+        assert writer.record("add", i, 1, i + 1, user_id=1)
+    assert writer.pending == 5
+    assert writer.flush() == 5
+    assert writer.pending == 0
+    assert writer.written == 5
+
+    with engine.connect() as conn:
+        row = conn.execute(select(calculations).order_by(calculations.c.id)).first()
+    assert (row.operation, row.operand_a, row.operand_b, row.result, row.user_id) == ("add", 0, 1, 1, 1)
+    assert row.timestamp is not None
+
+
+def test_record_many(engine):
+    writer = CalculationWriter(engine)
+    rows = [{"operation": "multiply", "operand_a": 2, "operand_b": 3, "result": 6, "user_id": 2}] * 3
+    assert writer.record_many(dict(row) for row in rows) == 3
+    writer.flush()
+    assert count_rows(engine) == 3
+
+
+# ----------------------------------------------------------
+# Test the background thread
+# ----------------------------------------------------------
+def test_background_thread_flushes_on_stop(engine):
+    writer = CalculationWriter(engine, batch_size=10, flush_interval=0.01)
+    writer.start()
+    writer.start()  # second start is a no-op
+    for i in range(25):
+        writer.record("subtract", i, 1, i - 1, user_id=1)
+    writer.stop()
+    assert count_rows(engine) == 25
+    assert writer.written == 25
+
+
+# ----------------------------------------------------------
+# Test overload and failure handling
+# ----------------------------------------------------------
+def test_full_queue_drops_rows(engine):
+    writer = CalculationWriter(engine, max_queue=2)
+    results = [writer.record("add", 1, 1, 2, user_id=1) for _ in range(3)]
+    assert results == [True, True, False]
+    rows = [{"operation": "add", "operand_a": 1, "operand_b": 1, "result": 2, "user_id": 1}]
+    assert writer.record_many(rows) == 0
+    assert writer.dropped == 2
+
+
+def test_write_failure_is_counted(tmp_path):
+    """A missing table must not crash the writer."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    writer = CalculationWriter(engine)
+    writer.record("add", 1, 1, 2, user_id=1)
+    assert writer.flush() == 0
+    assert writer.failed == 1
+    engine.dispose()
+
+
+def test_create_db_engine_configures_pool_for_servers():
+    engine = create_db_engine("postgresql://user:pw@localhost/db", pool_size=3, max_overflow=4)
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 4
+    engine.dispose()
+
+
+# ----------------------------------------------------------
+# Test foreign-key failures (PRAGMA foreign_keys=ON)
+# ----------------------------------------------------------
+@pytest.fixture
+def fk_engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'fk.db'}")
+    event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+    init_db(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_rejected_rows_do_not_take_down_the_batch(fk_engine):
+    assert ensure_user(fk_engine, 1) is True
+    assert ensure_user(fk_engine, 1) is False
+    writer = CalculationWriter(fk_engine, batch_size=500)
+    for i in range(10):
+        writer.record("add", i, 1, i + 1, user_id=99 if i in (3, 7) else 1)
+    assert writer.flush() == 8
+    assert (writer.written, writer.failed) == (8, 2)
+    assert count_rows(fk_engine) == 8
+    with fk_engine.connect() as conn:
+        assert conn.execute(select(calculation_stats.c.count)).scalar_one() == 8
+
+
+def test_default_user_is_created_at_startup(fk_engine):
+    with fk_engine.connect() as conn:
+        assert conn.execute(select(users.c.id)).all() == []
+    ensure_user(fk_engine, 1)
+    writer = CalculationWriter(fk_engine)
+    writer.record("add", 1, 2, 3, user_id=1)
+    writer.record("add", 2, 2, 4, user_id=1)
+    assert writer.flush() == 2 and writer.failed == 0
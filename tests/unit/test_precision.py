@@ -0,0 +1,130 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_precision.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for exact operand parsing, decimal / fraction
+# arithmetic, the native-int fast path and batch evaluation
+# in app/precision.py.
+# ----------------------------------------------------------
+
+from decimal import Decimal
+from fractions import Fraction
+import pytest
+from app.precision import (
+    PrecisionError, calculate, evaluate_exact, evaluate_exact_batch, format_exact, to_exact, to_float,
+)
+
+
+# ----------------------------------------------------------
+# Operand parsing
+# ----------------------------------------------------------
+@pytest.mark.parametrize("value, mode, expected", [
+    (12345678901234567890123, "decimal", 12345678901234567890123),
+    (3.0, "decimal", 3),
+    (0.1, "decimal", Decimal("0.1")),          # shortest repr, not the binary expansion
+    (0.1, "fraction", Fraction(1, 10)),
+    ("  2.50 ", "decimal", Decimal("2.50")),
+    ("1e3", "fraction", 1000),
+    ("1/3", "fraction", Fraction(1, 3)),
+    ("4/2", "fraction", 2),
+    (2.0 ** 60, "decimal", 1152921504606847000),   # beyond 2**53: read by its repr too
+])
+def test_to_exact_keeps_the_value_sent(value, mode, expected):
+    result = to_exact(value, mode)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+@pytest.mark.parametrize("value, mode", [
+    (True, "decimal"), (None, "decimal"), ([1], "fraction"), ("", "decimal"), ("abc", "decimal"),
+    ("NaN", "decimal"), ("Infinity", "fraction"), (float("inf"), "decimal"), ("1/3", "decimal"),
+    ("1/0", "fraction"), ("x/2", "fraction"), ("1e1001", "fraction"), ("9" * 1001, "decimal"),
+])
+def test_to_exact_rejects_invalid_operands(value, mode):
+    with pytest.raises(PrecisionError):
+        to_exact(value, mode)
+
+
+# ----------------------------------------------------------
+# Arithmetic
+# ----------------------------------------------------------
+def test_decimal_mode_is_exact_for_decimal_fractions():
+    assert calculate("add", Decimal("0.1"), Decimal("0.2"), "decimal") == Decimal("0.3")
+    assert calculate("subtract", Decimal("1.10"), 1, "decimal") == Decimal("0.10")
+    assert calculate("multiply", Decimal("1.5"), 3, "decimal") == Decimal("4.5")
+
+
+def test_decimal_mode_rounds_to_requested_digits():
+    assert format_exact(calculate("divide", 2, 3, "decimal", digits=5)) == "0.66667"
+    assert format_exact(calculate("divide", 1, 3, "decimal")) == "0." + "3" * 28
+    # integer results wider than the precision are rounded, not returned exactly
+    assert calculate("multiply", 10 ** 20, 10 ** 20, "decimal", digits=10) == Decimal("1.000000000E+40")
+
+
+def test_fraction_mode_is_exact():
+    assert calculate("divide", 1, 3, "fraction") == Fraction(1, 3)
+    assert calculate("add", Fraction(1, 3), Fraction(2, 3), "fraction") == 1
+    assert calculate("subtract", Fraction(1, 2), Decimal("0.25"), "fraction") == Fraction(1, 4)
+    assert calculate("multiply", Fraction(2, 3), 3, "fraction") == 2
+
+
+def test_native_int_fast_path_returns_ints():
+    big = 12345678901234567890123
+    assert calculate("add", big, 1, "decimal") == big + 1
+    assert type(calculate("divide", 10, 5, "decimal")) is int
+    assert type(calculate("multiply", big, big, "fraction")) is int
+    assert calculate("divide", 7, 2, "decimal") == Decimal("3.5")
+
+
+def test_calculate_errors():
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        calculate("divide", Decimal("1.5"), 0, "decimal")
+    with pytest.raises(PrecisionError, match="Unknown precision mode"):
+        calculate("add", 1, 2, "float")
+    with pytest.raises(PrecisionError, match="Unsupported operation"):
+        calculate("power", 1, 2, "fraction")
+
+
+def test_integer_operands_are_limited_to_max_digits():
+    assert to_exact(10 ** 1000 - 1, "fraction") == 10 ** 1000 - 1
+    for value in (10 ** 1000, -(10 ** 4000)):
+        with pytest.raises(PrecisionError, match="exceeds 1000 digits"):
+            to_exact(value, "decimal")
+
+
+def test_format_exact_rejects_unprintable_results():
+    with pytest.raises(PrecisionError, match="too large"):
+        format_exact(10 ** 5000)
+
+
+def test_to_float_approximates_or_gives_up():
+    assert to_float(Fraction(1, 4)) == 0.25
+    assert to_float(Decimal("0.1")) == 0.1
+    assert to_float(10 ** 400) is None
+    assert to_float(Decimal("1e400")) is None
+
+
+# ----------------------------------------------------------
+# Route helpers
+# ----------------------------------------------------------
+def test_evaluate_exact_parses_and_computes():
+    assert evaluate_exact("divide", "1", 4, "fraction") == (1, 4, Fraction(1, 4))
+
+
+def test_evaluate_exact_batch_reports_errors_per_item():
+    recorded = []
+    entries = evaluate_exact_batch(
+        [("add", "0.1", 0.2), ("divide", 1, 0), ("add", "abc", 1), ("divide", 1, 3)], "decimal", digits=4,
+        record=lambda *row: recorded.append(row),
+    )
+    assert entries == [
+        {"result": "0.3"},
+        {"error": "Cannot divide by zero."},
+        {"error": "Invalid exact operand: 'abc'"},
+        {"result": "0.3333"},
+    ]
+    assert recorded == [("add", Decimal("0.1"), Decimal("0.2"), Decimal("0.3")),
+                        ("divide", 1, 3, Decimal("0.3333"))]
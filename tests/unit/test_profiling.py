@@ -0,0 +1,122 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_profiling.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for stage timing, the profile ring buffer, the
+# stack sampler and the profiler in app/profiling.py.
+# ----------------------------------------------------------
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from app.profiling import (
+    ProfileStore, Profiler, ProfilingMiddleware, RequestProfile, StackSampler, StageTimer, _timer, mark,
+)
+
+
+def make_app(work=0.0):
+    """A tiny ASGI app that reads the body, marks stages and answers 200."""
+    async def app(scope, receive, send):
+        await receive()
+        mark("parse")
+        if work:
+            time.sleep(work)
+        mark("compute")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return app
+
+
+def call(asgi, path="/calculate", state=None):
+    scope = {"type": "http", "method": "POST", "path": path, "app": SimpleNamespace(state=state)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi(scope, receive, send))
+    return sent
+
+
+def test_stage_timer_accumulates_consecutive_stages():
+    timer = StageTimer()
+    timer.mark("parse")
+    timer.mark("compute")
+    timer.mark("compute")
+    assert list(timer.stages) == ["parse", "compute"]
+    assert sum(timer.stages.values()) <= timer.last - timer.start + 1e-9
+
+
+def test_mark_is_a_no_op_without_a_timer():
+    assert _timer.get() is None
+    mark("parse")  # nothing to record into
+    timer = StageTimer()
+    token = _timer.set(timer)
+    mark("parse")
+    _timer.reset(token)
+    assert "parse" in timer.stages
+
+
+def test_profile_store_keeps_the_last_n_newest_first():
+    store = ProfileStore(size=2)
+    for profile_id in (1, 2, 3):
+        store.add(RequestProfile(profile_id, "slow", "GET", "/", "/", 200, 0.0, 0.1, {}))
+    assert [p.id for p in store.list()] == [3, 2]
+    assert store.get(1) is None and store.get(2).id == 2
+    assert len(store) == 2
+
+
+def test_sampled_request_gets_a_cprofile_report_and_stages():
+    profiler = Profiler(sample_rate=2)
+    for _ in range(4):
+        sent = call(lambda s, r, w: profiler.run(make_app(), s, r, w))
+        assert sent[0]["status"] == 200
+    assert profiler.stats() == {"sampled": 2, "slow": 0, "stored": 2}
+    profile = profiler.store.list()[0]
+    assert profile.reason == "sampled" and profile.route == "unmatched"
+    assert "function calls" in profile.cprofile
+    assert list(profile.stages) == ["receive", "parse", "compute", "serialize", "send"]
+    summary = profile.summary()
+    assert abs(sum(summary["stages_ms"].values()) - summary["duration_ms"]) < 1.0
+
+
+def test_slow_request_is_captured_with_sampled_stacks():
+    profiler = Profiler(slow_ms=20, stack_interval=0.002)
+    profiler.start()
+    try:
+        call(lambda s, r, w: profiler.run(make_app(), s, r, w))
+        call(lambda s, r, w: profiler.run(make_app(work=0.05), s, r, w))
+    finally:
+        profiler.stop()
+    assert profiler.stats() == {"sampled": 0, "slow": 1, "stored": 1}
+    profile = profiler.store.list()[0].to_dict()
+    assert profile["reason"] == "slow" and profile["cprofile"] is None
+    assert profile["duration_ms"] >= 50
+    assert any("app (test_profiling.py" in entry["stack"] for entry in profile["stacks"])
+
+
+def test_stack_sampler_filters_by_time_window():
+    sampler = StackSampler(threading.get_ident())
+    for _ in range(2):
+        sampler.sample()  # same line, so the same stack
+    at = sampler.samples[-1][0]
+    [top] = sampler.between(at - 1, at + 1)
+    assert top["samples"] == 2 and "test_stack_sampler_filters_by_time_window" in top["stack"]
+    assert sampler.between(at + 1, at + 2) == []
+
+
+def test_middleware_passes_through_when_disabled_or_exempt():
+    profiler = Profiler(sample_rate=1)
+    middleware = ProfilingMiddleware(make_app())
+    assert call(middleware, state=SimpleNamespace())[0]["status"] == 200
+    call(middleware, path="/metrics", state=SimpleNamespace(profiler=profiler))
+    assert len(profiler.store) == 0
+    call(middleware, state=SimpleNamespace(profiler=profiler))
+    assert len(profiler.store) == 1
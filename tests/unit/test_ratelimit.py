@@ -0,0 +1,241 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_ratelimit.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for route policy parsing, per-client token
+# buckets, the adaptive concurrency limiter and the
+# load-shedding middleware in app/ratelimit.py.
+# ----------------------------------------------------------
+
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from app.ratelimit import (
+    ConcurrencyLimiter, LoadSheddingMiddleware, RateLimiter, RoutePolicy, parse_route_policies,
+)
+
+
+# ----------------------------------------------------------
+# Route policies
+# ----------------------------------------------------------
+def test_parse_route_policies():
+    assert parse_route_policies("") == {}
+    assert parse_route_policies("/batch=5:10, /add=100,/stream=1:2:noshed") == {
+        "/batch": RoutePolicy(5.0, 10),
+        "/add": RoutePolicy(100.0, 0),
+        "/stream": RoutePolicy(1.0, 2, shed=False),
+    }
+    assert parse_route_policies("/evaluate=0:0:noshed")["/evaluate"] == RoutePolicy(0.0, 0, shed=False)
+
+
+@pytest.mark.parametrize("spec", ["batch=5", "/batch", "/batch=", "/batch=fast", "/batch=1:2:3", "/batch=-1"])
+def test_parse_route_policies_rejects_malformed_entries(spec):
+    with pytest.raises(ValueError, match="Invalid route policy"):
+        parse_route_policies(spec)
+
+
+def test_policy_capacity_defaults_to_rate():
+    assert RoutePolicy(2.5).capacity == 3.0
+    assert RoutePolicy(0.2).capacity == 1.0
+    assert RoutePolicy(2, burst=10).capacity == 10.0
+
+
+# ----------------------------------------------------------
+# Token buckets
+# ----------------------------------------------------------
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = Clock()
+    limiter = RateLimiter(RoutePolicy(rate=2, burst=3), clock=clock)
+    assert [limiter.check("/add", "10.0.0.1") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.check("/add", "10.0.0.1") == pytest.approx(0.5)
+    assert limiter.check("/subtract", "10.0.0.2") == 0.0   # other clients have their own bucket
+    clock.now += 0.5
+    assert limiter.check("/multiply", "10.0.0.1") == 0.0   # routes share the default bucket
+    assert limiter.stats() == {"allowed": 5, "limited": 1, "clients": 2}
+
+
+def test_route_override_has_its_own_bucket():
+    limiter = RateLimiter(RoutePolicy(rate=100), {"/batch": RoutePolicy(rate=1), "/add": RoutePolicy()},
+                          clock=Clock())
+    assert limiter.check("/batch", "c") == 0.0
+    assert limiter.check("/batch", "c") == pytest.approx(1.0)
+    assert limiter.check("/subtract", "c") == 0.0
+    assert all(limiter.check("/add", "c") == 0.0 for _ in range(500))   # rate 0 = unlimited
+
+
+def test_least_recent_clients_are_dropped():
+    limiter = RateLimiter(RoutePolicy(rate=1), max_clients=2, clock=Clock())
+    for client in ("a", "b", "c"):
+        limiter.check("/add", client)
+    assert limiter.stats()["clients"] == 2
+    assert limiter.check("/add", "a") == 0.0   # "a" was forgotten, so it starts with a full bucket
+
+
+# ----------------------------------------------------------
+# Concurrency limiter
+# ----------------------------------------------------------
+def test_requests_queue_for_a_slot_and_are_shed_after_the_target():
+    limiter = ConcurrencyLimiter(max_limit=1, queue_target=0.05)
+
+    async def scenario():
+        assert await limiter.acquire()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert limiter.stats()["queued"] == 1
+        limiter.release(0.001)             # hands the slot to the queued request
+        assert await queued
+        assert not await limiter.acquire()  # nobody releases within queue_target
+        limiter.release(0.001)
+
+    asyncio.run(scenario())
+    assert limiter.stats() == {"limit": 1, "in_flight": 0, "queued": 0, "admitted": 2, "shed": 1,
+                               "queue_delay_ms": 0.0}
+
+
+def test_full_queue_sheds_immediately():
+    limiter = ConcurrencyLimiter(max_limit=1, queue_target=1.0, max_queue=0)
+
+    async def scenario():
+        assert await limiter.acquire()
+        return await limiter.acquire()
+
+    assert asyncio.run(scenario()) is False
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    limiter = ConcurrencyLimiter(max_limit=1, queue_target=1.0)
+
+    async def scenario():
+        await limiter.acquire()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        limiter.release(0.001)
+
+    asyncio.run(scenario())
+    assert limiter.stats()["queued"] == 0 and limiter.in_flight == 0
+
+
+def test_limit_adapts_to_latency():
+    limiter = ConcurrencyLimiter(max_limit=10, min_limit=2, queue_target=0.05)
+    assert limiter.latency_target == 0.1
+    for _ in range(30):
+        limiter.in_flight += 1
+        limiter.release(0.5)          # slow: multiplicative decrease down to min_limit
+    assert limiter.stats()["limit"] == 2
+
+    for _ in range(20):
+        limiter.in_flight = int(limiter.limit)  # cap fully used
+        limiter.release(0.001)        # fast: additive increase
+    assert limiter.stats()["limit"] > 2
+    limiter.in_flight = 1
+    before = limiter.limit
+    limiter.release(0.001)            # fast but the cap was not in use: unchanged
+    assert limiter.limit == before
+
+
+def test_loop_delay_sheds_new_requests():
+    limiter = ConcurrencyLimiter(max_limit=10, queue_target=0.02)
+
+    async def scenario():
+        limiter.start(interval=0.005)
+        await asyncio.sleep(0.02)
+        admitted = await limiter.acquire()
+        limiter.release(0.0)
+        limiter._due -= 1.0           # the next sample is a second overdue: the loop is behind
+        shed = await limiter.acquire()
+        limiter.stop()
+        return admitted, shed
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert limiter.current_delay() == limiter.queue_delay
+
+
+# ----------------------------------------------------------
+# Middleware
+# ----------------------------------------------------------
+class App:
+    def __init__(self, rate_limiter=None, concurrency_limiter=None):
+        self.calls = 0
+        self.state = SimpleNamespace(rate_limiter=rate_limiter, concurrency_limiter=concurrency_limiter)
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def call(app, path="/add"):
+    scope = {"type": "http", "method": "POST", "path": path, "headers": [], "app": app,
+             "client": ("10.0.0.1", 5000)}
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(LoadSheddingMiddleware(app)(scope, None, send))
+    return sent[0]["status"], dict(sent[0]["headers"]), sent[1]["body"]
+
+
+def test_middleware_rate_limits_with_retry_after():
+    app = App(rate_limiter=RateLimiter(RoutePolicy(rate=0.5)))
+    assert call(app)[0] == 200
+    status, headers, body = call(app)
+    assert (status, headers[b"retry-after"]) == (429, b"2")
+    assert json.loads(body) == {"error": "Rate limit exceeded."}
+    assert call(app, "/health")[0] == 200     # exempt
+    assert app.calls == 2
+
+
+def test_middleware_sheds_with_503():
+    limiter = ConcurrencyLimiter(max_limit=1, queue_target=0.01)
+    limiter.in_flight = 1                     # slot taken by a long request
+    app = App(concurrency_limiter=limiter)
+    status, headers, body = call(app)
+    assert (status, headers[b"retry-after"]) == (503, b"1")
+    assert json.loads(body) == {"error": "Server is overloaded, retry later."}
+    assert call(app, "/stream")[0] == 200     # not counted against the cap
+    assert call(app, "/jobs/abc")[0] == 200   # nor are job polls
+    assert call(app, "/jobs")[0] == 503       # but submissions are
+    assert app.calls == 2
+
+
+def test_middleware_honours_noshed_policies_and_releases_slots():
+    limiter = ConcurrencyLimiter(max_limit=1, queue_target=0.01)
+    app = App(RateLimiter(RoutePolicy(), {"/batch": RoutePolicy(shed=False)}), limiter)
+    assert call(app)[0] == 200
+    assert limiter.in_flight == 0
+    limiter.in_flight = 1
+    assert call(app, "/batch")[0] == 200
+    assert call(app)[0] == 503
+
+
+def test_websocket_handshake_is_rate_limited_but_not_shed():
+    limiter = ConcurrencyLimiter(max_limit=1, queue_target=0.01)
+    limiter.in_flight = 1                     # a full cap does not refuse sockets
+    app = App(RateLimiter(RoutePolicy(), {"/ws": RoutePolicy(rate=0.5)}), limiter)
+    scope = {"type": "websocket", "path": "/ws", "headers": [], "app": app, "client": ("10.0.0.1", 5000)}
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(LoadSheddingMiddleware(app)(scope, None, send))
+    assert app.calls == 1                     # first connection goes through
+    asyncio.run(LoadSheddingMiddleware(app)(scope, None, send))
+    assert app.calls == 1
+    assert sent[-1] == {"type": "websocket.close", "code": 1013}
@@ -0,0 +1,72 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_readiness.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for readiness checks and the background warm-up
+# in app/readiness.py.
+# ----------------------------------------------------------
+
+import asyncio
+from app.readiness import OK, PENDING, Readiness, start_warm_up
+
+
+def test_ready_only_when_every_check_is_ok():
+    now = [10.0]
+    readiness = Readiness(clock=lambda: now[0])
+    readiness.add("database")
+    readiness.add("homepage")
+    assert not readiness.ready
+    assert readiness.to_dict() == {"status": "starting", "checks": {"database": PENDING, "homepage": PENDING},
+                                   "warmup_seconds": None}
+    now[0] = 10.5
+    readiness.mark("database", OK)
+    readiness.mark("homepage", OK)
+    assert readiness.ready
+    assert readiness.to_dict()["status"] == "ready"
+    assert readiness.stats() == {"ready": 1, "warmup_seconds": 0.5}
+
+    readiness.stop()
+    assert not readiness.ready
+    assert readiness.to_dict()["status"] == "stopping"
+
+
+def test_warm_up_runs_steps_and_retries_failures():
+    readiness = Readiness()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("database is starting up")
+
+    async def fine():
+        pass
+
+    async def scenario():
+        task = start_warm_up(readiness, {"database": flaky, "kernels": fine}, retry=0.001)
+        assert readiness.checks == {"database": PENDING, "kernels": PENDING}  # registered before running
+        await task
+
+    asyncio.run(scenario())
+    assert len(attempts) == 3
+    assert readiness.ready
+    assert readiness.warmup_seconds is not None
+
+
+def test_failed_step_is_reported_until_it_succeeds():
+    readiness = Readiness()
+
+    async def down():
+        raise ConnectionError("refused")
+
+    async def scenario():
+        task = start_warm_up(readiness, {"database": down}, retry=0.001, max_retry=0.001)
+        await asyncio.sleep(0.02)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert readiness.checks["database"] == "error: refused"
+    assert not readiness.ready
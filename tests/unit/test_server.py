@@ -0,0 +1,123 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_server.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the production launch options, command
+# lines and listening socket in app/server.py.
+# ----------------------------------------------------------
+
+import socket
+import pytest
+import uvicorn
+from uvicorn import supervisors
+from app import server
+from app.server import ServerOptions, bind_socket, default_workers, gunicorn_argv, uvicorn_kwargs
+
+
+# ----------------------------------------------------------
+# Worker count and auto-detection
+# ----------------------------------------------------------
+def test_default_workers_follows_cpu_count(monkeypatch):
+    monkeypatch.delenv("CALC_WORKERS", raising=False)
+    monkeypatch.setattr(server.os, "cpu_count", lambda: 6)
+    assert default_workers() == 6
+    monkeypatch.setenv("CALC_WORKERS", "3")
+    assert default_workers() == 3
+    monkeypatch.setenv("CALC_WORKERS", "lots")
+    assert default_workers() == 6
+
+
+def test_resolved_picks_fast_implementations_when_installed(monkeypatch):
+    monkeypatch.setattr(server, "installed", lambda module: True)
+    options = ServerOptions(workers=4).resolved()
+    assert (options.server, options.loop, options.http) == ("gunicorn", "uvloop", "httptools")
+
+
+def test_resolved_falls_back_to_uvicorn_and_asyncio(monkeypatch):
+    monkeypatch.setattr(server, "installed", lambda module: False)
+    options = ServerOptions(workers=4).resolved()
+    assert (options.server, options.loop, options.http) == ("uvicorn", "asyncio", "h11")
+    assert options.workers == 4
+
+
+def test_resolved_keeps_explicit_choices(monkeypatch):
+    monkeypatch.setattr(server, "installed", lambda module: True)
+    options = ServerOptions(workers=1, server="uvicorn", loop="asyncio", http="h11").resolved()
+    assert (options.server, options.loop, options.http) == ("uvicorn", "asyncio", "h11")
+    # a single worker gains nothing from gunicorn's master process
+    assert ServerOptions(workers=1).resolved().server == "uvicorn"
+
+
+# ----------------------------------------------------------
+# Server command lines
+# ----------------------------------------------------------
+def test_uvicorn_kwargs():
+    options = ServerOptions(port=9000, workers=2, loop="asyncio", http="h11", graceful_timeout=12)
+    kwargs = uvicorn_kwargs(options)
+    assert kwargs["workers"] == 2
+    assert kwargs["timeout_graceful_shutdown"] == 12
+    assert kwargs["access_log"] is False
+    uvicorn.Config("main:app", **kwargs)  # every key is a valid uvicorn setting
+
+
+def test_gunicorn_argv_preloads_uvicorn_workers():
+    argv = gunicorn_argv(ServerOptions(host="127.0.0.1", port=9000, workers=8, max_requests=1000))
+    assert argv[:2] == ["gunicorn", "main:app"]
+    assert "--preload" in argv
+    assert argv[argv.index("--worker-class") + 1] == "uvicorn.workers.UvicornWorker"
+    assert argv[argv.index("--bind") + 1] == "127.0.0.1:9000"
+    assert argv[argv.index("--max-requests-jitter") + 1] == "100"
+    assert "--max-requests" not in gunicorn_argv(ServerOptions(workers=2))
+
+
+# ----------------------------------------------------------
+# Listening socket and run()
+# ----------------------------------------------------------
+def test_bind_socket_is_tcp_so_accepted_connections_get_nodelay():
+    sock = bind_socket(ServerOptions(host="127.0.0.1", port=0))
+    try:
+        assert sock.proto == socket.IPPROTO_TCP
+        assert sock.get_inheritable()
+    finally:
+        sock.close()
+
+
+def test_run_single_worker_serves_in_process(monkeypatch):
+    calls = []
+    monkeypatch.setattr(uvicorn.Server, "run", lambda self: calls.append(self.config.workers))
+    server.run(ServerOptions(workers=1, server="uvicorn"))
+    assert calls == [1]
+
+
+def test_run_multiple_workers_uses_shared_socket(monkeypatch):
+    started = []
+
+    class FakeMultiprocess:
+        def __init__(self, config, target, sockets):
+            started.append((config.workers, sockets[0].proto))
+            sockets[0].close()
+
+        def run(self):
+            started.append("run")
+
+    monkeypatch.setattr(supervisors, "Multiprocess", FakeMultiprocess)
+    server.run(ServerOptions(host="127.0.0.1", port=0, workers=3, server="uvicorn"))
+    assert started == [(3, socket.IPPROTO_TCP), "run"]
+
+
+def test_run_gunicorn_requires_installation(monkeypatch):
+    monkeypatch.setattr(server.shutil, "which", lambda name: None)
+    with pytest.raises(RuntimeError, match="gunicorn is not installed"):
+        server.run(ServerOptions(workers=2, server="gunicorn"))
+
+
+def test_run_gunicorn_execs_with_preload(monkeypatch):
+    calls = []
+    monkeypatch.setattr(server.shutil, "which", lambda name: "/usr/bin/gunicorn")
+    monkeypatch.setattr(server.os, "execv", lambda path, argv: calls.append((path, argv)))
+    server.run(ServerOptions(workers=2, server="gunicorn"))
+    assert calls[0][0] == "/usr/bin/gunicorn"
+    assert "--preload" in calls[0][1]
@@ -0,0 +1,153 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_stats.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the calculation_stats rollup in app/stats.py:
+# incremental upserts from the writer, per-user reads and the
+# chunked rebuild (plus its CLI command), on SQLite.
+# ----------------------------------------------------------
+
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import func, select
+from app.db import calculation_stats, calculations, create_db_engine, init_db
+from app.persistence import CalculationWriter
+from app.stats import _upsert_generic, aggregate_rows, get_user_stats, rebuild_stats, upsert_stats
+from cli import cli
+
+ROWS = [
+    {"operation": "add", "operand_a": 1, "operand_b": 2, "result": 3.0, "user_id": 1},
+    {"operation": "add", "operand_a": 5, "operand_b": 5, "result": 10.0, "user_id": 1},
+    {"operation": "divide", "operand_a": 1, "operand_b": 4, "result": 0.25, "user_id": 1},
+    {"operation": "add", "operand_a": -4, "operand_b": 1, "result": -3.0, "user_id": 2},
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'calc.db'}")
+    init_db(engine)
+    yield engine
+    engine.dispose()
+
+
+def stats_table(engine):
+    with engine.connect() as conn:
+        return {
+            (row.user_id, row.operation): (row.count, row.total, row.min_result, row.max_result)
+            for row in conn.execute(select(calculation_stats))
+        }
+
+
+def group_by_table(engine):
+    c = calculations.c
+    with engine.connect() as conn:
+        return {
+            (row[0], row[1]): tuple(row[2:])
+            for row in conn.execute(
+                select(c.user_id, c.operation, func.count(), func.sum(c.result),
+                       func.min(c.result), func.max(c.result)).group_by(c.user_id, c.operation)
+            )
+        }
+
+
+# ----------------------------------------------------------
+# Aggregation and upserts
+# ----------------------------------------------------------
+def test_aggregate_rows():
+    assert aggregate_rows(ROWS) == {
+        (1, "add"): [2, 13.0, 3.0, 10.0],
+        (1, "divide"): [1, 0.25, 0.25, 0.25],
+        (2, "add"): [1, -3.0, -3.0, -3.0],
+    }
+
+
+def test_upsert_merges_into_existing_rows(engine):
+    with engine.begin() as conn:
+        upsert_stats(conn, aggregate_rows(ROWS[:2]))
+        upsert_stats(conn, aggregate_rows(ROWS[2:] + [dict(ROWS[0], result=-7.0)]))
+        upsert_stats(conn, {})
+    assert stats_table(engine) == {
+        (1, "add"): (3, 6.0, -7.0, 10.0),
+        (1, "divide"): (1, 0.25, 0.25, 0.25),
+        (2, "add"): (1, -3.0, -3.0, -3.0),
+    }
+
+
+def test_generic_upsert_fallback(engine):
+    with engine.begin() as conn:
+        for rows in (ROWS, ROWS[:1]):
+            values = [
+                {"user_id": u, "operation": op, "count": n, "total": t, "min_result": lo, "max_result": hi}
+                for (u, op), (n, t, lo, hi) in aggregate_rows(rows).items()
+            ]
+            _upsert_generic(conn, values)
+    assert stats_table(engine)[(1, "add")] == (3, 16.0, 3.0, 10.0)
+
+
+# ----------------------------------------------------------
+# Writer keeps the rollup in step with inserted rows
+# ----------------------------------------------------------
+def test_writer_maintains_stats(engine):
+    writer = CalculationWriter(engine, batch_size=2)
+    writer.record_many(dict(row) for row in ROWS * 3)
+    writer.flush()
+    assert stats_table(engine) == group_by_table(engine)
+    assert stats_table(engine)[(1, "add")][0] == 6
+
+
+def test_writer_can_skip_stats(engine):
+    writer = CalculationWriter(engine, maintain_stats=False)
+    writer.record_many(dict(row) for row in ROWS)
+    writer.flush()
+    assert stats_table(engine) == {}
+
+
+# ----------------------------------------------------------
+# Reads
+# ----------------------------------------------------------
+def test_get_user_stats(engine):
+    with engine.begin() as conn:
+        upsert_stats(conn, aggregate_rows(ROWS))
+    stats = get_user_stats(engine, 1)
+    assert stats["operations"]["add"] == {"count": 2, "sum": 13.0, "min": 3.0, "max": 10.0, "mean": 6.5}
+    assert list(stats["operations"]) == ["add", "divide"]
+    assert stats["overall"] == {"count": 3, "sum": 13.25, "min": 0.25, "max": 10.0, "mean": 13.25 / 3}
+    with engine.connect() as conn:
+        assert get_user_stats(conn, 99) == {
+            "user_id": 99, "operations": {},
+            "overall": {"count": 0, "sum": 0, "min": None, "max": None, "mean": None},
+        }
+
+
+# ----------------------------------------------------------
+# Rebuild from raw rows
+# ----------------------------------------------------------
+def test_rebuild_matches_group_by_in_chunks(engine):
+    rows = [dict(ROWS[i % 4], result=float(i % 17 - 8), user_id=i % 5) for i in range(1000)]
+    with engine.begin() as conn:
+        conn.execute(calculations.insert(), rows)
+        upsert_stats(conn, {(1, "add"): [999, 1.0, 1.0, 1.0]})  # stale rollup is replaced
+    summary = rebuild_stats(engine, chunk_size=64)
+    assert summary.rows == 1000
+    assert summary.chunks == 16
+    assert summary.groups == len(group_by_table(engine))
+    assert stats_table(engine) == group_by_table(engine)
+
+
+def test_rebuild_empty_table(engine):
+    assert rebuild_stats(engine).rows == 0
+    assert stats_table(engine) == {}
+
+
+def test_cli_rebuild_stats(engine, tmp_path):
+    with engine.begin() as conn:
+        conn.execute(calculations.insert(), ROWS)
+    url = str(engine.url)
+    result = CliRunner().invoke(cli, ["rebuild-stats", "--chunk-size", "2"], env={"DATABASE_URL": url})
+    assert result.exit_code == 0, result.output
+    assert "Rebuilt 3 user/operation rows from 4 calculations (2 chunks)" in result.output
+    assert stats_table(engine) == group_by_table(engine)
@@ -0,0 +1,110 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_streaming.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the NDJSON streaming helpers in
+# app/streaming.py: line splitting across chunk boundaries,
+# record parsing and ordered, grouped evaluation.
+# ----------------------------------------------------------
+
+import asyncio
+import json
+import pytest
+from app.streaming import encode_ndjson, iter_lines, parse_record, stream_calculations
+
+
+async def chunked(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def collect(async_iter):
+    async def run():
+        return [item async for item in async_iter]
+    return asyncio.run(run())
+
+
+# ----------------------------------------------------------
+# iter_lines()
+# ----------------------------------------------------------
+def test_lines_split_across_chunks():
+    lines = collect(iter_lines(chunked(b'{"a":', b' 1}\n{"b"', b": 2}\n", b"tail")))
+    assert lines == [b'{"a": 1}', b'{"b": 2}', b"tail"]
+
+
+def test_overlong_lines_are_reported_once():
+    lines = collect(iter_lines(chunked(b"x" * 6, b"y" * 6, b"z\nok\n", b"short\n" + b"w" * 8 + b"\n"), max_line=5))
+    assert lines == [None, b"ok", b"short", None]
+
+
+def test_overlong_trailing_line():
+    assert collect(iter_lines(chunked(b"abc\n123456"), max_line=5)) == [b"abc", None]
+
+
+# ----------------------------------------------------------
+# parse_record()
+# ----------------------------------------------------------
+@pytest.mark.parametrize("line, expected", [
+    (b'{"op": "add", "a": 1, "b": 2.5}', ("add", 1, 2.5)),
+    (b'{"op": "add", "a": true, "b": 2}', {"error": "Invalid or missing numeric input."}),
+    (b'{"op": "add", "a": 1}', {"error": "Invalid or missing numeric input."}),
+    (b'[1, 2]', {"error": "Invalid or missing numeric input."}),
+    (b'{"op": ', {"error": "Invalid JSON."}),
+])
+def test_parse_record(line, expected):
+    assert parse_record(line) == expected
+
+
+# ----------------------------------------------------------
+# stream_calculations()
+# ----------------------------------------------------------
+def test_stream_preserves_order_and_groups_output():
+    body = b"".join([
+        b'{"op": "add", "a": 1, "b": 2}\n',
+        b"\n",
+        b'{"op": "divide", "a": 1, "b": 0}\n',
+        b"not json\n",
+        b'{"op": "multiply", "a": 3, "b": 3}\n',
+    ])
+    sunk = []
+    chunks = collect(stream_calculations(chunked(body[:20], body[20:]), sink=sunk.extend, group_size=2))
+    assert len(chunks) == 2
+    lines = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert lines == [
+        {"result": 3},
+        {"error": "Cannot divide by zero."},
+        {"error": "Invalid JSON."},
+        {"result": 9},
+    ]
+    assert [row["operation"] for row in sunk] == ["add", "multiply"]
+
+
+def strict_loads(line):
+    """json.loads that rejects NaN / Infinity like every other JSON parser."""
+    def reject(constant):
+        raise ValueError(f"non-standard JSON constant: {constant}")
+    return json.loads(line, parse_constant=reject)
+
+
+def test_stream_output_is_strict_json():
+    body = b"".join([
+        b'{"op": "multiply", "a": 1e308, "b": 10}\n',
+        b'{"op": "add", "a": Infinity, "b": 1}\n',
+        b'{"op": "subtract", "a": NaN, "b": 1}\n',
+        b'{"op": "add", "a": 1, "b": 2}\n',
+    ])
+    sunk = []
+    chunks = collect(stream_calculations(chunked(body), sink=sunk.extend))
+    lines = [strict_loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert lines == [{"error": "Result is out of range."}] * 3 + [{"result": 3}]
+    assert [row["result"] for row in sunk] == [3]
+
+
+def test_encode_ndjson_never_emits_non_finite_numbers():
+    encoded = encode_ndjson([{"result": float("inf")}, {"result": float("nan")}, {"result": 1.5}])
+    assert [strict_loads(line) for line in encoded.splitlines()] == [
+        {"error": "Result is out of range."}, {"error": "Result is out of range."}, {"result": 1.5},
+    ]
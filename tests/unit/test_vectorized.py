@@ -0,0 +1,101 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_vectorized.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the NumPy-based column operations in
+# app/vectorized.py. Results are compared with the scalar
+# functions in app/operations.py so both paths stay in sync.
+# ----------------------------------------------------------
+
+import numpy as np
+import pytest
+from app.operations import add, subtract, multiply, divide
+from app.vectorized import (
+    STATUS_DIVIDE_BY_ZERO,
+    STATUS_OK,
+    STATUS_OUT_OF_RANGE,
+    STATUS_UNSUPPORTED,
+    add_array,
+    as_column,
+    divide_array,
+    evaluate_columns,
+    multiply_array,
+    op_code_column,
+    subtract_array,
+)
+
+A = [3, -2, 2.5, 0, 7.5]
+B = [5, 6, 1.5, 4, 2.5]
+
+
+# ----------------------------------------------------------
+# Test element-wise operations against the scalar versions
+# ----------------------------------------------------------
+@pytest.mark.parametrize("array_func, scalar_func", [
+    (add_array, add),
+    (subtract_array, subtract),
+    (multiply_array, multiply),
+])
+def test_array_matches_scalar(array_func, scalar_func):
+    """Each array function must agree with its scalar counterpart."""
+    expected = [scalar_func(a, b) for a, b in zip(A, B)]
+    assert array_func(A, B).tolist() == expected
+
+
+def test_divide_array_reports_zero_mask():
+    """Zero divisors are flagged in the mask instead of raising."""
+    result, zero_mask = divide_array(np.array([8, 1, -9]), np.array([2, 0, 3]))
+    assert zero_mask.tolist() == [False, True, False]
+    assert result[0] == divide(8, 2)
+    assert np.isnan(result[1])
+    assert result[2] == divide(-9, 3)
+
+
+# ----------------------------------------------------------
+# Test column validation
+# ----------------------------------------------------------
+@pytest.mark.parametrize("values", [["abc", 1], [1, None], [{"a": 1}]])
+def test_as_column_rejects_non_numeric(values):
+    """Non-numeric columns raise the same TypeError as the scalar path."""
+    with pytest.raises(TypeError, match="Both operands must be numbers"):
+        as_column(values)
+
+
+def test_as_column_rejects_matrix():
+    with pytest.raises(ValueError, match="one-dimensional"):
+        as_column([[1, 2], [3, 4]])
+
+
+def test_mismatched_lengths():
+    with pytest.raises(ValueError, match="same length"):
+        add_array([1, 2, 3], [1, 2])
+
+
+# ----------------------------------------------------------
+# Test mixed op-code evaluation
+# ----------------------------------------------------------
+def test_evaluate_columns_mixed():
+    """Mixed operations are computed in one pass with per-row status."""
+    codes = op_code_column(["add", "subtract", "multiply", "divide", "divide", "power"])
+    results, status = evaluate_columns(codes, [1, 5, 2, 9, 1, 2], [2, 3, 4, 3, 0, 3])
+    assert results[:4].tolist() == [3.0, 2.0, 8.0, 3.0]
+    assert np.isnan(results[4]) and np.isnan(results[5])
+    assert status.tolist() == [
+        STATUS_OK, STATUS_OK, STATUS_OK, STATUS_OK, STATUS_DIVIDE_BY_ZERO, STATUS_UNSUPPORTED,
+    ]
+
+
+def test_evaluate_columns_length_mismatch():
+    with pytest.raises(ValueError, match="same length"):
+        evaluate_columns([0, 0], [1, 2, 3], [1, 2, 3])
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+def test_evaluate_columns_flags_overflow_without_warnings():
+    codes = op_code_column(["multiply", "add", "divide", "subtract"])
+    results, status = evaluate_columns(codes, [1e308, 1, 1e308, float("inf")], [10, 2, 1e-10, float("inf")])
+    assert status.tolist() == [STATUS_OUT_OF_RANGE, STATUS_OK, STATUS_OUT_OF_RANGE, STATUS_OUT_OF_RANGE]
+    assert results[1] == 3 and np.isnan(results[[0, 2, 3]]).all()
@@ -0,0 +1,162 @@
+# ----------------------------------------------------------
+# Author: Nandan Kumar
+# Date: 11/03/2025
+# Assignment-9: Working with Raw SQL in pgAdmin
+# File: tests/unit/test_websocket.py
+# ----------------------------------------------------------
+# Description:
+# Unit tests for the text and binary frame handlers and the
+# connection loop in app/websocket.py.
+# ----------------------------------------------------------
+
+import asyncio
+import json
+import numpy as np
+import pytest
+from starlette.websockets import WebSocketDisconnect
+from app.cache import ResultCache
+from app.ratelimit import RateLimiter, RoutePolicy
+from app.websocket import (
+    REQUEST_RECORD, RESPONSE_RECORD, YIELD_EVERY, CalculationChannel, ChannelStats, serve_channel,
+)
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.rows = []
+
+    def record(self, operation, a, b, result, user_id):
+        self.rows.append((operation, a, b, result, user_id))
+
+
+def text(channel, payload):
+    reply, ok = channel.handle_text(payload if isinstance(payload, str) else json.dumps(payload))
+    return json.loads(reply), ok
+
+
+# ----------------------------------------------------------
+# Text frames
+# ----------------------------------------------------------
+def test_text_frame_is_computed_cached_and_persisted():
+    writer, cache = RecordingWriter(), ResultCache(16)
+    channel = CalculationChannel(cache=cache, writer=writer, user_id=7)
+    assert text(channel, {"id": "r1", "op": "multiply", "a": "3", "b": 4}) == ({"id": "r1", "result": 12.0}, True)
+    assert text(channel, {"id": 2, "op": "multiply", "a": 3, "b": 4}) == ({"id": 2, "result": 12.0}, True)
+    assert cache.stats()["hits"] == 1
+    assert writer.rows == [("multiply", 3.0, 4.0, 12.0, 7)] * 2
+
+
+@pytest.mark.parametrize("payload, error", [
+    ({"id": 1, "op": "divide", "a": 1, "b": 0}, "Cannot divide by zero."),
+    ({"id": 1, "op": "power", "a": 1, "b": 2}, "Unsupported operation: power"),
+    ({"id": 1, "op": "add", "a": "x", "b": 2}, "Invalid or missing numeric input."),
+    ({"id": 1, "op": "add", "a": 1}, "Invalid or missing numeric input."),
+    ({"id": 1, "op": "multiply", "a": 1e308, "b": 10}, "Out of range float values are not JSON compliant"),
+])
+def test_text_frame_errors_echo_the_id(payload, error):
+    writer = RecordingWriter()
+    assert text(CalculationChannel(writer=writer), payload) == ({"id": 1, "error": error}, False)
+    assert writer.rows == []
+
+
+@pytest.mark.parametrize("payload", ["not json", "[1, 2]", {"id": [1], "op": "add", "a": 1, "b": 1},
+                                     {"id": True, "op": "add", "a": 1, "b": 1},
+                                     {"id": 2 ** 70, "op": "add", "a": 1, "b": 1}])
+def test_malformed_text_frames_get_a_null_id(payload):
+    reply, ok = text(CalculationChannel(), payload)
+    assert reply == {"id": None, "error": "Invalid or missing numeric input."}
+    assert not ok
+
+
+# ----------------------------------------------------------
+# Binary frames
+# ----------------------------------------------------------
+def test_binary_frame_round_trip_and_persistence():
+    records = np.zeros(4, dtype=REQUEST_RECORD)
+    records["id"] = [10, 11, 12, 13]
+    records["op"] = [0, 3, 3, 200]
+    records["a"] = [1.5, 1.0, 9.0, 1.0]
+    records["b"] = [2.0, 0.0, 3.0, 1.0]
+    writer = RecordingWriter()
+    reply, ok = CalculationChannel(writer=writer, user_id=3).handle_binary(records.tobytes())
+    assert ok
+    response = np.frombuffer(reply, dtype=RESPONSE_RECORD)
+    assert response["id"].tolist() == [10, 11, 12, 13]
+    assert response["status"].tolist() == [0, 1, 0, 2]
+    assert response["result"][[0, 2]].tolist() == [3.5, 3.0]
+    assert writer.rows == [("add", 1.5, 2.0, 3.5, 3), ("divide", 9.0, 3.0, 3.0, 3)]
+
+
+def test_binary_frame_reports_overflow_as_out_of_range():
+    records = np.zeros(2, dtype=REQUEST_RECORD)
+    records["op"] = [2, 0]
+    records["a"] = [1e308, 1.0]
+    records["b"] = [10.0, 2.0]
+    writer = RecordingWriter()
+    reply, ok = CalculationChannel(writer=writer).handle_binary(records.tobytes())
+    response = np.frombuffer(reply, dtype=RESPONSE_RECORD)
+    assert ok and response["status"].tolist() == [3, 0]
+    assert writer.rows == [("add", 1.0, 2.0, 3.0, 1)]
+
+
+@pytest.mark.parametrize("payload", [b"", b"x" * 20, b"x" * (REQUEST_RECORD.itemsize + 1)])
+def test_malformed_binary_frames(payload):
+    reply, ok = CalculationChannel().handle_binary(payload)
+    assert not ok
+    assert "Binary frames must hold" in json.loads(reply)["error"]
+
+
+# ----------------------------------------------------------
+# Connection loop
+# ----------------------------------------------------------
+class FakeWebSocket:
+    def __init__(self, messages, fail_send=False):
+        self.messages = list(messages)
+        self.sent = []
+        self.fail_send = fail_send
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        return self.messages.pop(0) if self.messages else {"type": "websocket.disconnect"}
+
+    async def send_text(self, data):
+        if self.fail_send:
+            raise WebSocketDisconnect(1006)
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+def test_serve_channel_answers_in_order_and_counts():
+    frames = [{"type": "websocket.receive", "text": json.dumps({"id": i, "op": "add", "a": i, "b": 1})}
+              for i in range(YIELD_EVERY + 1)]
+    frames.append({"type": "websocket.receive", "bytes": b"bad"})
+    websocket, stats = FakeWebSocket(frames), ChannelStats()
+    asyncio.run(serve_channel(websocket, CalculationChannel(stats=stats)))
+    assert [json.loads(reply)["id"] for reply in websocket.sent[:-1]] == list(range(YIELD_EVERY + 1))
+    assert stats.stats() == {"connections": 0, "opened": 1, "messages": YIELD_EVERY + 2, "errors": 1, "limited": 0}
+
+
+def test_serve_channel_stops_when_the_client_is_gone():
+    websocket = FakeWebSocket([{"type": "websocket.receive", "text": "{}"}] * 3, fail_send=True)
+    stats = ChannelStats()
+    asyncio.run(serve_channel(websocket, CalculationChannel(stats=stats)))
+    assert stats.connections == 0
+    assert stats.messages == 0
+
+
+def test_serve_channel_rate_limits_frames():
+    frames = [{"type": "websocket.receive", "text": json.dumps({"id": i, "op": "add", "a": i, "b": 1})}
+              for i in range(3)]
+    frames.append({"type": "websocket.receive", "bytes": np.zeros(1, dtype=REQUEST_RECORD).tobytes()})
+    limiter = RateLimiter(RoutePolicy(), {"/ws": RoutePolicy(rate=1, burst=2)}, clock=lambda: 0.0)
+    websocket, stats = FakeWebSocket(frames), ChannelStats()
+    asyncio.run(serve_channel(websocket, CalculationChannel(stats=stats, rate_limiter=limiter, client="a")))
+    replies = [json.loads(reply) for reply in websocket.sent]
+    assert replies[:2] == [{"id": 0, "result": 1.0}, {"id": 1, "result": 2.0}]
+    assert replies[2] == {"id": 2, "error": "Rate limit exceeded.", "retry_after": 1.0}
+    assert replies[3] == {"id": None, "error": "Rate limit exceeded.", "retry_after": 1.0}
+    assert (stats.messages, stats.limited) == (2, 2)